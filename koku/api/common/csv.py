@@ -15,7 +15,9 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 """API views for CSV output."""
+from django.http import StreamingHttpResponse
 from rest_framework_csv.renderers import CSVRenderer
+from rest_framework_csv.renderers import CSVStreamingRenderer
 
 
 class PaginatedCSVRenderer(CSVRenderer):
@@ -32,3 +34,19 @@ class PaginatedCSVRenderer(CSVRenderer):
         if not isinstance(data, list):
             data = data.get(self.results_field, [])
         return super().render(data, *args, **kwargs)
+
+
+def streaming_csv_response(rows, header):
+    """Return a response writing CSV rows as they are produced.
+
+    Args:
+        rows (iterable): The row dictionaries to render
+        header (list): The CSV column names
+
+    Returns:
+        (StreamingHttpResponse): The CSV response
+
+    """
+    renderer = CSVStreamingRenderer()
+    content = renderer.render(rows, renderer_context={"header": header})
+    return StreamingHttpResponse(content, content_type="text/csv")
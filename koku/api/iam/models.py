@@ -19,8 +19,12 @@ from uuid import uuid4
 
 from django.contrib.postgres.fields import JSONField
 from django.db import models
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 from tenant_schemas.models import TenantMixin
 
+from koku.cache import invalidate_identity_cache
+
 
 class Customer(models.Model):
     """A Koku Customer.
@@ -87,3 +91,15 @@ class Tenant(TenantMixin):
 
     # Delete all schemas when a tenant is removed
     auto_drop_schema = True
+
+
+@receiver(post_delete, sender=Customer)
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Tenant)
+def identity_post_delete_callback(*args, **kwargs):
+    """
+    Drop cached identities that may refer to the deleted row.
+
+    Note: Signal receivers must accept keyword arguments (**kwargs).
+    """
+    invalidate_identity_cache()
@@ -38,6 +38,43 @@ from reporting_common.models import CostUsageReportStatus
 DATE_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 LOG = logging.getLogger(__name__)
 
+# The number of billing periods, oldest first, and manifests per period,
+# newest first, reported in provider statistics.
+STATISTICS_MONTHS = 2
+STATISTICS_MANIFESTS = 3
+
+# The tenant model holding the processing times of a billing period, and
+# its period start field, for each provider type.
+PERIOD_MODELS = {
+    Provider.PROVIDER_OCP: (OCPUsageReportPeriod, "report_period_start"),
+    Provider.PROVIDER_AWS: (AWSCostEntryBill, "billing_period_start"),
+    Provider.PROVIDER_AWS_LOCAL: (AWSCostEntryBill, "billing_period_start"),
+    Provider.PROVIDER_AZURE: (AzureCostEntryBill, "billing_period_start"),
+    Provider.PROVIDER_AZURE_LOCAL: (AzureCostEntryBill, "billing_period_start"),
+}
+
+# Ranks the manifests of every provider in a single query, so only the ones
+# reported in the statistics are loaded.
+STATISTICS_MANIFESTS_SQL = """
+SELECT ranked.*
+  FROM (
+    SELECT manifest.*,
+           dense_rank() OVER (
+               PARTITION BY manifest.provider_id
+               ORDER BY manifest.billing_period_start_datetime
+           ) AS month_rank,
+           row_number() OVER (
+               PARTITION BY manifest.provider_id, manifest.billing_period_start_datetime
+               ORDER BY manifest.manifest_creation_datetime DESC
+           ) AS manifest_rank
+      FROM {table} AS manifest
+     WHERE manifest.provider_id = ANY(%s::uuid[])
+  ) AS ranked
+ WHERE ranked.month_rank <= %s
+   AND ranked.manifest_rank <= %s
+ ORDER BY ranked.billing_period_start_datetime DESC, ranked.manifest_rank
+"""
+
 
 class ProviderManagerError(Exception):
     """General Exception class for ProviderManager errors."""
@@ -74,96 +111,19 @@ class ProviderManager:
 
     def get_infrastructure_name(self):
         """Get the name of the infrastructure that the provider is running on."""
-        if self.model.infrastructure and self.model.infrastructure.infrastructure_type:
-            return self.model.infrastructure.infrastructure_type
-        return "Unknown"
+        return get_infrastructure_name(self.model)
 
     def is_removable_by_user(self, current_user):
         """Determine if the current_user can remove the provider."""
         return self.model.customer == current_user.customer
 
-    def _get_tenant_provider_stats(self, provider, tenant, period_start):
-        """Return provider statistics for schema."""
-        stats = {}
-        query = None
-        with tenant_context(tenant):
-            if provider.type == Provider.PROVIDER_OCP:
-                query = OCPUsageReportPeriod.objects.filter(
-                    provider=provider, report_period_start=period_start
-                ).first()
-            elif provider.type == Provider.PROVIDER_AWS or provider.type == Provider.PROVIDER_AWS_LOCAL:
-                query = AWSCostEntryBill.objects.filter(provider=provider, billing_period_start=period_start).first()
-            elif provider.type == Provider.PROVIDER_AZURE or provider.type == Provider.PROVIDER_AZURE_LOCAL:
-                query = AzureCostEntryBill.objects.filter(provider=provider, billing_period_start=period_start).first()
-        if query and query.summary_data_creation_datetime:
-            stats["summary_data_creation_datetime"] = query.summary_data_creation_datetime.strftime(DATE_TIME_FORMAT)
-        if query and query.summary_data_updated_datetime:
-            stats["summary_data_updated_datetime"] = query.summary_data_updated_datetime.strftime(DATE_TIME_FORMAT)
-        if query and query.derived_cost_datetime:
-            stats["derived_cost_datetime"] = query.derived_cost_datetime.strftime(DATE_TIME_FORMAT)
-
-        return stats
-
     def provider_statistics(self, tenant=None):
         """Return a json object of provider report statistics."""
-        manifest_months_query = (
-            CostUsageReportManifest.objects.filter(provider=self.model)
-            .distinct("billing_period_start_datetime")
-            .order_by("billing_period_start_datetime")
-            .all()
-        )
-
-        months = []
-        for month in manifest_months_query[:2]:
-            months.append(month.billing_period_start_datetime)
-
-        provider_stats = {}
-        for month in sorted(months, reverse=True):
-            stats_key = str(month.date())
-            provider_stats[stats_key] = []
-            month_stats = []
-            stats_query = CostUsageReportManifest.objects.filter(
-                provider=self.model, billing_period_start_datetime=month
-            ).order_by("manifest_creation_datetime")
-
-            for provider_manifest in stats_query.reverse()[:3]:
-                status = {}
-                report_status = CostUsageReportStatus.objects.filter(manifest=provider_manifest).first()
-                status["assembly_id"] = provider_manifest.assembly_id
-                status["billing_period_start"] = provider_manifest.billing_period_start_datetime.date()
-                status["files_processed"] = "{}/{}".format(
-                    provider_manifest.num_processed_files, provider_manifest.num_total_files
-                )
-                last_process_start_date = None
-                last_process_complete_date = None
-                last_manifest_complete_datetime = None
-                if provider_manifest.manifest_completed_datetime:
-                    last_manifest_complete_datetime = provider_manifest.manifest_completed_datetime.strftime(
-                        DATE_TIME_FORMAT
-                    )
-                if report_status and report_status.last_started_datetime:
-                    last_process_start_date = report_status.last_started_datetime.strftime(DATE_TIME_FORMAT)
-                if report_status and report_status.last_completed_datetime:
-                    last_process_complete_date = report_status.last_completed_datetime.strftime(DATE_TIME_FORMAT)
-                status["last_process_start_date"] = last_process_start_date
-                status["last_process_complete_date"] = last_process_complete_date
-                status["last_manifest_complete_date"] = last_manifest_complete_datetime
-                schema_stats = self._get_tenant_provider_stats(provider_manifest.provider, tenant, month)
-                status["summary_data_creation_datetime"] = schema_stats.get("summary_data_creation_datetime")
-                status["summary_data_updated_datetime"] = schema_stats.get("summary_data_updated_datetime")
-                status["derived_cost_datetime"] = schema_stats.get("derived_cost_datetime")
-                month_stats.append(status)
-
-            provider_stats[stats_key] = month_stats
-
-        return provider_stats
+        return get_providers_statistics([self.model], tenant).get(self.model.uuid, {})
 
     def get_cost_models(self, tenant):
         """Get the cost models associated with this provider."""
-        with tenant_context(tenant):
-            cost_models_map = CostModelMap.objects.filter(provider_uuid=self._uuid)
-        cost_models = [m.cost_model for m in cost_models_map]
-        return cost_models
+        return get_providers_cost_models([self.model.uuid], tenant).get(self.model.uuid, [])
 
     def update(self, request):
         """Check if provider is a sources model."""
@@ -189,6 +149,125 @@ class ProviderManager:
             raise ProviderManagerError(err_msg)
 
 
+def _format_datetime(value):
+    """Return the datetime as a string, or None if it is not set."""
+    return value.strftime(DATE_TIME_FORMAT) if value else None
+
+
+def get_infrastructure_name(provider):
+    """Get the name of the infrastructure that the provider is running on."""
+    if provider.infrastructure and provider.infrastructure.infrastructure_type:
+        return provider.infrastructure.infrastructure_type
+    return "Unknown"
+
+
+def _get_tenant_providers_stats(providers, tenant, periods):
+    """Return the processing times of the providers' billing periods in the tenant schema.
+
+    Args:
+        providers (list): Provider objects
+        tenant (Tenant): The tenant holding the providers' data
+        periods (set): Billing period start datetimes
+
+    Returns:
+        (dict): Statistics keyed by (provider uuid, period start)
+
+    """
+    providers_by_model = {}
+    for provider in providers:
+        if provider.type in PERIOD_MODELS:
+            providers_by_model.setdefault(PERIOD_MODELS[provider.type], []).append(provider.uuid)
+
+    stats = {}
+    with tenant_context(tenant):
+        for (model, period_field), provider_uuids in providers_by_model.items():
+            query = model.objects.filter(provider_id__in=provider_uuids, **{f"{period_field}__in": periods}).order_by(
+                "id"
+            )
+            for period in query:
+                stats.setdefault(
+                    (period.provider_id, getattr(period, period_field)),
+                    {
+                        "summary_data_creation_datetime": _format_datetime(period.summary_data_creation_datetime),
+                        "summary_data_updated_datetime": _format_datetime(period.summary_data_updated_datetime),
+                        "derived_cost_datetime": _format_datetime(period.derived_cost_datetime),
+                    },
+                )
+    return stats
+
+
+def get_providers_statistics(providers, tenant=None):
+    """Return the report statistics of several providers.
+
+    The manifests, report statuses and tenant billing periods of all of the
+    providers are each loaded in one query.
+
+    Args:
+        providers (list): Provider objects
+        tenant (Tenant): The tenant holding the providers' data
+
+    Returns:
+        (dict): Statistics keyed by provider uuid, for providers with manifests
+
+    """
+    provider_uuids = [str(provider.uuid) for provider in providers]
+    manifests = list(
+        CostUsageReportManifest.objects.raw(
+            STATISTICS_MANIFESTS_SQL.format(table=CostUsageReportManifest._meta.db_table),
+            [provider_uuids, STATISTICS_MONTHS, STATISTICS_MANIFESTS],
+        )
+    )
+    if not manifests:
+        return {}
+
+    report_statuses = {}
+    statuses = CostUsageReportStatus.objects.filter(manifest_id__in=[manifest.id for manifest in manifests])
+    for report_status in statuses.order_by("id"):
+        report_statuses.setdefault(report_status.manifest_id, report_status)
+
+    periods = {manifest.billing_period_start_datetime for manifest in manifests}
+    schema_stats = _get_tenant_providers_stats(providers, tenant, periods)
+
+    provider_stats = {}
+    for provider_manifest in manifests:
+        month = provider_manifest.billing_period_start_datetime
+        report_status = report_statuses.get(provider_manifest.id)
+        month_stats = provider_stats.setdefault(provider_manifest.provider_id, {}).setdefault(str(month.date()), [])
+        status = {}
+        status["assembly_id"] = provider_manifest.assembly_id
+        status["billing_period_start"] = month.date()
+        status["files_processed"] = "{}/{}".format(
+            provider_manifest.num_processed_files, provider_manifest.num_total_files
+        )
+        status["last_process_start_date"] = _format_datetime(report_status and report_status.last_started_datetime)
+        status["last_process_complete_date"] = _format_datetime(
+            report_status and report_status.last_completed_datetime
+        )
+        status["last_manifest_complete_date"] = _format_datetime(provider_manifest.manifest_completed_datetime)
+        stats = schema_stats.get((provider_manifest.provider_id, month), {})
+        status["summary_data_creation_datetime"] = stats.get("summary_data_creation_datetime")
+        status["summary_data_updated_datetime"] = stats.get("summary_data_updated_datetime")
+        status["derived_cost_datetime"] = stats.get("derived_cost_datetime")
+        month_stats.append(status)
+
+    return provider_stats
+
+
+def get_providers_cost_models(provider_uuids, tenant):
+    """Get the cost models associated with several providers in one query.
+
+    Returns:
+        (dict): Lists of cost models keyed by provider uuid
+
+    """
+    cost_models = {}
+    with tenant_context(tenant):
+        cost_models_map = CostModelMap.objects.filter(provider_uuid__in=provider_uuids).select_related("cost_model")
+        for cost_model_map in cost_models_map:
+            cost_models.setdefault(cost_model_map.provider_uuid, []).append(cost_model_map.cost_model)
+    return cost_models
+
+
 @receiver(post_delete, sender=Provider)
 def provider_post_delete_callback(*args, **kwargs):
     """
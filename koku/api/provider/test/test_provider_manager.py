@@ -32,6 +32,7 @@ from api.provider.models import Provider
 from api.provider.models import ProviderAuthentication
 from api.provider.models import ProviderBillingSource
 from api.provider.models import Sources
+from api.provider.provider_manager import get_providers_statistics
 from api.provider.provider_manager import ProviderManager
 from api.provider.provider_manager import ProviderManagerError
 from api.report.test.azure.openshift.helpers import OCPAzureReportDataGenerator
@@ -441,6 +442,32 @@ class ProviderManagerTest(IamTestCase):
             self.assertIsNone(value_data.get("summary_data_updated_datetime"))
             self.assertIsNone(value_data.get("derived_cost_datetime"))
 
+    def test_get_providers_statistics(self):
+        """Test that statistics of several providers match each provider's statistics."""
+        providers = []
+        for provider_type, cluster_id in ((Provider.PROVIDER_OCP, "cluster_id_1001"), (Provider.PROVIDER_AWS, None)):
+            provider_authentication = ProviderAuthentication.objects.create(
+                provider_resource_name=cluster_id or "arn:aws:iam::2:role/mg"
+            )
+            provider = Provider.objects.create(
+                name=f"{provider_type}providername",
+                type=provider_type,
+                created_by=self.user,
+                customer=self.customer,
+                authentication=provider_authentication,
+            )
+            providers.append(provider)
+        data_generator = OCPReportDataGenerator(self.tenant, providers[0])
+        data_generator.add_data_to_tenant(**{"provider_uuid": providers[0].uuid})
+
+        stats = get_providers_statistics(providers, self.tenant)
+
+        self.assertEqual(list(stats.keys()), [providers[0].uuid])
+        self.assertEqual(stats[providers[0].uuid], ProviderManager(providers[0].uuid).provider_statistics(self.tenant))
+        self.assertEqual(ProviderManager(providers[1].uuid).provider_statistics(self.tenant), {})
+        for month_stats in stats[providers[0].uuid].values():
+            self.assertLessEqual(len(month_stats), 3)
+
     def test_ocp_on_aws_infrastructure_type(self):
         """Test that the provider infrastructure returns AWS when running on AWS."""
         provider_authentication = ProviderAuthentication.objects.create(provider_resource_name="cluster_id_1001")
@@ -30,6 +30,9 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.serializers import UUIDField
 
+from .provider_manager import get_infrastructure_name
+from .provider_manager import get_providers_cost_models
+from .provider_manager import get_providers_statistics
 from .provider_manager import ProviderManager
 from .provider_manager import ProviderManagerError
 from api.common.filters import CharListFilter
@@ -137,7 +140,9 @@ class ProviderViewSet(
         user = self.request.user
         if user:
             try:
-                queryset = Provider.objects.filter(customer=user.customer)
+                queryset = Provider.objects.filter(customer=user.customer).select_related(
+                    "authentication", "billing_source", "customer", "created_by", "infrastructure"
+                )
             except Customer.DoesNotExist:
                 LOG.error("No customer found for user %s.", user)
         return queryset
@@ -184,14 +189,22 @@ class ProviderViewSet(
         """Obtain the list of providers."""
         response = super().list(request=request, args=args, kwargs=kwargs)
         stats = request.query_params.get("stats", "false").lower()
+        tenant = get_tenant(request.user)
+        uuids = [provider["uuid"] for provider in response.data["data"]]
+        providers = {
+            str(provider.uuid): provider
+            for provider in Provider.objects.filter(uuid__in=uuids).select_related("infrastructure")
+        }
+        cost_models = get_providers_cost_models(list(providers), tenant)
+        if stats == "true":
+            provider_stats = get_providers_statistics(list(providers.values()), tenant)
         for provider in response.data["data"]:
-            manager = ProviderManager(provider["uuid"])
-            tenant = get_tenant(request.user)
+            model = providers[str(provider["uuid"])]
             if stats == "true":
-                provider["stats"] = manager.provider_statistics(tenant)
-            provider["infrastructure"] = manager.get_infrastructure_name()
+                provider["stats"] = provider_stats.get(model.uuid, {})
+            provider["infrastructure"] = get_infrastructure_name(model)
             provider["cost_models"] = [
-                {"name": model.name, "uuid": model.uuid} for model in manager.get_cost_models(tenant)
+                {"name": cost_model.name, "uuid": cost_model.uuid} for cost_model in cost_models.get(model.uuid, [])
             ]
         return response
 
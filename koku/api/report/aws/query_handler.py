@@ -243,6 +243,9 @@ class AWSReportQueryHandler(ReportQueryHandler):
                     account_alias=Coalesce(F(self._mapper.provider_map.get("alias")), "usage_account_id")
                 )
 
+            if self.is_csv_streaming:
+                return self._format_csv_stream_response(query_data, query_order_by)
+
             query_sum = self._build_sum(query, annotations)
 
             if self._limit:
@@ -250,7 +253,7 @@ class AWSReportQueryHandler(ReportQueryHandler):
                 rank_by_total = Window(expression=RowNumber(), partition_by=F("date"), order_by=rank_order)
                 query_data = query_data.annotate(rank=rank_by_total)
                 query_order_by.insert(1, "rank")
-                query_data = self._ranked_list(query_data)
+                query_data = self._ranked_query(query_data)
 
             if self._delta:
                 query_data = self.add_deltas(query_data, query_sum)
@@ -15,7 +15,6 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 """AWS Report Serializers."""
-from pint.errors import UndefinedUnitError
 from rest_framework import serializers
 
 from api.report.serializers import FilterSerializer as BaseFilterSerializer
@@ -24,6 +23,7 @@ from api.report.serializers import OrderSerializer
 from api.report.serializers import ParamSerializer
 from api.report.serializers import StringOrListField
 from api.report.serializers import validate_field
+from api.utils import UndefinedUnitError
 from api.utils import UnitConverter
 
 
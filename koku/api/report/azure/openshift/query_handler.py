@@ -75,12 +75,15 @@ class OCPAzureReportQueryHandler(AzureReportQueryHandler):
             annotations = self._mapper.report_type_map.get("annotations")
             query_data = query_data.values(*query_group_by).annotate(**annotations)
 
+            if self.is_csv_streaming:
+                return self._format_csv_stream_response(query_data, query_order_by)
+
             if self._limit:
                 rank_order = getattr(F(self.order_field), self.order_direction)()
                 rank_by_total = Window(expression=RowNumber(), partition_by=F("date"), order_by=rank_order)
                 query_data = query_data.annotate(rank=rank_by_total)
                 query_order_by.insert(1, "rank")
-                query_data = self._ranked_list(query_data)
+                query_data = self._ranked_query(query_data)
 
             if query.exists():
                 aggregates = self._mapper.report_type_map.get("aggregates")
@@ -150,6 +150,9 @@ class AzureReportQueryHandler(ReportQueryHandler):
 
             annotations = self._mapper.report_type_map.get("annotations")
             query_data = query_data.values(*query_group_by).annotate(**annotations)
+            if self.is_csv_streaming:
+                return self._format_csv_stream_response(query_data, query_order_by)
+
             query_sum = self._build_sum(query)
 
             if self._limit:
@@ -157,7 +160,7 @@ class AzureReportQueryHandler(ReportQueryHandler):
                 rank_by_total = Window(expression=RowNumber(), partition_by=F("date"), order_by=rank_order)
                 query_data = query_data.annotate(rank=rank_by_total)
                 query_order_by.insert(1, "rank")
-                query_data = self._ranked_list(query_data)
+                query_data = self._ranked_query(query_data)
 
             if self._delta:
                 query_data = self.add_deltas(query_data, query_sum)
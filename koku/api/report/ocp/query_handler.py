@@ -77,6 +77,17 @@ class OCPReportQueryHandler(ReportQueryHandler):
             annotations[q_param] = Concat(db_field, Value(""))
         return annotations
 
+    @property
+    def is_csv_streaming(self):
+        """Return whether CSV rows are streamed straight from the database.
+
+        Monthly cluster capacity is added to each row in python, so reports
+        with a capacity aggregate are not streamed.
+        """
+        if self._mapper.report_type_map.get("capacity_aggregate") and self.resolution == "monthly":
+            return False
+        return super().is_csv_streaming
+
     @property
     def report_annotations(self):
         """Return annotations with the correct capacity field."""
@@ -136,11 +147,14 @@ class OCPReportQueryHandler(ReportQueryHandler):
 
             query_data = query_data.values(*query_group_by).annotate(**self.report_annotations)
 
+            if self.is_csv_streaming:
+                return self._format_csv_stream_response(query_data, query_order_by)
+
             if self._limit and group_by_value:
                 rank_by_total = self.get_rank_window_function(group_by_value)
                 query_data = query_data.annotate(rank=rank_by_total)
                 query_order_by.insert(1, "rank")
-                query_data = self._ranked_list(query_data)
+                query_data = self._ranked_query(query_data)
 
             # Populate the 'total' section of the API response
             if query.exists():
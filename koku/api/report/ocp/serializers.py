@@ -16,7 +16,6 @@
 #
 """OCP Report Serializers."""
 from django.utils.translation import ugettext as _
-from pint.errors import UndefinedUnitError
 from rest_framework import serializers
 
 from api.models import Provider
@@ -26,6 +25,7 @@ from api.report.serializers import OrderSerializer
 from api.report.serializers import ParamSerializer
 from api.report.serializers import StringOrListField
 from api.report.serializers import validate_field
+from api.utils import UndefinedUnitError
 from api.utils import UnitConverter
 
 
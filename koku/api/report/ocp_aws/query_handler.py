@@ -59,12 +59,15 @@ class OCPInfrastructureReportQueryHandlerBase(AWSReportQueryHandler):
                     account_alias=Coalesce(F(self._mapper.provider_map.get("alias")), "usage_account_id")
                 )
 
+            if self.is_csv_streaming:
+                return self._format_csv_stream_response(query_data, query_order_by)
+
             if self._limit:
                 rank_order = getattr(F(self.order_field), self.order_direction)()
                 rank_by_total = Window(expression=RowNumber(), partition_by=F("date"), order_by=rank_order)
                 query_data = query_data.annotate(rank=rank_by_total)
                 query_order_by.insert(1, "rank")
-                query_data = self._ranked_list(query_data)
+                query_data = self._ranked_query(query_data)
 
             if query.exists():
                 aggregates = self._mapper.report_type_map.get("aggregates")
@@ -27,9 +27,17 @@ from decimal import InvalidOperation
 from itertools import groupby
 from urllib.parse import quote_plus
 
+from django.conf import settings
+from django.db import connections
+from django.db.models import F
 from django.db.models import Q
+from django.db.models import Value
 from django.db.models.expressions import OrderBy
 from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+from django.db.models.functions import Lower
+from django.db.models.functions import NullIf
+from tenant_schemas.utils import tenant_context
 
 from api.query_filter import QueryFilter
 from api.query_filter import QueryFilterCollection
@@ -37,6 +45,24 @@ from api.query_handler import QueryHandler
 
 LOG = logging.getLogger(__name__)
 
+# Fields ordered by value rather than alphabetically
+NUMERIC_ORDERING = [
+    "date",
+    "rank",
+    "delta",
+    "delta_percent",
+    "total",
+    "usage",
+    "request",
+    "limit",
+    "cost",
+    "infrastructure_cost",
+    "derived_cost",
+]
+
+# Rows fetched per round trip when streaming CSV from a server-side cursor
+CSV_STREAM_CHUNK_SIZE = 2000
+
 
 def strip_tag_prefix(tag):
     """Remove the query tag prefix from a tag key."""
@@ -69,6 +95,7 @@ class ReportQueryHandler(QueryHandler):
         self._delta = parameters.delta
         self._offset = parameters.get_filter("offset", default=0)
         self.query_delta = {"value": None, "percent": None}
+        self.csv_header = None
 
         self.query_filter = self._get_filter()
 
@@ -495,19 +522,6 @@ class ReportQueryHandler(QueryHandler):
             (list): The sorted/ordered list
 
         """
-        numeric_ordering = [
-            "date",
-            "rank",
-            "delta",
-            "delta_percent",
-            "total",
-            "usage",
-            "request",
-            "limit",
-            "cost",
-            "infrastructure_cost",
-            "derived_cost",
-        ]
         tag_str = "tag:"
         db_tag_prefix = self._mapper.tag_column + "__"
         sorted_data = data
@@ -517,7 +531,7 @@ class ReportQueryHandler(QueryHandler):
             if field.startswith("-"):
                 reverse = True
                 field = field[1:]
-            if field in numeric_ordering:
+            if field in NUMERIC_ORDERING:
                 sorted_data = sorted(
                     sorted_data, key=lambda entry: (entry[field] is None, entry[field]), reverse=reverse
                 )
@@ -532,6 +546,94 @@ class ReportQueryHandler(QueryHandler):
                 sorted_data = sorted(sorted_data, key=lambda entry: entry[field].lower(), reverse=reverse)
         return sorted_data
 
+    @property
+    def is_csv_output(self):
+        """Return whether the report is rendered as CSV."""
+        accept_type = self.parameters.accept_type
+        return bool(accept_type and "text/csv" in accept_type)
+
+    @property
+    def is_csv_streaming(self):
+        """Return whether CSV rows are streamed straight from the database.
+
+        Ranked and delta reports need the whole result set in memory, unit
+        conversion is applied to the full response, and an explicitly
+        paginated request keeps the paginated response.
+        """
+        if not (settings.STREAM_CSV_REPORTS and self.is_csv_output):
+            return False
+        if self._limit or self._delta or self.parameters.get("units"):
+            return False
+        query_params = self.parameters.request.GET
+        return "limit" not in query_params and "offset" not in query_params
+
+    def _order_by_query(self, query_data, order_fields):
+        """Order a values query in the database the way order_by orders rows.
+
+        Args:
+            query_data (QuerySet): The values query to order
+            order_fields (list): The list of dictionary keys to order by.
+
+        Returns
+            (QuerySet): The ordered query
+
+        """
+        tag_str = "tag:"
+        db_tag_prefix = self._mapper.tag_column + "__"
+        ordering = []
+        for field in order_fields:
+            descending = field.startswith("-")
+            field = field.lstrip("-")
+            if field in NUMERIC_ORDERING:
+                expression = F(field)
+            elif tag_str in field:
+                tag = db_tag_prefix + field[field.index(tag_str) + len(tag_str) :]  # noqa: E203
+                ordering.append(f"-{tag}" if descending else tag)
+                continue
+            else:
+                expression = Coalesce(Lower(NullIf(F(field), Value(""))), Value(f"no-{field}"))
+            ordering.append(expression.desc() if descending else expression.asc())
+        return query_data.order_by(*ordering)
+
+    def _stream_csv_rows(self, query_data, order_fields):
+        """Stream the rows of a values query through a server-side cursor.
+
+        Sets the CSV header, which cannot be discovered from the rows
+        without reading all of them first.
+
+        Args:
+            query_data (QuerySet): The values query for the report
+            order_fields (list): The list of dictionary keys to order by.
+
+        Returns
+            (generator): The report rows
+
+        """
+        query_data = self._order_by_query(query_data, order_fields)
+        query = query_data.query
+        self.csv_header = sorted([*query.extra_select, *query.values_select, *query.annotation_select])
+        fill_fields = [
+            field.lstrip("-")
+            for field in order_fields
+            if field.lstrip("-") not in NUMERIC_ORDERING and "tag:" not in field
+        ]
+
+        def rows():
+            with tenant_context(self.tenant):
+                for row in query_data.iterator(chunk_size=CSV_STREAM_CHUNK_SIZE):
+                    for field in fill_fields:
+                        if not row.get(field):
+                            row[field] = f"no-{field}"
+                    yield row
+
+        return rows()
+
+    def _format_csv_stream_response(self, query_data, order_fields):
+        """Format the query response with streamed CSV rows and no totals."""
+        self.query_sum = self.initialize_totals()
+        self.query_data = self._stream_csv_rows(query_data, order_fields)
+        return self._format_query_response()
+
     def get_tag_order_by(self, tag):
         """Generate an OrderBy clause forcing JSON column->key to be used.
 
@@ -589,8 +691,101 @@ class ReportQueryHandler(QueryHandler):
 
         return self.unpack_date_grouped_data(rank_limited_data)
 
-    # needs refactoring, but disabling pylint's complexity check for now.
-    def _perform_rank_summation(self, entry, is_offset):  # noqa: C901
+    def _ranked_query(self, query_data):
+        """Rank limit a query in the database.
+
+        This does the work of _ranked_list in a single SQL statement so that
+        only the rows inside the requested page and one "Others" row per
+        date are returned, no matter how many groups the query produces.
+
+        Args:
+            query_data (QuerySet): A values query annotated with a per date rank
+        Returns:
+            List(Dict): List of data points meeting the rank criteria
+
+        """
+        query = query_data.query
+        compiler = query.get_compiler(using=query_data.db)
+        inner_sql, inner_params = compiler.as_sql()
+
+        # Same column order as django's ValuesIterable
+        names = [*query.extra_select, *query.values_select, *query.annotation_select]
+        columns = dict(zip(names, (f"col_{index}" for index in range(len(names)))))
+        date_column = columns["date"]
+        rank_column = columns["rank"]
+        column_list = ", ".join(columns.values())
+
+        is_offset = "offset" in self.parameters.get("filter", {})
+        params = [*inner_params, self._offset, self._limit + self._offset]
+        sql = f"""
+            WITH ranked ({column_list}) AS ({inner_sql}),
+            page AS (
+                SELECT *,
+                    {rank_column} > %s AND {rank_column} <= %s AS in_page,
+                    max({rank_column}) OVER () AS max_rank
+                FROM ranked
+            )
+            SELECT {column_list}, max_rank, 0 AS others_count
+            FROM page
+            WHERE in_page
+        """
+
+        if not is_offset:
+            sum_columns = [column for name, column in columns.items() if name in (self._mapper.sum_columns or [])]
+            label_columns = set(self._get_group_by()) | {"account_alias", "cluster_alias"}
+            others_sums = ", ".join(f"sum({column}) FILTER (WHERE NOT in_page) AS {column}" for column in sum_columns)
+            others_columns = []
+            for name, column in columns.items():
+                if name == "date":
+                    others_columns.append(f"others.{column}")
+                elif name == "rank":
+                    others_columns.append("%s")
+                    params.append(self._limit + 1)
+                elif column in sum_columns:
+                    others_columns.append(f"coalesce(others.{column}, 0)")
+                elif name in label_columns:
+                    others_columns.append("NULL")
+                else:
+                    # Like a copy of the first row, keep its remaining values
+                    others_columns.append(f"first.{column}")
+            others_sums = f"{others_sums}," if others_sums else ""
+            sql += f"""
+            UNION ALL
+            SELECT {", ".join(others_columns)}, others.max_rank, others.others_count
+            FROM (
+                SELECT {date_column},
+                    {others_sums}
+                    max(max_rank) AS max_rank,
+                    count(*) FILTER (WHERE NOT in_page) AS others_count
+                FROM page
+                GROUP BY {date_column}
+            ) AS others
+            JOIN page AS first
+                ON first.{date_column} = others.{date_column}
+                AND first.{rank_column} = 1
+            WHERE others.others_count > 0
+            """
+
+        # Run on the database the router picked for the query, the read replica when configured
+        with connections[query_data.db].cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        converters = compiler.get_converters([expression for expression, _, _ in compiler.select])
+        if converters:
+            rows = compiler.apply_converters(rows, converters)
+
+        ranked_list = []
+        for row in rows:
+            data = dict(zip(names, row))
+            self.max_rank = row[-2]
+            num_others = row[-1]
+            if num_others:
+                self._label_others(data, num_others)
+            ranked_list.append(data)
+        return ranked_list
+
+    def _perform_rank_summation(self, entry, is_offset):
         """Do the actual rank limiting for rank_list."""
         other = None
         ranked_list = []
@@ -608,37 +803,39 @@ class ReportQueryHandler(QueryHandler):
                     other_sums[column] += data.get(column) if data.get(column) else 0
 
         if other is not None and others_list and not is_offset:
-            num_others = len(others_list)
-            others_label = f"{num_others} Others"
-
-            if num_others == 1:
-                others_label = f"{num_others} Other"
-
             other.update(other_sums)
             other["rank"] = self._limit + 1
-            group_by = self._get_group_by()
+            self._label_others(other, len(others_list))
+            ranked_list.append(other)
 
-            for group in group_by:
-                other[group] = others_label
+        return ranked_list
 
-            if "account" in group_by:
-                other["account_alias"] = others_label
+    def _label_others(self, other, num_others):
+        """Replace the group by values of an "Others" row with its label."""
+        others_label = f"{num_others} Others"
 
-            if "cluster" in group_by:
-                other["cluster_alias"] = others_label
-                exclusions = []
-            else:
-                # delete these labels from the Others category if we're not
-                # grouping by cluster.
-                exclusions = ["cluster", "cluster_alias"]
+        if num_others == 1:
+            others_label = f"{num_others} Other"
 
-            for exclude in exclusions:
-                if exclude in other:
-                    del other[exclude]
+        group_by = self._get_group_by()
 
-            ranked_list.append(other)
+        for group in group_by:
+            other[group] = others_label
 
-        return ranked_list
+        if "account" in group_by:
+            other["account_alias"] = others_label
+
+        if "cluster" in group_by:
+            other["cluster_alias"] = others_label
+            exclusions = []
+        else:
+            # delete these labels from the Others category if we're not
+            # grouping by cluster.
+            exclusions = ["cluster", "cluster_alias"]
+
+        for exclude in exclusions:
+            if exclude in other:
+                del other[exclude]
 
     def date_group_data(self, data_list):
         """Group data by date."""
@@ -660,11 +857,15 @@ class ReportQueryHandler(QueryHandler):
     def _create_previous_totals(self, previous_query, query_group_by):
         """Get totals from the time period previous to the current report.
 
+        The grouped totals and the total over the whole previous period
+        come from the same grouped query.
+
         Args:
             previous_query (Query): A Django ORM query
             query_group_by (dict): The group by dict for the current report
         Returns:
             (dict) A dictionary keyed off the grouped values for the report
+            (Decimal) The total of the previous time period
 
         """
         date_delta = self._get_date_delta()
@@ -675,14 +876,16 @@ class ReportQueryHandler(QueryHandler):
         delta_annotation = {self._delta: delta_field}
         previous_sums = previous_sums.values(*query_group_by).annotate(**delta_annotation)
         previous_dict = OrderedDict()
+        previous_total = Decimal(0)
         for row in previous_sums:
             date = self.string_to_date(row["date"])
             date = date + date_delta
             row["date"] = self.date_to_string(date)
             key = tuple(row[key] for key in query_group_by)
             previous_dict[key] = row[self._delta]
+            previous_total += Decimal(row[self._delta] or 0)
 
-        return previous_dict
+        return previous_dict, previous_total
 
     def _get_previous_totals_filter(self, filter_dates):
         """Filter previous time range to exlude days from the current range.
@@ -694,23 +897,16 @@ class ReportQueryHandler(QueryHandler):
             filter_dates (list) A list of date strings of dates to filter
 
         Returns:
-            (django.db.models.query_utils.Q) The OR date filter
+            (django.db.models.query_utils.Q) The date filter, None without dates
 
         """
         date_delta = self._get_date_delta()
-        prev_total_filters = None
-
-        for i in range(len(filter_dates)):
-            date = self.string_to_date(filter_dates[i])
-            date = date - date_delta
-            filter_dates[i] = self.date_to_string(date)
-
-        for date in filter_dates:
-            if prev_total_filters:
-                prev_total_filters = prev_total_filters | Q(usage_start=date)
-            else:
-                prev_total_filters = Q(usage_start=date)
-        return prev_total_filters
+        previous_dates = {
+            self.date_to_string(self.string_to_date(date) - date_delta) for date in filter_dates if date is not None
+        }
+        if not previous_dates:
+            return None
+        return Q(usage_start__in=sorted(previous_dates))
 
     def add_deltas(self, query_data, query_sum):
         """Calculate and add cost deltas to a result set.
@@ -727,7 +923,14 @@ class ReportQueryHandler(QueryHandler):
         delta_filter = self._get_filter(delta=True)
         q_table = self._mapper.query_table
         previous_query = q_table.objects.filter(delta_filter)
-        previous_dict = self._create_previous_totals(previous_query, delta_group_by)
+        if self.resolution == "daily":
+            # Only the days present in the current range are compared, so the
+            # previous period is narrowed to them before grouping.
+            dates = [entry.get("date") for entry in query_data]
+            prev_total_filters = self._get_previous_totals_filter(dates)
+            if prev_total_filters:
+                previous_query = previous_query.filter(prev_total_filters)
+        previous_dict, prev_total_sum = self._create_previous_totals(previous_query, delta_group_by)
         for row in query_data:
             key = tuple(row[key] for key in delta_group_by)
             previous_total = previous_dict.get(key) or 0
@@ -745,15 +948,6 @@ class ReportQueryHandler(QueryHandler):
                 current_total_sum = Decimal(query_sum.get("cost", {}).get("value") or 0)
             else:
                 current_total_sum = Decimal(query_sum.get("cost") or 0)
-        delta_field = self._mapper._report_type_map.get("delta_key").get(self._delta)
-        prev_total_sum = previous_query.aggregate(value=delta_field)
-        if self.resolution == "daily":
-            dates = [entry.get("date") for entry in query_data]
-            prev_total_filters = self._get_previous_totals_filter(dates)
-            if prev_total_filters:
-                prev_total_sum = previous_query.filter(prev_total_filters).aggregate(value=delta_field)
-
-        prev_total_sum = Decimal(prev_total_sum.get("value") or 0)
 
         total_delta = current_total_sum - prev_total_sum
         total_delta_percent = self._percent_delta(current_total_sum, prev_total_sum)
@@ -27,6 +27,8 @@ from unittest.mock import PropertyMock
 from django.db.models import Count
 from django.db.models import F
 from django.db.models import Sum
+from django.db.models import Window
+from django.db.models.functions import RowNumber
 from django.urls import reverse
 from rest_framework.exceptions import ValidationError
 from tenant_schemas.utils import tenant_context
@@ -988,6 +990,40 @@ class AWSReportQueryTest(IamTestCase):
         ranked_list = handler._ranked_list(data_list)
         self.assertEqual(ranked_list, expected)
 
+    def test_ranked_query_matches_ranked_list(self):
+        """Test that ranking in the database gives the same rows as ranking in python."""
+        for product in ["ec2", "ebs", "s3", "rds"]:
+            self.generator.add_data_to_tenant(FakeAWSCostData(self.provider), product=product)
+        for extra_filter in ["", "&filter[offset]=1"]:
+            with self.subTest(extra_filter=extra_filter):
+                url = f"?filter[time_scope_units]=month&filter[time_scope_value]=-1&filter[resolution]=monthly&filter[limit]=1&group_by[service]=*{extra_filter}"  # noqa: E501
+                query_params = self.mocked_query_params(url, AWSCostView)
+                handler = AWSReportQueryHandler(query_params)
+                with tenant_context(self.tenant):
+                    query = handler.query_table.objects.filter(handler.query_filter)
+                    query_data = query.annotate(**handler.annotations)
+                    query_data = query_data.values(*(["date"] + handler._get_group_by())).annotate(
+                        **handler._mapper.report_type_map.get("annotations")
+                    )
+                    rank_order = getattr(F(handler.order_field), handler.order_direction)()
+                    query_data = query_data.annotate(
+                        rank=Window(expression=RowNumber(), partition_by=F("date"), order_by=rank_order)
+                    )
+                    expected = handler._ranked_list(list(query_data))
+                    expected_max_rank = handler.max_rank
+                    handler.max_rank = 0
+                    ranked_list = handler._ranked_query(query_data)
+
+                def sort_key(row):
+                    return (row["date"], row["rank"])
+
+                self.assertEqual(len(ranked_list), len(expected))
+                self.assertEqual(handler.max_rank, expected_max_rank)
+                for actual_row, expected_row in zip(sorted(ranked_list, key=sort_key), sorted(expected, key=sort_key)):
+                    self.assertEqual(actual_row["service"], expected_row["service"])
+                    for column in handler._mapper.sum_columns:
+                        self.assertAlmostEqual(actual_row[column], expected_row[column], 6)
+
     def test_query_costs_with_totals(self):
         """Test execute_query() - costs with totals.
 
@@ -17,6 +17,7 @@
 """Test the Report Queries."""
 from unittest.mock import Mock
 
+from django.db.models import Q
 from django.test import TestCase
 from faker import Faker
 
@@ -347,13 +348,23 @@ class ReportQueryHandlerTest(IamTestCase):
         self.assertIsInstance(output, QueryFilterCollection)
         assertSameQ(output.compose(), expected.compose())
 
+    def test_get_previous_totals_filter(self):
+        """Test that the previous period is filtered to the shifted dates with one IN clause."""
+        url = "?filter[time_scope_units]=day&filter[time_scope_value]=-10&filter[resolution]=daily"
+        params = self.mocked_query_params(url, self.mock_view)
+        rqh = create_test_handler(params)
+        dates = ["2020-01-12", "2020-01-11", "2020-01-12"]
+        output = rqh._get_previous_totals_filter(dates)
+        self.assertEqual(output, Q(usage_start__in=["2020-01-01", "2020-01-02"]))
+        self.assertEqual(dates, ["2020-01-12", "2020-01-11", "2020-01-12"])
+        self.assertIsNone(rqh._get_previous_totals_filter([]))
+
     # FIXME: need test for _apply_group_by
     # FIXME: need test for _apply_group_null_label
     # FIXME: need test for _build_custom_filter_list  }
     # FIXME: need test for _create_previous_totals
     # FIXME: need test for _get_filter
     # FIXME: need test for _get_group_by
-    # FIXME: need test for _get_previous_totals_filter
     # FIXME: need test for _get_search_filter
     # FIXME: need test for _get_tag_group_by
     # FIXME: need test for _group_data_by_list
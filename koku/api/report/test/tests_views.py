@@ -15,6 +15,10 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 """Test the Report views."""
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.test import override_settings
 from django.test import RequestFactory
 from django.urls import reverse
 from rest_framework import status
@@ -28,6 +32,7 @@ from api.iam.test.iam_test_case import IamTestCase
 from api.report.view import _fill_in_missing_units
 from api.report.view import _find_unit
 from api.report.view import get_paginator
+from koku.cache import invalidate_report_cache
 
 
 class ReportViewTest(IamTestCase):
@@ -121,6 +126,62 @@ class ReportViewTest(IamTestCase):
                 self.assertEqual(response.accepted_media_type, "text/csv")
                 self.assertIsInstance(response.accepted_renderer, CSVRenderer)
 
+    @override_settings(STREAM_CSV_REPORTS=True)
+    def test_endpoint_csv_streaming(self):
+        """Test that CSV reports are streamed when enabled."""
+        self.client = APIClient(HTTP_ACCEPT="text/csv")
+        for endpoint in self.ENDPOINTS:
+            with self.subTest(endpoint=endpoint):
+                url = reverse(endpoint)
+                response = self.client.get(url, content_type="text/csv", **self.headers)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertTrue(response.streaming)
+                self.assertEqual(response["Content-Type"], "text/csv")
+                lines = b"".join(response.streaming_content).decode("utf-8").splitlines()
+                self.assertIn("date", lines[0].split(","))
+                self.assertTrue(len(lines) > 1)
+
+    @override_settings(STREAM_CSV_REPORTS=True)
+    def test_endpoint_csv_paginated_not_streamed(self):
+        """Test that explicitly paginated CSV requests keep the paginated response."""
+        self.client = APIClient(HTTP_ACCEPT="text/csv")
+        url = reverse("reports-aws-costs") + "?limit=5"
+        response = self.client.get(url, content_type="text/csv", **self.headers)
+        response.render()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.streaming)
+        self.assertIsInstance(response.accepted_renderer, CSVRenderer)
+
+    @override_settings(STREAM_CSV_REPORTS=True)
+    def test_endpoint_csv_units_not_streamed(self):
+        """Test that CSV requests with unit conversion keep the converted response."""
+        self.client = APIClient(HTTP_ACCEPT="text/csv")
+        url = reverse("reports-aws-storage") + "?units=byte"
+        response = self.client.get(url, content_type="text/csv", **self.headers)
+        response.render()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.streaming)
+        self.assertIsInstance(response.accepted_renderer, CSVRenderer)
+
+    @override_settings(CACHE_REPORTS=True)
+    def test_endpoint_cached_until_invalidated(self):
+        """Test that repeated report requests are served from the cache until invalidated."""
+        caches["default"].clear()
+        url = reverse("reports-aws-costs")
+        with patch("api.report.aws.query_handler.AWSReportQueryHandler.execute_query") as mock_execute:
+            mock_execute.return_value = {"data": []}
+            first = self.client.get(url, **self.headers)
+            second = self.client.get(url, **self.headers)
+            self.assertEqual(first.json(), second.json())
+            mock_execute.assert_called_once()
+
+            self.client.get(url + "?filter[time_scope_units]=month", **self.headers)
+            self.assertEqual(mock_execute.call_count, 2)
+
+            invalidate_report_cache(self.schema_name)
+            self.client.get(url, **self.headers)
+            self.assertEqual(mock_execute.call_count, 3)
+
     def test_find_unit_list(self):
         """Test that the correct unit is returned."""
         expected_unit = "Hrs"
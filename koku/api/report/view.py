@@ -19,18 +19,22 @@ import logging
 
 from django.utils.translation import ugettext as _
 from django.views.decorators.vary import vary_on_headers
-from pint.errors import DimensionalityError
-from pint.errors import UndefinedUnitError
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.serializers import ValidationError
 from rest_framework.views import APIView
 
 from api.common import RH_IDENTITY_HEADER
+from api.common.csv import streaming_csv_response
 from api.common.pagination import ReportPagination
 from api.common.pagination import ReportRankedPagination
 from api.query_params import QueryParameters
+from api.utils import DimensionalityError
+from api.utils import UndefinedUnitError
 from api.utils import UnitConverter
+from koku.cache import get_cached_report
+from koku.cache import get_report_cache_key
+from koku.cache import set_cached_report
 
 LOG = logging.getLogger(__name__)
 
@@ -156,8 +160,18 @@ class ReportView(APIView):
             return Response(data=exc.detail, status=status.HTTP_400_BAD_REQUEST)
 
         handler = self.query_handler(params)
-        output = handler.execute_query()
-        max_rank = handler.max_rank
+        if handler.is_csv_streaming:
+            output = handler.execute_query()
+            return streaming_csv_response(output.get("data"), handler.csv_header)
+
+        cache_key = get_report_cache_key(params)
+        cached_report = get_cached_report(cache_key)
+        if cached_report is not None:
+            output, max_rank = cached_report
+        else:
+            output = handler.execute_query()
+            max_rank = handler.max_rank
+            set_cached_report(cache_key, output, max_rank)
 
         if "units" in params.parameters:
             from_unit = _find_unit()(output["data"])
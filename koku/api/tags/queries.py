@@ -18,17 +18,38 @@
 import copy
 import logging
 
-from django.db.models import F
+from django.db import connections
+from django.db import router
 from django.db.models import Q
 from tenant_schemas.utils import tenant_context
 
-from api.functions import JSONBObjectKeys
+from api.common.pagination import ReportRankedPagination
 from api.query_filter import QueryFilter
 from api.query_filter import QueryFilterCollection
 from api.query_handler import QueryHandler
 
 LOG = logging.getLogger(__name__)
 
+TAG_KEYS_SQL = """
+    SELECT tag_keys.key,
+        count(*) OVER () AS total
+    FROM ({sources}) AS tag_keys
+    {where}
+    ORDER BY tag_keys.key {direction}
+    {limit}
+"""
+
+TAG_KEYS_SOURCE_SQL = "SELECT jsonb_object_keys(source.{column}) AS key FROM ({query}) AS source"
+
+TAG_VALUES_SQL = """
+    SELECT tags.key,
+        array_agg(DISTINCT tags.value ORDER BY tags.value) AS values
+    FROM ({query}) AS source,
+        jsonb_each_text(source.{column}) AS tags
+    {where}
+    GROUP BY tags.key
+"""
+
 
 class TagQueryHandler(QueryHandler):
     """Handles tag queries and responses.
@@ -182,84 +203,129 @@ class TagQueryHandler(QueryHandler):
 
         return composed_filter
 
+    @property
+    def is_tag_request(self):
+        """Return whether the handler is serving the tags endpoint."""
+        return self.parameters.report_type == "tags"
+
+    @property
+    def key_prefix(self):
+        """Return the prefix tag keys are filtered on, if any."""
+        if not self.is_tag_request:
+            return None
+        return self.parameters.get_filter("key")
+
+    @property
+    def page(self):
+        """Return the (limit, offset) of the requested page, or None.
+
+        Pages are selected in the database when the ranked pagination
+        parameters are given, otherwise the whole result is returned and
+        paginated by the view.
+        """
+        if not self.is_tag_request or "offset" not in self.parameters.get("filter", {}):
+            return None
+        limit = self.parameters.get_filter("limit", default=ReportRankedPagination.default_limit)
+        offset = self.parameters.get_filter("offset", default=0)
+        return int(limit), int(offset)
+
+    def _get_sources(self):
+        """Return the data sources matching the type filter."""
+        type_filter = self.parameters.get_filter("type")
+        return [source for source in self.data_sources if not type_filter or type_filter == source.get("type")]
+
+    def _get_source_query(self, source, filters=True):
+        """Return the SQL and params selecting the filtered tag column of a source."""
+        column = source.get("db_column")
+        query = source.get("db_table").objects
+        if filters is True:
+            query = query.filter(self.query_filter)
+        query = query.exclude(self._get_exclusions(column)).values(column)
+        return query.query.sql_with_params()
+
+    def _key_prefix_clause(self, key_column):
+        """Return the SQL and params limiting keys to the requested prefix."""
+        if not self.key_prefix:
+            return "", []
+        escaped = self.key_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return f"WHERE {key_column} LIKE %s", [f"{escaped}%"]
+
     def get_tag_keys(self, filters=True):
         """Get a list of tag keys to validate filters."""
-        type_filter = self.parameters.get_filter("type")
-        tag_keys = []
+        sources = []
+        params = []
+        models = []
+        for source in self._get_sources():
+            query, query_params = self._get_source_query(source, filters)
+            sources.append(TAG_KEYS_SOURCE_SQL.format(column=source.get("db_column"), query=query))
+            params.extend(query_params)
+            models.append(source.get("db_table"))
+        if not sources:
+            return []
+
+        where, where_params = self._key_prefix_clause("tag_keys.key")
+        params.extend(where_params)
+        limit = ""
+        if self.page:
+            limit = "LIMIT %s OFFSET %s"
+            params.extend(self.page)
+        sql = TAG_KEYS_SQL.format(
+            sources=" UNION ".join(sources),
+            where=where,
+            direction="DESC" if self.order_direction == "desc" else "ASC",
+            limit=limit,
+        )
         with tenant_context(self.tenant):
-            for source in self.data_sources:
-                tag_keys_query = source.get("db_table").objects
+            # The sources are all report tables, which the router reads from the same database
+            with connections[router.db_for_read(models[0])].cursor() as cursor:
+                cursor.execute(sql, params)
+                rows = cursor.fetchall()
 
-                if filters is True:
-                    tag_keys_query = tag_keys_query.filter(self.query_filter)
+        # The total is only known from the rows of the page, so an out of range page has none
+        self.max_rank = rows[0][1] if rows else 0
+        return [row[0] for row in rows]
 
-                if type_filter and type_filter != source.get("type"):
-                    continue
-                exclusion = self._get_exclusions(source.get("db_column"))
-                tag_keys_query = (
-                    tag_keys_query.annotate(tag_keys=JSONBObjectKeys(F(source.get("db_column"))))
-                    .exclude(exclusion)
-                    .values("tag_keys")
-                    .distinct()
-                    .all()
-                )
+    @staticmethod
+    def _merge_tags(source, tag_values, merged_data=None):
+        """Merge key and values pairs into common key dictionaries.
 
-                tag_keys_query = [tag.get("tag_keys") for tag in tag_keys_query]
-                for tag_key in tag_keys_query:
-                    tag_keys.append(tag_key)
+        Args:
+            source (dict): The data source the tags came from
+            tag_values (list): (key, values) pairs
+            merged_data (dict): Previously merged tags, indexed by key and type
 
-        return list(set(tag_keys))
+        Returns:
+            (dict): The merged tags, indexed by key and type
 
-    @staticmethod
-    def _get_dictionary_for_key(dictionary_list, key):
-        """Get dictionary matching key from list of dictionaries."""
-        for di in dictionary_list:
-            if key in di.get("key"):
-                return di
-        return None
-
-    def _merge_tags(self, source, tag_keys):
-        """Merge the tag results into common key dictionaries."""
-        merged_data = []
-        for item in tag_keys:
-            for key, value in item.items():
-                key_dict = TagQueryHandler._get_dictionary_for_key(merged_data, key)
-                if not key_dict:
-                    new_dict = {}
-                    new_dict["key"] = key
-                    new_dict["values"] = [value]
-                    if source.get("type"):
-                        new_dict["type"] = source.get("type")
-                    merged_data.append(new_dict)
-                else:
-                    if value not in key_dict.get("values"):
-                        key_dict["values"].append(value)
-                        key_dict["values"].sort()
+        """
+        if merged_data is None:
+            merged_data = {}
+        tag_type = source.get("type")
+        for key, values in tag_values:
+            key_dict = merged_data.get((key, tag_type))
+            if key_dict is None:
+                key_dict = {"key": key, "values": set()}
+                if tag_type:
+                    key_dict["type"] = tag_type
+                merged_data[(key, tag_type)] = key_dict
+            key_dict["values"].update(values)
         return merged_data
 
     def get_tags(self):
         """Get a list of tags and values to validate filters."""
-        type_filter = self.parameters.get_filter("type")
-
-        merged_data = []
+        merged_data = {}
         with tenant_context(self.tenant):
-            tag_keys = []
-            for source in self.data_sources:
-                if type_filter and type_filter != source.get("type"):
-                    continue
-                exclusion = self._get_exclusions(source.get("db_column"))
-                tag_keys = (
-                    source.get("db_table")
-                    .objects.filter(self.query_filter)
-                    .exclude(exclusion)
-                    .values(source.get("db_column"))
-                    .distinct()
-                    .all()
-                )
-                tag_keys = [tag.get(source.get("db_column")) for tag in tag_keys]
-
-                merged_data = self._merge_tags(source, tag_keys)
-        return merged_data
+            for source in self._get_sources():
+                query, params = self._get_source_query(source)
+                where, where_params = self._key_prefix_clause("tags.key")
+                sql = TAG_VALUES_SQL.format(query=query, column=source.get("db_column"), where=where)
+                with connections[router.db_for_read(source.get("db_table"))].cursor() as cursor:
+                    cursor.execute(sql, params + where_params)
+                    merged_data = self._merge_tags(source, cursor.fetchall(), merged_data)
+
+        for key_dict in merged_data.values():
+            key_dict["values"] = sorted(key_dict["values"])
+        return list(merged_data.values())
 
     def execute_query(self):
         """Execute query and return provided data.
@@ -269,11 +335,14 @@ class TagQueryHandler(QueryHandler):
 
         """
         if self.parameters.get("key_only"):
-            tag_data = self.get_tag_keys()
-            query_data = sorted(tag_data, reverse=self.order_direction == "desc")
+            query_data = self.get_tag_keys()
         else:
             tag_data = self.get_tags()
             query_data = sorted(tag_data, key=lambda k: k["key"], reverse=self.order_direction == "desc")
+            if self.page:
+                limit, offset = self.page
+                self.max_rank = len(query_data)
+                query_data = query_data[offset : offset + limit]  # noqa: E203
 
         self.query_data = query_data
 
@@ -37,6 +37,9 @@ class FilterSerializer(serializers.Serializer):
     resolution = serializers.ChoiceField(choices=RESOLUTION_CHOICES, required=False)
     time_scope_value = serializers.ChoiceField(choices=TIME_CHOICES, required=False)
     time_scope_units = serializers.ChoiceField(choices=TIME_UNIT_CHOICES, required=False)
+    key = serializers.CharField(required=False, max_length=253)
+    limit = serializers.IntegerField(required=False, min_value=1)
+    offset = serializers.IntegerField(required=False, min_value=0)
 
     def validate(self, data):
         """Validate incoming data.
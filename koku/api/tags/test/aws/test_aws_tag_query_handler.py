@@ -15,6 +15,8 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 """Test the AWS Report Queries."""
+from unittest.mock import patch
+
 from api.iam.test.iam_test_case import IamTestCase
 from api.tags.aws.queries import AWSTagQueryHandler
 from api.tags.aws.view import AWSTagView
@@ -70,6 +72,18 @@ class AWSTagQueryHandlerTest(IamTestCase):
         self.assertEqual(handler.time_scope_units, "day")
         self.assertEqual(handler.time_scope_value, -10)
 
+    @patch("api.tags.queries.router")
+    def test_execute_query_routes_reads(self, mock_router):
+        """Test that the tag SQL runs on the database the router picks for reads."""
+        mock_router.db_for_read.return_value = "default"
+        for url in ["?key_only=True", "?"]:
+            with self.subTest(url=url):
+                mock_router.db_for_read.reset_mock()
+                query_params = self.mocked_query_params(url, AWSTagView)
+                handler = AWSTagQueryHandler(query_params)
+                self.assertIsNotNone(handler.execute_query().get("data"))
+                mock_router.db_for_read.assert_called_with(handler.data_sources[0].get("db_table"))
+
     def test_execute_query_month_parameters(self):
         """Test that the execute query runs properly with single month query."""
         url = "?filter[time_scope_units]=month&filter[time_scope_value]=-1&filter[resolution]=monthly"
@@ -32,25 +32,26 @@ class AzureTagQueryHandlerTest(IamTestCase):
 
         # Test no source type
         source = {}
-        tag_keys = [
-            {"ms-resource-usage": "azure-cloud-shell"},
-            {"project": "p1"},
-            {"cost": "management", "project": "p2"},
-        ]
-        expected = [
-            {"key": "ms-resource-usage", "values": ["azure-cloud-shell"]},
-            {"key": "project", "values": ["p1", "p2"]},
-            {"key": "cost", "values": ["management"]},
-        ]
-        merged_data = tagHandler._merge_tags(source, tag_keys)
+        tag_values = [("ms-resource-usage", ["azure-cloud-shell"]), ("project", ["p2"]), ("cost", ["management"])]
+        merged_data = tagHandler._merge_tags(source, tag_values)
+        merged_data = tagHandler._merge_tags(source, [("project", ["p1", "p2"])], merged_data)
+        expected = {
+            ("ms-resource-usage", None): {"key": "ms-resource-usage", "values": {"azure-cloud-shell"}},
+            ("project", None): {"key": "project", "values": {"p1", "p2"}},
+            ("cost", None): {"key": "cost", "values": {"management"}},
+        }
         self.assertEqual(merged_data, expected)
 
         # Test with source type
         source = {"type": "storage"}
-        merged_data = tagHandler._merge_tags(source, tag_keys)
-        expected = [
-            {"key": "ms-resource-usage", "values": ["azure-cloud-shell"], "type": "storage"},
-            {"key": "project", "values": ["p1", "p2"], "type": "storage"},
-            {"key": "cost", "values": ["management"], "type": "storage"},
-        ]
+        merged_data = tagHandler._merge_tags(source, tag_values)
+        expected = {
+            ("ms-resource-usage", "storage"): {
+                "key": "ms-resource-usage",
+                "values": {"azure-cloud-shell"},
+                "type": "storage",
+            },
+            ("project", "storage"): {"key": "project", "values": {"p2"}, "type": "storage"},
+            ("cost", "storage"): {"key": "cost", "values": {"management"}, "type": "storage"},
+        }
         self.assertEqual(merged_data, expected)
@@ -214,3 +214,60 @@ class OCPTagQueryHandlerTest(IamTestCase):
 
         result = handler.get_tag_keys(filters=False)
         self.assertEqual(sorted(result), sorted(tag_keys))
+
+    def test_get_tags_matches_labels(self):
+        """Test that the tag values are aggregated from the labels in the time scope."""
+        url = "?filter[time_scope_units]=month&filter[time_scope_value]=-1&filter[resolution]=monthly&filter[type]=pod"
+        query_params = self.mocked_query_params(url, OCPTagView)
+        handler = OCPTagQueryHandler(query_params)
+
+        expected = {}
+        with tenant_context(self.tenant):
+            labels = (
+                OCPUsageLineItemDailySummary.objects.filter(usage_start__gte=self.dh.this_month_start)
+                .values_list("pod_labels", flat=True)
+                .all()
+            )
+            for label in labels:
+                for key, value in (label or {}).items():
+                    expected.setdefault(key, set()).add(value)
+
+        tags = handler.get_tags()
+        self.assertEqual({tag.get("key"): set(tag.get("values")) for tag in tags}, expected)
+        for tag in tags:
+            self.assertEqual(tag.get("values"), sorted(tag.get("values")))
+            self.assertEqual(tag.get("type"), "pod")
+
+    def test_get_tag_keys_prefix_and_page(self):
+        """Test that tag keys can be filtered by prefix and paged in the database."""
+        url = "?filter[time_scope_units]=month&filter[time_scope_value]=-1&filter[resolution]=monthly&key_only=True"
+        query_params = self.mocked_query_params(url, OCPTagView)
+        all_keys = sorted(OCPTagQueryHandler(query_params).get_tag_keys())
+        self.assertTrue(all_keys)
+
+        prefix = all_keys[0][:3]
+        url = f"{url}&filter[key]={prefix}"
+        query_params = self.mocked_query_params(url, OCPTagView)
+        handler = OCPTagQueryHandler(query_params)
+        expected = [key for key in all_keys if key.startswith(prefix)]
+        self.assertEqual(handler.get_tag_keys(), expected)
+
+        url = f"{url}&filter[limit]=1&filter[offset]=0"
+        query_params = self.mocked_query_params(url, OCPTagView)
+        handler = OCPTagQueryHandler(query_params)
+        query_output = handler.execute_query()
+        self.assertEqual(query_output.get("data"), expected[:1])
+        self.assertEqual(handler.max_rank, len(expected))
+
+    def test_get_tag_keys_page_out_of_range(self):
+        """Test that a page past the last key returns no keys."""
+        url = (
+            "?filter[time_scope_units]=month&filter[time_scope_value]=-1&filter[resolution]=monthly&key_only=True"
+            "&filter[limit]=5&filter[offset]=100000"
+        )
+        query_params = self.mocked_query_params(url, OCPTagView)
+        handler = OCPTagQueryHandler(query_params)
+        handler.max_rank = 10
+        query_output = handler.execute_query()
+        self.assertEqual(query_output.get("data"), [])
+        self.assertEqual(handler.max_rank, 0)
@@ -21,8 +21,10 @@ from unittest.mock import Mock
 from unittest.mock import patch
 from uuid import uuid4
 
+from django.core.cache import caches
 from django.core.exceptions import PermissionDenied
 from django.http import HttpRequest
+from django.test import override_settings
 from django.test import TestCase
 from faker import Faker
 from querystring_parser import parser
@@ -35,6 +37,7 @@ from api.query_params import get_tenant
 from api.query_params import QueryParameters
 from api.report.serializers import ParamSerializer
 from api.report.view import ReportView
+from koku.cache import invalidate_tag_key_cache
 
 LOG = logging.getLogger(__name__)
 PROVIDERS = [Provider.PROVIDER_AWS, Provider.PROVIDER_AZURE, Provider.PROVIDER_OCP, Provider.OCP_AWS, Provider.OCP_ALL]
@@ -78,10 +81,7 @@ class QueryParametersTests(TestCase):
         """
 
         def fake_tags():
-            fake_tags = []
-            for _ in range(0, random.randint(2, 10)):
-                fake_tags.append({"key": self.FAKE.word(), "value": self.FAKE.word()})
-            return fake_tags
+            return Mock(distinct=lambda: [self.FAKE.word() for _ in range(0, random.randint(2, 10))])
 
         fake_request = Mock(
             spec=HttpRequest,
@@ -95,8 +95,8 @@ class QueryParametersTests(TestCase):
             report=self.FAKE.word(),
             serializer=Mock,
             tag_handler=[
-                Mock(objects=Mock(values=lambda _: fake_tags())),
-                Mock(objects=Mock(values=lambda _: fake_tags())),
+                Mock(objects=Mock(values_list=lambda *args, **kwargs: fake_tags())),
+                Mock(objects=Mock(values_list=lambda *args, **kwargs: fake_tags())),
             ],
         )
         self.assertIsInstance(QueryParameters(fake_request, fake_view), QueryParameters)
@@ -614,7 +614,7 @@ class QueryParametersTests(TestCase):
             user=Mock(access=Mock(get=lambda key, default: default), customer=Mock(schema_name="acct10001")),
             GET=Mock(urlencode=Mock(return_value=fake_uri)),
         )
-        fake_objects = Mock(values=lambda _: [{"key": key, "value": self.FAKE.word()} for key in tag_keys])
+        fake_objects = Mock(values_list=lambda *args, **kwargs: Mock(distinct=lambda: tag_keys))
         fake_view = Mock(
             spec=ReportView,
             provider=self.FAKE.word(),
@@ -625,3 +625,33 @@ class QueryParametersTests(TestCase):
         )
         params = QueryParameters(fake_request, fake_view)
         self.assertEqual(params.tag_keys, expected)
+
+    @override_settings(CACHE_TAG_KEYS=True)
+    def test_tag_keys_cached(self):
+        """Test that tag keys are read from the cache after the first request."""
+        caches["default"].clear()
+        fake_uri = "filter[resolution]=monthly&filter[time_scope_value]=-1&filter[time_scope_units]=month"
+        fake_request = Mock(
+            spec=HttpRequest,
+            user=Mock(access=Mock(get=lambda key, default: default), customer=Mock(schema_name="acct10001")),
+            GET=Mock(urlencode=Mock(return_value=fake_uri)),
+        )
+        tag_model = Mock(_meta=Mock(db_table="reporting_awstags_summary"))
+        tag_model.objects.values_list.return_value.distinct.return_value = ["app", "environment"]
+        fake_view = Mock(
+            spec=ReportView,
+            provider=self.FAKE.word(),
+            query_handler=Mock(provider=random.choice(PROVIDERS)),
+            report=self.FAKE.word(),
+            serializer=Mock,
+            tag_handler=[tag_model],
+        )
+        QueryParameters(fake_request, fake_view)
+        params = QueryParameters(fake_request, fake_view)
+        self.assertEqual(tag_model.objects.values_list.call_count, 1)
+        self.assertTrue(params._is_tag_param("or:tag:app"))
+        self.assertFalse(params._is_tag_param("tag:az"))
+
+        invalidate_tag_key_cache("acct10001")
+        QueryParameters(fake_request, fake_view)
+        self.assertEqual(tag_model.objects.values_list.call_count, 2)
@@ -17,10 +17,9 @@
 """Unit conversion util functions."""
 import calendar
 import datetime
+from decimal import Decimal
 
-import pint
 from django.utils import timezone
-from pint.errors import UndefinedUnitError
 
 
 class DateHelper:
@@ -202,16 +201,74 @@ class DateHelper:
         return num_days
 
 
+class UndefinedUnitError(Exception):
+    """A unit that UnitConverter does not know."""
+
+
+class DimensionalityError(Exception):
+    """A conversion between units that measure different things."""
+
+
+def _build_unit_table():
+    """Return the units that can be converted, as {unit: (dimension, size)}.
+
+    Sizes are in the base unit of the dimension: bytes for information and
+    hours for time. Each unit is listed under its name, its plural and its
+    symbols, the spellings the report units and units parameter use.
+    """
+    units = {}
+
+    def add(dimension, size, names, symbols=()):
+        for name in names:
+            units[name] = (dimension, size)
+            units[f"{name}s"] = (dimension, size)
+        for symbol in symbols:
+            units[symbol] = (dimension, size)
+
+    add("information", 1, ["byte"], ["B"])
+    prefixes = [("kilo", "kibi", "k"), ("mega", "mebi", "M"), ("giga", "gibi", "G"), ("tera", "tebi", "T")]
+    prefixes.append(("peta", "pebi", "P"))
+    for power, (decimal_prefix, binary_prefix, symbol) in enumerate(prefixes, start=1):
+        add("information", 1000 ** power, [f"{decimal_prefix}byte"], [f"{symbol}B"])
+        add("information", 1024 ** power, [f"{binary_prefix}byte"], [f"{symbol.upper()}iB"])
+
+    add("time", 1 / 3600, ["second"], ["s", "sec"])
+    add("time", 1 / 60, ["minute"], ["min"])
+    add("time", 1, ["hour", "hr"], ["h"])
+    add("time", 24, ["day"], ["d"])
+    return units
+
+
+UNIT_TABLE = _build_unit_table()
+
+
+class Quantity:
+    """A converted value and its unit."""
+
+    def __init__(self, magnitude, units):
+        """Initialize the quantity."""
+        self.magnitude = magnitude
+        self.units = units
+
+    def __repr__(self):
+        """Return the quantity in the style of pint."""
+        return f"<Quantity({self.magnitude}, '{self.units}')>"
+
+
 class UnitConverter:
-    """Utility class to do unit conversion."""
+    """Utility class to do unit conversion.
+
+    Conversion factors come from a precomputed table of the units reports
+    use, so no unit registry is built per converter. Factors are kept per
+    pair of units, so converting every value of a report looks them up once.
+    """
 
     def __init__(self):
-        """Initialize the UnitConverter."""
-        self.unit_registry = pint.UnitRegistry()
-        self.Quantity = self.unit_registry.Quantity
+        """Initialize the unit converter."""
+        self._factors = {}
 
     def validate_unit(self, unit):
-        """Validate that the unit type exists in the registry.
+        """Validate that the unit type is known.
 
         Args:
             unit (str): The unit type being checked
@@ -220,17 +277,29 @@ class UnitConverter:
             (str) The validated unit
 
         """
-        try:
-            getattr(self.unit_registry, str(unit))
-        except (AttributeError, UndefinedUnitError):
-            try:
-                getattr(self.unit_registry, str(unit.lower()))
-            except (AttributeError, UndefinedUnitError) as err:
-                raise err
-            else:
-                return unit.lower()
-
-        return str(unit)
+        if str(unit) in UNIT_TABLE:
+            return str(unit)
+        if str(unit).lower() in UNIT_TABLE:
+            return str(unit).lower()
+        raise UndefinedUnitError(f"'{unit}' is not defined in the unit table")
+
+    def conversion_factor(self, from_unit, to_unit):
+        """Return the number a value in from_unit is multiplied by to be in to_unit.
+
+        Raises:
+            (UndefinedUnitError): If either unit is unknown
+            (DimensionalityError): If the units measure different things
+
+        """
+        key = (from_unit, to_unit)
+        if key in self._factors:
+            return self._factors[key]
+        from_dimension, from_size = UNIT_TABLE[self.validate_unit(from_unit)]
+        to_dimension, to_size = UNIT_TABLE[self.validate_unit(to_unit)]
+        if from_dimension != to_dimension:
+            raise DimensionalityError(f"Cannot convert from '{from_unit}' to '{to_unit}'")
+        self._factors[key] = from_size / to_size
+        return self._factors[key]
 
     def convert_quantity(self, value, from_unit, to_unit):
         """Convert a quantity between comparable units.
@@ -241,11 +310,11 @@ class UnitConverter:
             to_unit (str): The ending unit to conver to
 
         Returns:
-            (pint.Quantity): A quantity with both magnitude and unit
+            (Quantity): A quantity with both magnitude and unit
 
         Example:
             >>> uc = UnitConverter()
-            >>> result = uc.covert_quantity(1.2, 'gigabyte', 'byte')
+            >>> result = uc.convert_quantity(1.2, 'gigabyte', 'byte')
             >>> result
             <Quantity(1200000000.0, 'byte')>
             >>> print(result.magnitude)
@@ -254,6 +323,7 @@ class UnitConverter:
             byte
 
         """
-        from_unit = self.validate_unit(from_unit)
-        to_unit = self.validate_unit(to_unit)
-        return self.Quantity(value, from_unit).to(to_unit)
+        factor = self.conversion_factor(from_unit, to_unit)
+        if isinstance(value, Decimal):
+            factor = Decimal(repr(factor))
+        return Quantity(value * factor, self.validate_unit(to_unit))
@@ -0,0 +1,231 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Cache of report query results and tag keys shared by the API and masu.
+
+Entries are namespaced by a per-tenant version token. Bumping the token
+when a schema's summary data changes makes every cached report for that
+tenant unreachable, and the stale entries age out on their own. Tag keys
+are versioned separately so they are only reloaded when the tag and label
+summary tables change.
+
+The customer, user and tenant resolved from an identity header are also
+cached for a short time, so repeated requests skip the public schema
+lookups. A cached identity is trusted without re-reading those rows, so
+deleting a customer, user or tenant bumps the identity version token and
+every cached identity is resolved again on its next request.
+"""
+import hashlib
+import json
+import logging
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+
+from api.utils import DateHelper
+
+LOG = logging.getLogger(__name__)
+
+REPORT_CACHE_ALIAS = "default"
+REPORT_CACHE_PREFIX = "report"
+REPORT_CACHE_VERSION_PREFIX = "report-version"
+TAG_KEY_CACHE_PREFIX = "tag-keys"
+TAG_KEY_CACHE_VERSION_PREFIX = "tag-keys-version"
+IDENTITY_CACHE_PREFIX = "identity"
+IDENTITY_CACHE_VERSION_PREFIX = "identity-version"
+IDENTITY_CACHE_SCHEMA = "public"
+
+
+def _get_cache():
+    """Return the cache backing report results."""
+    return caches[REPORT_CACHE_ALIAS]
+
+
+def _get_tenant_version(schema_name, prefix=REPORT_CACHE_VERSION_PREFIX):
+    """Return the current cache version token for a tenant."""
+    cache = _get_cache()
+    version_key = f"{prefix}:{schema_name}"
+    version = cache.get(version_key)
+    if version is None:
+        cache.add(version_key, uuid4().hex, None)
+        version = cache.get(version_key)
+    return version
+
+
+def get_report_cache_key(params):
+    """Build the cache key for a report request.
+
+    The key covers everything the query result depends on: the tenant,
+    the user's RBAC access, the handler and the validated parameters
+    (which already include the access filters), plus the current date
+    because time scopes are relative to today.
+
+    Args:
+        params (QueryParameters): The validated request parameters
+
+    Returns:
+        (str): The cache key, or None if report caching is disabled
+
+    """
+    if not settings.CACHE_REPORTS:
+        return None
+    schema_name = params.tenant.schema_name
+    version = _get_tenant_version(schema_name)
+    if version is None:
+        return None
+
+    key_data = {
+        "handler": f"{params.query_handler.__module__}.{params.query_handler.__name__}",
+        "report_type": params.report_type,
+        "parameters": params.parameters,
+        "access": params.access,
+        "date": DateHelper().today.date(),
+    }
+    digest = hashlib.sha256(json.dumps(key_data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return f"{REPORT_CACHE_PREFIX}:{schema_name}:{version}:{digest}"
+
+
+def get_cached_report(cache_key):
+    """Return the cached (output, max_rank) pair for a key, or None."""
+    if cache_key is None:
+        return None
+    return _get_cache().get(cache_key)
+
+
+def set_cached_report(cache_key, output, max_rank):
+    """Cache a report query result."""
+    if cache_key is None:
+        return
+    _get_cache().set(cache_key, (output, max_rank), settings.REPORT_CACHE_TIMEOUT)
+
+
+def invalidate_report_cache(schema_name):
+    """Drop every cached report for a tenant.
+
+    Args:
+        schema_name (str): The tenant schema whose data changed
+
+    Returns:
+        None
+
+    """
+    if not settings.CACHE_REPORTS:
+        return
+    version_key = f"{REPORT_CACHE_VERSION_PREFIX}:{schema_name}"
+    _get_cache().set(version_key, uuid4().hex, None)
+    LOG.info("Invalidated cached reports for schema %s.", schema_name)
+
+
+def get_tag_key_cache_key(schema_name, table_name):
+    """Build the cache key for the tag keys of a tag summary table.
+
+    Args:
+        schema_name (str): The tenant schema
+        table_name (str): The tag or label summary table
+
+    Returns:
+        (str): The cache key, or None if tag key caching is disabled
+
+    """
+    if not settings.CACHE_TAG_KEYS:
+        return None
+    version = _get_tenant_version(schema_name, TAG_KEY_CACHE_VERSION_PREFIX)
+    if version is None:
+        return None
+    return f"{TAG_KEY_CACHE_PREFIX}:{schema_name}:{version}:{table_name}"
+
+
+def get_cached_tag_keys(cache_key):
+    """Return the cached set of tag keys for a key, or None."""
+    if cache_key is None:
+        return None
+    return _get_cache().get(cache_key)
+
+
+def set_cached_tag_keys(cache_key, tag_keys):
+    """Cache the set of tag keys of a tag summary table."""
+    if cache_key is None:
+        return
+    _get_cache().set(cache_key, frozenset(tag_keys), settings.TAG_KEY_CACHE_TIMEOUT)
+
+
+def invalidate_tag_key_cache(schema_name):
+    """Drop every cached tag key set for a tenant.
+
+    Args:
+        schema_name (str): The tenant schema whose tag summaries changed
+
+    Returns:
+        None
+
+    """
+    if not settings.CACHE_TAG_KEYS:
+        return
+    version_key = f"{TAG_KEY_CACHE_VERSION_PREFIX}:{schema_name}"
+    _get_cache().set(version_key, uuid4().hex, None)
+    LOG.info("Invalidated cached tag keys for schema %s.", schema_name)
+
+
+def get_identity_cache_key(encoded_header):
+    """Build the cache key for an identity header.
+
+    Args:
+        encoded_header (str): The base64 encoded identity header
+
+    Returns:
+        (str): The cache key, or None if identity caching is disabled
+
+    """
+    if not settings.CACHE_IDENTITY:
+        return None
+    version = _get_tenant_version(IDENTITY_CACHE_SCHEMA, IDENTITY_CACHE_VERSION_PREFIX)
+    if version is None:
+        return None
+    if isinstance(encoded_header, str):
+        encoded_header = encoded_header.encode("utf-8")
+    return f"{IDENTITY_CACHE_PREFIX}:{version}:{hashlib.sha256(encoded_header).hexdigest()}"
+
+
+def get_cached_identity(cache_key):
+    """Return the cached (customer, user, tenant) for a key, or None."""
+    if cache_key is None:
+        return None
+    return _get_cache().get(cache_key)
+
+
+def set_cached_identity(cache_key, customer, user, tenant):
+    """Cache the customer, user and tenant resolved from an identity header."""
+    if cache_key is None:
+        return
+    _get_cache().set(cache_key, (customer, user, tenant), settings.IDENTITY_CACHE_TIMEOUT)
+
+
+def invalidate_identity_cache():
+    """Drop every cached identity.
+
+    Cached identities skip the customer, user and tenant lookups, so they
+    must be dropped when any of those rows is deleted.
+
+    Returns:
+        None
+
+    """
+    if not settings.CACHE_IDENTITY:
+        return
+    version_key = f"{IDENTITY_CACHE_VERSION_PREFIX}:{IDENTITY_CACHE_SCHEMA}"
+    _get_cache().set(version_key, uuid4().hex, None)
+    LOG.info("Invalidated cached identities.")
@@ -106,6 +106,13 @@ app.conf.beat_schedule["vacuum-schemas"] = {
     "args": [],
 }
 
+# Create the monthly line item partitions ahead of the data.
+app.conf.beat_schedule["create-partitions"] = {
+    "task": "masu.celery.tasks.create_all_partitions",
+    "schedule": crontab(hour=int(VACUUM_HOUR), minute=int(VACUUM_MINUTE)),
+    "args": [],
+}
+
 # Collect prometheus metrics.
 app.conf.beat_schedule["db_metrics"] = {"task": "koku.metrics.collect_metrics", "schedule": crontab(minute="*/15")}
 
@@ -18,13 +18,20 @@
 import os
 
 from django.conf import settings
+from django.db import connections
+from django.db import DEFAULT_DB_ALIAS
 
 from .env import ENVIRONMENT
 
+READ_REPLICA_DB_ALIAS = "read_replica"
+
+# Apps whose reads may be served by the read replica
+READ_REPLICA_APPS = ("reporting",)
+
 # pylint: disable=invalid-name
 engines = {
     "sqlite": "django.db.backends.sqlite3",
-    "postgresql": "tenant_schemas.postgresql_backend",
+    "postgresql": "koku.postgresql_backend",
     "mysql": "django.db.backends.mysql",
 }
 
@@ -58,7 +65,60 @@ def config():
         "PASSWORD": ENVIRONMENT.get_value("DATABASE_PASSWORD", default="postgres"),
         "HOST": ENVIRONMENT.get_value(f"{service_name}_SERVICE_HOST", default="localhost"),
         "PORT": ENVIRONMENT.get_value(f"{service_name}_SERVICE_PORT", default=15432),
+        "CONN_MAX_AGE": ENVIRONMENT.get_value("DATABASE_CONN_MAX_AGE", default=60, cast=int),
     }
 
     database_cert = ENVIRONMENT.get_value("DATABASE_SERVICE_CERT", default=None)
     return _cert_config(db_config, database_cert)
+
+
+def read_replica_config(db_config):
+    """Return the read replica config, or None if no replica is configured."""
+    host = ENVIRONMENT.get_value("DATABASE_READ_REPLICA_HOST", default=None)
+    if not host:
+        return None
+    replica_config = dict(db_config)
+    replica_config["HOST"] = host
+    replica_config["PORT"] = ENVIRONMENT.get_value("DATABASE_READ_REPLICA_PORT", default=db_config["PORT"])
+    replica_config["TEST"] = {"MIRROR": DEFAULT_DB_ALIAS}
+    return replica_config
+
+
+class ReadReplicaRouter:
+    """Route reads of report data to the read replica, when one is configured.
+
+    Only the API should set DATABASE_READ_REPLICA_HOST. Workers read the
+    data they have just written and must not see replication lag.
+    """
+
+    def db_for_read(self, model, **hints):
+        """Return the read replica for report data read outside a transaction."""
+        if READ_REPLICA_DB_ALIAS not in settings.DATABASES or model._meta.app_label not in READ_REPLICA_APPS:
+            return None
+        default = connections[DEFAULT_DB_ALIAS]
+        if default.in_atomic_block:
+            return None
+        replica = connections[READ_REPLICA_DB_ALIAS]
+        if (replica.schema_name, replica.include_public_schema) != (
+            default.schema_name,
+            default.include_public_schema,
+        ):
+            replica.set_schema(default.schema_name, default.include_public_schema)
+        return READ_REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        """Write to the default database, even when saving an instance read from the replica."""
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Allow relations between objects read from the replica and the default database."""
+        databases = {DEFAULT_DB_ALIAS, READ_REPLICA_DB_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """Never migrate the read replica."""
+        if db == READ_REPLICA_DB_ALIAS:
+            return False
+        return None
@@ -20,7 +20,6 @@ import logging
 from http import HTTPStatus
 from json.decoder import JSONDecodeError
 
-from django.core.cache import caches
 from django.core.exceptions import PermissionDenied
 from django.db import connection
 from django.db import transaction
@@ -41,6 +40,9 @@ from api.iam.models import User
 from api.iam.serializers import create_schema_name
 from api.iam.serializers import extract_header
 from api.iam.serializers import UserSerializer
+from koku.cache import get_cached_identity
+from koku.cache import get_identity_cache_key
+from koku.cache import set_cached_identity
 from koku.metrics import DB_CONNECTION_ERRORS_COUNTER
 from koku.rbac import RbacConnectionError
 from koku.rbac import RbacService
@@ -71,6 +73,14 @@ def is_no_auth(request):
     return no_auth
 
 
+def get_resolved_tenant(user):
+    """Return the tenant IdentityHeaderMiddleware resolved for a user, or None."""
+    tenant = getattr(user, "tenant", None)
+    if isinstance(tenant, Tenant):
+        return tenant
+    return None
+
+
 class HttpResponseUnauthorizedRequest(HttpResponse):
     """A subclass of HttpResponse to return a 401.
 
@@ -119,11 +129,11 @@ class KokuTenantMiddleware(BaseTenantMiddleware):
 
         if not is_no_auth(request):
             if hasattr(request, "user") and hasattr(request.user, "username"):
-                username = request.user.username
-                try:
-                    User.objects.get(username=username)
-                except User.DoesNotExist:
-                    return HttpResponseUnauthorizedRequest()
+                if get_resolved_tenant(request.user) is None:
+                    try:
+                        User.objects.get(username=request.user.username)
+                    except User.DoesNotExist:
+                        return HttpResponseUnauthorizedRequest()
                 if not request.user.admin and request.user.access is None:
                     raise PermissionDenied()
             else:
@@ -139,6 +149,9 @@ class KokuTenantMiddleware(BaseTenantMiddleware):
         """Override the tenant selection logic."""
         schema_name = "public"
         if not is_no_auth(request):
+            tenant = get_resolved_tenant(request.user)
+            if tenant:
+                return tenant
             user = User.objects.get(username=request.user.username)
             customer = user.customer
             schema_name = customer.schema_name
@@ -214,11 +227,11 @@ class IdentityHeaderMiddleware(MiddlewareMixin):  # pylint: disable=R0903
         return new_user
 
     def _get_access(self, user):
-        """Obtain access for given user from RBAC service."""
+        """Obtain access for given user from the RBAC cache or service."""
         access = None
         if user.admin:
             return access
-        access = self.rbac.get_access_for_user(user)
+        access = self.rbac.get_cached_access(user)
         return access
 
     # pylint: disable=R0914, R1710
@@ -265,32 +278,41 @@ class IdentityHeaderMiddleware(MiddlewareMixin):  # pylint: disable=R0903
                 f" ORG_ADMIN: {is_admin} REQ_ID: {req_id}"
             )
             LOG.info(stmt)
-            try:
-                customer = Customer.objects.filter(account_id=account).get()
-            except Customer.DoesNotExist:
-                customer = IdentityHeaderMiddleware._create_customer(account)
-            except OperationalError as err:
-                LOG.error("IdentityHeaderMiddleware exception: %s", err)
-                DB_CONNECTION_ERRORS_COUNTER.inc()
-                return HttpResponseFailedDependency({"source": "Database", "exception": err})
+            identity_cache_key = get_identity_cache_key(rh_auth_header)
+            identity = get_cached_identity(identity_cache_key)
+            if identity:
+                customer, user, tenant = identity
+            else:
+                try:
+                    customer = Customer.objects.filter(account_id=account).get()
+                except Customer.DoesNotExist:
+                    customer = IdentityHeaderMiddleware._create_customer(account)
+                except OperationalError as err:
+                    LOG.error("IdentityHeaderMiddleware exception: %s", err)
+                    DB_CONNECTION_ERRORS_COUNTER.inc()
+                    return HttpResponseFailedDependency({"source": "Database", "exception": err})
 
-            try:
-                user = User.objects.get(username=username)
-            except User.DoesNotExist:
-                user = IdentityHeaderMiddleware._create_user(username, email, customer, request)
+                try:
+                    user = User.objects.select_related("customer").get(username=username)
+                except User.DoesNotExist:
+                    user = IdentityHeaderMiddleware._create_user(username, email, customer, request)
 
+                tenant = None
+                if user.customer:
+                    tenant = Tenant.objects.filter(schema_name=user.customer.schema_name).first()
+                if tenant:
+                    set_cached_identity(identity_cache_key, customer, user, tenant)
+
+            # The resolved tenant is reused by KokuTenantMiddleware and QueryParameters
+            user.tenant = tenant
             user.identity_header = {"encoded": rh_auth_header, "decoded": json_rh_auth}
             user.admin = is_admin
             user.req_id = req_id
 
-            cache = caches["rbac"]
-            user_access = cache.get(user.uuid)
-            if not user_access:
-                try:
-                    user_access = self._get_access(user)
-                except RbacConnectionError as err:
-                    return HttpResponseFailedDependency({"source": "Rbac", "exception": err})
-                cache.set(user.uuid, user_access, self.rbac.cache_ttl)
+            try:
+                user_access = self._get_access(user)
+            except RbacConnectionError as err:
+                return HttpResponseFailedDependency({"source": "Rbac", "exception": err})
             user.access = user_access
             request.user = user
 
@@ -0,0 +1,106 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""A tenant schema aware PostgreSQL backend for persistent connections.
+
+django-tenant-schemas marks the search path as unset whenever a schema is
+selected, so every request and every accessor that selects a schema pays
+for another SET search_path, even when the connection already uses it.
+This backend remembers the search path applied to the open connection and
+only sets it again when it changes or may have been reverted. Persistent
+connections are checked once per request, before they are first used.
+"""
+from tenant_schemas.postgresql_backend.base import DatabaseWrapper as TenantDatabaseWrapper
+
+
+class DatabaseWrapper(TenantDatabaseWrapper):
+    """A tenant schema database wrapper that skips redundant schema switches."""
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the wrapper."""
+        self.applied_search_path = None
+        self.health_check_done = False
+        super().__init__(*args, **kwargs)
+
+    @property
+    def requested_search_path(self):
+        """Return the schema and public schema flag the next cursor needs."""
+        return (self.schema_name, self.include_public_schema)
+
+    def _restore_search_path_set(self):
+        """Mark the search path as set if the connection already uses it."""
+        if self.applied_search_path is not None and self.applied_search_path == self.requested_search_path:
+            self.search_path_set = True
+
+    def set_tenant(self, tenant, include_public=True):
+        """Select the schema of a tenant."""
+        super().set_tenant(tenant, include_public)
+        self._restore_search_path_set()
+
+    def set_schema(self, schema_name, include_public=True):
+        """Select a schema by name."""
+        super().set_schema(schema_name, include_public)
+        self._restore_search_path_set()
+
+    def set_schema_to_public(self):
+        """Select the public schema."""
+        super().set_schema_to_public()
+        self._restore_search_path_set()
+
+    def _cursor(self, name=None):
+        """Return a cursor, setting the search path if it changed."""
+        cursor = super()._cursor(name=name)
+        if self.search_path_set:
+            self.applied_search_path = self.requested_search_path
+        return cursor
+
+    def close(self):
+        """Close the connection and forget its search path."""
+        self.applied_search_path = None
+        super().close()
+
+    def rollback(self):
+        """Roll back the transaction, which reverts a search path set within it."""
+        self.applied_search_path = None
+        super().rollback()
+
+    def _savepoint_rollback(self, sid):
+        """Roll back to a savepoint, which reverts a search path set after it."""
+        self.applied_search_path = None
+        self.search_path_set = False
+        super()._savepoint_rollback(sid)
+
+    def close_if_unusable_or_obsolete(self):
+        """Close the connection if it is broken or too old.
+
+        Django calls this when a request starts and finishes, so the next
+        use of a persistent connection is checked again.
+        """
+        super().close_if_unusable_or_obsolete()
+        self.health_check_done = False
+
+    def ensure_connection(self):
+        """Open a connection, or check that a persistent one still works."""
+        if (
+            self.connection is not None
+            and not self.health_check_done
+            and self.settings_dict["CONN_MAX_AGE"] != 0
+            and not self.in_atomic_block
+            and not self.is_usable()
+        ):
+            self.close()
+        super().ensure_connection()
+        self.health_check_done = True
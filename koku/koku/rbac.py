@@ -16,9 +16,19 @@
 #
 """Interactions with the rbac service."""
 import logging
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl
+from urllib.parse import urlencode
+from urllib.parse import urlsplit
+from urllib.parse import urlunsplit
 
 import requests
+from django.core.cache import caches
 from prometheus_client import Counter
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectionError  # pylint: disable=W0622
 from rest_framework import status
 
@@ -32,6 +42,11 @@ PROTOCOL = "protocol"
 HOST = "host"
 PORT = "port"
 PATH = "path"
+RBAC_CACHE_ALIAS = "rbac"
+# Entries are (access, fetched time) tuples; the prefix keeps them apart from
+# the plain access dicts cached by earlier releases during a rolling deploy.
+RBAC_CACHE_KEY_PREFIX = "rbac-access"
+RBAC_PAGE_LIMIT = 100
 RESOURCE_TYPES = {
     "aws.account": ["read"],
     "azure.subscription_guid": ["read"],
@@ -43,6 +58,11 @@ RESOURCE_TYPES = {
 }
 
 
+def get_access_cache_key(user_uuid):
+    """Return the key of the cached access of a user."""
+    return f"{RBAC_CACHE_KEY_PREFIX}:{user_uuid}"
+
+
 def _extract_permission_data(permission):
     """Extract resource type and operation from permission."""
     perm_components = permission.split(":")
@@ -161,8 +181,26 @@ class RbacConnectionError(ConnectionError):
     """Exception for Rbac ConnectionErrors."""
 
 
+class RbacServiceError(RbacConnectionError):
+    """Exception for failed or unreadable Rbac responses."""
+
+
+def _page_url(url, offset, limit):
+    """Return the url with its offset and limit query parameters replaced."""
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    query.update({"offset": offset, "limit": limit})
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
 class RbacService:  # pylint: disable=too-few-public-methods
-    """A class to handle interactions with the RBAC service."""
+    """A class to handle interactions with the RBAC service.
+
+    Access is cached for RBAC_CACHE_TTL seconds. Older entries are still
+    served for RBAC_CACHE_STALE_TTL more seconds while they are refreshed
+    in the background, so only a user without any cached access waits for
+    RBAC. Concurrent fetches for the same user share one request.
+    """
 
     def __init__(self):
         """Establish RBAC connection information."""
@@ -172,6 +210,15 @@ class RbacService:  # pylint: disable=too-few-public-methods
         self.port = rbac_conn_info.get(PORT)
         self.path = rbac_conn_info.get(PATH)
         self.cache_ttl = int(ENVIRONMENT.get_value("RBAC_CACHE_TTL", default="30"))
+        self.stale_ttl = int(ENVIRONMENT.get_value("RBAC_CACHE_STALE_TTL", default="300"))
+        self.max_workers = int(ENVIRONMENT.get_value("RBAC_MAX_WORKERS", default="4"))
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=self.max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._fetches = {}
+        self._fetches_lock = threading.Lock()
+        self._refresh_executor = None
 
     def _get_rbac_service(self):  # pylint: disable=no-self-use
         """Get RBAC service host and port info from environment."""
@@ -183,11 +230,16 @@ class RbacService:  # pylint: disable=too-few-public-methods
         }
         return rbac_conn_info
 
-    def _request_user_access(self, url, headers):
-        """Send request to RBAC service and handle pagination case."""
-        access = []
+    def _request_page(self, url, headers):
+        """Request one page of user access and return the decoded response.
+
+        Raises:
+            (RbacConnectionError): If RBAC is unreachable
+            (RbacServiceError): If RBAC answers with an error or an unreadable page
+
+        """
         try:
-            response = requests.get(url, headers=headers)
+            response = self.session.get(url, headers=headers)
         except ConnectionError as err:
             LOGGER.error("Error requesting user access: %s", err)
             RBAC_CONNECTION_ERROR_COUNTER.inc()
@@ -199,30 +251,52 @@ class RbacService:  # pylint: disable=too-few-public-methods
                 LOGGER.error("Error requesting user access: %s", error)
             except ValueError as res_error:
                 LOGGER.error("Error processing failed, %s, user access: %s", response.status_code, res_error)
-            return access
+            raise RbacServiceError(f"Rbac responded with status {response.status_code}.")
 
-        # check for pagination handling
         try:
             data = response.json()
         except ValueError as res_error:
             LOGGER.error("Error processing user access: %s", res_error)
-            return access
+            raise RbacServiceError(res_error)
 
         if not isinstance(data, dict):
             LOGGER.error("Error processing user access. Unexpected response object: %s", data)
+            raise RbacServiceError("Unexpected Rbac response object.")
+        return data
+
+    def _request_user_access(self, url, headers):
+        """Send request to RBAC service and handle pagination case.
+
+        Once the first page gives the total count, the remaining pages are
+        requested concurrently. Responses without a count are followed page
+        by page through their next links. A failed page fails the whole
+        request, so partial access is never returned.
+        """
+        data = self._request_page(url, headers)
+        access = data.get("data", [])
+
+        meta = data.get("meta", {})
+        count = meta.get("count")
+        limit = meta.get("limit") or RBAC_PAGE_LIMIT
+        if isinstance(count, int) and data.get("links", {}).get("next"):
+            offsets = range(meta.get("offset", 0) + limit, count, limit)
+            page_urls = [_page_url(url, offset, limit) for offset in offsets]
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(page_urls)))) as executor:
+                for page in executor.map(lambda page_url: self._request_page(page_url, headers), page_urls):
+                    access += page.get("data", [])
             return access
 
         next_link = data.get("links", {}).get("next")
-        access = data.get("data", [])
-        if next_link:
-            next_url = f"{self.protocol}://{self.host}:{self.port}{next_link}"
-            access += self._request_user_access(next_url, headers)
+        while next_link:
+            data = self._request_page(f"{self.protocol}://{self.host}:{self.port}{next_link}", headers)
+            access += data.get("data", [])
+            next_link = data.get("links", {}).get("next")
         return access
 
     def get_access_for_user(self, user):
         """Obtain access information for user."""
-        url = "{}://{}:{}{}?application=cost-management&limit=100".format(
-            self.protocol, self.host, self.port, self.path
+        url = "{}://{}:{}{}?application=cost-management&limit={}".format(
+            self.protocol, self.host, self.port, self.path, RBAC_PAGE_LIMIT
         )
         headers = {"x-rh-identity": user.identity_header.get("encoded")}
         acls = self._request_user_access(url, headers)
@@ -232,6 +306,59 @@ class RbacService:  # pylint: disable=too-few-public-methods
         processed_acls = _process_acls(acls)
         return _apply_access(processed_acls)
 
+    def _fetch_access(self, user):
+        """Obtain and cache access for a user, sharing a fetch already in progress."""
+        with self._fetches_lock:
+            fetch = self._fetches.get(user.uuid)
+            in_progress = fetch is not None
+            if not in_progress:
+                fetch = Future()
+                self._fetches[user.uuid] = fetch
+        if in_progress:
+            return fetch.result()
+
+        try:
+            access = self.get_access_for_user(user)
+            caches[RBAC_CACHE_ALIAS].set(
+                get_access_cache_key(user.uuid), (access, time.time()), self.cache_ttl + self.stale_ttl
+            )
+            fetch.set_result(access)
+            return access
+        except Exception as err:
+            fetch.set_exception(err)
+            raise
+        finally:
+            with self._fetches_lock:
+                self._fetches.pop(user.uuid, None)
+
+    def _refresh_access(self, user):
+        """Refresh the cached access of a user, keeping the stale entry on failure."""
+        try:
+            self._fetch_access(user)
+        except Exception as err:  # pylint: disable=broad-except
+            LOGGER.warning("Could not refresh access for user %s: %s", user.uuid, err)
+
+    def get_cached_access(self, user):
+        """Return the access of a user from the cache, fetching it if needed.
+
+        Raises:
+            (RbacConnectionError): If access is not cached and RBAC is unreachable or fails
+
+        """
+        entry = caches[RBAC_CACHE_ALIAS].get(get_access_cache_key(user.uuid))
+        if entry is None:
+            return self._fetch_access(user)
+
+        access, fetched = entry
+        if time.time() - fetched >= self.cache_ttl:
+            with self._fetches_lock:
+                refreshing = user.uuid in self._fetches
+                if not refreshing and self._refresh_executor is None:
+                    self._refresh_executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            if not refreshing:
+                self._refresh_executor.submit(self._refresh_access, user)
+        return access
+
     def get_cache_ttl(self):
         """Return the cache time to live value."""
         return self.cache_ttl
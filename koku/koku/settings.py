@@ -139,6 +139,14 @@ MIDDLEWARE.extend(
 CACHE_MIDDLEWARE_ALIAS = "default"
 CACHE_MIDDLEWARE_SECONDS = ENVIRONMENT.get_value("CACHE_TIMEOUT", default=3600)
 
+CACHE_REPORTS = ENVIRONMENT.bool("CACHE_REPORTS", default=False)
+REPORT_CACHE_TIMEOUT = ENVIRONMENT.int("REPORT_CACHE_TIMEOUT", default=3600)
+CACHE_TAG_KEYS = ENVIRONMENT.bool("CACHE_TAG_KEYS", default=False)
+TAG_KEY_CACHE_TIMEOUT = ENVIRONMENT.int("TAG_KEY_CACHE_TIMEOUT", default=86400)
+CACHE_IDENTITY = ENVIRONMENT.bool("CACHE_IDENTITY", default=False)
+IDENTITY_CACHE_TIMEOUT = ENVIRONMENT.int("IDENTITY_CACHE_TIMEOUT", default=30)
+STREAM_CSV_REPORTS = ENVIRONMENT.bool("STREAM_CSV_REPORTS", default=False)
+
 DEVELOPMENT = ENVIRONMENT.bool("DEVELOPMENT", default=False)
 if DEVELOPMENT:
     MIDDLEWARE.insert(5, "koku.dev_middleware.DevelopmentIdentityHeaderMiddleware")
@@ -202,8 +210,14 @@ else:
     }
 
 DATABASES = {"default": database.config()}
+READ_REPLICA_DATABASE = database.read_replica_config(DATABASES["default"])
+if READ_REPLICA_DATABASE:
+    DATABASES[database.READ_REPLICA_DB_ALIAS] = READ_REPLICA_DATABASE
+
+DATABASE_ROUTERS = ("koku.database.ReadReplicaRouter", "tenant_schemas.routers.TenantSyncRouter")
 
-DATABASE_ROUTERS = ("tenant_schemas.routers.TenantSyncRouter",)
+# Only set the search path when the schema of a connection changes
+TENANT_LIMIT_SET_CALLS = True
 
 #
 TENANT_MODEL = "api.Tenant"
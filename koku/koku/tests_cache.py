@@ -0,0 +1,131 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test the report result cache."""
+from collections import OrderedDict
+from unittest.mock import Mock
+
+from django.core.cache import caches
+from django.test import override_settings
+from django.test import TestCase
+
+from api.report.aws.query_handler import AWSReportQueryHandler
+from koku.cache import get_cached_identity
+from koku.cache import get_cached_report
+from koku.cache import get_identity_cache_key
+from koku.cache import get_report_cache_key
+from koku.cache import invalidate_identity_cache
+from koku.cache import invalidate_report_cache
+from koku.cache import set_cached_identity
+from koku.cache import set_cached_report
+
+
+@override_settings(CACHE_REPORTS=True)
+class ReportCacheTest(TestCase):
+    """Tests for the report result cache."""
+
+    def setUp(self):
+        """Set up the cache tests."""
+        caches["default"].clear()
+        self.params = Mock(
+            query_handler=AWSReportQueryHandler,
+            report_type="costs",
+            parameters=OrderedDict([("filter", {"resolution": "daily"}), ("group_by", {"account": ["*"]})]),
+            access={"aws.account": {"read": ["*"]}},
+        )
+        self.params.tenant.schema_name = "acct10001"
+
+    def test_key_ignores_parameter_order(self):
+        """Test that equal parameters in a different order share a key."""
+        key = get_report_cache_key(self.params)
+        self.params.parameters = OrderedDict([("group_by", {"account": ["*"]}), ("filter", {"resolution": "daily"})])
+        self.assertEqual(get_report_cache_key(self.params), key)
+
+    def test_key_depends_on_access(self):
+        """Test that users with different access do not share results."""
+        key = get_report_cache_key(self.params)
+        self.params.access = {"aws.account": {"read": ["123456789"]}}
+        self.assertNotEqual(get_report_cache_key(self.params), key)
+
+    def test_key_depends_on_tenant(self):
+        """Test that tenants do not share results."""
+        key = get_report_cache_key(self.params)
+        self.params.tenant.schema_name = "acct10002"
+        self.assertNotEqual(get_report_cache_key(self.params), key)
+
+    def test_set_and_get(self):
+        """Test that a cached result is returned for its key."""
+        key = get_report_cache_key(self.params)
+        self.assertIsNone(get_cached_report(key))
+        set_cached_report(key, {"data": [1]}, 5)
+        self.assertEqual(get_cached_report(key), ({"data": [1]}, 5))
+
+    def test_invalidate_report_cache(self):
+        """Test that invalidation only drops the results of one tenant."""
+        key = get_report_cache_key(self.params)
+        set_cached_report(key, {"data": [1]}, 0)
+        other_params = Mock(query_handler=AWSReportQueryHandler, report_type="costs", parameters={}, access={})
+        other_params.tenant.schema_name = "acct10002"
+        other_key = get_report_cache_key(other_params)
+        set_cached_report(other_key, {"data": [2]}, 0)
+
+        invalidate_report_cache("acct10001")
+
+        new_key = get_report_cache_key(self.params)
+        self.assertNotEqual(new_key, key)
+        self.assertIsNone(get_cached_report(new_key))
+        self.assertEqual(get_report_cache_key(other_params), other_key)
+        self.assertEqual(get_cached_report(other_key), ({"data": [2]}, 0))
+
+    @override_settings(CACHE_REPORTS=False)
+    def test_disabled(self):
+        """Test that no key is built when report caching is disabled."""
+        self.assertIsNone(get_report_cache_key(self.params))
+        self.assertIsNone(get_cached_report(None))
+
+
+@override_settings(CACHE_IDENTITY=True)
+class IdentityCacheTest(TestCase):
+    """Tests for the identity cache."""
+
+    def setUp(self):
+        """Set up the cache tests."""
+        caches["default"].clear()
+        self.header = "eyJpZGVudGl0eSI6IHt9fQ=="
+
+    def test_set_and_get(self):
+        """Test that a cached identity is returned for its header."""
+        key = get_identity_cache_key(self.header)
+        self.assertIsNone(get_cached_identity(key))
+        set_cached_identity(key, "customer", "user", "tenant")
+        self.assertEqual(get_cached_identity(key), ("customer", "user", "tenant"))
+
+    def test_invalidate_identity_cache(self):
+        """Test that invalidation drops every cached identity."""
+        key = get_identity_cache_key(self.header)
+        set_cached_identity(key, "customer", "user", "tenant")
+
+        invalidate_identity_cache()
+
+        new_key = get_identity_cache_key(self.header)
+        self.assertNotEqual(new_key, key)
+        self.assertIsNone(get_cached_identity(new_key))
+
+    @override_settings(CACHE_IDENTITY=False)
+    def test_disabled(self):
+        """Test that no key is built when identity caching is disabled."""
+        self.assertIsNone(get_identity_cache_key(self.header))
+        self.assertIsNone(get_cached_identity(None))
@@ -0,0 +1,87 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test the database configuration and backend."""
+import os
+from unittest.mock import patch
+
+from django.db import connection
+from django.db import DEFAULT_DB_ALIAS
+from django.db.utils import ConnectionRouter
+from django.test import TestCase
+
+from api.models import Provider
+from koku.database import config
+from koku.database import READ_REPLICA_DB_ALIAS
+from koku.database import read_replica_config
+from koku.database import ReadReplicaRouter
+from reporting.models import AWSCostEntryBill
+
+
+class DatabaseConfigTest(TestCase):
+    """Tests for the database settings."""
+
+    def test_config_persistent_connections(self):
+        """Test that connections are kept open between requests."""
+        with patch.dict(os.environ, {"DATABASE_CONN_MAX_AGE": "120"}):
+            self.assertEqual(config()["CONN_MAX_AGE"], 120)
+
+    def test_read_replica_config(self):
+        """Test that the replica copies the default database with its own host."""
+        db_config = {"NAME": "postgres", "HOST": "localhost", "PORT": 15432}
+        with patch.dict(os.environ, {"DATABASE_READ_REPLICA_HOST": "replica"}):
+            replica_config = read_replica_config(db_config)
+        self.assertEqual(replica_config["HOST"], "replica")
+        self.assertEqual(replica_config["PORT"], 15432)
+        self.assertEqual(replica_config["NAME"], "postgres")
+
+        with patch.dict(os.environ, {"DATABASE_READ_REPLICA_HOST": ""}):
+            self.assertIsNone(read_replica_config(db_config))
+
+    def test_router_without_replica(self):
+        """Test that reads use the default database when no replica is configured."""
+        router = ReadReplicaRouter()
+        self.assertIsNone(router.db_for_read(AWSCostEntryBill))
+        self.assertIsNone(router.db_for_read(Provider))
+        self.assertFalse(router.allow_migrate(READ_REPLICA_DB_ALIAS, "reporting"))
+        self.assertIsNone(router.allow_migrate("default", "reporting"))
+
+    def test_router_writes_replica_instance_to_default(self):
+        """Test that saving an instance read from the replica writes to the default database."""
+        instance = AWSCostEntryBill()
+        instance._state.db = READ_REPLICA_DB_ALIAS
+        self.assertEqual(ReadReplicaRouter().db_for_write(AWSCostEntryBill, instance=instance), DEFAULT_DB_ALIAS)
+        self.assertEqual(ConnectionRouter().db_for_write(AWSCostEntryBill, instance=instance), DEFAULT_DB_ALIAS)
+
+
+class DatabaseWrapperTest(TestCase):
+    """Tests for the schema aware database wrapper."""
+
+    def test_set_schema_skips_unchanged_search_path(self):
+        """Test that selecting the schema already in use does not set it again."""
+        self.addCleanup(connection.set_schema_to_public)
+        connection.set_schema("acct10001")
+        connection.cursor().close()
+        self.assertTrue(connection.search_path_set)
+        self.assertEqual(connection.applied_search_path, ("acct10001", True))
+
+        connection.set_schema("acct10001")
+        self.assertTrue(connection.search_path_set)
+
+        connection.set_schema_to_public()
+        self.assertFalse(connection.search_path_set)
+        connection.set_schema("acct10001")
+        self.assertTrue(connection.search_path_set)
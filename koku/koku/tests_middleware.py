@@ -21,6 +21,7 @@ from unittest.mock import patch
 from django.core.cache import caches
 from django.core.exceptions import PermissionDenied
 from django.db.utils import OperationalError
+from django.test.utils import override_settings
 from requests.exceptions import ConnectionError  # pylint: disable=W0622
 from rest_framework import status
 
@@ -29,9 +30,11 @@ from api.iam.models import Tenant
 from api.iam.models import User
 from api.iam.serializers import UserSerializer
 from api.iam.test.iam_test_case import IamTestCase
+from koku.cache import get_identity_cache_key
 from koku.middleware import HttpResponseUnauthorizedRequest
 from koku.middleware import IdentityHeaderMiddleware
 from koku.middleware import KokuTenantMiddleware
+from koku.rbac import get_access_cache_key
 
 
 class KokuTenantMiddlewareTest(IamTestCase):
@@ -117,6 +120,48 @@ class IdentityHeaderMiddlewareTest(IamTestCase):
         with self.assertRaises(User.DoesNotExist):
             User.objects.get(username=self.user_data["username"])
 
+    def test_process_resolves_tenant(self):
+        """Test that the tenant is resolved once and reused by the tenant middleware."""
+        mock_request = self.request
+        IdentityHeaderMiddleware().process_request(mock_request)
+        self.assertEqual(mock_request.user.tenant.schema_name, self.schema_name)
+
+        with self.assertNumQueries(0):
+            tenant = KokuTenantMiddleware().get_tenant(Tenant, "localhost", mock_request)
+        self.assertEqual(tenant, mock_request.user.tenant)
+
+    @override_settings(CACHE_IDENTITY=True)
+    def test_process_cached_identity(self):
+        """Test that a repeated identity header is resolved from the cache."""
+        self.addCleanup(caches["default"].clear)
+        middleware = IdentityHeaderMiddleware()
+        middleware.process_request(self.request)
+        user = self.request.user
+        self.assertIsNotNone(caches["default"].get(get_identity_cache_key(self.request.META["HTTP_X_RH_IDENTITY"])))
+
+        with patch("koku.middleware.Customer.objects") as mock_customer:
+            mock_customer.filter.side_effect = OperationalError
+            response = middleware.process_request(self.request)
+        self.assertIsNone(response)
+        self.assertEqual(self.request.user.uuid, user.uuid)
+        self.assertEqual(self.request.user.tenant.schema_name, self.schema_name)
+
+    @override_settings(CACHE_IDENTITY=True)
+    def test_process_cached_identity_user_deleted(self):
+        """Test that deleting a cached user resolves the identity again."""
+        self.addCleanup(caches["default"].clear)
+        middleware = IdentityHeaderMiddleware()
+        middleware.process_request(self.request)
+        user = self.request.user
+        cache_key = get_identity_cache_key(self.request.META["HTTP_X_RH_IDENTITY"])
+
+        User.objects.filter(uuid=user.uuid).delete()
+
+        self.assertNotEqual(get_identity_cache_key(self.request.META["HTTP_X_RH_IDENTITY"]), cache_key)
+        middleware.process_request(self.request)
+        self.assertNotEqual(self.request.user.uuid, user.uuid)
+        self.assertEqual(self.request.user.username, user.username)
+
     def test_race_condition_customer(self):
         """Test case where another request may create the customer in a race condition."""
         customer = self._create_customer_data()
@@ -169,11 +214,11 @@ class IdentityHeaderMiddlewareTest(IamTestCase):
 
         user_uuid = mock_request.user.uuid
         cache = caches["rbac"]
-        self.assertEqual(cache.get(user_uuid), mock_access)
+        self.assertEqual(cache.get(get_access_cache_key(user_uuid))[0], mock_access)
 
         middleware.process_request(mock_request)
-        cache = caches["rbac"]
-        self.assertEqual(cache.get(user_uuid), mock_access)
+        self.assertEqual(mock_request.user.access, mock_access)
+        get_access_mock.assert_called_once()
 
     def test_process_not_entitled(self):
         """Test that the a request cannot be made if not entitled."""
@@ -223,7 +268,7 @@ class IdentityHeaderMiddlewareTest(IamTestCase):
             response = middleware.process_request(mock_request)
             self.assertEqual(response.status_code, status.HTTP_424_FAILED_DEPENDENCY)
 
-    @patch("koku.rbac.requests.get", side_effect=ConnectionError("test exception"))
+    @patch("koku.rbac.requests.Session.get", side_effect=ConnectionError("test exception"))
     def test_rbac_connection_error_return_424(self, mocked_get):
         """Test RbacConnectionError causes 424 Reponse."""
         user_data = self._create_user_data()
@@ -16,9 +16,12 @@
 #
 """Test the RBAC Service interaction."""
 import os
+import threading
+import time
 from unittest.mock import Mock
 from unittest.mock import patch
 
+from django.core.cache import caches
 from django.test import TestCase
 from prometheus_client import REGISTRY
 from requests.exceptions import ConnectionError  # pylint: disable=W0622
@@ -27,8 +30,10 @@ from rest_framework import status
 from koku.rbac import _apply_access
 from koku.rbac import _get_operation
 from koku.rbac import _process_acls
+from koku.rbac import get_access_cache_key
 from koku.rbac import RbacConnectionError
 from koku.rbac import RbacService
+from koku.rbac import RbacServiceError
 
 LIMITED_AWS_ACCESS = {
     "permission": "cost-management:aws.account:read",
@@ -82,6 +87,12 @@ def mocked_requests_get_200_except(*args, **kwargs):  # pylint: disable=unused-a
     return MockResponse(None, status.HTTP_200_OK, ValueError("Decode Problem"))
 
 
+def mocked_requests_get_200_empty(*args, **kwargs):  # pylint: disable=unused-argument
+    """Mock valid status response for a user without access."""
+    json_response = {"links": {"next": None}, "data": []}
+    return MockResponse(json_response, status.HTTP_200_OK)
+
+
 def mocked_requests_get_200_no_next(*args, **kwargs):  # pylint: disable=unused-argument
     """Mock valid status response that has no next."""
     json_response = {"links": {"next": None}, "data": [LIMITED_AWS_ACCESS]}
@@ -97,6 +108,26 @@ def mocked_requests_get_200_next(*args, **kwargs):  # pylint: disable=unused-arg
     return MockResponse(json_response, status.HTTP_200_OK)
 
 
+def mocked_requests_get_200_paged(*args, **kwargs):  # pylint: disable=unused-argument
+    """Mock valid status responses with a count and offset pages."""
+    offset = 0
+    if "offset=" in args[0]:
+        offset = int(args[0].split("offset=")[1].split("&")[0])
+    json_response = {
+        "meta": {"count": 250, "limit": 100, "offset": offset},
+        "links": {"next": "/v1/access/?limit=100&offset=100" if offset == 0 else None},
+        "data": [LIMITED_AWS_ACCESS],
+    }
+    return MockResponse(json_response, status.HTTP_200_OK)
+
+
+def mocked_requests_get_paged_error(*args, **kwargs):  # pylint: disable=unused-argument
+    """Mock a count paged response whose last page fails."""
+    if "offset=200" in args[0]:
+        return MockResponse({"details": "Server error."}, status.HTTP_500_INTERNAL_SERVER_ERROR)
+    return mocked_requests_get_200_paged(*args, **kwargs)
+
+
 def mocked_get_operation(access_item, res_type):  # pylint: disable=unused-argument
     """Mock value error for get operation."""
     raise ValueError("Invalid wildcard for invalid res type.")
@@ -105,52 +136,52 @@ def mocked_get_operation(access_item, res_type):  # pylint: disable=unused-argum
 class RbacServiceTest(TestCase):
     """Test RbacService object."""
 
-    @patch("koku.rbac.requests.get", side_effect=mocked_requests_get_404_json)
+    @patch("koku.rbac.requests.Session.get", side_effect=mocked_requests_get_404_json)
     def test_non_200_error_json(self, mock_get):
         """Test handling of request with non-200 response and json error."""
         rbac = RbacService()
         url = f"{rbac.protocol}://{rbac.host}:{rbac.port}{rbac.path}"
-        access = rbac._request_user_access(url, headers={})  # pylint: disable=protected-access
-        self.assertEqual(access, [])
+        with self.assertRaises(RbacServiceError):
+            rbac._request_user_access(url, headers={})  # pylint: disable=protected-access
         mock_get.assert_called()
 
-    @patch("koku.rbac.requests.get", side_effect=mocked_requests_get_404_text)
+    @patch("koku.rbac.requests.Session.get", side_effect=mocked_requests_get_404_text)
     def test_non_200_error_text(self, mock_get):
         """Test handling of request with non-200 response and non-json error."""
         rbac = RbacService()
         url = f"{rbac.protocol}://{rbac.host}:{rbac.port}{rbac.path}"
-        access = rbac._request_user_access(url, headers={})  # pylint: disable=protected-access
-        self.assertEqual(access, [])
+        with self.assertRaises(RbacServiceError):
+            rbac._request_user_access(url, headers={})  # pylint: disable=protected-access
         mock_get.assert_called()
 
-    @patch("koku.rbac.requests.get", side_effect=mocked_requests_get_404_except)
+    @patch("koku.rbac.requests.Session.get", side_effect=mocked_requests_get_404_except)
     def test_non_200_error_except(self, mock_get):
         """Test handling of request with non-200 response and non-json error."""
         rbac = RbacService()
         url = f"{rbac.protocol}://{rbac.host}:{rbac.port}{rbac.path}"
-        access = rbac._request_user_access(url, headers={})  # pylint: disable=protected-access
-        self.assertEqual(access, [])
+        with self.assertRaises(RbacServiceError):
+            rbac._request_user_access(url, headers={})  # pylint: disable=protected-access
         mock_get.assert_called()
 
-    @patch("koku.rbac.requests.get", side_effect=mocked_requests_get_200_text)
+    @patch("koku.rbac.requests.Session.get", side_effect=mocked_requests_get_200_text)
     def test_200_text(self, mock_get):
         """Test handling of request with 200 response and non-json error."""
         rbac = RbacService()
         url = f"{rbac.protocol}://{rbac.host}:{rbac.port}{rbac.path}"
-        access = rbac._request_user_access(url, headers={})  # pylint: disable=protected-access
-        self.assertEqual(access, [])
+        with self.assertRaises(RbacServiceError):
+            rbac._request_user_access(url, headers={})  # pylint: disable=protected-access
         mock_get.assert_called()
 
-    @patch("koku.rbac.requests.get", side_effect=mocked_requests_get_200_except)
+    @patch("koku.rbac.requests.Session.get", side_effect=mocked_requests_get_200_except)
     def test_200_exception(self, mock_get):
         """Test handling of request with 200 response and raises a json error."""
         rbac = RbacService()
         url = f"{rbac.protocol}://{rbac.host}:{rbac.port}{rbac.path}"
-        access = rbac._request_user_access(url, headers={})  # pylint: disable=protected-access
-        self.assertEqual(access, [])
+        with self.assertRaises(RbacServiceError):
+            rbac._request_user_access(url, headers={})  # pylint: disable=protected-access
         mock_get.assert_called()
 
-    @patch("koku.rbac.requests.get", side_effect=mocked_requests_get_200_no_next)
+    @patch("koku.rbac.requests.Session.get", side_effect=mocked_requests_get_200_no_next)
     def test_200_all_results(self, mock_get):
         """Test handling of request with 200 response with no next link."""
         rbac = RbacService()
@@ -159,7 +190,7 @@ class RbacServiceTest(TestCase):
         self.assertEqual(access, [LIMITED_AWS_ACCESS])
         mock_get.assert_called()
 
-    @patch("koku.rbac.requests.get", side_effect=mocked_requests_get_200_next)
+    @patch("koku.rbac.requests.Session.get", side_effect=mocked_requests_get_200_next)
     def test_200_results_next(self, mock_get):
         """Test handling of request with 200 response with next link."""
         rbac = RbacService()
@@ -168,7 +199,7 @@ class RbacServiceTest(TestCase):
         self.assertEqual(access, [LIMITED_AWS_ACCESS, LIMITED_AWS_ACCESS])
         mock_get.assert_called()
 
-    @patch("koku.rbac.requests.get", side_effect=ConnectionError("test exception"))
+    @patch("koku.rbac.requests.Session.get", side_effect=ConnectionError("test exception"))
     def test_get_except(self, mock_get):
         """Test handling of request with ConnectionError."""
         before = REGISTRY.get_sample_value("rbac_connection_errors_total")
@@ -333,7 +364,7 @@ class RbacServiceTest(TestCase):
         }
         self.assertEqual(res_access, expected)
 
-    @patch("koku.rbac.requests.get", side_effect=mocked_requests_get_200_except)
+    @patch("koku.rbac.requests.Session.get", side_effect=mocked_requests_get_200_empty)
     def test_get_access_for_user_none(self, mock_get):
         """Test handling of user request where no access returns None."""
         rbac = RbacService()
@@ -343,7 +374,7 @@ class RbacServiceTest(TestCase):
         self.assertIsNone(access)
         mock_get.assert_called()
 
-    @patch("koku.rbac.requests.get", side_effect=mocked_requests_get_200_no_next)
+    @patch("koku.rbac.requests.Session.get", side_effect=mocked_requests_get_200_no_next)
     def test_get_access_for_user_data_limited(self, mock_get):
         """Test handling of user request where access returns data."""
         rbac = RbacService()
@@ -362,6 +393,114 @@ class RbacServiceTest(TestCase):
         self.assertEqual(access, expected)
         mock_get.assert_called()
 
+    @patch("koku.rbac.requests.Session.get", side_effect=mocked_requests_get_200_paged)
+    def test_200_results_paged(self, mock_get):
+        """Test that the pages after the first are requested by offset."""
+        rbac = RbacService()
+        url = f"{rbac.protocol}://{rbac.host}:{rbac.port}{rbac.path}?limit=100"
+        access = rbac._request_user_access(url, headers={})  # pylint: disable=protected-access
+        self.assertEqual(access, [LIMITED_AWS_ACCESS] * 3)
+        requested = sorted(call[0][0] for call in mock_get.call_args_list)
+        self.assertEqual(len(requested), 3)
+        self.assertTrue(any("offset=100" in url for url in requested))
+        self.assertTrue(any("offset=200" in url for url in requested))
+
+    @patch("koku.rbac.requests.Session.get", side_effect=mocked_requests_get_paged_error)
+    def test_200_results_paged_error(self, mock_get):
+        """Test that a failed page fails the whole request instead of returning partial access."""
+        rbac = RbacService()
+        url = f"{rbac.protocol}://{rbac.host}:{rbac.port}{rbac.path}?limit=100"
+        with self.assertRaises(RbacServiceError):
+            rbac._request_user_access(url, headers={})  # pylint: disable=protected-access
+        mock_get.assert_called()
+
+    @patch("koku.rbac.requests.Session.get", side_effect=mocked_requests_get_404_json)
+    def test_get_cached_access_error_not_cached(self, mock_get):
+        """Test that an RBAC error on a cache miss raises and caches nothing."""
+        self.addCleanup(caches["rbac"].clear)
+        rbac = RbacService()
+        mock_user = Mock(uuid="error-user")
+        mock_user.identity_header = {"encoded": "dGVzdCBoZWFkZXIgZGF0YQ=="}
+        with self.assertRaises(RbacConnectionError):
+            rbac.get_cached_access(mock_user)
+        self.assertIsNone(caches["rbac"].get(get_access_cache_key(mock_user.uuid)))
+        mock_get.assert_called()
+
+    @patch("koku.rbac.requests.Session.get", side_effect=mocked_requests_get_200_empty)
+    def test_get_cached_access_no_access_cached(self, mock_get):
+        """Test that an empty RBAC response is cached as no access."""
+        self.addCleanup(caches["rbac"].clear)
+        rbac = RbacService()
+        mock_user = Mock(uuid="empty-user")
+        mock_user.identity_header = {"encoded": "dGVzdCBoZWFkZXIgZGF0YQ=="}
+        self.assertIsNone(rbac.get_cached_access(mock_user))
+        self.assertIsNone(caches["rbac"].get(get_access_cache_key(mock_user.uuid))[0])
+        mock_get.assert_called_once()
+
+    def test_get_cached_access_stale_kept_on_error(self):
+        """Test that stale access is kept when its refresh fails."""
+        self.addCleanup(caches["rbac"].clear)
+        rbac = RbacService()
+        mock_user = Mock(uuid="stale-error-user")
+        fetched = time.time() - rbac.cache_ttl - 1
+        caches["rbac"].set(get_access_cache_key(mock_user.uuid), ({"old": True}, fetched))
+
+        with patch.object(RbacService, "get_access_for_user", side_effect=RbacServiceError("error")):
+            self.assertEqual(rbac.get_cached_access(mock_user), {"old": True})
+            rbac._refresh_executor.shutdown(wait=True)  # pylint: disable=protected-access
+        self.assertEqual(caches["rbac"].get(get_access_cache_key(mock_user.uuid)), ({"old": True}, fetched))
+
+    def test_get_cached_access_stale(self):
+        """Test that stale access is served while it is refreshed."""
+        self.addCleanup(caches["rbac"].clear)
+        rbac = RbacService()
+        mock_user = Mock(uuid="stale-user")
+        caches["rbac"].set(get_access_cache_key(mock_user.uuid), ({"old": True}, time.time() - rbac.cache_ttl - 1))
+
+        with patch.object(RbacService, "get_access_for_user", return_value={"new": True}):
+            self.assertEqual(rbac.get_cached_access(mock_user), {"old": True})
+            rbac._refresh_executor.shutdown(wait=True)  # pylint: disable=protected-access
+        self.assertEqual(caches["rbac"].get(get_access_cache_key(mock_user.uuid))[0], {"new": True})
+        self.assertEqual(rbac.get_cached_access(mock_user), {"new": True})
+
+    def test_get_cached_access_ignores_legacy_entry(self):
+        """Test that access cached under the user uuid alone by earlier releases is not read."""
+        self.addCleanup(caches["rbac"].clear)
+        rbac = RbacService()
+        mock_user = Mock(uuid="legacy-user")
+        caches["rbac"].set(mock_user.uuid, {"old": True})
+
+        with patch.object(RbacService, "get_access_for_user", return_value={"new": True}):
+            self.assertEqual(rbac.get_cached_access(mock_user), {"new": True})
+        self.assertEqual(caches["rbac"].get(mock_user.uuid), {"old": True})
+
+    def test_get_cached_access_collapses_fetches(self):
+        """Test that concurrent misses for one user make a single request."""
+        self.addCleanup(caches["rbac"].clear)
+        rbac = RbacService()
+        mock_user = Mock(uuid="collapsed-user")
+        started = threading.Event()
+        release = threading.Event()
+        results = []
+
+        def slow_access(user):
+            started.set()
+            release.wait(5)
+            return {"aws.account": {"read": ["*"]}}
+
+        with patch.object(RbacService, "get_access_for_user", side_effect=slow_access) as mock_access:
+            first = threading.Thread(target=lambda: results.append(rbac.get_cached_access(mock_user)))
+            first.start()
+            started.wait(5)
+            second = threading.Thread(target=lambda: results.append(rbac.get_cached_access(mock_user)))
+            second.start()
+            time.sleep(0.05)
+            release.set()
+            first.join(5)
+            second.join(5)
+        mock_access.assert_called_once()
+        self.assertEqual(results, [{"aws.account": {"read": ["*"]}}] * 2)
+
     @patch.dict(os.environ, {"RBAC_CACHE_TTL": "5"})
     def test_get_cache_ttl(self):
         """Test to get the cache ttl value."""
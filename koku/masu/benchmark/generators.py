@@ -0,0 +1,526 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Synthetic report files for the ingestion benchmarks.
+
+Every generator is seeded, so the same options always produce the same
+file. Rows are spread over the hours of the current month so that the
+processors treat the data as new.
+"""
+import csv
+import json
+import os
+import random
+from datetime import timedelta
+from uuid import UUID
+
+from api.models import Provider
+from masu.external.date_accessor import DateAccessor
+
+AWS_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+AZURE_DATE_FORMAT = "%Y-%m-%d"
+GCP_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S+00:00"
+OCP_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S +0000 UTC"
+
+AWS_PRODUCT_CODES = ["AmazonEC2", "AmazonS3", "AmazonRDS", "AmazonVPC", "AmazonCloudFront"]
+AWS_REGIONS = ["us-east-1", "us-east-2", "us-west-1", "us-west-2", "eu-west-1"]
+AWS_INSTANCE_TYPES = ["m5.large", "m5.xlarge", "t3.medium", "r5.2xlarge", ""]
+AZURE_LOCATIONS = ["US East", "US East 2", "US West", "EU North"]
+AZURE_SERVICES = ["Microsoft.Compute", "Microsoft.Storage", "Microsoft.Network", "Microsoft.Sql"]
+OCP_STORAGE_CLASSES = ["gp2", "standard", "fast", "slow"]
+
+OCP_CPU_MEM_COLUMNS = [
+    "report_period_start",
+    "report_period_end",
+    "pod",
+    "namespace",
+    "node",
+    "resource_id",
+    "interval_start",
+    "interval_end",
+    "pod_usage_cpu_core_seconds",
+    "pod_request_cpu_core_seconds",
+    "pod_limit_cpu_core_seconds",
+    "pod_usage_memory_byte_seconds",
+    "pod_request_memory_byte_seconds",
+    "pod_limit_memory_byte_seconds",
+    "node_capacity_cpu_cores",
+    "node_capacity_cpu_core_seconds",
+    "node_capacity_memory_bytes",
+    "node_capacity_memory_byte_seconds",
+    "pod_labels",
+]
+
+OCP_STORAGE_COLUMNS = [
+    "report_period_start",
+    "report_period_end",
+    "interval_start",
+    "interval_end",
+    "namespace",
+    "pod",
+    "persistentvolumeclaim",
+    "persistentvolume",
+    "storageclass",
+    "persistentvolumeclaim_capacity_bytes",
+    "persistentvolumeclaim_capacity_byte_seconds",
+    "volume_request_storage_byte_seconds",
+    "persistentvolumeclaim_usage_byte_seconds",
+    "persistentvolume_labels",
+    "persistentvolumeclaim_labels",
+]
+
+
+class ReportShape:
+    """The size and cardinality of a synthetic report.
+
+    Args:
+        rows (int): The number of line items to generate
+        tag_keys (int): The number of distinct tag or label keys
+        tag_values (int): The number of distinct values per tag key
+        skus (int): The number of distinct products, meters or nodes
+        resources (int): The number of distinct resources, pods or volumes
+        seed (int): The random seed
+
+    """
+
+    def __init__(self, rows=10000, tag_keys=5, tag_values=10, skus=50, resources=500, seed=42):
+        """Initialize the report shape."""
+        self.rows = rows
+        self.tag_keys = tag_keys
+        self.tag_values = tag_values
+        self.skus = skus
+        self.resources = resources
+        self.seed = seed
+
+    def __repr__(self):
+        """Return a readable summary of the shape."""
+        return (
+            f"ReportShape(rows={self.rows}, tag_keys={self.tag_keys}, tag_values={self.tag_values}, "
+            f"skus={self.skus}, resources={self.resources}, seed={self.seed})"
+        )
+
+
+class ReportGenerator:
+    """Base class writing a synthetic report file for one provider type."""
+
+    def __init__(self, shape):
+        """Initialize the generator.
+
+        Args:
+            shape (ReportShape): The size of the report to generate
+
+        """
+        self.shape = shape
+        self.random = random.Random(shape.seed)
+        self.month_start = (
+            DateAccessor().today_with_timezone("UTC").replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        )
+        self.month_end = (self.month_start + timedelta(days=32)).replace(day=1)
+        self.hours_in_month = int((self.month_end - self.month_start).total_seconds() // 3600)
+
+    def uuid(self):
+        """Return a reproducible UUID string."""
+        return str(UUID(int=self.random.getrandbits(128), version=4))
+
+    def interval_start(self, index):
+        """Return the start of the hour a row falls in, cycling through the month."""
+        return self.month_start + timedelta(hours=index % self.hours_in_month)
+
+    def tags(self):
+        """Return a random dict of tags drawn from the configured cardinality."""
+        tags = {}
+        for key in range(self.shape.tag_keys):
+            if self.random.random() < 0.7:
+                tags[f"key{key}"] = f"value{self.random.randrange(self.shape.tag_values)}"
+        return tags
+
+    @property
+    def columns(self):
+        """Return the report header."""
+        raise NotImplementedError
+
+    def rows(self):
+        """Yield the report rows as lists in header order."""
+        raise NotImplementedError
+
+    def file_name(self):
+        """Return the name of the report file."""
+        raise NotImplementedError
+
+    def write(self, directory):
+        """Write the report to a directory.
+
+        Args:
+            directory (str): Where to write the report
+
+        Returns:
+            (str): The path of the report file
+
+        """
+        os.makedirs(directory, exist_ok=True)
+        report_path = os.path.join(directory, self.file_name())
+        with open(report_path, "w", newline="") as report_file:
+            writer = csv.writer(report_file)
+            writer.writerow(self.columns)
+            writer.writerows(self.rows())
+        return report_path
+
+
+class AWSReportGenerator(ReportGenerator):
+    """Write a synthetic AWS Cost and Usage Report."""
+
+    base_columns = [
+        "identity/LineItemId",
+        "identity/TimeInterval",
+        "bill/BillingEntity",
+        "bill/BillType",
+        "bill/PayerAccountId",
+        "bill/BillingPeriodStartDate",
+        "bill/BillingPeriodEndDate",
+        "lineItem/UsageAccountId",
+        "lineItem/LineItemType",
+        "lineItem/UsageStartDate",
+        "lineItem/UsageEndDate",
+        "lineItem/ProductCode",
+        "lineItem/UsageType",
+        "lineItem/Operation",
+        "lineItem/AvailabilityZone",
+        "lineItem/ResourceId",
+        "lineItem/UsageAmount",
+        "lineItem/CurrencyCode",
+        "lineItem/UnblendedRate",
+        "lineItem/UnblendedCost",
+        "lineItem/BlendedRate",
+        "lineItem/BlendedCost",
+        "lineItem/LineItemDescription",
+        "product/ProductName",
+        "product/instanceType",
+        "product/productFamily",
+        "product/region",
+        "product/sku",
+        "pricing/publicOnDemandCost",
+        "pricing/publicOnDemandRate",
+        "pricing/term",
+        "pricing/unit",
+        "reservation/ReservationARN",
+    ]
+
+    @property
+    def columns(self):
+        """Return the CUR header, including one column per tag key."""
+        return self.base_columns + [f"resourceTags/user:key{key}" for key in range(self.shape.tag_keys)]
+
+    def file_name(self):
+        """Return the name of the report file."""
+        return "benchmark-aws-cur.csv"
+
+    def rows(self):
+        """Yield CUR rows."""
+        payer_account = "123456789012"
+        accounts = [payer_account] + [f"{100000000000 + account:012d}" for account in range(4)]
+        bill_start = self.month_start.strftime(AWS_DATETIME_FORMAT)
+        bill_end = self.month_end.strftime(AWS_DATETIME_FORMAT)
+        skus = [
+            (
+                f"SKU{sku:08d}",
+                self.random.choice(AWS_PRODUCT_CODES),
+                self.random.choice(AWS_REGIONS),
+                self.random.choice(AWS_INSTANCE_TYPES),
+            )
+            for sku in range(self.shape.skus)
+        ]
+        for index in range(self.shape.rows):
+            start = self.interval_start(index)
+            end = start + timedelta(hours=1)
+            sku, product_code, region, instance_type = self.random.choice(skus)
+            usage_amount = self.random.uniform(0, 10)
+            rate = self.random.uniform(0, 1)
+            cost = usage_amount * rate
+            tags = self.tags()
+            yield [
+                self.uuid(),
+                f"{start.strftime(AWS_DATETIME_FORMAT)}/{end.strftime(AWS_DATETIME_FORMAT)}",
+                "AWS",
+                "Anniversary",
+                payer_account,
+                bill_start,
+                bill_end,
+                self.random.choice(accounts),
+                "Usage",
+                start.strftime(AWS_DATETIME_FORMAT),
+                end.strftime(AWS_DATETIME_FORMAT),
+                product_code,
+                f"{region}-Usage",
+                "RunInstances",
+                f"{region}a",
+                f"i-{self.random.randrange(self.shape.resources):08x}",
+                usage_amount,
+                "USD",
+                rate,
+                cost,
+                rate,
+                cost,
+                f"{product_code} usage",
+                product_code,
+                instance_type,
+                "Compute Instance" if instance_type else "Storage",
+                region,
+                sku,
+                cost,
+                rate,
+                "OnDemand",
+                "Hrs",
+                "",
+            ] + [tags.get(f"key{key}", "") for key in range(self.shape.tag_keys)]
+
+
+class AzureReportGenerator(ReportGenerator):
+    """Write a synthetic Azure cost export."""
+
+    columns = [
+        "SubscriptionGuid",
+        "ResourceGroup",
+        "ResourceLocation",
+        "UsageDateTime",
+        "MeterCategory",
+        "MeterSubcategory",
+        "MeterId",
+        "MeterName",
+        "MeterRegion",
+        "UsageQuantity",
+        "ResourceRate",
+        "PreTaxCost",
+        "ConsumedService",
+        "ResourceType",
+        "InstanceId",
+        "Tags",
+        "OfferId",
+        "AdditionalInfo",
+        "ServiceInfo1",
+        "ServiceInfo2",
+        "ServiceName",
+        "ServiceTier",
+        "Currency",
+    ]
+
+    def file_name(self):
+        """Return the name of the report file."""
+        return "benchmark-azure-costreport.csv"
+
+    def rows(self):
+        """Yield Azure cost export rows."""
+        subscription = self.uuid()
+        days_in_month = self.hours_in_month // 24
+        meters = [
+            (self.uuid(), f"Meter {meter}", self.random.choice(AZURE_LOCATIONS), self.random.choice(AZURE_SERVICES))
+            for meter in range(self.shape.skus)
+        ]
+        for index in range(self.shape.rows):
+            usage_date = self.month_start + timedelta(days=index % days_in_month)
+            meter_id, meter_name, location, service = self.random.choice(meters)
+            quantity = self.random.uniform(0, 10)
+            rate = self.random.uniform(0, 1)
+            resource = f"vm-{self.random.randrange(self.shape.resources)}"
+            yield [
+                subscription,
+                "BENCHMARK",
+                location,
+                usage_date.strftime(AZURE_DATE_FORMAT),
+                service.split(".")[-1],
+                "",
+                meter_id,
+                meter_name,
+                location,
+                quantity,
+                rate,
+                quantity * rate,
+                service,
+                f"{service}/resources",
+                f"/subscriptions/{subscription}/resourceGroups/BENCHMARK/providers/{service}/{resource}",
+                json.dumps(self.tags()),
+                "",
+                "{}",
+                "",
+                "",
+                service.split(".")[-1],
+                "Standard",
+                "USD",
+            ]
+
+
+class GCPReportGenerator(ReportGenerator):
+    """Write a synthetic GCP billing export."""
+
+    columns = [
+        "Account ID",
+        "Line Item",
+        "Start Time",
+        "End Time",
+        "Project",
+        "Measurement1",
+        "Measurement1 Total Consumption",
+        "Measurement1 Units",
+        "Credit1",
+        "Credit1 Amount",
+        "Credit1 Currency",
+        "Cost",
+        "Currency",
+        "Project Number",
+        "Project ID",
+        "Project Name",
+        "Project Labels",
+        "Description",
+    ]
+
+    def file_name(self):
+        """Return the name of the report file."""
+        return "benchmark-gcp.csv"
+
+    def rows(self):
+        """Yield GCP billing export rows."""
+        days_in_month = self.hours_in_month // 24
+        projects = [(str(100000000000 + project), f"project-{project}") for project in range(self.shape.resources)]
+        line_items = [f"com.google.cloud/services/compute-engine/Sku{sku}" for sku in range(self.shape.skus)]
+        for index in range(self.shape.rows):
+            start = self.month_start + timedelta(days=index % days_in_month)
+            end = start + timedelta(days=1)
+            project_number, project_id = self.random.choice(projects)
+            line_item = self.random.choice(line_items)
+            labels = ";".join(f"{key}:{value}" for key, value in self.tags().items())
+            yield [
+                "01C2AB-2F30E0-1EF054",
+                line_item,
+                start.strftime(GCP_DATETIME_FORMAT),
+                end.strftime(GCP_DATETIME_FORMAT),
+                project_number,
+                line_item,
+                self.random.randrange(100000),
+                "seconds",
+                "",
+                "",
+                "",
+                self.random.uniform(0, 10),
+                "USD",
+                project_number,
+                project_id,
+                project_id,
+                labels,
+                "Benchmark usage",
+            ]
+
+
+class OCPCpuMemReportGenerator(ReportGenerator):
+    """Write a synthetic OpenShift pod usage report."""
+
+    columns = OCP_CPU_MEM_COLUMNS
+
+    def file_name(self):
+        """Return the name of the report file."""
+        return "benchmark-ocp-cpu-mem.csv"
+
+    def labels(self):
+        """Return an operator formatted label string."""
+        return "|".join(f"label_{key}:{value}" for key, value in self.tags().items())
+
+    def rows(self):
+        """Yield pod usage rows, one per pod and hour."""
+        period_start = self.month_start.strftime(OCP_DATETIME_FORMAT)
+        period_end = self.month_end.strftime(OCP_DATETIME_FORMAT)
+        nodes = [f"node-{node}" for node in range(self.shape.skus)]
+        pods = [
+            (f"pod-{pod}", f"namespace-{pod % 20}", self.random.choice(nodes), self.labels())
+            for pod in range(self.shape.resources)
+        ]
+        for index in range(self.shape.rows):
+            start = self.interval_start(index // len(pods))
+            pod, namespace, node, labels = pods[index % len(pods)]
+            yield [
+                period_start,
+                period_end,
+                pod,
+                namespace,
+                node,
+                f"i-{node}",
+                start.strftime(OCP_DATETIME_FORMAT),
+                (start + timedelta(hours=1)).strftime(OCP_DATETIME_FORMAT),
+                self.random.uniform(0, 3600),
+                3600,
+                7200,
+                self.random.uniform(0, 3600 * 2 ** 30),
+                3600 * 2 ** 30,
+                3600 * 2 ** 31,
+                4,
+                4 * 3600,
+                16 * 2 ** 30,
+                16 * 2 ** 30 * 3600,
+                labels,
+            ]
+
+
+class OCPStorageReportGenerator(OCPCpuMemReportGenerator):
+    """Write a synthetic OpenShift volume usage report."""
+
+    columns = OCP_STORAGE_COLUMNS
+
+    def file_name(self):
+        """Return the name of the report file."""
+        return "benchmark-ocp-storage.csv"
+
+    def rows(self):
+        """Yield volume usage rows, one per claim and hour."""
+        period_start = self.month_start.strftime(OCP_DATETIME_FORMAT)
+        period_end = self.month_end.strftime(OCP_DATETIME_FORMAT)
+        claims = [
+            (
+                f"pod-{claim}",
+                f"namespace-{claim % 20}",
+                f"claim-{claim}",
+                f"pvc-{self.uuid()}",
+                OCP_STORAGE_CLASSES[claim % len(OCP_STORAGE_CLASSES)],
+                self.labels(),
+                self.labels(),
+            )
+            for claim in range(self.shape.resources)
+        ]
+        for index in range(self.shape.rows):
+            start = self.interval_start(index // len(claims))
+            pod, namespace, claim, volume, storage_class, volume_labels, claim_labels = claims[index % len(claims)]
+            yield [
+                period_start,
+                period_end,
+                start.strftime(OCP_DATETIME_FORMAT),
+                (start + timedelta(hours=1)).strftime(OCP_DATETIME_FORMAT),
+                namespace,
+                pod,
+                claim,
+                volume,
+                storage_class,
+                10 * 2 ** 30,
+                10 * 2 ** 30 * 3600,
+                10 * 2 ** 30 * 3600,
+                self.random.uniform(0, 10 * 2 ** 30 * 3600),
+                volume_labels,
+                claim_labels,
+            ]
+
+
+GENERATORS = {
+    Provider.PROVIDER_AWS: AWSReportGenerator,
+    Provider.PROVIDER_AZURE: AzureReportGenerator,
+    Provider.PROVIDER_GCP: GCPReportGenerator,
+    "OCP-cpu-mem": OCPCpuMemReportGenerator,
+    "OCP-storage": OCPStorageReportGenerator,
+}
@@ -0,0 +1,379 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Run a report processor against a synthetic file and measure it.
+
+Phases are measured by wrapping the processor and accessor methods that
+implement them for the duration of a run. Each phase records exclusive
+time, so a clean_data call made while resolving a dimension is counted
+as cleaning and not twice. Time not spent in an instrumented method is
+reported as parse: reading the file and building rows.
+"""
+import functools
+import inspect
+import logging
+import os
+import resource
+import shutil
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextlib import ExitStack
+
+from django.db import connection
+
+from api.models import Provider
+from masu.benchmark.generators import GENERATORS
+from masu.database.report_db_accessor_base import ReportDBAccessorBase
+from masu.external import UNCOMPRESSED
+from masu.processor.aws.aws_columnar_report_processor import AWSColumnarReportProcessor
+from masu.processor.aws.aws_report_processor import AWSReportProcessor
+from masu.processor.azure.azure_report_processor import AzureReportProcessor
+from masu.processor.gcp.gcp_report_processor import GCPReportProcessor
+from masu.processor.ocp.ocp_report_processor import OCPReportProcessor
+from masu.processor.ocp.ocp_report_processor import OCPReportProcessorBase
+
+LOG = logging.getLogger(__name__)
+
+PHASE_PARSE = "parse"
+PHASE_SETUP = "setup"
+PHASE_CLEAN = "clean"
+PHASE_DIMENSION = "dimension lookup"
+PHASE_COPY = "copy"
+PHASE_MERGE = "merge"
+
+# (class, method name, phase) for every provider
+ACCESSOR_PHASES = [
+    (ReportDBAccessorBase, "clean_data", PHASE_CLEAN),
+    (ReportDBAccessorBase, "bulk_insert_rows", PHASE_COPY),
+    (ReportDBAccessorBase, "merge_temp_table", PHASE_MERGE),
+]
+
+PROCESSOR_PHASES = {
+    Provider.PROVIDER_AWS: [
+        (AWSReportProcessor, "_create_cost_entry_bill", PHASE_DIMENSION),
+        (AWSReportProcessor, "_create_cost_entry", PHASE_DIMENSION),
+        (AWSReportProcessor, "_create_cost_entry_product", PHASE_DIMENSION),
+        (AWSReportProcessor, "_create_cost_entry_pricing", PHASE_DIMENSION),
+        (AWSReportProcessor, "_create_cost_entry_reservation", PHASE_DIMENSION),
+        (AWSReportProcessor, "_create_dimensions", PHASE_DIMENSION),
+        (AWSReportProcessor, "_create_cost_entry_line_item", PHASE_CLEAN),
+        (AWSColumnarReportProcessor, "_resolve_dimension", PHASE_DIMENSION),
+        (AWSColumnarReportProcessor, "_coerce_columns", PHASE_CLEAN),
+        (AWSColumnarReportProcessor, "_process_tag_columns", PHASE_CLEAN),
+    ],
+    Provider.PROVIDER_AZURE: [
+        (AzureReportProcessor, "_create_cost_entry_bill", PHASE_DIMENSION),
+        (AzureReportProcessor, "_create_cost_entry_product", PHASE_DIMENSION),
+        (AzureReportProcessor, "_create_meter", PHASE_DIMENSION),
+        (AzureReportProcessor, "_create_cost_entry_line_item", PHASE_CLEAN),
+    ],
+    Provider.PROVIDER_GCP: [
+        (GCPReportProcessor, "_get_or_create_cost_entry_bill", PHASE_DIMENSION),
+        (GCPReportProcessor, "_get_or_create_gcp_project", PHASE_DIMENSION),
+        (GCPReportProcessor, "_coerce_columns", PHASE_CLEAN),
+        (GCPReportProcessor, "_aggregate_line_items", PHASE_CLEAN),
+    ],
+    Provider.PROVIDER_OCP: [
+        (OCPReportProcessorBase, "_create_report_period", PHASE_DIMENSION),
+        (OCPReportProcessorBase, "_create_report", PHASE_DIMENSION),
+        (OCPReportProcessorBase, "_create_usage_report_line_item", PHASE_CLEAN),
+    ],
+}
+
+PROCESSOR_CLASSES = {
+    Provider.PROVIDER_AWS: AWSReportProcessor,
+    "AWS-columnar": AWSColumnarReportProcessor,
+    Provider.PROVIDER_AZURE: AzureReportProcessor,
+    Provider.PROVIDER_GCP: GCPReportProcessor,
+    "OCP-cpu-mem": OCPReportProcessor,
+    "OCP-storage": OCPReportProcessor,
+}
+
+PROVIDER_TYPES = {
+    Provider.PROVIDER_AWS: Provider.PROVIDER_AWS,
+    "AWS-columnar": Provider.PROVIDER_AWS,
+    Provider.PROVIDER_AZURE: Provider.PROVIDER_AZURE,
+    Provider.PROVIDER_GCP: Provider.PROVIDER_GCP,
+    "OCP-cpu-mem": Provider.PROVIDER_OCP,
+    "OCP-storage": Provider.PROVIDER_OCP,
+}
+
+REPORT_KINDS = list(PROCESSOR_CLASSES)
+
+
+class PhaseTimer:
+    """Accumulate exclusive wall time and call counts per phase."""
+
+    def __init__(self):
+        """Initialize the timer."""
+        self.seconds = {}
+        self.calls = {}
+        self._stack = []
+
+    @contextmanager
+    def phase(self, name):
+        """Time a block of code as the given phase.
+
+        Time spent in a nested phase is subtracted from the enclosing one.
+        """
+        start = time.perf_counter()
+        self._stack.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = self._stack.pop()
+            self.seconds[name] = self.seconds.get(name, 0.0) + elapsed - nested
+            self.calls[name] = self.calls.get(name, 0) + 1
+            if self._stack:
+                self._stack[-1] += elapsed
+
+    @property
+    def total(self):
+        """Return the time spent in all phases."""
+        return sum(self.seconds.values())
+
+
+class QueryCounter:
+    """Count the SQL statements executed on the default connection."""
+
+    def __init__(self):
+        """Initialize the counter."""
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Count a statement and execute it."""
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class CopyCounter:
+    """Count the rows the processors write with COPY."""
+
+    def __init__(self):
+        """Initialize the counter."""
+        self.rows = 0
+
+
+class CountingReader:
+    """A file-like object counting the lines COPY reads through it.
+
+    COPY text format escapes newlines in values, so each line is one row.
+    """
+
+    def __init__(self, file_obj):
+        """Initialize the reader.
+
+        Args:
+            file_obj (file): The file-like object passed to COPY
+
+        """
+        self.file_obj = file_obj
+        self.lines = 0
+        self._partial = False
+
+    def _count(self, data):
+        """Count the lines in data read from the file."""
+        newline = b"\n" if isinstance(data, bytes) else "\n"
+        if data:
+            self.lines += data.count(newline)
+            self._partial = not data.endswith(newline)
+        elif self._partial:
+            # The last line was not newline terminated
+            self.lines += 1
+            self._partial = False
+        return data
+
+    def read(self, size=-1):
+        """Read from the file, counting lines."""
+        return self._count(self.file_obj.read(size))
+
+    def readline(self, size=-1):
+        """Read a line from the file, counting it."""
+        return self._count(self.file_obj.readline(size))
+
+
+def _wrap_method(timer, cls, name, phase):
+    """Return the timed replacement for a class attribute."""
+    attribute = inspect.getattr_static(cls, name)
+    is_static = isinstance(attribute, staticmethod)
+    function = attribute.__func__ if is_static else attribute
+
+    @functools.wraps(function)
+    def timed(*args, **kwargs):
+        with timer.phase(phase):
+            return function(*args, **kwargs)
+
+    return staticmethod(timed) if is_static else timed
+
+
+@contextmanager
+def instrument(timer, methods):
+    """Time the given methods for the duration of the block.
+
+    Args:
+        timer (PhaseTimer): The timer collecting phase times
+        methods (list): (class, method name, phase) tuples
+
+    """
+    originals = []
+    try:
+        for cls, name, phase in methods:
+            if name not in cls.__dict__:
+                continue
+            originals.append((cls, name, cls.__dict__[name]))
+            setattr(cls, name, _wrap_method(timer, cls, name, phase))
+        yield timer
+    finally:
+        for cls, name, original in reversed(originals):
+            setattr(cls, name, original)
+
+
+@contextmanager
+def count_copied_rows(counter):
+    """Count the rows written with COPY for the duration of the block.
+
+    Args:
+        counter (CopyCounter): The counter to add the rows to
+
+    """
+    original = ReportDBAccessorBase.__dict__["bulk_insert_rows"]
+
+    @functools.wraps(original)
+    def counted(accessor, file_obj, *args, **kwargs):
+        reader = CountingReader(file_obj)
+        try:
+            return original(accessor, reader, *args, **kwargs)
+        finally:
+            counter.rows += reader.lines
+
+    ReportDBAccessorBase.bulk_insert_rows = counted
+    try:
+        yield counter
+    finally:
+        ReportDBAccessorBase.bulk_insert_rows = original
+
+
+class BenchmarkResult:
+    """The measurements of one benchmark run."""
+
+    def __init__(self, kind, shape, rows, seconds, phases, calls, queries, peak_memory):
+        """Initialize the result."""
+        self.kind = kind
+        self.shape = shape
+        self.rows = rows
+        self.seconds = seconds
+        self.phases = phases
+        self.calls = calls
+        self.queries = queries
+        self.peak_memory = peak_memory
+
+    @property
+    def rows_per_second(self):
+        """Return the processing throughput."""
+        return self.rows / self.seconds if self.seconds else float(self.rows)
+
+    def as_dict(self):
+        """Return the result as a JSON serializable dict."""
+        return {
+            "kind": self.kind,
+            "shape": vars(self.shape),
+            "rows": self.rows,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "queries": self.queries,
+            "peak_memory_bytes": self.peak_memory,
+            "phases": {phase: round(seconds, 3) for phase, seconds in self.phases.items()},
+            "phase_calls": self.calls,
+        }
+
+    def __str__(self):
+        """Return a readable report of the run."""
+        lines = [
+            f"{self.kind}: {self.shape}",
+            f"  rows: {self.rows}",
+            f"  seconds: {self.seconds:.2f}",
+            f"  rows/sec: {self.rows_per_second:.0f}",
+            f"  queries: {self.queries}",
+            f"  peak memory (bytes): {self.peak_memory}",
+        ]
+        for phase, seconds in sorted(self.phases.items(), key=lambda item: -item[1]):
+            share = seconds / self.seconds * 100 if self.seconds else 0
+            lines.append(f"  {phase}: {seconds:.2f}s ({share:.0f}%, {self.calls.get(phase, 0)} calls)")
+        return "\n".join(lines)
+
+
+def run_benchmark(kind, shape, schema_name, provider_uuid, trace_memory=False):
+    """Generate a report and process it, measuring every phase.
+
+    Args:
+        kind (str): One of REPORT_KINDS
+        shape (ReportShape): The size of the report to generate
+        schema_name (str): The tenant schema to process into
+        provider_uuid (str): An existing provider of the matching type
+        trace_memory (bool): Measure peak Python allocations with tracemalloc.
+            This is exact but slows processing, otherwise the process peak
+            RSS is reported.
+
+    Returns:
+        (BenchmarkResult): The measurements
+
+    """
+    provider_type = PROVIDER_TYPES[kind]
+    generator_kind = kind if kind in GENERATORS else provider_type
+    methods = ACCESSOR_PHASES + PROCESSOR_PHASES[provider_type]
+    timer = PhaseTimer()
+    queries = QueryCounter()
+    copied = CopyCounter()
+
+    # OCP processors read the cluster id from the name of the directory
+    directory = tempfile.mkdtemp(prefix="masu-benchmark-")
+    report_path = GENERATORS[generator_kind](shape).write(os.path.join(directory, "benchmark-cluster"))
+    LOG.info("Generated %s report %s: %s", kind, report_path, shape)
+
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        with ExitStack() as stack:
+            stack.enter_context(instrument(timer, methods))
+            stack.enter_context(count_copied_rows(copied))
+            stack.enter_context(connection.execute_wrapper(queries))
+            start = time.perf_counter()
+            with timer.phase(PHASE_PARSE):
+                with timer.phase(PHASE_SETUP):
+                    processor = PROCESSOR_CLASSES[kind](
+                        schema_name=schema_name,
+                        report_path=report_path,
+                        compression=UNCOMPRESSED,
+                        provider_uuid=provider_uuid,
+                    )
+                processor.process()
+            seconds = time.perf_counter() - start
+        if trace_memory:
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        else:
+            # ru_maxrss is reported in kilobytes on Linux
+            peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        shutil.rmtree(directory, ignore_errors=True)
+
+    return BenchmarkResult(
+        kind, shape, copied.rows, seconds, dict(timer.seconds), dict(timer.calls), queries.count, peak_memory
+    )
@@ -44,6 +44,7 @@ from koku.celery import app
 from masu.celery.export import table_export_settings
 from masu.external.date_accessor import DateAccessor
 from masu.processor.orchestrator import Orchestrator
+from masu.processor.tasks import create_partitions
 from masu.processor.tasks import vacuum_schema
 from masu.util.common import dictify_table_export_settings
 from masu.util.common import NamedTemporaryGZip
@@ -312,3 +313,18 @@ def vacuum_schemas():
     for schema_name in schema_names:
         LOG.info("Scheduling VACUUM task for %s", schema_name)
         vacuum_schema.delay(schema_name)
+
+
+@app.task(name="masu.celery.tasks.create_all_partitions", queue_name="reporting")
+def create_all_partitions():
+    """Create next month's line item partitions in all schemas."""
+    tenants = Tenant.objects.values("schema_name")
+    schema_names = [
+        tenant.get("schema_name")
+        for tenant in tenants
+        if (tenant.get("schema_name") and tenant.get("schema_name") != "public")
+    ]
+
+    for schema_name in schema_names:
+        LOG.info("Scheduling partition creation for %s", schema_name)
+        create_partitions.delay(schema_name)
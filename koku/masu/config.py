@@ -94,6 +94,27 @@ class Config:
 
     REPORT_PROCESSING_BATCH_SIZE = 100000
 
+    # Fan the files of a polled provider's manifest out to parallel Celery subtasks
+    PARALLEL_REPORT_PROCESSING = False if os.getenv("PARALLEL_REPORT_PROCESSING", "False") == "False" else True
+
+    # Number of report rows whose dimensions (bills, products, etc.) are resolved together
+    REPORT_DIMENSION_BATCH_SIZE = 10000
+
+    # Number of dimension ids (bills, cost entries, products, etc.) a report processor keeps in memory
+    REPORT_DIMENSION_CACHE_SIZE = int(os.getenv("REPORT_DIMENSION_CACHE_SIZE", "100000"))
+
+    # Number of files of a manifest downloaded at once by ReportDownloader.download_report
+    REPORT_DOWNLOAD_WORKERS = int(os.getenv("REPORT_DOWNLOAD_WORKERS", "1"))
+
+    # Bytes requested per ranged request when downloading report files
+    REPORT_DOWNLOAD_CHUNK_SIZE = int(os.getenv("REPORT_DOWNLOAD_CHUNK_SIZE", str(64 * 1024 * 1024)))
+
+    # Process AWS report files as streams from S3 instead of downloading them first
+    STREAM_REPORT_FILES = False if os.getenv("STREAM_REPORT_FILES", "False") == "False" else True
+
+    # Ingest AWS cost usage reports with the columnar (chunked pandas) engine
+    AWS_COLUMNAR_PROCESSING = False if os.getenv("AWS_COLUMNAR_PROCESSING", "False") == "False" else True
+
     AWS_DATETIME_STR_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
     OCP_DATETIME_STR_FORMAT = "%Y-%m-%d %H:%M:%S +0000 UTC"
     AZURE_DATETIME_STR_FORMAT = "%Y-%m-%d"
@@ -56,3 +56,14 @@ AZURE_REPORT_TABLE_MAP = {
     "ocp_on_azure_daily_summary": "reporting_ocpazurecostlineitem_daily_summary",
     "ocp_on_azure_project_daily_summary": "reporting_ocpazurecostlineitem_project_daily_summary",
 }
+
+# Tables partitioned by month and the column they are partitioned on. The raw
+# AWS line items are loaded with plain COPY, so unlike the other raw line item
+# tables they do not need ON CONFLICT and can be partitioned too.
+PARTITIONED_TABLES = {
+    AWS_CUR_TABLE_MAP["line_item"]: "usage_start",
+    AWS_CUR_TABLE_MAP["line_item_daily"]: "usage_start",
+    AZURE_REPORT_TABLE_MAP["line_item"]: "usage_date_time",
+    OCP_REPORT_TABLE_MAP["line_item_daily"]: "usage_start",
+    OCP_REPORT_TABLE_MAP["storage_line_item_daily"]: "usage_start",
+}
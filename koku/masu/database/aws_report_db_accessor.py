@@ -20,6 +20,8 @@ import pkgutil
 import uuid
 
 from dateutil.parser import parse
+from dateutil.relativedelta import relativedelta
+from django.db import transaction
 from django.db.models import F
 from jinjasql import JinjaSql
 from tenant_schemas.utils import schema_context
@@ -148,11 +150,13 @@ class AWSReportDBAccessor(ReportDBAccessorBase):
             line_item_query = base_query.filter(bill_id=bill_id)
             return line_item_query
 
-    def get_cost_entries(self):
-        """Make a mapping of cost entries by start time."""
+    def get_cost_entries(self, bill_id=None):
+        """Make a mapping of cost entries by start time, optionally for a single bill."""
         table_name = AWSCostEntry
         with schema_context(self.schema):
             cost_entries = self._get_db_obj_query(table_name).all()
+            if bill_id is not None:
+                cost_entries = cost_entries.filter(bill_id=bill_id)
 
             return {(ce.bill_id, ce.interval_start.strftime(self._datetime_format)): ce.id for ce in cost_entries}
 
@@ -237,6 +241,36 @@ class AWSReportDBAccessor(ReportDBAccessorBase):
             table_name, summary_sql, start_date, end_date, bind_params=list(summary_sql_params)
         )
 
+    def populate_ui_summary_tables(self, start_date=None, end_date=None):
+        """Populate the UI summary tables for a date range.
+
+        Rows for the range are deleted and re-aggregated from the daily
+        summary table, so the cost is proportional to the days that were
+        summarized rather than the whole retention window. Concurrent runs
+        for a schema are serialized by an advisory lock.
+
+        Args:
+            start_date (datetime.date) The date to start populating the tables.
+            end_date (datetime.date) The date to end on.
+
+        Returns
+            (None)
+
+        """
+        if start_date is None or end_date is None:
+            today = self.date_accessor.today_with_timezone("UTC").date()
+            start_date = today.replace(day=1) - relativedelta(months=1)
+            end_date = today.replace(day=1) + relativedelta(months=1, days=-1)
+
+        summary_sql = pkgutil.get_data("masu.database", "sql/reporting_aws_ui_summary_tables.sql")
+        summary_sql = summary_sql.decode("utf-8")
+        summary_sql_params = {"start_date": start_date, "end_date": end_date, "schema": self.schema}
+        summary_sql, summary_sql_params = self.jinja_sql.prepare_query(summary_sql, summary_sql_params)
+        with transaction.atomic():
+            self._execute_raw_sql_query(
+                "AWS UI summary tables", summary_sql, start_date, end_date, bind_params=list(summary_sql_params)
+            )
+
     def mark_bill_as_finalized(self, bill_id):
         """Mark a bill in the database as finalized."""
         table_name = AWSCostEntryBill
@@ -247,8 +281,16 @@ class AWSReportDBAccessor(ReportDBAccessorBase):
                 bill.finalized_datetime = self.date_accessor.today_with_timezone("UTC")
                 bill.save()
 
-    def populate_tags_summary_table(self):
-        """Populate the line item aggregated totals data table."""
+    def populate_tags_summary_table(self, bill_ids=None):
+        """Populate the tag key summary table.
+
+        Args:
+            bill_ids (list) The bills to summarize tags for, all bills if empty.
+
+        Returns
+            (None)
+
+        """
         table_name = AWS_CUR_TABLE_MAP["tags_summary"]
 
         agg_sql = pkgutil.get_data("masu.database", f"sql/reporting_cloudtags_summary.sql")
@@ -257,6 +299,7 @@ class AWSReportDBAccessor(ReportDBAccessorBase):
             "schema": self.schema,
             "tag_table": "reporting_awstags_summary",
             "lineitem_table": "reporting_awscostentrylineitem_daily",
+            "bill_ids": bill_ids,
         }
         agg_sql, agg_sql_params = self.jinja_sql.prepare_query(agg_sql, agg_sql_params)
         self._execute_raw_sql_query(table_name, agg_sql, bind_params=list(agg_sql_params))
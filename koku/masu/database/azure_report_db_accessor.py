@@ -132,8 +132,16 @@ class AzureReportDBAccessor(ReportDBAccessorBase):
             table_name, summary_sql, start_date, end_date, bind_params=list(summary_sql_params)
         )
 
-    def populate_tags_summary_table(self):
-        """Populate the line item aggregated totals data table."""
+    def populate_tags_summary_table(self, bill_ids=None):
+        """Populate the tag key summary table.
+
+        Args:
+            bill_ids (list) The bills to summarize tags for, all bills if empty.
+
+        Returns
+            (None)
+
+        """
         table_name = AZURE_REPORT_TABLE_MAP["tags_summary"]
 
         agg_sql = pkgutil.get_data("masu.database", f"sql/reporting_cloudtags_summary.sql")
@@ -142,6 +150,7 @@ class AzureReportDBAccessor(ReportDBAccessorBase):
             "schema": self.schema,
             "tag_table": "reporting_azuretags_summary",
             "lineitem_table": "reporting_azurecostentrylineitem_daily",
+            "bill_ids": bill_ids,
         }
         agg_sql, agg_sql_params = self.jinja_sql.prepare_query(agg_sql, agg_sql_params)
         self._execute_raw_sql_query(table_name, agg_sql, bind_params=list(agg_sql_params))
@@ -45,18 +45,6 @@ from reporting.provider.ocp.models import OCPUsageReportPeriod
 LOG = logging.getLogger(__name__)
 
 
-def create_filter(data_source, start_date, end_date, cluster_id):
-    """Create filter with data source, start and end dates."""
-    filters = {"data_source": data_source}
-    if start_date:
-        filters["usage_start__gte"] = start_date
-    if end_date:
-        filters["usage_start__lte"] = end_date
-    if cluster_id:
-        filters["cluster_id"] = cluster_id
-    return filters
-
-
 # pylint: disable=too-many-public-methods
 class OCPReportDBAccessor(ReportDBAccessorBase):
     """Class to interact with customer reporting tables."""
@@ -221,82 +209,17 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
             return_value = {(p["cluster_id"], p["report_period_start"], p["provider_id"]): p["id"] for p in periods}
             return return_value
 
-    def get_reports(self):
-        """Make a mapping of reports by time."""
+    def get_reports(self, report_period_id=None):
+        """Make a mapping of reports by time, optionally for a single report period."""
         with schema_context(self.schema):
             reports = OCPUsageReport.objects.all()
+            if report_period_id is not None:
+                reports = reports.filter(report_period_id=report_period_id)
             return {
                 (entry.report_period_id, entry.interval_start.strftime(self._datetime_format)): entry.id
                 for entry in reports
             }
 
-    def get_pod_usage_cpu_core_hours(self, start_date, end_date, cluster_id=None):
-        """Make a mapping of cpu pod usage hours."""
-        table = OCPUsageLineItemDailySummary
-        filters = create_filter("Pod", start_date, end_date, cluster_id)
-        with schema_context(self.schema):
-            reports = self._get_reports(table, filters)
-            return {entry.id: entry.pod_usage_cpu_core_hours for entry in reports}
-
-    def _get_reports(self, table, filters=None):
-        """Return requested reports from given table.
-
-        Args:
-            table (Django models.Model object): The table to query against
-            filters (dict): Columns to filter the query on
-
-        Returns:
-            (QuerySet): Django queryset of objects queried on
-
-        """
-        with schema_context(self.schema):
-            if filters:
-                reports = self._get_db_obj_query(table).filter(**filters).all()
-            else:
-                reports = self._get_db_obj_query(table).all()
-            return reports
-
-    def get_pod_request_cpu_core_hours(self, start_date, end_date, cluster_id=None):
-        """Make a mapping of cpu pod request hours."""
-        table = OCPUsageLineItemDailySummary
-        filters = create_filter("Pod", start_date, end_date, cluster_id)
-        with schema_context(self.schema):
-            reports = self._get_reports(table, filters)
-            return {entry.id: entry.pod_request_cpu_core_hours for entry in reports}
-
-    def get_pod_usage_memory_gigabyte_hours(self, start_date, end_date, cluster_id=None):
-        """Make a mapping of memory_usage hours."""
-        table = OCPUsageLineItemDailySummary
-        filters = create_filter("Pod", start_date, end_date, cluster_id)
-        with schema_context(self.schema):
-            reports = self._get_reports(table, filters)
-            return {entry.id: entry.pod_usage_memory_gigabyte_hours for entry in reports}
-
-    def get_pod_request_memory_gigabyte_hours(self, start_date, end_date, cluster_id=None):
-        """Make a mapping of memory_request_hours."""
-        table = OCPUsageLineItemDailySummary
-        filters = create_filter("Pod", start_date, end_date, cluster_id)
-        with schema_context(self.schema):
-            reports = self._get_reports(table, filters)
-            return {entry.id: entry.pod_request_memory_gigabyte_hours for entry in reports}
-
-    def get_persistentvolumeclaim_usage_gigabyte_months(self, start_date, end_date, cluster_id=None):
-        """Make a mapping of persistentvolumeclaim_usage_gigabyte_months."""
-        table = OCPUsageLineItemDailySummary
-        filters = create_filter("Storage", start_date, end_date, cluster_id)
-        with schema_context(self.schema):
-            reports = self._get_reports(table, filters)
-            # pylint: disable=line-too-long
-            return {entry.id: entry.persistentvolumeclaim_usage_gigabyte_months for entry in reports}
-
-    def get_volume_request_storage_gigabyte_months(self, start_date, end_date, cluster_id=None):
-        """Make a mapping of volume_request_storage_gigabyte_months."""
-        table = OCPUsageLineItemDailySummary
-        filters = create_filter("Storage", start_date, end_date, cluster_id)
-        with schema_context(self.schema):
-            reports = self._get_reports(table, filters)
-            return {entry.id: entry.volume_request_storage_gigabyte_months for entry in reports}
-
     def populate_line_item_daily_table(self, start_date, end_date, cluster_id):
         """Populate the daily aggregate of line items table.
 
@@ -411,30 +334,16 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         daily_sql, daily_sql_params = self.jinja_sql.prepare_query(daily_sql, daily_sql_params)
         self._execute_raw_sql_query(table_name, daily_sql, start_date, end_date, bind_params=list(daily_sql_params))
 
-    def populate_pod_charge(self, cpu_temp_table, mem_temp_table):
-        """Populate the memory and cpu charge on daily summary table.
-
-        Args:
-            cpu_temp_table (String) Name of cpu charge temp table
-            mem_temp_table (String) Name of mem charge temp table
-
-        Returns
-            (None)
-
-        """
-        table_name = OCP_REPORT_TABLE_MAP["line_item_daily_summary"]
-
-        daily_charge_sql = pkgutil.get_data("masu.database", "sql/reporting_ocpusagelineitem_daily_pod_charge.sql")
-        charge_line_sql = daily_charge_sql.decode("utf-8")
-        charge_line_sql_params = {"cpu_temp": cpu_temp_table, "mem_temp": mem_temp_table, "schema": self.schema}
-        charge_line_sql, charge_line_sql_params = self.jinja_sql.prepare_query(charge_line_sql, charge_line_sql_params)
-        self._execute_raw_sql_query(table_name, charge_line_sql, bind_params=list(charge_line_sql_params))
-
-    def populate_storage_charge(self, temp_table_name):
-        """Populate the storage charge into the daily summary table.
+    def populate_tiered_charges(self, charges, data_source, start_date, end_date, cluster_id):
+        """Price usage in the daily summary table with tiered rates.
 
         Args:
-            storage_charge (Float) Storage charge.
+            charges (list) Dicts of the charge column to set and the usage
+                columns and tiers that contribute to it
+            data_source (String) The data source of the rows to update
+            start_date (datetime.date) The date to start updating charges.
+            end_date (datetime.date) The date to end on.
+            cluster_id (String) Cluster Identifier
 
         Returns
             (None)
@@ -442,11 +351,18 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         """
         table_name = OCP_REPORT_TABLE_MAP["line_item_daily_summary"]
 
-        daily_charge_sql = pkgutil.get_data("masu.database", "sql/reporting_ocp_storage_charge.sql")
-        charge_line_sql = daily_charge_sql.decode("utf-8")
-        charge_line_sql_params = {"temp_table": temp_table_name, "schema": self.schema}
-        charge_line_sql, charge_line_sql_params = self.jinja_sql.prepare_query(charge_line_sql, charge_line_sql_params)
-        self._execute_raw_sql_query(table_name, charge_line_sql, bind_params=list(charge_line_sql_params))
+        charge_sql = pkgutil.get_data("masu.database", "sql/reporting_ocpusagelineitem_daily_tiered_charge.sql")
+        charge_sql = charge_sql.decode("utf-8")
+        charge_sql_params = {
+            "charges": charges,
+            "data_source": data_source,
+            "start_date": start_date,
+            "end_date": end_date,
+            "cluster_id": cluster_id,
+            "schema": self.schema,
+        }
+        charge_sql, charge_sql_params = self.jinja_sql.prepare_query(charge_sql, charge_sql_params)
+        self._execute_raw_sql_query(table_name, charge_sql, start_date, end_date, bind_params=list(charge_sql_params))
 
     def populate_line_item_daily_summary_table(self, start_date, end_date, cluster_id):
         """Populate the daily aggregate of line items table.
@@ -564,35 +480,62 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         return cost_summary_query
 
     # pylint: disable=invalid-name
-    def populate_pod_label_summary_table(self):
-        """Populate the line item aggregated totals data table."""
+    def populate_pod_label_summary_table(self, report_period_ids=None):
+        """Populate the OCP pod label summary table.
+
+        Args:
+            report_period_ids (list) The report periods to summarize labels for,
+                all report periods if empty.
+
+        Returns
+            (None)
+
+        """
         table_name = OCP_REPORT_TABLE_MAP["pod_label_summary"]
 
         agg_sql = pkgutil.get_data("masu.database", f"sql/reporting_ocpusagepodlabel_summary.sql")
         agg_sql = agg_sql.decode("utf-8")
-        agg_sql_params = {"schema": self.schema}
+        agg_sql_params = {"schema": self.schema, "report_period_ids": report_period_ids}
         agg_sql, agg_sql_params = self.jinja_sql.prepare_query(agg_sql, agg_sql_params)
         self._execute_raw_sql_query(table_name, agg_sql, bind_params=list(agg_sql_params))
 
     # pylint: disable=invalid-name
-    def populate_volume_claim_label_summary_table(self):
-        """Populate the OCP volume claim label summary table."""
+    def populate_volume_claim_label_summary_table(self, report_period_ids=None):
+        """Populate the OCP volume claim label summary table.
+
+        Args:
+            report_period_ids (list) The report periods to summarize labels for,
+                all report periods if empty.
+
+        Returns
+            (None)
+
+        """
         table_name = OCP_REPORT_TABLE_MAP["volume_claim_label_summary"]
 
         agg_sql = pkgutil.get_data("masu.database", f"sql/reporting_ocpstoragevolumeclaimlabel_summary.sql")
         agg_sql = agg_sql.decode("utf-8")
-        agg_sql_params = {"schema": self.schema}
+        agg_sql_params = {"schema": self.schema, "report_period_ids": report_period_ids}
         agg_sql, agg_sql_params = self.jinja_sql.prepare_query(agg_sql, agg_sql_params)
         self._execute_raw_sql_query(table_name, agg_sql, bind_params=list(agg_sql_params))
 
     # pylint: disable=invalid-name
-    def populate_volume_label_summary_table(self):
-        """Populate the OCP volume label summary table."""
+    def populate_volume_label_summary_table(self, report_period_ids=None):
+        """Populate the OCP volume label summary table.
+
+        Args:
+            report_period_ids (list) The report periods to summarize labels for,
+                all report periods if empty.
+
+        Returns
+            (None)
+
+        """
         table_name = OCP_REPORT_TABLE_MAP["volume_label_summary"]
 
         agg_sql = pkgutil.get_data("masu.database", f"sql/reporting_ocpstoragevolumelabel_summary.sql")
         agg_sql = agg_sql.decode("utf-8")
-        agg_sql_params = {"schema": self.schema}
+        agg_sql_params = {"schema": self.schema, "report_period_ids": report_period_ids}
         agg_sql, agg_sql_params = self.jinja_sql.prepare_query(agg_sql, agg_sql_params)
         self._execute_raw_sql_query(table_name, agg_sql, bind_params=list(agg_sql_params))
 
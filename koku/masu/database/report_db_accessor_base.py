@@ -16,19 +16,101 @@
 #
 """Database accessor for report data."""
 import logging
+import re
 import uuid
-from decimal import Decimal
-from decimal import InvalidOperation
 
 import django.apps
+import pytz
+from dateutil import parser
+from dateutil.relativedelta import relativedelta
 from django.db import connection
+from django.db import transaction
 from tenant_schemas.utils import schema_context
 
 from masu.config import Config
+from masu.database import PARTITIONED_TABLES
 from masu.database.koku_database_access import KokuDBAccess
 
 LOG = logging.getLogger(__name__)
 
+# The number of rows sent in each multi-row insert statement
+BULK_INSERT_PAGE_SIZE = 1000
+
+PARTITIONS_SQL = """
+    SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+    FROM pg_inherits AS i
+    JOIN pg_class AS c ON c.oid = i.inhrelid
+    JOIN pg_class AS p ON p.oid = i.inhparent
+    JOIN pg_namespace AS n ON n.oid = p.relnamespace
+    WHERE n.nspname = %s
+        AND p.relname = %s
+"""
+
+# LIKE does not copy foreign keys, so they are copied from the template
+FOREIGN_KEYS_SQL = """
+    SELECT c.conname, pg_get_constraintdef(c.oid)
+    FROM pg_constraint AS c
+    JOIN pg_class AS t ON t.oid = c.conrelid
+    JOIN pg_namespace AS n ON n.oid = t.relnamespace
+    WHERE n.nspname = %s
+        AND t.relname = %s
+        AND c.contype = 'f'
+"""
+
+PARTITION_UPPER_BOUND = re.compile(r"TO \((.+)\)$")
+
+
+def _partition_upper_bound(bound):
+    """Return the exclusive end of a range partition, or None if unbounded."""
+    value = PARTITION_UPPER_BOUND.search(bound).group(1)
+    if value == "MAXVALUE":
+        return None
+    return parser.parse(value.strip("'"))
+
+
+def _month_start(value):
+    """Return the start of the month of a datetime in UTC."""
+    if value.tzinfo is None:
+        value = pytz.UTC.localize(value)
+    return value.astimezone(pytz.UTC).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _convert_int(value):
+    """Convert a value for an integer column, or return None if it is not a number."""
+    try:
+        return int(value)
+    except ValueError as err:
+        LOG.warning(err)
+        return None
+
+
+# Converters for column internal types whose values clean_data converts.
+# Values of other columns are inserted as they were read.
+COLUMN_CONVERTERS = {"BigIntegerField": _convert_int}
+
+# Report schemas shared by every accessor in the process, keyed by column map.
+_REPORT_SCHEMA_CACHE = {}
+
+
+def get_report_schema(column_map):
+    """Return the report schema for a column map, building it once per process.
+
+    The returned schema is shared and must not be modified.
+
+    Args:
+        column_map (dict): A mapping of report columns to database columns
+
+    Returns:
+        (ReportSchema): The report schema
+
+    """
+    key = tuple(sorted((table, tuple(sorted(columns.items()))) for table, columns in column_map.items() if columns))
+    report_schema = _REPORT_SCHEMA_CACHE.get(key)
+    if report_schema is None:
+        report_schema = ReportSchema(django.apps.apps.get_models(), column_map)
+        _REPORT_SCHEMA_CACHE[key] = report_schema
+    return report_schema
+
 
 # pylint: disable=too-few-public-methods
 class ReportSchema:
@@ -37,6 +119,7 @@ class ReportSchema:
     def __init__(self, tables, column_map):
         """Initialize the report schema."""
         self.column_types = {}
+        self.converters = {}
         self._set_reporting_tables(tables, column_map)
 
     def _set_reporting_tables(self, models, column_map):
@@ -49,14 +132,21 @@ class ReportSchema:
 
         """
         column_types = {}
+        converters = {}
         for model in models:
             if "django" in model._meta.db_table:
                 continue
             setattr(self, model._meta.db_table, model)
-            columns = column_map[model._meta.db_table].values()
+            columns = column_map.get(model._meta.db_table, {}).values()
             types = {column: model._meta.get_field(column).get_internal_type() for column in columns}
             column_types.update({model._meta.db_table: types})
-            self.column_types = column_types
+            converters[model._meta.db_table] = {
+                column: COLUMN_CONVERTERS[column_type]
+                for column, column_type in types.items()
+                if column_type in COLUMN_CONVERTERS
+            }
+        self.column_types = column_types
+        self.converters = converters
 
 
 # pylint: disable=too-many-public-methods
@@ -73,7 +163,7 @@ class ReportDBAccessorBase(KokuDBAccess):
         """
         super().__init__(schema)
         self.column_map = column_map
-        self.report_schema = ReportSchema(django.apps.apps.get_models(), self.column_map)
+        self.report_schema = get_report_schema(self.column_map)
 
     @property
     def decimal_precision(self):
@@ -231,6 +321,91 @@ class ReportDBAccessorBase(KokuDBAccess):
 
         return self._get_primary_key(table, data)
 
+    def bulk_insert_on_conflict_do_nothing(self, table, rows, key_columns):
+        """Insert many rows and return the id of each new or existing row.
+
+        Rows whose key already exists are not inserted. Each page of rows
+        costs a single statement, in place of an insert and a select per row.
+
+        Args:
+            table (DjangoModel): The table to insert into
+            rows (list): Dictionaries of data to insert, distinct on key_columns
+            key_columns (list): The columns identifying an existing row
+
+        Returns:
+            (list): The row ids, in the same order as rows
+
+        """
+        table_name = table._meta.db_table
+        rows = [self.clean_data(row, table_name) for row in rows]
+        ids = []
+        for start in range(0, len(rows), BULK_INSERT_PAGE_SIZE):
+            page = rows[start : start + BULK_INSERT_PAGE_SIZE]  # noqa: E203
+            page_ids = self._bulk_insert_page(table, page, key_columns)
+            missing = [index for index, row_id in enumerate(page_ids) if row_id is None]
+            if missing:
+                # A concurrent insert won the race for these keys; they are visible now.
+                retry_ids = self._bulk_insert_page(table, [page[index] for index in missing], key_columns)
+                for index, row_id in zip(missing, retry_ids):
+                    page_ids[index] = row_id
+            ids.extend(page_ids)
+        return ids
+
+    def _bulk_insert_page(self, table, rows, key_columns):
+        """Run the insert-or-select statement for one page of rows."""
+        table_name = table._meta.db_table
+        fields = {field.column: field for field in table._meta.fields}
+        columns = []
+        for row in rows:
+            columns.extend(column for column in row if column not in columns)
+
+        column_str = ", ".join(columns)
+        placeholder = ", ".join(["%s"] + [f"%s::{fields[column].db_type(connection)}" for column in columns])
+        values_str = ", ".join(f"({placeholder})" for _ in rows)
+        params = []
+        for index, row in enumerate(rows):
+            params.append(index)
+            params.extend(row.get(column) for column in columns)
+
+        # Key columns may be NULL, which neither = nor the unique constraint matches
+        existing_join = " AND ".join(f"t.{column} IS NOT DISTINCT FROM new_rows.{column}" for column in key_columns)
+        inserted_join = " AND ".join(
+            f"inserted.{column} IS NOT DISTINCT FROM new_rows.{column}" for column in key_columns
+        )
+        key_str = ", ".join(key_columns)
+        sql = f"""
+            WITH new_rows (ord, {column_str}) AS (
+                VALUES {values_str}
+            ),
+            existing AS (
+                SELECT DISTINCT ON (new_rows.ord) new_rows.ord, t.id
+                FROM new_rows
+                JOIN {self.schema}.{table_name} AS t
+                    ON {existing_join}
+                ORDER BY new_rows.ord, t.id
+            ),
+            inserted AS (
+                INSERT INTO {self.schema}.{table_name} ({column_str})
+                SELECT {column_str}
+                FROM new_rows
+                WHERE new_rows.ord NOT IN (SELECT ord FROM existing)
+                ORDER BY new_rows.ord
+                ON CONFLICT DO NOTHING
+                RETURNING id, {key_str}
+            )
+            SELECT new_rows.ord, coalesce(existing.id, inserted.id)
+            FROM new_rows
+            LEFT JOIN existing
+                ON existing.ord = new_rows.ord
+            LEFT JOIN inserted
+                ON existing.id IS NULL AND {inserted_join}
+            ORDER BY new_rows.ord
+        """
+        with connection.cursor() as cursor:
+            cursor.db.set_schema(self.schema)
+            cursor.execute(sql, params)
+            return [row_id for _, row_id in cursor.fetchall()]
+
     def insert_on_conflict_do_update(self, table, data, conflict_columns, set_columns):
         """Write an INSERT statement with an ON CONFLICT clause.
 
@@ -295,45 +470,18 @@ class ReportDBAccessorBase(KokuDBAccess):
             (dict): The data with values converted to required types
 
         """
-        column_types = self.report_schema.column_types[table_name]
+        converters = self.report_schema.converters[table_name]
 
         for key, value in data.items():
             if value is None or value == "":
                 data[key] = None
                 continue
-            if column_types.get(key) == int or column_types.get(key) == "BigIntegerField":
-                data[key] = self._convert_value(value, int)
-            elif column_types.get(key) == float:
-                data[key] = self._convert_value(value, float)
-            elif column_types.get(key) == Decimal:
-                data[key] = self._convert_value(value, Decimal)
+            converter = converters.get(key)
+            if converter is not None:
+                data[key] = converter(value)
 
         return data
 
-    def _convert_value(self, value, column_type):
-        """Convert a single value to the specified column type.
-
-        Args:
-            value (var): A value of any type
-            column_type (type) A Python type
-
-        Returns:
-            (var): The variable converted to type or None if conversion fails.
-
-        """
-        if column_type == Decimal:
-            try:
-                value = Decimal(value).quantize(Decimal(self.decimal_precision))
-            except InvalidOperation:
-                value = None
-        else:
-            try:
-                value = column_type(value)
-            except ValueError as err:
-                LOG.warning(err)
-                value = None
-        return value
-
     def _execute_raw_sql_query(self, table, sql, start=None, end=None, bind_params=None):
         """Run a SQL statement via a cursor."""
         if start and end:
@@ -345,3 +493,124 @@ class ReportDBAccessorBase(KokuDBAccess):
             cursor.db.set_schema(self.schema)
             cursor.execute(sql, params=bind_params)
         LOG.info("Finished updating %s.", table)
+
+    def _get_partitions(self, cursor, table):
+        """Return the partitions of a table and the end of their ranges, oldest first."""
+        cursor.execute(PARTITIONS_SQL, [self.schema, table])
+        partitions = [(name, _partition_upper_bound(bound)) for name, bound in cursor.fetchall()]
+        return sorted(partitions, key=lambda partition: (partition[1] is None, partition[1] or 0))
+
+    def get_partitions(self, table):
+        """Return the partitions of a table and the end of their ranges, oldest first.
+
+        Args:
+            table (str): The partitioned table name
+
+        Returns:
+            ([(str, datetime)]): Partition names and the exclusive end of their range
+
+        """
+        with connection.cursor() as cursor:
+            cursor.db.set_schema(self.schema)
+            return self._get_partitions(cursor, table)
+
+    def create_month_partitions(self, table, start_date, end_date):
+        """Create the monthly partitions of a table through the month of end_date.
+
+        Partitions are contiguous: each new month is attached after the newest
+        partition, which is also the template for its columns, indexes and
+        foreign keys. Months that precede the newest partition are already
+        covered.
+
+        Args:
+            table (str): The partitioned table name
+            start_date (datetime): The first month to cover
+            end_date (datetime): The last month to cover
+
+        Returns:
+            ([str]): The names of the partitions created
+
+        """
+        created = []
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.db.set_schema(self.schema)
+            cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [f"{self.schema}.{table}"])
+            partitions = self._get_partitions(cursor, table)
+            if not partitions:
+                LOG.warning("%s.%s is not partitioned.", self.schema, table)
+                return created
+
+            template, covered_until = partitions[-1]
+            if covered_until is None:
+                return created
+            month = max(_month_start(start_date), covered_until)
+            while month <= _month_start(end_date):
+                next_month = month + relativedelta(months=1)
+                partition = f"{table}_{month:%Y_%m}"
+                cursor.execute(
+                    f"CREATE TABLE {partition} "
+                    f"(LIKE {template} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING INDEXES)"
+                )
+                cursor.execute(FOREIGN_KEYS_SQL, [self.schema, template])
+                for name, definition in cursor.fetchall():
+                    cursor.execute(f'ALTER TABLE {partition} ADD CONSTRAINT "{name}" {definition}')
+                cursor.execute(
+                    f"ALTER TABLE {table} ATTACH PARTITION {partition} "
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+                )
+                LOG.info("Created partition %s.%s for %s.", self.schema, partition, month.date())
+                created.append(partition)
+                template, month = partition, next_month
+        return created
+
+    def create_all_month_partitions(self, start_date, end_date):
+        """Create the monthly partitions of every partitioned table through the month of end_date.
+
+        Args:
+            start_date (datetime, str): The first month to cover
+            end_date (datetime, str): The last month to cover
+
+        Returns:
+            (dict): The names of the partitions created for each table
+
+        """
+        if isinstance(start_date, str):
+            start_date = parser.parse(start_date)
+        if isinstance(end_date, str):
+            end_date = parser.parse(end_date)
+        created = {}
+        for table in PARTITIONED_TABLES:
+            partitions = self.create_month_partitions(table, start_date, end_date)
+            if partitions:
+                LOG.info("Created partitions of %s.%s: %s", self.schema, table, partitions)
+                created[table] = partitions
+        return created
+
+    def drop_expired_partitions(self, table, expired_date, simulate=False):
+        """Detach and drop the partitions of a table holding only expired data.
+
+        The newest partition is always kept so that it can be the template for
+        the next month.
+
+        Args:
+            table (str): The partitioned table name
+            expired_date (datetime): Partitions ending on or before this date are dropped
+            simulate (bool): Only return the partitions that would be dropped
+
+        Returns:
+            ([str]): The names of the dropped partitions
+
+        """
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.db.set_schema(self.schema)
+            cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [f"{self.schema}.{table}"])
+            partitions = self._get_partitions(cursor, table)[:-1]
+            if expired_date.tzinfo is None:
+                expired_date = pytz.UTC.localize(expired_date)
+            expired = [name for name, end in partitions if end is not None and end <= expired_date]
+            if not simulate:
+                for partition in expired:
+                    cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {partition}")
+                    cursor.execute(f"DROP TABLE {partition}")
+                    LOG.info("Dropped expired partition %s.%s.", self.schema, partition)
+        return expired
@@ -15,6 +15,7 @@
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 """Report manifest database accessor for cost usage reports."""
+from django.db.models import F
 from tenant_schemas.utils import schema_context
 
 from masu.database.koku_database_access import KokuDBAccess
@@ -47,7 +48,19 @@ class ReportManifestDBAccessor(KokuDBAccess):
     def mark_manifest_as_updated(self, manifest):
         """Update the updated timestamp."""
         manifest.manifest_updated_datetime = self.date_accessor.today_with_timezone("UTC")
-        manifest.save()
+        manifest.save(update_fields=["manifest_updated_datetime"])
+
+    def increment_num_processed_files(self, manifest):
+        """Atomically count one more processed file for a manifest.
+
+        Files of a manifest may be processed concurrently, so the counter is
+        incremented in the database rather than from the in-memory value.
+        When called inside a transaction the row stays locked until commit,
+        so the refreshed count reflects exactly this increment.
+        """
+        self._get_db_obj_query().filter(id=manifest.id).update(num_processed_files=F("num_processed_files") + 1)
+        manifest.refresh_from_db(fields=["num_processed_files"])
+        return manifest.num_processed_files
 
     def mark_manifest_as_completed(self, manifest):
         """Update the updated timestamp."""
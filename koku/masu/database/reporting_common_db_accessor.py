@@ -22,6 +22,11 @@ import django.apps
 from masu.database.koku_database_access import KokuDBAccess
 from reporting_common.models import ReportColumnMap
 
+# The report column map only changes with migrations, so it is read once per
+# process. It is kept as a tuple of (table, ((provider column, db column), ...))
+# and copied for each accessor, as callers are free to modify their map.
+_COLUMN_MAP_CACHE = {}
+
 
 class ReportingCommonDBAccessor(KokuDBAccess):
     """Class to interact with customer reporting tables."""
@@ -62,16 +67,32 @@ class ReportingCommonDBAccessor(KokuDBAccess):
         table = getattr(self.report_common_schema, table_name)
         return table.objects.all()
 
+    @staticmethod
+    def _get_cached_column_map():
+        """Return the report column map, reading it from the database once per process."""
+        cached = _COLUMN_MAP_CACHE.get("column_map")
+        if cached is None:
+            column_map = defaultdict(dict)
+            for row in ReportColumnMap.objects.all():
+                column_map[row.database_table][row.provider_column_name] = row.database_column
+            cached = tuple((table, tuple(columns.items())) for table, columns in column_map.items())
+            # An empty map means the column map data has not been loaded yet.
+            if cached:
+                _COLUMN_MAP_CACHE["column_map"] = cached
+        return cached
+
+    @staticmethod
+    def clear_column_map_cache():
+        """Clear the process wide report column map."""
+        _COLUMN_MAP_CACHE.clear()
+
     # pylint: disable=no-self-use
     def generate_column_map(self):
         """Generate a mapping of provider data columns to db columns."""
         column_map = defaultdict(dict)
 
-        report_column_map = ReportColumnMap.objects.all()
-
-        for row in report_column_map:
-            entry = {row.provider_column_name: row.database_column}
-            column_map[row.database_table].update(entry)
+        for table, columns in self._get_cached_column_map():
+            column_map[table].update(columns)
 
         return column_map
 
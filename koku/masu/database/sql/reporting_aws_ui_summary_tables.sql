@@ -0,0 +1,647 @@
+-- Maintain the AWS UI summary tables for the summarized date range.
+-- Rows for the range are replaced and rows older than last month are dropped.
+-- The lock serializes concurrent runs for a schema until the transaction ends,
+-- so their deletes and inserts cannot interleave.
+
+SELECT pg_advisory_xact_lock(hashtext('{{schema | sqlsafe}}.reporting_aws_ui_summary'))
+;
+
+DELETE FROM {{schema | sqlsafe}}.reporting_aws_cost_summary
+WHERE usage_start < date_trunc('month', now() - '1 month'::interval)
+    OR (usage_start >= {{start_date}}::date AND usage_start <= {{end_date}}::date)
+;
+
+INSERT INTO {{schema | sqlsafe}}.reporting_aws_cost_summary (
+    usage_start,
+    usage_end,
+    unblended_cost,
+    markup_cost,
+    currency_code
+)
+SELECT date(usage_start) as usage_start,
+    date(usage_start) as usage_end,
+    sum(unblended_cost) as unblended_cost,
+    sum(markup_cost) as markup_cost,
+    max(currency_code) as currency_code
+FROM {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily_summary
+WHERE usage_start >= date_trunc('month', now() - '1 month'::interval)
+    AND usage_start < date_trunc('month', now() + '1 month'::interval)
+    AND usage_start >= {{start_date}}::date
+    AND usage_start < {{end_date}}::date + '1 day'::interval
+GROUP BY date(usage_start)
+;
+
+DELETE FROM {{schema | sqlsafe}}.reporting_aws_cost_summary_by_service
+WHERE usage_start < date_trunc('month', now() - '1 month'::interval)
+    OR (usage_start >= {{start_date}}::date AND usage_start <= {{end_date}}::date)
+;
+
+INSERT INTO {{schema | sqlsafe}}.reporting_aws_cost_summary_by_service (
+    usage_start,
+    usage_end,
+    product_code,
+    product_family,
+    unblended_cost,
+    markup_cost,
+    currency_code
+)
+SELECT date(usage_start) as usage_start,
+    date(usage_start) as usage_end,
+    product_code,
+    product_family,
+    sum(unblended_cost) as unblended_cost,
+    sum(markup_cost) as markup_cost,
+    max(currency_code) as currency_code
+FROM {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily_summary
+WHERE usage_start >= date_trunc('month', now() - '1 month'::interval)
+    AND usage_start < date_trunc('month', now() + '1 month'::interval)
+    AND usage_start >= {{start_date}}::date
+    AND usage_start < {{end_date}}::date + '1 day'::interval
+GROUP BY date(usage_start), product_code, product_family
+;
+
+DELETE FROM {{schema | sqlsafe}}.reporting_aws_cost_summary_by_account
+WHERE usage_start < date_trunc('month', now() - '1 month'::interval)
+    OR (usage_start >= {{start_date}}::date AND usage_start <= {{end_date}}::date)
+;
+
+INSERT INTO {{schema | sqlsafe}}.reporting_aws_cost_summary_by_account (
+    usage_start,
+    usage_end,
+    usage_account_id,
+    account_alias_id,
+    unblended_cost,
+    markup_cost,
+    currency_code
+)
+SELECT date(usage_start) as usage_start,
+    date(usage_start) as usage_end,
+    usage_account_id,
+    account_alias_id,
+    sum(unblended_cost) as unblended_cost,
+    sum(markup_cost) as markup_cost,
+    max(currency_code) as currency_code
+FROM {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily_summary
+WHERE usage_start >= date_trunc('month', now() - '1 month'::interval)
+    AND usage_start < date_trunc('month', now() + '1 month'::interval)
+    AND usage_start >= {{start_date}}::date
+    AND usage_start < {{end_date}}::date + '1 day'::interval
+GROUP BY date(usage_start), usage_account_id, account_alias_id
+;
+
+DELETE FROM {{schema | sqlsafe}}.reporting_aws_cost_summary_by_region
+WHERE usage_start < date_trunc('month', now() - '1 month'::interval)
+    OR (usage_start >= {{start_date}}::date AND usage_start <= {{end_date}}::date)
+;
+
+INSERT INTO {{schema | sqlsafe}}.reporting_aws_cost_summary_by_region (
+    usage_start,
+    usage_end,
+    region,
+    availability_zone,
+    unblended_cost,
+    markup_cost,
+    currency_code
+)
+SELECT date(usage_start) as usage_start,
+    date(usage_start) as usage_end,
+    region,
+    availability_zone,
+    sum(unblended_cost) as unblended_cost,
+    sum(markup_cost) as markup_cost,
+    max(currency_code) as currency_code
+FROM {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily_summary
+WHERE usage_start >= date_trunc('month', now() - '1 month'::interval)
+    AND usage_start < date_trunc('month', now() + '1 month'::interval)
+    AND usage_start >= {{start_date}}::date
+    AND usage_start < {{end_date}}::date + '1 day'::interval
+GROUP BY date(usage_start), region, availability_zone
+;
+
+DELETE FROM {{schema | sqlsafe}}.reporting_aws_storage_summary
+WHERE usage_start < date_trunc('month', now() - '1 month'::interval)
+    OR (usage_start >= {{start_date}}::date AND usage_start <= {{end_date}}::date)
+;
+
+INSERT INTO {{schema | sqlsafe}}.reporting_aws_storage_summary (
+    usage_start,
+    usage_end,
+    product_family,
+    usage_amount,
+    unit,
+    unblended_cost,
+    markup_cost,
+    currency_code
+)
+SELECT date(usage_start) as usage_start,
+    date(usage_start) as usage_end,
+    product_family,
+    sum(usage_amount) as usage_amount,
+    max(unit) as unit,
+    sum(unblended_cost) as unblended_cost,
+    sum(markup_cost) as markup_cost,
+    max(currency_code) as currency_code
+FROM {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily_summary
+WHERE product_family LIKE '%%Storage%%'
+    AND unit = 'GB-Mo'
+    AND usage_start >= date_trunc('month', now() - '1 month'::interval)
+    AND usage_start < date_trunc('month', now() + '1 month'::interval)
+    AND usage_start >= {{start_date}}::date
+    AND usage_start < {{end_date}}::date + '1 day'::interval
+GROUP BY date(usage_start), product_family
+;
+
+DELETE FROM {{schema | sqlsafe}}.reporting_aws_storage_summary_by_service
+WHERE usage_start < date_trunc('month', now() - '1 month'::interval)
+    OR (usage_start >= {{start_date}}::date AND usage_start <= {{end_date}}::date)
+;
+
+INSERT INTO {{schema | sqlsafe}}.reporting_aws_storage_summary_by_service (
+    usage_start,
+    usage_end,
+    product_code,
+    product_family,
+    usage_amount,
+    unit,
+    unblended_cost,
+    markup_cost,
+    currency_code
+)
+SELECT date(usage_start) as usage_start,
+    date(usage_start) as usage_end,
+    product_code,
+    product_family,
+    sum(usage_amount) as usage_amount,
+    max(unit) as unit,
+    sum(unblended_cost) as unblended_cost,
+    sum(markup_cost) as markup_cost,
+    max(currency_code) as currency_code
+FROM {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily_summary
+WHERE product_family LIKE '%%Storage%%'
+    AND unit = 'GB-Mo'
+    AND usage_start >= date_trunc('month', now() - '1 month'::interval)
+    AND usage_start < date_trunc('month', now() + '1 month'::interval)
+    AND usage_start >= {{start_date}}::date
+    AND usage_start < {{end_date}}::date + '1 day'::interval
+GROUP BY date(usage_start), product_code, product_family
+;
+
+DELETE FROM {{schema | sqlsafe}}.reporting_aws_storage_summary_by_account
+WHERE usage_start < date_trunc('month', now() - '1 month'::interval)
+    OR (usage_start >= {{start_date}}::date AND usage_start <= {{end_date}}::date)
+;
+
+INSERT INTO {{schema | sqlsafe}}.reporting_aws_storage_summary_by_account (
+    usage_start,
+    usage_end,
+    usage_account_id,
+    account_alias_id,
+    product_family,
+    usage_amount,
+    unit,
+    unblended_cost,
+    markup_cost,
+    currency_code
+)
+SELECT date(usage_start) as usage_start,
+    date(usage_start) as usage_end,
+    usage_account_id,
+    account_alias_id,
+    product_family,
+    sum(usage_amount) as usage_amount,
+    max(unit) as unit,
+    sum(unblended_cost) as unblended_cost,
+    sum(markup_cost) as markup_cost,
+    max(currency_code) as currency_code
+FROM {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily_summary
+WHERE product_family LIKE '%%Storage%%'
+    AND unit = 'GB-Mo'
+    AND usage_start >= date_trunc('month', now() - '1 month'::interval)
+    AND usage_start < date_trunc('month', now() + '1 month'::interval)
+    AND usage_start >= {{start_date}}::date
+    AND usage_start < {{end_date}}::date + '1 day'::interval
+GROUP BY date(usage_start), usage_account_id, account_alias_id, product_family
+;
+
+DELETE FROM {{schema | sqlsafe}}.reporting_aws_storage_summary_by_region
+WHERE usage_start < date_trunc('month', now() - '1 month'::interval)
+    OR (usage_start >= {{start_date}}::date AND usage_start <= {{end_date}}::date)
+;
+
+INSERT INTO {{schema | sqlsafe}}.reporting_aws_storage_summary_by_region (
+    usage_start,
+    usage_end,
+    region,
+    availability_zone,
+    product_family,
+    usage_amount,
+    unit,
+    unblended_cost,
+    markup_cost,
+    currency_code
+)
+SELECT date(usage_start) as usage_start,
+    date(usage_start) as usage_end,
+    region,
+    availability_zone,
+    product_family,
+    sum(usage_amount) as usage_amount,
+    max(unit) as unit,
+    sum(unblended_cost) as unblended_cost,
+    sum(markup_cost) as markup_cost,
+    max(currency_code) as currency_code
+FROM {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily_summary
+WHERE product_family LIKE '%%Storage%%'
+    AND unit = 'GB-Mo'
+    AND usage_start >= date_trunc('month', now() - '1 month'::interval)
+    AND usage_start < date_trunc('month', now() + '1 month'::interval)
+    AND usage_start >= {{start_date}}::date
+    AND usage_start < {{end_date}}::date + '1 day'::interval
+GROUP BY date(usage_start), region, availability_zone, product_family
+;
+
+DELETE FROM {{schema | sqlsafe}}.reporting_aws_network_summary
+WHERE usage_start < date_trunc('month', now() - '1 month'::interval)
+    OR (usage_start >= {{start_date}}::date AND usage_start <= {{end_date}}::date)
+;
+
+INSERT INTO {{schema | sqlsafe}}.reporting_aws_network_summary (
+    usage_start,
+    usage_end,
+    product_code,
+    usage_amount,
+    unit,
+    unblended_cost,
+    markup_cost,
+    currency_code
+)
+SELECT date(usage_start) as usage_start,
+    date(usage_start) as usage_end,
+    product_code,
+    sum(usage_amount) as usage_amount,
+    max(unit) as unit,
+    sum(unblended_cost) as unblended_cost,
+    sum(markup_cost) as markup_cost,
+    max(currency_code) as currency_code
+FROM {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily_summary
+WHERE product_code IN ('AmazonVPC','AmazonCloudFront','AmazonRoute53','AmazonAPIGateway')
+    AND usage_start >= date_trunc('month', now() - '1 month'::interval)
+    AND usage_start < date_trunc('month', now() + '1 month'::interval)
+    AND usage_start >= {{start_date}}::date
+    AND usage_start < {{end_date}}::date + '1 day'::interval
+GROUP BY date(usage_start), product_code
+;
+
+DELETE FROM {{schema | sqlsafe}}.reporting_aws_database_summary
+WHERE usage_start < date_trunc('month', now() - '1 month'::interval)
+    OR (usage_start >= {{start_date}}::date AND usage_start <= {{end_date}}::date)
+;
+
+INSERT INTO {{schema | sqlsafe}}.reporting_aws_database_summary (
+    usage_start,
+    usage_end,
+    product_code,
+    usage_amount,
+    unit,
+    unblended_cost,
+    markup_cost,
+    currency_code
+)
+SELECT date(usage_start) as usage_start,
+    date(usage_start) as usage_end,
+    product_code,
+    sum(usage_amount) as usage_amount,
+    max(unit) as unit,
+    sum(unblended_cost) as unblended_cost,
+    sum(markup_cost) as markup_cost,
+    max(currency_code) as currency_code
+FROM {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily_summary
+WHERE product_code IN ('AmazonRDS','AmazonDynamoDB','AmazonElastiCache','AmazonNeptune','AmazonRedshift','AmazonDocumentDB')
+    AND usage_start >= date_trunc('month', now() - '1 month'::interval)
+    AND usage_start < date_trunc('month', now() + '1 month'::interval)
+    AND usage_start >= {{start_date}}::date
+    AND usage_start < {{end_date}}::date + '1 day'::interval
+GROUP BY date(usage_start), product_code
+;
+
+DELETE FROM {{schema | sqlsafe}}.reporting_aws_compute_summary
+WHERE usage_start < date_trunc('month', now() - '1 month'::interval)
+    OR (usage_start >= {{start_date}}::date AND usage_start <= {{end_date}}::date)
+;
+
+INSERT INTO {{schema | sqlsafe}}.reporting_aws_compute_summary (
+    usage_start,
+    usage_end,
+    instance_type,
+    resource_ids,
+    resource_count,
+    usage_amount,
+    unit,
+    unblended_cost,
+    markup_cost,
+    currency_code
+)
+SELECT c.usage_start,
+    c.usage_start as usage_end,
+    c.instance_type,
+    r.resource_ids,
+    cardinality(r.resource_ids) as resource_count,
+    c.usage_amount,
+    c.unit,
+    c.unblended_cost,
+    c.markup_cost,
+    c.currency_code
+FROM (
+    -- this group by gets the counts
+    SELECT date(usage_start) as usage_start,
+        instance_type,
+        sum(usage_amount) as usage_amount,
+        max(unit) as unit,
+        sum(unblended_cost) as unblended_cost,
+        sum(markup_cost) as markup_cost,
+        max(currency_code) as currency_code
+    FROM {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily_summary
+    WHERE instance_type IS NOT NULL
+        AND usage_start >= date_trunc('month', now() - '1 month'::interval)
+        AND usage_start < date_trunc('month', now() + '1 month'::interval)
+        AND usage_start >= {{start_date}}::date
+        AND usage_start < {{end_date}}::date + '1 day'::interval
+    GROUP BY date(usage_start),
+        instance_type
+) AS c
+JOIN (
+    -- this group by gets the distinct resources running by day
+    SELECT usage_start,
+        instance_type,
+        array_agg(distinct resource_id order by resource_id) as resource_ids
+    FROM (
+        SELECT date(usage_start) as usage_start,
+            instance_type,
+            unnest(resource_ids) as resource_id
+        FROM {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily_summary
+        WHERE instance_type IS NOT NULL
+            AND usage_start >= date_trunc('month', now() - '1 month'::interval)
+            AND usage_start < date_trunc('month', now() + '1 month'::interval)
+            AND usage_start >= {{start_date}}::date
+            AND usage_start < {{end_date}}::date + '1 day'::interval
+    ) AS x
+    GROUP BY usage_start,
+        instance_type
+) AS r
+    ON c.usage_start = r.usage_start
+    AND c.instance_type = r.instance_type
+;
+
+DELETE FROM {{schema | sqlsafe}}.reporting_aws_compute_summary_by_service
+WHERE usage_start < date_trunc('month', now() - '1 month'::interval)
+    OR (usage_start >= {{start_date}}::date AND usage_start <= {{end_date}}::date)
+;
+
+INSERT INTO {{schema | sqlsafe}}.reporting_aws_compute_summary_by_service (
+    usage_start,
+    usage_end,
+    product_code,
+    product_family,
+    instance_type,
+    resource_ids,
+    resource_count,
+    usage_amount,
+    unit,
+    unblended_cost,
+    markup_cost,
+    currency_code
+)
+SELECT c.usage_start,
+    c.usage_start as usage_end,
+    c.product_code,
+    c.product_family,
+    c.instance_type,
+    r.resource_ids,
+    cardinality(r.resource_ids) as resource_count,
+    c.usage_amount,
+    c.unit,
+    c.unblended_cost,
+    c.markup_cost,
+    c.currency_code
+FROM (
+    -- this group by gets the counts
+    SELECT date(usage_start) as usage_start,
+        product_code,
+        product_family,
+        instance_type,
+        sum(usage_amount) as usage_amount,
+        max(unit) as unit,
+        sum(unblended_cost) as unblended_cost,
+        sum(markup_cost) as markup_cost,
+        max(currency_code) as currency_code
+    FROM {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily_summary
+    WHERE instance_type IS NOT NULL
+        AND usage_start >= date_trunc('month', now() - '1 month'::interval)
+        AND usage_start < date_trunc('month', now() + '1 month'::interval)
+        AND usage_start >= {{start_date}}::date
+        AND usage_start < {{end_date}}::date + '1 day'::interval
+    GROUP BY date(usage_start),
+        product_code,
+        product_family,
+        instance_type
+) AS c
+JOIN (
+    -- this group by gets the distinct resources running by day
+    SELECT usage_start,
+        product_code,
+        product_family,
+        instance_type,
+        array_agg(distinct resource_id order by resource_id) as resource_ids
+    FROM (
+        SELECT date(usage_start) as usage_start,
+            product_code,
+            product_family,
+            instance_type,
+            unnest(resource_ids) as resource_id
+        FROM {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily_summary
+        WHERE instance_type IS NOT NULL
+            AND usage_start >= date_trunc('month', now() - '1 month'::interval)
+            AND usage_start < date_trunc('month', now() + '1 month'::interval)
+            AND usage_start >= {{start_date}}::date
+            AND usage_start < {{end_date}}::date + '1 day'::interval
+    ) AS x
+    GROUP BY usage_start,
+        product_code,
+        product_family,
+        instance_type
+) AS r
+    ON c.usage_start = r.usage_start
+    AND c.product_code = r.product_code
+    AND c.product_family = r.product_family
+    AND c.instance_type = r.instance_type
+;
+
+DELETE FROM {{schema | sqlsafe}}.reporting_aws_compute_summary_by_account
+WHERE usage_start < date_trunc('month', now() - '1 month'::interval)
+    OR (usage_start >= {{start_date}}::date AND usage_start <= {{end_date}}::date)
+;
+
+INSERT INTO {{schema | sqlsafe}}.reporting_aws_compute_summary_by_account (
+    usage_start,
+    usage_end,
+    usage_account_id,
+    account_alias_id,
+    instance_type,
+    resource_ids,
+    resource_count,
+    usage_amount,
+    unit,
+    unblended_cost,
+    markup_cost,
+    currency_code
+)
+SELECT c.usage_start,
+    c.usage_start as usage_end,
+    c.usage_account_id,
+    c.account_alias_id,
+    c.instance_type,
+    r.resource_ids,
+    cardinality(r.resource_ids) as resource_count,
+    c.usage_amount,
+    c.unit,
+    c.unblended_cost,
+    c.markup_cost,
+    c.currency_code
+FROM (
+    -- this group by gets the counts
+    SELECT date(usage_start) as usage_start,
+        usage_account_id,
+        account_alias_id,
+        instance_type,
+        sum(usage_amount) as usage_amount,
+        max(unit) as unit,
+        sum(unblended_cost) as unblended_cost,
+        sum(markup_cost) as markup_cost,
+        max(currency_code) as currency_code
+    FROM {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily_summary
+    WHERE instance_type IS NOT NULL
+        AND usage_start >= date_trunc('month', now() - '1 month'::interval)
+        AND usage_start < date_trunc('month', now() + '1 month'::interval)
+        AND usage_start >= {{start_date}}::date
+        AND usage_start < {{end_date}}::date + '1 day'::interval
+    GROUP BY date(usage_start),
+        usage_account_id,
+        account_alias_id,
+        instance_type
+) AS c
+JOIN (
+    -- this group by gets the distinct resources running by day
+    SELECT usage_start,
+        usage_account_id,
+        account_alias_id,
+        instance_type,
+        array_agg(distinct resource_id order by resource_id) as resource_ids
+    FROM (
+        SELECT date(usage_start) as usage_start,
+            usage_account_id,
+            account_alias_id,
+            instance_type,
+            unnest(resource_ids) as resource_id
+        FROM {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily_summary
+        WHERE instance_type IS NOT NULL
+            AND usage_start >= date_trunc('month', now() - '1 month'::interval)
+            AND usage_start < date_trunc('month', now() + '1 month'::interval)
+            AND usage_start >= {{start_date}}::date
+            AND usage_start < {{end_date}}::date + '1 day'::interval
+    ) AS x
+    GROUP BY usage_start,
+        usage_account_id,
+        account_alias_id,
+        instance_type
+) AS r
+    ON c.usage_start = r.usage_start
+    AND (
+        (c.usage_account_id = r.usage_account_id)
+        OR (c.account_alias_id = r.account_alias_id)
+    )
+    AND c.instance_type = r.instance_type
+;
+
+DELETE FROM {{schema | sqlsafe}}.reporting_aws_compute_summary_by_region
+WHERE usage_start < date_trunc('month', now() - '1 month'::interval)
+    OR (usage_start >= {{start_date}}::date AND usage_start <= {{end_date}}::date)
+;
+
+INSERT INTO {{schema | sqlsafe}}.reporting_aws_compute_summary_by_region (
+    usage_start,
+    usage_end,
+    region,
+    availability_zone,
+    instance_type,
+    resource_ids,
+    resource_count,
+    usage_amount,
+    unit,
+    unblended_cost,
+    markup_cost,
+    currency_code
+)
+SELECT c.usage_start,
+    c.usage_start as usage_end,
+    c.region,
+    c.availability_zone,
+    c.instance_type,
+    r.resource_ids,
+    cardinality(r.resource_ids) as resource_count,
+    c.usage_amount,
+    c.unit,
+    c.unblended_cost,
+    c.markup_cost,
+    c.currency_code
+FROM (
+    -- this group by gets the counts
+    SELECT date(usage_start) as usage_start,
+        region,
+        availability_zone,
+        instance_type,
+        sum(usage_amount) as usage_amount,
+        max(unit) as unit,
+        sum(unblended_cost) as unblended_cost,
+        sum(markup_cost) as markup_cost,
+        max(currency_code) as currency_code
+    FROM {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily_summary
+    WHERE instance_type IS NOT NULL
+        AND usage_start >= date_trunc('month', now() - '1 month'::interval)
+        AND usage_start < date_trunc('month', now() + '1 month'::interval)
+        AND usage_start >= {{start_date}}::date
+        AND usage_start < {{end_date}}::date + '1 day'::interval
+    GROUP BY date(usage_start),
+        region,
+        availability_zone,
+        instance_type
+) AS c
+JOIN (
+    -- this group by gets the distinct resources running by day
+    SELECT usage_start,
+        region,
+        availability_zone,
+        instance_type,
+        array_agg(distinct resource_id order by resource_id) as resource_ids
+    FROM (
+        SELECT date(usage_start) as usage_start,
+            region,
+            availability_zone,
+            instance_type,
+            unnest(resource_ids) as resource_id
+        FROM {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily_summary
+        WHERE instance_type IS NOT NULL
+            AND usage_start >= date_trunc('month', now() - '1 month'::interval)
+            AND usage_start < date_trunc('month', now() + '1 month'::interval)
+            AND usage_start >= {{start_date}}::date
+            AND usage_start < {{end_date}}::date + '1 day'::interval
+    ) AS x
+    GROUP BY usage_start,
+        region,
+        availability_zone,
+        instance_type
+) AS r
+    ON c.usage_start = r.usage_start
+    AND c.region = r.region
+    AND c.availability_zone = r.availability_zone
+    AND c.instance_type = r.instance_type
+;
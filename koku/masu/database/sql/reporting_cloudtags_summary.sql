@@ -1,10 +1,26 @@
+-- Remove keys that no longer appear on the bills being summarized
+DELETE FROM {{schema | sqlsafe}}.{{tag_table | sqlsafe}} AS ts
+WHERE NOT EXISTS (
+        SELECT 1
+        FROM {{schema | sqlsafe}}.{{lineitem_table | sqlsafe}} AS li
+        WHERE li.cost_entry_bill_id = ts.cost_entry_bill_id
+            AND li.tags ? ts.key
+    )
+    {% if bill_ids %}
+    AND ts.cost_entry_bill_id IN (
+        {%- for bill_id in bill_ids  -%}
+            {{bill_id}}{% if not loop.last %},{% endif %}
+        {%- endfor -%})
+    {% endif %}
+;
+
 INSERT INTO {{schema | sqlsafe}}.{{tag_table | sqlsafe}} (
     key,
     values,
     cost_entry_bill_id
 )
 SELECT l.key,
-    array_agg(DISTINCT l.value) as values,
+    array_agg(l.value ORDER BY l.value) as values,
     l.cost_entry_bill_id
 FROM (
     SELECT key,
@@ -12,6 +28,13 @@ FROM (
         li.cost_entry_bill_id
     FROM {{schema | sqlsafe}}.{{lineitem_table | sqlsafe}} AS li,
         jsonb_each_text(li.tags) labels
+    {% if bill_ids %}
+    WHERE li.cost_entry_bill_id IN (
+        {%- for bill_id in bill_ids  -%}
+            {{bill_id}}{% if not loop.last %},{% endif %}
+        {%- endfor -%})
+    {% endif %}
+    GROUP BY key, value, li.cost_entry_bill_id
 ) l
 GROUP BY l.key, l.cost_entry_bill_id
 ON CONFLICT (key, cost_entry_bill_id) DO UPDATE
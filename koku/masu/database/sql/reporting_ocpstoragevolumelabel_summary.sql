@@ -1,10 +1,26 @@
+-- Remove keys that no longer appear in the report periods being summarized
+DELETE FROM {{schema | sqlsafe}}.reporting_ocpstoragevolumelabel_summary AS ts
+WHERE NOT EXISTS (
+        SELECT 1
+        FROM {{schema | sqlsafe}}.reporting_ocpstoragelineitem_daily AS li
+        WHERE li.report_period_id = ts.report_period_id
+            AND li.persistentvolume_labels ? ts.key
+    )
+    {% if report_period_ids %}
+    AND ts.report_period_id IN (
+        {%- for report_period_id in report_period_ids  -%}
+            {{report_period_id}}{% if not loop.last %},{% endif %}
+        {%- endfor -%})
+    {% endif %}
+;
+
 INSERT INTO {{schema | sqlsafe}}.reporting_ocpstoragevolumelabel_summary (
     key,
     values,
     report_period_id
 )
 SELECT l.key,
-    array_agg(DISTINCT l.value) as values,
+    array_agg(l.value ORDER BY l.value) as values,
     l.report_period_id
 FROM (
     SELECT key,
@@ -12,6 +28,13 @@ FROM (
         li.report_period_id
     FROM {{schema | sqlsafe}}.reporting_ocpstoragelineitem_daily AS li,
         jsonb_each_text(li.persistentvolume_labels) labels
+    {% if report_period_ids %}
+    WHERE li.report_period_id IN (
+        {%- for report_period_id in report_period_ids  -%}
+            {{report_period_id}}{% if not loop.last %},{% endif %}
+        {%- endfor -%})
+    {% endif %}
+    GROUP BY key, value, li.report_period_id
 ) l
 GROUP BY l.key, l.report_period_id
 ON CONFLICT (key, report_period_id) DO UPDATE
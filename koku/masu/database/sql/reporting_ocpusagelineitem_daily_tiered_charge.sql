@@ -0,0 +1,26 @@
+-- Calculate and update OCP charges from tiered rates
+-- Each bounded tier prices the usage that falls between its lower limit and
+-- lower limit plus size. The final tier prices everything above its lower
+-- limit, and negative usage that no bounded tier applies to.
+UPDATE {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary
+    SET {% for charge in charges %}{{charge.column | sqlsafe}} = 0{% for term in charge.terms %}{% for tier in term.tiers %}
+        + {{tier.rate}}::numeric * least(greatest(coalesce({{term.usage | sqlsafe}}, 0) - {{tier.lower}}::numeric, 0), {{tier.size}}::numeric){% endfor %}{% if term.remainder %}
+        + {{term.remainder.rate}}::numeric * CASE
+            WHEN coalesce({{term.usage | sqlsafe}}, 0) > {{term.remainder.lower}}::numeric
+                THEN coalesce({{term.usage | sqlsafe}}, 0) - {{term.remainder.lower}}::numeric
+            WHEN coalesce({{term.usage | sqlsafe}}, 0) < 0
+                THEN coalesce({{term.usage | sqlsafe}}, 0)
+            ELSE 0
+        END{% endif %}{% endfor %}{% if not loop.last %},
+        {% endif %}{% endfor %}
+WHERE data_source = {{data_source}}
+    {% if start_date %}
+    AND usage_start >= {{start_date}}
+    {% endif %}
+    {% if end_date %}
+    AND usage_start <= {{end_date}}
+    {% endif %}
+    {% if cluster_id %}
+    AND cluster_id = {{cluster_id}}
+    {% endif %}
+;
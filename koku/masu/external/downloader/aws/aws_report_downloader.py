@@ -24,6 +24,7 @@ import logging
 import os
 import shutil
 import struct
+from functools import partial
 
 import boto3
 from botocore.exceptions import ClientError
@@ -32,6 +33,8 @@ from masu.config import Config
 from masu.exceptions import MasuProviderError
 from masu.external.downloader.downloader_interface import DownloaderInterface
 from masu.external.downloader.report_downloader_base import ReportDownloaderBase
+from masu.external.downloader.transfer import download_ranges
+from masu.external.downloader.transfer import TransferError
 from masu.util.aws import common as utils
 
 DATA_DIR = Config.TMP_DIR
@@ -55,6 +58,7 @@ class AWSReportDownloader(ReportDownloaderBase, DownloaderInterface):
     """
 
     empty_manifest = {"reportKeys": []}
+    supports_streaming = True
 
     # Disabling until we can refactor
     # pylint: disable=too-many-arguments
@@ -107,7 +111,49 @@ class AWSReportDownloader(ReportDownloaderBase, DownloaderInterface):
         """Set the AWS manifest date format."""
         return "%Y%m%dT000000.000Z"
 
-    def _check_size(self, s3key, check_inflate=False):
+    def _head_object(self, key):
+        """Return the metadata of an S3 object without downloading it.
+
+        Args:
+            key (str): The S3 object key
+
+        Returns:
+            (dict): The head_object response, including ETag and ContentLength
+
+        """
+        try:
+            return self.s3_client.head_object(Bucket=self.report.get("S3Bucket"), Key=key)
+        except ClientError as ex:
+            if ex.response["Error"]["Code"] in ("NoSuchKey", "404"):
+                s3_filename = key.split("/")[-1]
+                log_msg = "Unable to find {} in S3 Bucket: {}".format(s3_filename, self.report.get("S3Bucket"))
+                LOG.info(log_msg)
+                raise AWSReportDownloaderNoFileError(log_msg)
+
+            LOG.error("Error downloading file: Error: %s", str(ex))
+            raise AWSReportDownloaderError(str(ex))
+
+    def _get_range(self, key, etag, start, end):
+        """Return an inclusive byte range of a version of an S3 object."""
+        try:
+            response = self.s3_client.get_object(
+                Bucket=self.report.get("S3Bucket"), Key=key, Range=f"bytes={start}-{end}", IfMatch=etag
+            )
+        except ClientError as ex:
+            LOG.error("Error downloading file: Error: %s", str(ex))
+            raise AWSReportDownloaderError(str(ex))
+        return response["Body"].read()
+
+    def _open_object(self, key, etag):
+        """Return a binary stream of the content of a version of an S3 object."""
+        try:
+            response = self.s3_client.get_object(Bucket=self.report.get("S3Bucket"), Key=key, IfMatch=etag)
+        except ClientError as ex:
+            LOG.error("Error downloading file: Error: %s", str(ex))
+            raise AWSReportDownloaderError(str(ex))
+        return response["Body"]
+
+    def _check_size(self, s3key, check_inflate=False, size=None):
         """Check the size of an S3 file.
 
         Determine if there is enough local space to download and decompress the
@@ -116,6 +162,7 @@ class AWSReportDownloader(ReportDownloaderBase, DownloaderInterface):
         Args:
             s3key (str): the key name of the S3 object to check
             check_inflate (bool): if the file is compressed, evaluate the file's decompressed size.
+            size (int): the object size if it is already known
 
         Returns:
             (bool): whether the file can be safely stored (and decompressed)
@@ -123,11 +170,12 @@ class AWSReportDownloader(ReportDownloaderBase, DownloaderInterface):
         """
         size_ok = False
 
-        s3fileobj = self.s3_client.get_object(Bucket=self.report.get("S3Bucket"), Key=s3key)
-        size = int(s3fileobj.get("ContentLength", -1))
+        if size is None:
+            s3fileobj = self._head_object(s3key)
+            size = int(s3fileobj.get("ContentLength", -1))
 
         if size < 1:
-            raise AWSReportDownloaderError(f"Invalid size for S3 object: {s3fileobj}")
+            raise AWSReportDownloaderError(f"Invalid size for S3 object: {s3key}")
 
         free_space = shutil.disk_usage(self.download_path)[2]
         if size < free_space:
@@ -216,6 +264,30 @@ class AWSReportDownloader(ReportDownloaderBase, DownloaderInterface):
             files.append(file_name)
         return files
 
+    def _get_local_file_path(self, key):
+        """Return the local file path of an S3 object."""
+        local_s3_filename = utils.get_local_file_name(key)
+        LOG.info("Local S3 filename: %s", local_s3_filename)
+        return f"{DATA_DIR}/{self.customer_name}/aws/{self.bucket}/{local_s3_filename}"
+
+    def stream_file(self, key):
+        """
+        Return an opener for a stream of an S3 object instead of downloading it.
+
+        Args:
+            key (str): The S3 object key identified.
+
+        Returns:
+            (String, String, Callable) The local file path the object would be
+                downloaded to, its etag and a function opening a binary stream
+                of the object's content
+
+        """
+        s3_file = self._head_object(key)
+        s3_etag = s3_file.get("ETag")
+        LOG.info("Streaming %s for processing", key)
+        return self._get_local_file_path(key), s3_etag, partial(self._open_object, key, s3_etag)
+
     def download_file(self, key, stored_etag=None):
         """
         Download an S3 object to file.
@@ -227,34 +299,23 @@ class AWSReportDownloader(ReportDownloaderBase, DownloaderInterface):
             (String): The path and file name of the saved file
 
         """
-        s3_filename = key.split("/")[-1]
-        directory_path = f"{DATA_DIR}/{self.customer_name}/aws/{self.bucket}"
-
-        local_s3_filename = utils.get_local_file_name(key)
-        LOG.info("Local S3 filename: %s", local_s3_filename)
-        full_file_path = f"{directory_path}/{local_s3_filename}"
+        full_file_path = self._get_local_file_path(key)
 
         # Make sure the data directory exists
-        os.makedirs(directory_path, exist_ok=True)
-        s3_etag = None
-        try:
-            s3_file = self.s3_client.get_object(Bucket=self.report.get("S3Bucket"), Key=key)
-            s3_etag = s3_file.get("ETag")
-        except ClientError as ex:
-            if ex.response["Error"]["Code"] == "NoSuchKey":
-                log_msg = "Unable to find {} in S3 Bucket: {}".format(s3_filename, self.report.get("S3Bucket"))
-                LOG.info(log_msg)
-                raise AWSReportDownloaderNoFileError(log_msg)
-
-            LOG.error("Error downloading file: Error: %s", str(ex))
-            raise AWSReportDownloaderError(str(ex))
-
-        if not self._check_size(key, check_inflate=True):
-            raise AWSReportDownloaderError(f"Insufficient disk space to download file: {s3_file}")
+        os.makedirs(os.path.dirname(full_file_path), exist_ok=True)
+        s3_file = self._head_object(key)
+        s3_etag = s3_file.get("ETag")
 
         if s3_etag != stored_etag or not os.path.isfile(full_file_path):
+            size = int(s3_file.get("ContentLength", -1))
+            if not self._check_size(key, check_inflate=True, size=size):
+                raise AWSReportDownloaderError(f"Insufficient disk space to download file: {s3_file}")
+
             LOG.info("Downloading %s to %s", key, full_file_path)
-            self.s3_client.download_file(self.report.get("S3Bucket"), key, full_file_path)
+            try:
+                download_ranges(partial(self._get_range, key, s3_etag), size, full_file_path, version=s3_etag)
+            except TransferError as ex:
+                raise AWSReportDownloaderError(str(ex))
         return full_file_path, s3_etag
 
     def get_report_context_for_date(self, date_time):
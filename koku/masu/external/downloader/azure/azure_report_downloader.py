@@ -21,6 +21,7 @@
 import datetime
 import logging
 import os
+from functools import partial
 
 from masu.config import Config
 from masu.external import UNCOMPRESSED
@@ -28,6 +29,8 @@ from masu.external.downloader.azure.azure_service import AzureCostReportNotFound
 from masu.external.downloader.azure.azure_service import AzureService
 from masu.external.downloader.downloader_interface import DownloaderInterface
 from masu.external.downloader.report_downloader_base import ReportDownloaderBase
+from masu.external.downloader.transfer import download_ranges
+from masu.external.downloader.transfer import TransferError
 from masu.util.azure import common as utils
 from masu.util.common import extract_uuids_from_string
 from masu.util.common import month_date_range
@@ -231,8 +234,12 @@ class AzureReportDownloader(ReportDownloaderBase, DownloaderInterface):
             LOG.error(log_msg)
             raise AzureReportDownloaderError(log_msg)
 
-        if etag != stored_etag:
+        if etag != stored_etag or not os.path.isfile(full_file_path):
             LOG.info("Downloading %s to %s", key, full_file_path)
-            blob = self._azure_client.download_cost_export(key, self.container_name, destination=full_file_path)
+            fetch_range = partial(self._azure_client.get_cost_export_range, blob.name, self.container_name)
+            try:
+                download_ranges(fetch_range, blob.properties.content_length, full_file_path, version=etag)
+            except TransferError as ex:
+                raise AzureReportDownloaderError(str(ex))
         LOG.info("Returning full_file_path: %s, etag: %s", full_file_path, etag)
         return full_file_path, etag
@@ -87,6 +87,16 @@ class AzureService:
             raise AzureServiceError("Failed to download cost export. Error: ", str(error))
         return file_path
 
+    def get_cost_export_range(self, blob_name, container_name, start, end):
+        """Return the bytes of an inclusive range of a cost export blob."""
+        try:
+            blob = self._blockblob_service.get_blob_to_bytes(
+                container_name, blob_name, start_range=start, end_range=end
+            )
+        except AzureException as error:
+            raise AzureServiceError("Failed to download cost export. Error: ", str(error))
+        return blob.content
+
     def get_latest_cost_export_for_path(self, report_path, container_name):
         """Get the latest cost export file from given storage account container."""
         latest_report = None
@@ -1,6 +1,7 @@
 """GCP Report Downloader."""
 import logging
 import os
+from functools import partial
 
 from dateutil.relativedelta import relativedelta
 from dateutil.rrule import DAILY
@@ -12,6 +13,8 @@ from masu.config import Config
 from masu.external import UNCOMPRESSED
 from masu.external.downloader.downloader_interface import DownloaderInterface
 from masu.external.downloader.report_downloader_base import ReportDownloaderBase
+from masu.external.downloader.transfer import download_ranges
+from masu.external.downloader.transfer import TransferError
 from providers.gcp.provider import GCPProvider
 
 
@@ -226,12 +229,19 @@ class GCPReportDownloader(ReportDownloaderBase, DownloaderInterface):
         """
         return report
 
+    @staticmethod
+    def _download_blob_range(blob, start, end):
+        """Return the bytes of an inclusive range of a blob."""
+        return blob.download_as_string(start=start, end=end)
+
     def download_file(self, key, stored_etag=None):
         """
         Download a file from GCP storage bucket.
 
         If we have a stored etag and it matches the current GCP blob, we can
         safely skip download since the blob/file content must not have changed.
+        Otherwise the blob is downloaded in byte ranges, resuming any partial
+        download of the same blob version.
 
         Args:
             key (str): name of the blob in the GCP storage bucket
@@ -255,11 +265,16 @@ class GCPReportDownloader(ReportDownloaderBase, DownloaderInterface):
         directory_path = self._get_local_directory_path()
         full_local_path = self._get_local_file_path(directory_path, key)
         os.makedirs(directory_path, exist_ok=True)
-        LOG.info(
-            'Downloading "%(blob_name)s" to %(full_local_path)s',
-            {"blob_name": key, "full_local_path": full_local_path},
-        )
-        blob.download_to_filename(full_local_path)
+        if stored_etag != blob.etag or not os.path.isfile(full_local_path):
+            LOG.info(
+                'Downloading "%(blob_name)s" to %(full_local_path)s',
+                {"blob_name": key, "full_local_path": full_local_path},
+            )
+            fetch_range = partial(self._download_blob_range, blob)
+            try:
+                download_ranges(fetch_range, blob.size, full_local_path, version=blob.etag)
+            except TransferError as ex:
+                raise GCPReportDownloaderError(str(ex))
 
         LOG.info(
             "Returning full_file_path: %(full_local_path)s, etag: %(etag)s",
@@ -34,6 +34,9 @@ class ReportDownloaderBase:
     Base object class for downloading cost reports from a cloud provider.
     """
 
+    # Whether the downloader implements stream_file
+    supports_streaming = False
+
     # pylint: disable=unused-argument
     def __init__(self, task, download_path=None, **kwargs):
         """
@@ -0,0 +1,161 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Transfer helpers shared by the report downloaders.
+
+Large report files are fetched as a sequence of byte ranges appended to
+a partial file named for the object's ETag. If a download is interrupted
+the next attempt for the same object version continues where it stopped,
+and the partial file only replaces the destination once it is complete.
+"""
+import glob
+import hashlib
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections
+
+from masu.config import Config
+
+LOG = logging.getLogger(__name__)
+
+PARTIAL_SUFFIX = ".part"
+
+
+class TransferError(Exception):
+    """Report file transfer error."""
+
+
+def partial_file_path(destination, version=None):
+    """Return the path a download is written to until it completes.
+
+    Args:
+        destination (str): The final local file path
+        version (str): The remote object's ETag, if known
+
+    Returns:
+        (str): The partial file path
+
+    """
+    if not version:
+        return f"{destination}{PARTIAL_SUFFIX}"
+    digest = hashlib.md5(str(version).encode("utf-8")).hexdigest()[:12]
+    return f"{destination}.{digest}{PARTIAL_SUFFIX}"
+
+
+def remove_stale_partial_files(destination, partial_path):
+    """Remove the partial files of other versions of a download.
+
+    A partial file is only resumed for the same object version, so once
+    the object changes any older partial file would never be used again.
+
+    Args:
+        destination (str): The final local file path
+        partial_path (str): The partial file of the current version, which is kept
+
+    Returns:
+        (list): The removed file paths
+
+    """
+    escaped = glob.escape(destination)
+    candidates = glob.glob(f"{escaped}{PARTIAL_SUFFIX}") + glob.glob(f"{escaped}.{'[0-9a-f]' * 12}{PARTIAL_SUFFIX}")
+    removed = []
+    for path in candidates:
+        if path == partial_path:
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            continue
+        LOG.info("Removed stale partial download %s.", path)
+        removed.append(path)
+    return removed
+
+
+def download_ranges(fetch_range, size, destination, version=None, chunk_size=None):
+    """Download an object in byte ranges, resuming a previous partial download.
+
+    Args:
+        fetch_range (Callable): Returns the bytes of the inclusive range (start, end)
+        size (int): The size of the remote object in bytes
+        destination (str): The local file to write
+        version (str): The remote object's ETag, so that only a partial file
+            of the same object version is resumed
+        chunk_size (int): Bytes requested per range
+
+    Returns:
+        (str): The destination path
+
+    """
+    chunk_size = chunk_size or Config.REPORT_DOWNLOAD_CHUNK_SIZE
+    partial_path = partial_file_path(destination, version)
+    remove_stale_partial_files(destination, partial_path)
+
+    offset = os.path.getsize(partial_path) if os.path.isfile(partial_path) else 0
+    if offset > size:
+        offset = 0
+    if offset:
+        LOG.info("Resuming download of %s at byte %s of %s.", destination, offset, size)
+
+    with open(partial_path, "ab" if offset else "wb") as partial_file:
+        while offset < size:
+            end = min(offset + chunk_size, size) - 1
+            data = fetch_range(offset, end)
+            if not data:
+                raise TransferError(f"Empty response for bytes {offset}-{end} of {destination}.")
+            partial_file.write(data)
+            partial_file.flush()
+            offset += len(data)
+
+    os.replace(partial_path, destination)
+    return destination
+
+
+def _close_connections_after(func):
+    """Wrap a function so the database connections of its thread are closed."""
+
+    def run(item):
+        try:
+            return func(item)
+        finally:
+            connections.close_all()
+
+    return run
+
+
+def map_concurrently(func, items, max_workers=None):
+    """Apply a function to items on a bounded thread pool.
+
+    Results are returned in the order of the items and the first exception
+    raised by any call is re-raised.
+
+    Args:
+        func (Callable): The function to apply
+        items (list): The arguments to apply it to
+        max_workers (int): The most calls to run at once
+
+    Returns:
+        (list): The results of each call
+
+    """
+    items = list(items)
+    max_workers = max_workers or Config.REPORT_DOWNLOAD_WORKERS
+    if max_workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(_close_connections_after(func), items))
@@ -20,6 +20,7 @@ import logging
 from dateutil.relativedelta import relativedelta
 
 from api.models import Provider
+from masu.config import Config
 from masu.database.report_stats_db_accessor import ReportStatsDBAccessor
 from masu.external.date_accessor import DateAccessor
 from masu.external.downloader.aws.aws_report_downloader import AWSReportDownloader
@@ -28,6 +29,7 @@ from masu.external.downloader.azure.azure_report_downloader import AzureReportDo
 from masu.external.downloader.azure_local.azure_local_report_downloader import AzureLocalReportDownloader
 from masu.external.downloader.gcp.gcp_report_downloader import GCPReportDownloader
 from masu.external.downloader.ocp.ocp_report_downloader import OCPReportDownloader
+from masu.external.downloader.transfer import map_concurrently
 
 
 LOG = logging.getLogger(__name__)
@@ -156,36 +158,74 @@ class ReportDownloader:
             raise ReportDownloaderError(str(err))
         return reports
 
-    def download_report(self, date_time):
+    def get_report_context(self, date_time):
         """
-        Download CUR for a given date.
+        Get the manifest context for a given date without downloading report files.
 
         Args:
             date_time (DateTime): The starting datetime object
 
         Returns:
-            ([{}]) List of dictionaries containing file path and compression.
+            ({}) Dictionary with manifest_id, assembly_id, compression and files.
 
         """
         LOG.info("Attempting to get %s manifest for %s...", self.provider_type, str(date_time))
-        report_context = self._downloader.get_report_context_for_date(date_time)
+        return self._downloader.get_report_context_for_date(date_time)
+
+    def download_report_file(self, report_context, report, date_time):
+        """
+        Download a single report file of a manifest.
+
+        When STREAM_REPORT_FILES is enabled and the downloader supports it,
+        the file is not downloaded. The returned dictionary instead holds a
+        report_stream function that opens the object for the processor.
+
+        Args:
+            report_context (Dict): The manifest context from get_report_context
+            report (String): The report file to download
+            date_time (DateTime): The starting datetime object
+
+        Returns:
+            ({}) Dictionary containing file path and compression.
+
+        """
         manifest_id = report_context.get("manifest_id")
-        reports = report_context.get("files", [])
-        cur_reports = []
-        for report in reports:
-            report_dictionary = {}
-            local_file_name = self._downloader.get_local_file_for_report(report)
-            with ReportStatsDBAccessor(local_file_name, manifest_id) as stats_recorder:
+        local_file_name = self._downloader.get_local_file_for_report(report)
+        report_stream = None
+        with ReportStatsDBAccessor(local_file_name, manifest_id) as stats_recorder:
+            if Config.STREAM_REPORT_FILES and self._downloader.supports_streaming:
+                file_name, etag, report_stream = self._downloader.stream_file(report)
+            else:
                 stored_etag = stats_recorder.get_etag()
                 file_name, etag = self._downloader.download_file(report, stored_etag)
-                stats_recorder.update(etag=etag)
+            stats_recorder.update(etag=etag)
+
+        report_dict = {
+            "file": file_name,
+            "compression": report_context.get("compression"),
+            "start_date": date_time,
+            "assembly_id": report_context.get("assembly_id"),
+            "manifest_id": manifest_id,
+            "provider_uuid": self.provider_uuid,
+        }
+        if report_stream:
+            report_dict["report_stream"] = report_stream
+        return report_dict
 
-            report_dictionary["file"] = file_name
-            report_dictionary["compression"] = report_context.get("compression")
-            report_dictionary["start_date"] = date_time
-            report_dictionary["assembly_id"] = report_context.get("assembly_id")
-            report_dictionary["manifest_id"] = manifest_id
-            report_dictionary["provider_uuid"] = self.provider_uuid
+    def download_report(self, date_time):
+        """
+        Download CUR for a given date.
 
-            cur_reports.append(report_dictionary)
-        return cur_reports
+        The files of the manifest are downloaded concurrently by up to
+        REPORT_DOWNLOAD_WORKERS threads.
+
+        Args:
+            date_time (DateTime): The starting datetime object
+
+        Returns:
+            ([{}]) List of dictionaries containing file path and compression.
+
+        """
+        report_context = self.get_report_context(date_time)
+        reports = report_context.get("files", [])
+        return map_concurrently(lambda report: self.download_report_file(report_context, report, date_time), reports)
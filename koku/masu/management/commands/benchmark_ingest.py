@@ -0,0 +1,76 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Benchmark report ingestion against the configured database."""
+import json
+
+from django.core.management.base import BaseCommand
+
+from masu.benchmark.generators import ReportShape
+from masu.benchmark.harness import REPORT_KINDS
+from masu.benchmark.harness import run_benchmark
+
+
+class Command(BaseCommand):
+    """Django command to benchmark the masu report processors.
+
+    Example:
+        python koku/manage.py benchmark_ingest OCP-cpu-mem --schema acct10001 \\
+            --provider-uuid <uuid> --rows 100000 --iterations 3
+
+    Processed line items are left in the schema, so run it against a
+    scratch tenant. Later iterations measure reprocessing of a known file.
+    """
+
+    help = "Generate a synthetic report and measure how fast it is processed."
+
+    def add_arguments(self, parser):
+        """Add the benchmark options."""
+        parser.add_argument("kind", choices=REPORT_KINDS, help="The report type to generate and process")
+        parser.add_argument("--schema", required=True, help="The tenant schema to process into")
+        parser.add_argument("--provider-uuid", required=True, help="An existing provider of the matching type")
+        parser.add_argument("--rows", type=int, default=10000, help="Line items in the report")
+        parser.add_argument("--tag-keys", type=int, default=5, help="Distinct tag or label keys")
+        parser.add_argument("--tag-values", type=int, default=10, help="Distinct values per tag key")
+        parser.add_argument("--skus", type=int, default=50, help="Distinct products, meters or nodes")
+        parser.add_argument("--resources", type=int, default=500, help="Distinct resources, pods or volumes")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed for the generated report")
+        parser.add_argument("--iterations", type=int, default=1, help="How many times to run the benchmark")
+        parser.add_argument("--trace-memory", action="store_true", help="Measure allocations with tracemalloc")
+        parser.add_argument("--json", action="store_true", help="Print results as JSON lines")
+
+    def handle(self, *args, **options):
+        """Run the benchmark and print the results."""
+        shape = ReportShape(
+            rows=options["rows"],
+            tag_keys=options["tag_keys"],
+            tag_values=options["tag_values"],
+            skus=options["skus"],
+            resources=options["resources"],
+            seed=options["seed"],
+        )
+        for _ in range(options["iterations"]):
+            result = run_benchmark(
+                options["kind"],
+                shape,
+                options["schema"],
+                options["provider_uuid"],
+                trace_memory=options["trace_memory"],
+            )
+            if options["json"]:
+                self.stdout.write(json.dumps(result.as_dict()))
+            else:
+                self.stdout.write(str(result))
@@ -90,3 +90,102 @@ def _get_report_files(task, customer_name, authentication, billing_source, provi
     with ProviderStatus(provider_uuid) as status:
         status.set_status(ProviderStatusCode.READY)
     return reports
+
+
+def _get_report_context(
+    task, customer_name, authentication, billing_source, provider_type, provider_uuid, report_month
+):
+    """
+    Get the manifest context for a month without downloading its report files.
+
+    Args:
+        task              (Object): Bound celery task.
+        customer_name     (String): Name of the customer owning the cost usage report.
+        authentication    (String): Credential needed to access cost usage report
+                                    in the backend provider.
+        billing_source    (String): Location of the cost usage report in the backend provider.
+        provider_type     (String): Koku defined provider type string.  Example: Amazon = 'AWS'
+        provider_uuid     (String): Provider uuid.
+        report_month      (DateTime): Month for report to download.
+
+    Returns:
+        ({}) Dictionary with manifest_id, assembly_id, compression and files.
+
+    """
+    try:
+        downloader = ReportDownloader(
+            task=task,
+            customer_name=customer_name,
+            access_credential=authentication,
+            report_source=billing_source,
+            provider_type=provider_type,
+            provider_uuid=provider_uuid,
+            report_name=None,
+        )
+        report_context = downloader.get_report_context(report_month)
+    except (MasuProcessingError, MasuProviderError, ReportDownloaderError) as err:
+        worker_stats.REPORT_FILE_DOWNLOAD_ERROR_COUNTER.labels(provider_type=provider_type).inc()
+        LOG.error(str(err))
+        with ProviderStatus(provider_uuid) as status:
+            status.set_error(error=err)
+        raise err
+
+    return report_context
+
+
+def _download_report_file(
+    task,
+    customer_name,
+    authentication,
+    billing_source,
+    provider_type,
+    provider_uuid,
+    report_month,
+    report_context,
+    report,
+):
+    """
+    Download a single report file of a manifest.
+
+    Args:
+        task              (Object): Bound celery task.
+        customer_name     (String): Name of the customer owning the cost usage report.
+        authentication    (String): Credential needed to access cost usage report
+                                    in the backend provider.
+        billing_source    (String): Location of the cost usage report in the backend provider.
+        provider_type     (String): Koku defined provider type string.  Example: Amazon = 'AWS'
+        provider_uuid     (String): Provider uuid.
+        report_month      (DateTime): Month for report to download.
+        report_context    (Dict): The manifest context from _get_report_context.
+        report            (String): The report file to download.
+
+    Returns:
+        ({}) Dictionary containing file path and compression.
+
+    """
+    try:
+        disk = psutil.disk_usage(Config.PVC_DIR)
+        disk_msg = f"Available disk space: {disk.free} bytes ({100 - disk.percent}%)"
+    except OSError:
+        disk_msg = f"Unable to find available disk space. {Config.PVC_DIR} does not exist"
+    LOG.info(disk_msg)
+
+    try:
+        downloader = ReportDownloader(
+            task=task,
+            customer_name=customer_name,
+            access_credential=authentication,
+            report_source=billing_source,
+            provider_type=provider_type,
+            provider_uuid=provider_uuid,
+            report_name=None,
+        )
+        report_dict = downloader.download_report_file(report_context, report, report_month)
+    except (MasuProcessingError, MasuProviderError, ReportDownloaderError) as err:
+        worker_stats.REPORT_FILE_DOWNLOAD_ERROR_COUNTER.labels(provider_type=provider_type).inc()
+        LOG.error(str(err))
+        with ProviderStatus(provider_uuid) as status:
+            status.set_error(error=err)
+        raise err
+
+    return report_dict
@@ -22,8 +22,10 @@ from celery.utils.log import get_task_logger
 from django.db import transaction
 
 from masu.database.provider_db_accessor import ProviderDBAccessor
+from masu.database.report_db_accessor_base import ReportDBAccessorBase
 from masu.database.report_manifest_db_accessor import ReportManifestDBAccessor
 from masu.database.report_stats_db_accessor import ReportStatsDBAccessor
+from masu.database.reporting_common_db_accessor import ReportingCommonDBAccessor
 from masu.processor.report_processor import ReportProcessor
 
 LOG = get_task_logger(__name__)
@@ -41,7 +43,7 @@ def _process_report_file(schema_name, provider, provider_uuid, report_dict):
         report_dict   (dict) The report data dict from previous task
 
     Returns:
-        None
+        (Boolean): Whether this file was the last of its manifest to be processed
 
     """
     start_date = report_dict.get("start_date")
@@ -67,6 +69,14 @@ def _process_report_file(schema_name, provider, provider_uuid, report_dict):
     with ReportStatsDBAccessor(file_name, manifest_id) as stats_recorder:
         stats_recorder.log_last_started_datetime()
 
+    if start_date:
+        # Data is only inserted once its month has a partition, which the daily
+        # partition task may not have created yet.
+        with ReportingCommonDBAccessor() as reporting_common:
+            column_map = reporting_common.column_map
+        with ReportDBAccessorBase(schema_name, column_map) as accessor:
+            accessor.create_all_month_partitions(start_date, start_date)
+
     processor = ReportProcessor(
         schema_name=schema_name,
         report_path=report_path,
@@ -74,9 +84,11 @@ def _process_report_file(schema_name, provider, provider_uuid, report_dict):
         provider=provider,
         provider_uuid=provider_uuid,
         manifest_id=manifest_id,
+        report_stream=report_dict.get("report_stream"),
     )
     processor.process()
 
+    manifest_complete = False
     with transaction.atomic():
         with ReportStatsDBAccessor(file_name, manifest_id) as stats_recorder:
             stats_recorder.log_last_completed_datetime()
@@ -84,8 +96,8 @@ def _process_report_file(schema_name, provider, provider_uuid, report_dict):
         with ReportManifestDBAccessor() as manifest_accesor:
             manifest = manifest_accesor.get_manifest_by_id(manifest_id)
             if manifest:
-                manifest.num_processed_files += 1
-                manifest.save()
+                num_processed_files = manifest_accesor.increment_num_processed_files(manifest)
+                manifest_complete = num_processed_files >= manifest.num_total_files
                 manifest_accesor.mark_manifest_as_updated(manifest)
             else:
                 LOG.error("Unable to find manifest for ID: %s, file %s", manifest_id, file_name)
@@ -95,3 +107,5 @@ def _process_report_file(schema_name, provider, provider_uuid, report_dict):
                 files = processor.remove_processed_files(path.dirname(report_path))
                 LOG.info("Temporary files removed: %s", str(files))
             provider_accessor.setup_complete()
+
+    return manifest_complete
@@ -0,0 +1,228 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Columnar processor for Cost Usage Reports."""
+import json
+import logging
+import time
+from itertools import chain
+
+import numpy
+import pandas
+
+from masu.database import AWS_CUR_TABLE_MAP
+from masu.database.aws_report_db_accessor import AWSReportDBAccessor
+from masu.processor.aws.aws_report_processor import AWSReportProcessor
+from masu.util.copy_stream import copy_lines_from_frame
+from masu.util.copy_stream import CopyStream
+
+LOG = logging.getLogger(__name__)
+
+BILL_KEY_COLUMNS = ["bill/BillType", "bill/PayerAccountId", "bill/BillingPeriodStartDate"]
+COST_ENTRY_KEY_COLUMNS = ["bill_id", "identity/TimeInterval"]
+PRODUCT_KEY_COLUMNS = ["product/sku", "product/ProductName", "product/region"]
+PRICING_KEY_COLUMNS = ["pricing/term", "pricing/unit"]
+RESERVATION_KEY_COLUMNS = ["reservation/ReservationARN", "is_rifee"]
+
+INTEGER_PATTERN = r"^-?\d+$"
+
+
+class AWSColumnarReportProcessor(AWSReportProcessor):
+    """Cost Usage Report processor operating on column-oriented chunks.
+
+    Rows are never materialized as dicts. Each chunk of the CUR is read into
+    a DataFrame, dimension ids are resolved once per distinct key in the
+    chunk, values are coerced column by column and the line items are
+    streamed into COPY.
+    """
+
+    def process(self):
+        """Process CUR file.
+
+        Returns:
+            (Boolean): Whether the bill is finalized
+
+        """
+        row_count = 0
+        start_time = time.monotonic()
+        is_full_month = self._should_process_full_month()
+
+        bill_id = None
+        with self._open_report() as report_file:
+            reader = pandas.read_csv(report_file, chunksize=self._batch_size, dtype=str, keep_default_na=False)
+            LOG.info("File %s opened for columnar processing", self._report_name)
+            first_chunk = next(reader, None)
+            is_finalized_data = self._is_finalized_chunk(first_chunk)
+            self._delete_line_items(AWSReportDBAccessor, self.column_map, is_finalized=is_finalized_data)
+            chunks = chain([first_chunk], reader) if first_chunk is not None else reader
+            with AWSReportDBAccessor(self._schema, self.column_map) as report_db:
+                for chunk in chunks:
+                    if not (is_finalized_data or is_full_month):
+                        chunk = self._filter_chunk_by_date(chunk, "lineItem/UsageStartDate")
+                    if chunk.empty:
+                        continue
+
+                    chunk_bill_id, line_items = self._create_line_item_frame(chunk, report_db)
+                    bill_id = chunk_bill_id or bill_id
+                    LOG.debug(
+                        "Saving report rows %d to %d for %s", row_count, row_count + len(line_items), self._report_name
+                    )
+                    stream = CopyStream(copy_lines_from_frame(line_items))
+                    report_db.bulk_insert_rows(stream, AWS_CUR_TABLE_MAP["line_item"], tuple(line_items.columns))
+                    row_count += stream.row_count
+                    self._update_mappings()
+
+                if is_finalized_data and bill_id is not None:
+                    report_db.mark_bill_as_finalized(bill_id)
+
+        LOG.info("Completed report processing for file: %s and schema: %s", self._report_name, self._schema)
+        self._log_processing_stats(row_count, start_time)
+
+        self._remove_report_file()
+
+        return is_finalized_data
+
+    def _is_finalized_chunk(self, chunk):
+        """Return whether the first row of a chunk belongs to a finalized bill."""
+        if chunk is None or chunk.empty or "bill/InvoiceId" not in chunk:
+            return False
+        return self._is_finalized_row({"bill/InvoiceId": chunk["bill/InvoiceId"].iloc[0]})
+
+    def _filter_chunk_by_date(self, chunk, date_column):
+        """Drop rows before the data cutoff date, the columnar _should_process_row."""
+        row_dates = pandas.to_datetime(chunk[date_column], utc=True, errors="coerce")
+        cutoff = pandas.Timestamp(self.data_cutoff_date, tz="UTC")
+        return chunk[row_dates >= cutoff]
+
+    @staticmethod
+    def _resolve_dimension(chunk, key_columns, create_func, bulk_create_func=None):
+        """Resolve a dimension id for every row of a chunk.
+
+        The create function is called once per distinct key in the chunk,
+        with the first row carrying that key. When given, the bulk create
+        function first receives all of those rows at once, so that new
+        dimensions are inserted together.
+
+        Args:
+            chunk (DataFrame): The rows being processed
+            key_columns (list): The columns that identify the dimension
+            create_func (function): Returns the id for a row dict
+            bulk_create_func (function): Creates the dimensions for a list of row dicts
+
+        Returns:
+            (numpy.ndarray): The dimension id for each row of the chunk
+
+        """
+        key_columns = [column for column in key_columns if column in chunk.columns]
+        if not key_columns:
+            first_rows = [chunk.iloc[0].to_dict()]
+            codes = numpy.zeros(len(chunk), dtype=int)
+        else:
+            codes = chunk.groupby(key_columns, sort=False).ngroup().values
+            first_rows = chunk.drop_duplicates(subset=key_columns).to_dict("records")
+
+        if bulk_create_func:
+            bulk_create_func(first_rows)
+        ids = numpy.empty(len(first_rows), dtype=object)
+        ids[:] = [create_func(row) for row in first_rows]
+        return ids[codes]
+
+    def _process_tag_columns(self, chunk, tag_prefix="resourceTags"):
+        """Return a JSON string of AWS resource tags for every row of a chunk."""
+        tag_columns = [column for column in chunk.columns if tag_prefix in column and len(column.split(":")) > 1]
+        if not tag_columns:
+            return numpy.full(len(chunk), "{}", dtype=object)
+
+        tag_keys = [column.split(":")[-1] for column in tag_columns]
+        tag_values = chunk[tag_columns].itertuples(index=False, name=None)
+        return [json.dumps({key: value for key, value in zip(tag_keys, values) if value}) for values in tag_values]
+
+    def _coerce_columns(self, frame, table_name):
+        """Coerce string columns to their database types, nulling invalid values."""
+        column_types = self.report_schema.column_types[table_name]
+        for column in frame.columns:
+            column_type = column_types.get(column)
+            series = frame[column]
+            if column_type == "DecimalField" or column_type == "FloatField":
+                valid = pandas.to_numeric(series, errors="coerce").notna()
+            elif column_type in ("BigIntegerField", "IntegerField"):
+                valid = series.str.match(INTEGER_PATTERN)
+            elif column_type == "DateTimeField":
+                valid = pandas.to_datetime(series, utc=True, errors="coerce").notna()
+            else:
+                valid = series != ""
+            frame[column] = series.where(valid, None)
+        return frame
+
+    def _create_line_item_frame(self, chunk, report_db):
+        """Resolve dimensions and build the line item columns for a chunk.
+
+        Args:
+            chunk (DataFrame): The CUR rows being processed
+            report_db (AWSReportDBAccessor): The database accessor
+
+        Returns:
+            (str, DataFrame): The last bill id and the line item rows
+
+        """
+        table_name = AWS_CUR_TABLE_MAP["line_item"]
+        column_map = self.column_map[table_name]
+
+        chunk = chunk.copy()
+        chunk["bill_id"] = self._resolve_dimension(
+            chunk,
+            BILL_KEY_COLUMNS,
+            lambda row: self._create_cost_entry_bill(row, report_db),
+            lambda rows: self._bulk_create_cost_entry_bills(rows, report_db),
+        )
+        cost_entry_ids = self._resolve_dimension(
+            chunk,
+            COST_ENTRY_KEY_COLUMNS,
+            lambda row: self._create_cost_entry(row, row["bill_id"], report_db),
+            lambda rows: self._bulk_create_cost_entries(rows, report_db),
+        )
+        product_ids = self._resolve_dimension(
+            chunk,
+            PRODUCT_KEY_COLUMNS,
+            lambda row: self._create_cost_entry_product(row, report_db),
+            lambda rows: self._bulk_create_cost_entry_products(rows, report_db),
+        )
+        pricing_ids = self._resolve_dimension(
+            chunk,
+            PRICING_KEY_COLUMNS,
+            lambda row: self._create_cost_entry_pricing(row, report_db),
+            lambda rows: self._bulk_create_cost_entry_pricing(rows, report_db),
+        )
+        if "lineItem/LineItemType" in chunk.columns:
+            chunk["is_rifee"] = chunk["lineItem/LineItemType"].str.lower() == "rifee"
+        reservation_ids = self._resolve_dimension(
+            chunk,
+            RESERVATION_KEY_COLUMNS,
+            lambda row: self._create_cost_entry_reservation(row, report_db),
+            lambda rows: self._bulk_create_cost_entry_reservations(rows, report_db),
+        )
+
+        report_columns = [column for column in chunk.columns if column in column_map]
+        line_items = chunk[report_columns].rename(columns=column_map)
+        line_items = self._coerce_columns(line_items, table_name)
+        line_items["tags"] = self._process_tag_columns(chunk)
+        line_items["cost_entry_id"] = cost_entry_ids
+        line_items["cost_entry_bill_id"] = chunk["bill_id"].values
+        line_items["cost_entry_product_id"] = product_ids
+        line_items["cost_entry_pricing_id"] = pricing_ids
+        line_items["cost_entry_reservation_id"] = reservation_ids
+
+        return chunk["bill_id"].iloc[-1], line_items
@@ -19,6 +19,7 @@ import logging
 
 from tenant_schemas.utils import schema_context
 
+from masu.database import AWS_CUR_TABLE_MAP
 from masu.database.aws_report_db_accessor import AWSReportDBAccessor
 from masu.database.reporting_common_db_accessor import ReportingCommonDBAccessor
 
@@ -67,6 +68,11 @@ class AWSReportDBCleaner:
             removed_items = []
 
             if expired_date is not None:
+                # Whole months of line items are dropped with their partitions,
+                # leaving only rows in the legacy partition to delete below.
+                for table in (AWS_CUR_TABLE_MAP["line_item"], AWS_CUR_TABLE_MAP["line_item_daily"]):
+                    dropped = accessor.drop_expired_partitions(table, expired_date, simulate=simulate)
+                    LOG.info("Expired partitions of %s to drop: %s", table, dropped)
                 bill_objects = accessor.get_bill_query_before_date(expired_date)
             else:
                 bill_objects = accessor.get_cost_entry_bills_query_by_provider(provider_uuid)
@@ -110,4 +116,9 @@ class AWSReportDBCleaner:
                 if not simulate:
                     bill_objects.delete()
 
+            if provider_uuid is not None and removed_items and not simulate:
+                # The UI summaries are not kept per bill, so rebuild the window
+                # without the removed provider's costs.
+                accessor.populate_ui_summary_tables()
+
         return removed_items
@@ -18,6 +18,8 @@
 import csv
 import json
 import logging
+import time
+from itertools import chain
 from os import path
 from os import remove
 
@@ -28,6 +30,7 @@ from masu.database import AWS_CUR_TABLE_MAP
 from masu.database.aws_report_db_accessor import AWSReportDBAccessor
 from masu.database.reporting_common_db_accessor import ReportingCommonDBAccessor
 from masu.processor.report_processor_base import ReportProcessorBase
+from masu.util.dimension_cache import DimensionCache
 from reporting.provider.aws.models import AWSCostEntry
 from reporting.provider.aws.models import AWSCostEntryBill
 from reporting.provider.aws.models import AWSCostEntryLineItem
@@ -69,7 +72,7 @@ class AWSReportProcessor(ReportProcessorBase):
     """Cost Usage Report processor."""
 
     # pylint:disable=too-many-arguments
-    def __init__(self, schema_name, report_path, compression, provider_uuid, manifest_id=None):
+    def __init__(self, schema_name, report_path, compression, provider_uuid, manifest_id=None, report_stream=None):
         """Initialize the report processor.
 
         Args:
@@ -77,6 +80,8 @@ class AWSReportProcessor(ReportProcessorBase):
             report_path (str): Where the report file lives in the file system
             compression (CONST): How the report file is compressed.
                 Accepted values: UNCOMPRESSED, GZIP_COMPRESSED
+            report_stream (Callable): Opens a binary stream of the report
+                object, read instead of a downloaded file
 
         """
         super().__init__(
@@ -86,12 +91,14 @@ class AWSReportProcessor(ReportProcessorBase):
             provider_uuid=provider_uuid,
             manifest_id=manifest_id,
             processed_report=ProcessedReport(),
+            report_stream=report_stream,
         )
 
         self.manifest_id = manifest_id
         self._report_name = path.basename(report_path)
         self._datetime_format = Config.AWS_DATETIME_STR_FORMAT
         self._batch_size = Config.REPORT_PROCESSING_BATCH_SIZE
+        self._dimension_batch_size = Config.REPORT_DIMENSION_BATCH_SIZE
 
         # Gather database accessors
         with ReportingCommonDBAccessor() as report_common_db:
@@ -99,11 +106,17 @@ class AWSReportProcessor(ReportProcessorBase):
 
         with AWSReportDBAccessor(self._schema, self.column_map) as report_db:
             self.report_schema = report_db.report_schema
-            self.existing_bill_map = report_db.get_cost_entry_bills()
-            self.existing_cost_entry_map = report_db.get_cost_entries()
-            self.existing_product_map = report_db.get_products()
-            self.existing_pricing_map = report_db.get_pricing()
-            self.existing_reservation_map = report_db.get_reservations()
+
+        # Dimensions are not loaded for the whole schema. Cost entries are
+        # loaded per bill as the file reaches it, and other dimensions missing
+        # from these caches are resolved with an insert-or-select.
+        self.existing_bill_map = DimensionCache()
+        self.existing_cost_entry_map = DimensionCache(
+            get_scope=lambda key: key[0] if isinstance(key, tuple) else None, load_scope=self._get_bill_cost_entries
+        )
+        self.existing_product_map = DimensionCache()
+        self.existing_pricing_map = DimensionCache()
+        self.existing_reservation_map = DimensionCache()
 
         self.line_item_columns = None
 
@@ -123,24 +136,30 @@ class AWSReportProcessor(ReportProcessorBase):
 
         """
         row_count = 0
-        opener, mode = self._get_file_opener(self._compression)
-        is_finalized_data = self._check_for_finalized_bill()
+        bill_id = None
+        start_time = time.monotonic()
         is_full_month = self._should_process_full_month()
-        self._delete_line_items(AWSReportDBAccessor, self.column_map, is_finalized=is_finalized_data)
-        opener, mode = self._get_file_opener(self._compression)
         # pylint: disable=invalid-name
-        with opener(self._report_path, mode) as f:
+        with self._open_report() as f:
+            LOG.info("File %s opened for processing", self._report_name)
+            reader = csv.DictReader(f)
+            first_row = next(reader, None)
+            is_finalized_data = self._is_finalized_row(first_row)
+            self._delete_line_items(AWSReportDBAccessor, self.column_map, is_finalized=is_finalized_data)
+            rows = chain([first_row], reader) if first_row else reader
             with AWSReportDBAccessor(self._schema, self.column_map) as report_db:
-                LOG.info("File %s opened for processing", str(f))
-                reader = csv.DictReader(f)
-                for row in reader:
+                pending_rows = []
+                for row in rows:
                     # If this isn't an initial load and it isn't finalized data
                     # we should only process recent data.
                     if not self._should_process_row(
                         row, "lineItem/UsageStartDate", is_full_month, is_finalized=is_finalized_data
                     ):
                         continue
-                    bill_id = self.create_cost_entry_objects(row, report_db)
+                    pending_rows.append(row)
+                    if len(pending_rows) >= self._dimension_batch_size:
+                        bill_id = self._create_cost_entry_objects_for_rows(pending_rows, report_db)
+                        pending_rows = []
                     if len(self.processed_report.line_items) >= self._batch_size:
                         LOG.debug(
                             "Saving report rows %d to %d for %s",
@@ -153,6 +172,9 @@ class AWSReportProcessor(ReportProcessorBase):
                         row_count += len(self.processed_report.line_items)
                         self._update_mappings()
 
+                if pending_rows:
+                    bill_id = self._create_cost_entry_objects_for_rows(pending_rows, report_db)
+
                 if self.processed_report.line_items:
                     LOG.debug(
                         "Saving report rows %d to %d for %s",
@@ -164,16 +186,27 @@ class AWSReportProcessor(ReportProcessorBase):
 
                     row_count += len(self.processed_report.line_items)
 
-                if is_finalized_data:
+                if is_finalized_data and bill_id is not None:
                     report_db.mark_bill_as_finalized(bill_id)
 
         LOG.info("Completed report processing for file: %s and schema: %s", self._report_name, self._schema)
+        self._log_processing_stats(row_count, start_time)
+
+        self._remove_report_file()
 
-        if not settings.DEVELOPMENT:
+        return is_finalized_data
+
+    def _remove_report_file(self):
+        """Remove the processed report file, unless it was streamed."""
+        if self._report_stream is None and not settings.DEVELOPMENT:
             LOG.info("Removing processed file: %s", self._report_path)
             remove(self._report_path)
 
-        return is_finalized_data
+    @staticmethod
+    def _is_finalized_row(row):
+        """Return whether a report row belongs to a finalized bill."""
+        invoice_id = row.get("bill/InvoiceId") if row else None
+        return invoice_id is not None and invoice_id != ""
 
     def _check_for_finalized_bill(self):
         """Read one line of the report file to check for finalization.
@@ -182,16 +215,18 @@ class AWSReportProcessor(ReportProcessorBase):
             (Boolean): Whether the bill is finalized
 
         """
-        opener, mode = self._get_file_opener(self._compression)
         # pylint: disable=invalid-name
-        with opener(self._report_path, mode) as f:
-            reader = csv.DictReader(f)
-            row = reader.__next__()
-            invoice_id = row.get("bill/InvoiceId")
-            return invoice_id is not None and invoice_id != ""
+        with self._open_report() as f:
+            return self._is_finalized_row(next(csv.DictReader(f), None))
+
+    def _get_bill_cost_entries(self, bill_id):
+        """Return the map of the existing cost entries of a bill."""
+        with AWSReportDBAccessor(self._schema, self.column_map) as report_db:
+            return report_db.get_cost_entries(bill_id=bill_id)
 
     def _update_mappings(self):
         """Update cache of database objects for reference."""
+        self.existing_bill_map.update(self.processed_report.bills)
         self.existing_cost_entry_map.update(self.processed_report.cost_entries)
         self.existing_product_map.update(self.processed_report.products)
         self.existing_pricing_map.update(self.processed_report.pricing)
@@ -475,3 +510,176 @@ class AWSReportProcessor(ReportProcessorBase):
         )
 
         return bill_id
+
+    def _create_cost_entry_objects_for_rows(self, rows, report_db_accesor):
+        """Create the set of objects required for a batch of rows.
+
+        Dimensions are resolved in bulk first, so each row then finds its
+        bill, cost entry, product, pricing and reservation ids in memory.
+
+        Returns:
+            (str): The cost entry bill id of the last row
+
+        """
+        self._create_dimensions(rows, report_db_accesor)
+        bill_id = None
+        for row in rows:
+            bill_id = self.create_cost_entry_objects(row, report_db_accesor)
+        return bill_id
+
+    def _create_dimensions(self, rows, report_db_accessor):
+        """Insert or look up every new dimension referenced by a batch of rows."""
+        self._bulk_create_cost_entry_bills(rows, report_db_accessor)
+        self._bulk_create_cost_entries(rows, report_db_accessor)
+        self._bulk_create_cost_entry_products(rows, report_db_accessor)
+        self._bulk_create_cost_entry_pricing(rows, report_db_accessor)
+        self._bulk_create_cost_entry_reservations(rows, report_db_accessor)
+
+    # pylint: disable=too-many-arguments
+    @staticmethod
+    def _bulk_create_dimension(rows, table, key_columns, get_key, get_data, processed_map, existing_map, accessor):
+        """Insert the rows of a dimension table that are not yet known.
+
+        Args:
+            rows (list): Dictionary representations of CSV file rows
+            table (DjangoModel): The dimension table
+            key_columns (list): The table columns identifying a dimension row
+            get_key (function): Returns the in-memory map key for a row
+            get_data (function): Returns the table data for a row, or None to skip it
+            processed_map (dict): Map of keys to ids created in this batch, updated in place
+            existing_map (dict): Map of keys to ids already in the database
+            accessor (ReportDBAccessorBase): The database accessor
+
+        Returns:
+            (None)
+
+        """
+        seen_keys = set()
+        new_keys = []
+        new_data = []
+        for row in rows:
+            key = get_key(row)
+            if key in processed_map or key in existing_map or key in seen_keys:
+                continue
+            seen_keys.add(key)
+            data = get_data(row)
+            if data is None:
+                continue
+            new_keys.append(key)
+            new_data.append(data)
+
+        if new_data:
+            ids = accessor.bulk_insert_on_conflict_do_nothing(table, new_data, key_columns)
+            processed_map.update(zip(new_keys, ids))
+
+    def _get_dimension_data(self, row, table):
+        """Return the table data for a row, or None if the row has none."""
+        data = self._get_data_for_table(row, table._meta.db_table)
+        if set(data.values()) == {""}:
+            return None
+        return data
+
+    def _bulk_create_cost_entry_bills(self, rows, report_db_accessor):
+        """Create the cost entry bills for a batch of rows."""
+
+        def get_key(row):
+            return (
+                row.get("bill/BillType"),
+                row.get("bill/PayerAccountId"),
+                row.get("bill/BillingPeriodStartDate"),
+                self._provider_uuid,
+            )
+
+        def get_data(row):
+            data = self._get_data_for_table(row, AWSCostEntryBill._meta.db_table)
+            data["provider_id"] = self._provider_uuid
+            return data
+
+        self._bulk_create_dimension(
+            rows,
+            AWSCostEntryBill,
+            ["bill_type", "payer_account_id", "billing_period_start", "provider_id"],
+            get_key,
+            get_data,
+            self.processed_report.bills,
+            self.existing_bill_map,
+            report_db_accessor,
+        )
+
+    def _bulk_create_cost_entries(self, rows, report_db_accessor):
+        """Create the cost entries for a batch of rows."""
+
+        def get_key(row):
+            bill_id = self._create_cost_entry_bill(row, report_db_accessor)
+            start, _ = self._get_cost_entry_time_interval(row.get("identity/TimeInterval"))
+            return (bill_id, start)
+
+        def get_data(row):
+            bill_id = self._create_cost_entry_bill(row, report_db_accessor)
+            start, end = self._get_cost_entry_time_interval(row.get("identity/TimeInterval"))
+            return {"bill_id": bill_id, "interval_start": start, "interval_end": end}
+
+        self._bulk_create_dimension(
+            rows,
+            AWSCostEntry,
+            ["bill_id", "interval_start"],
+            get_key,
+            get_data,
+            self.processed_report.cost_entries,
+            self.existing_cost_entry_map,
+            report_db_accessor,
+        )
+
+    def _bulk_create_cost_entry_products(self, rows, report_db_accessor):
+        """Create the cost entry products for a batch of rows."""
+
+        def get_key(row):
+            return (row.get("product/sku"), row.get("product/ProductName"), row.get("product/region"))
+
+        self._bulk_create_dimension(
+            rows,
+            AWSCostEntryProduct,
+            ["sku", "product_name", "region"],
+            get_key,
+            lambda row: self._get_dimension_data(row, AWSCostEntryProduct),
+            self.processed_report.products,
+            self.existing_product_map,
+            report_db_accessor,
+        )
+
+    def _bulk_create_cost_entry_pricing(self, rows, report_db_accessor):
+        """Create the cost entry pricing for a batch of rows."""
+
+        def get_key(row):
+            term = row.get("pricing/term") if row.get("pricing/term") else "None"
+            unit = row.get("pricing/unit") if row.get("pricing/unit") else "None"
+            return f"{term}-{unit}"
+
+        self._bulk_create_dimension(
+            rows,
+            AWSCostEntryPricing,
+            ["term", "unit"],
+            get_key,
+            lambda row: self._get_dimension_data(row, AWSCostEntryPricing),
+            self.processed_report.pricing,
+            self.existing_pricing_map,
+            report_db_accessor,
+        )
+
+    def _bulk_create_cost_entry_reservations(self, rows, report_db_accessor):
+        """Create the cost entry reservations for a batch of rows.
+
+        RIFee rows update their reservation in place, so they are left to
+        _create_cost_entry_reservation.
+        """
+        rows = [row for row in rows if row.get("lineItem/LineItemType", "").lower() != "rifee"]
+        self._bulk_create_dimension(
+            rows,
+            AWSCostEntryReservation,
+            ["reservation_arn"],
+            lambda row: row.get("reservation/ReservationARN"),
+            lambda row: self._get_dimension_data(row, AWSCostEntryReservation),
+            self.processed_report.reservations,
+            self.existing_reservation_map,
+            report_db_accessor,
+        )
@@ -19,6 +19,7 @@ import logging
 
 from tenant_schemas.utils import schema_context
 
+from masu.database import AZURE_REPORT_TABLE_MAP
 from masu.database.azure_report_db_accessor import AzureReportDBAccessor
 from masu.database.reporting_common_db_accessor import ReportingCommonDBAccessor
 
@@ -68,6 +69,11 @@ class AzureReportDBCleaner:
             removed_items = []
 
             if expired_date is not None:
+                # Whole months of line items are dropped with their partitions,
+                # leaving only rows in the legacy partition to delete below.
+                for table in (AZURE_REPORT_TABLE_MAP["line_item"],):
+                    dropped = accessor.drop_expired_partitions(table, expired_date, simulate=simulate)
+                    LOG.info("Expired partitions of %s to drop: %s", table, dropped)
                 bill_objects = accessor.get_bill_query_before_date(expired_date)
             else:
                 bill_objects = accessor.get_cost_entry_bills_query_by_provider(provider_uuid)
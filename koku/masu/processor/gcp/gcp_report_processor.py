@@ -1,8 +1,6 @@
 """Processor for GCP Cost Usage Reports."""
 import logging
-from collections import OrderedDict
 from datetime import datetime
-from numbers import Number
 from os import remove
 
 import pandas
@@ -15,6 +13,8 @@ from masu.database.gcp_report_db_accessor import GCPReportDBAccessor
 from masu.database.reporting_common_db_accessor import ReportingCommonDBAccessor
 from masu.processor.report_processor_base import ReportProcessorBase
 from masu.util import common as utils
+from masu.util.copy_stream import copy_lines_from_frame
+from masu.util.copy_stream import CopyStream
 from reporting.provider.gcp.models import GCPCostEntryBill
 from reporting.provider.gcp.models import GCPCostEntryLineItemDaily
 from reporting.provider.gcp.models import GCPProject
@@ -22,6 +22,9 @@ from reporting.provider.gcp.models import GCPProject
 
 LOG = logging.getLogger(__name__)
 
+NUMERIC_COLUMN_TYPES = ("BigIntegerField", "DecimalField", "FloatField", "IntegerField")
+INTEGER_COLUMN_TYPES = ("BigIntegerField", "IntegerField")
+
 
 class ProcessedGCPReport:
     """Kept in memory object of report items."""
@@ -29,14 +32,12 @@ class ProcessedGCPReport:
     def __init__(self):
         """Initialize new cost entry containers."""
         self.line_items = []
-        self.unique_line_items = {}
         self.bills = {}
         self.projects = {}
 
     def remove_processed_rows(self):
         """Clear a batch of rows after they've been saved."""
         self.line_items = []
-        self.unique_line_items = {}
 
 
 class GCPReportProcessor(ReportProcessorBase):
@@ -74,8 +75,6 @@ class GCPReportProcessor(ReportProcessorBase):
 
         LOG.info("Initialized report processor for file: %s and schema: %s", report_path, self._schema)
 
-        self.line_item_columns = None
-
     def _get_or_create_cost_entry_bill(self, row, report_db_accessor):
         """Get or Create a GCP cost entry bill object.
 
@@ -137,45 +136,80 @@ class GCPReportProcessor(ReportProcessorBase):
         self.processed_report.projects[key] = project_id
         return project_id
 
-    def _create_cost_entry_line_item(self, row, bill_id, project_id, report_db_accessor):
-        """Create a cost entry line item object.
+    def _create_line_item_frame(self, chunk, report_db_accessor):
+        """Build the line items of a chunk of the report.
 
-        Args:
-            row (OrderedDict): A dictionary representation of a CSV file row
-            bill_id (string): A monthly GCPCostEntryBill
-            project_id (string): A GCP Project
-
-        """
-        data = self._get_data_for_table(row, self.line_item_table_name)
-        data = report_db_accessor.clean_data(data, self.line_item_table_name)
+        Bills and projects are resolved once per distinct value in the chunk.
+        Duplicate line items are consolidated into one by adding their
+        numeric values together.
 
-        data["cost_entry_bill_id"] = bill_id
-        data["project_id"] = project_id
+        Args:
+            chunk (DataFrame): The report rows being processed
+            report_db_accessor (GCPReportDBAccessor): The database accessor
 
-        key = (project_id, data["start_time"], data["line_item_type"])
+        Returns:
+            (DataFrame): The line item rows, with database column names
 
-        # If we've already seen the key in this report, we have a duplicate line item
-        # and should consolidate the two lines into one.
-        if key in self.processed_report.unique_line_items:
-            data = self._consolidate_line_items(self.processed_report.unique_line_items[key], data)
+        """
+        bill_ids = {
+            start_time: self._get_or_create_cost_entry_bill({"Start Time": start_time}, report_db_accessor)
+            for start_time in chunk["Start Time"].unique()
+        }
+        project_ids = {
+            row["Project ID"]: self._get_or_create_gcp_project(row, report_db_accessor)
+            for row in chunk.drop_duplicates(subset=["Project ID"]).to_dict("records")
+        }
 
-        self.processed_report.unique_line_items[key] = data
-        if self.line_item_columns is None:
-            self.line_item_columns = list(data.keys())
+        column_map = self.column_map[self.line_item_table_name]
+        column_types = report_db_accessor.report_schema.column_types[self.line_item_table_name]
+        report_columns = [column for column in chunk.columns if column in column_map]
+        line_items = self._coerce_columns(chunk[report_columns].rename(columns=column_map), column_types)
+        line_items["cost_entry_bill_id"] = chunk["Start Time"].map(bill_ids).values
+        line_items["project_id"] = chunk["Project ID"].map(project_ids).values
+
+        line_items = self._aggregate_line_items(line_items, column_types)
+        for column in line_items.columns:
+            if column_types.get(column) in INTEGER_COLUMN_TYPES:
+                line_items[column] = self._format_integer_column(line_items[column])
+        return line_items
+
+    @staticmethod
+    def _coerce_columns(frame, column_types):
+        """Convert numeric columns to numbers and empty strings to nulls.
+
+        Values of numeric columns that are not numbers become nulls, as in
+        clean_data.
+        """
+        for column in frame.columns:
+            if column_types.get(column) in NUMERIC_COLUMN_TYPES:
+                frame[column] = pandas.to_numeric(frame[column], errors="coerce")
+            else:
+                frame[column] = frame[column].where(frame[column] != "", None)
+        return frame
 
-    def _consolidate_line_items(self, line1, line2):
-        """Given 2 line items consolidate them into one, by adding all numerical values together."""
-        ignored_keys = ["cost_entry_bill_id", "project_id"]
-        consolidated_line_item = {}
-        for key, value in line1.items():
-            consolidated_line_item[key] = value
+    def _aggregate_line_items(self, line_items, column_types):
+        """Consolidate line items with the same key by adding their numeric values together.
 
-            # If key is an id, ignore it during consolidation
-            if key in ignored_keys:
-                continue
-            if isinstance(value, Number):
-                consolidated_line_item[key] += line2[key]
-        return consolidated_line_item
+        Other values are taken from the first line item with the key.
+        """
+        key_columns = self.line_item_conflict_columns
+        numeric_columns = [
+            column
+            for column in line_items.columns
+            if column not in key_columns and column_types.get(column) in NUMERIC_COLUMN_TYPES
+        ]
+        other_columns = [
+            column for column in line_items.columns if column not in key_columns and column not in numeric_columns
+        ]
+        grouped = line_items.groupby(key_columns, sort=False)
+        aggregated = pandas.concat([grouped[other_columns].first(), grouped[numeric_columns].sum(min_count=1)], axis=1)
+        return aggregated.reset_index()
+
+    @staticmethod
+    def _format_integer_column(series):
+        """Return an integer column as strings, as the numbers are floats once they may be null."""
+        valid = series.dropna()
+        return valid.astype("int64").astype(str).reindex(series.index)
 
     @property
     def line_item_conflict_columns(self):
@@ -187,48 +221,29 @@ class GCPReportProcessor(ReportProcessorBase):
         row_count = 0
 
         # Read the csv in batched chunks.
-        report_csv = pandas.read_csv(self._report_path, chunksize=self._batch_size, compression="infer")
+        report_csv = pandas.read_csv(
+            self._report_path, chunksize=self._batch_size, compression="infer", dtype=str, keep_default_na=False
+        )
 
         with GCPReportDBAccessor(self._schema, self.column_map) as report_db:
+            # One staging table is used for the whole file. Merging a chunk
+            # into the line item table empties it for the next one.
+            temp_table = report_db.create_temp_table(self.line_item_table_name, drop_column="id")
 
             for chunk in report_csv:
-
-                # Group the information in the csv by the start time and the project id
-                report_groups = chunk.groupby(by=["Start Time", "Project ID"])
-                for group, rows in report_groups:
-
-                    # Each row in the group contains information that we'll need to create the bill
-                    # and the project. Just get the first row to pull this information.
-                    first_row = OrderedDict(zip(rows.columns.tolist(), rows.iloc[0].tolist()))
-
-                    bill_id = self._get_or_create_cost_entry_bill(first_row, report_db)
-
-                    project_id = self._get_or_create_gcp_project(first_row, report_db)
-
-                    for row in rows.values:
-                        processed_row = OrderedDict(zip(rows.columns.tolist(), row.tolist()))
-                        self._create_cost_entry_line_item(processed_row, bill_id, project_id, report_db)
+                line_items = self._create_line_item_frame(chunk, report_db)
 
                 LOG.info(
-                    "Saving report rows %d to %d for %s",
-                    row_count,
-                    row_count + len(self.processed_report.unique_line_items),
-                    self._report_name,
+                    "Saving report rows %d to %d for %s", row_count, row_count + len(line_items), self._report_name
                 )
 
-                # Create a temp table with all the line items, and merge the temp table to the line item table.
-                # This is faster than django's bulk_create.
-                temp_table = report_db.create_temp_table(self.line_item_table_name, drop_column="id")
-
-                # Have to put values into line_items because the parent class needs it to _save_to_db
-                self.processed_report.line_items = list(self.processed_report.unique_line_items.values())
-                self._save_to_db(temp_table, report_db)
+                columns = tuple(line_items.columns)
+                report_db.bulk_insert_rows(CopyStream(copy_lines_from_frame(line_items)), temp_table, columns)
                 report_db.merge_temp_table(
-                    self.line_item_table_name, temp_table, self.line_item_columns, self.line_item_conflict_columns
+                    self.line_item_table_name, temp_table, columns, self.line_item_conflict_columns
                 )
 
-                row_count += len(self.processed_report.line_items)
-                self.processed_report.remove_processed_rows()
+                row_count += len(line_items)
 
             LOG.info("Completed report processing for file: %s and schema: %s", self._report_name, self._schema)
 
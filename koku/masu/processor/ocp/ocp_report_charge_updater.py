@@ -15,8 +15,6 @@
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 """Updates report summary tables in the database with charge information."""
-import csv
-import io
 import logging
 from decimal import Decimal
 
@@ -89,99 +87,36 @@ class OCPReportChargeUpdater(OCPCloudUpdaterBase):
 
         return newlist
 
-    @staticmethod
-    def _bucket_applied(usage, lower_limit, upper_limit):
-        usage_applied = 0
-
-        if usage >= upper_limit:
-            usage_applied = upper_limit
-        elif usage > lower_limit:
-            usage_applied = usage - lower_limit
-
-        return usage_applied
-
-    def _calculate_variable_charge(self, usage, rates):
-        charge = Decimal(0)
-        balance = usage
-        tier = []
-        if rates:
-            tier = self._normalize_tier(rates.get("tiered_rates", []))
-
-        for bucket in tier:
-            usage_end = (
-                Decimal(bucket.get("usage", {}).get("usage_end")) if bucket.get("usage", {}).get("usage_end") else None
-            )
-            usage_start = (
-                Decimal(bucket.get("usage", {}).get("usage_start"))
-                if bucket.get("usage", {}).get("usage_start")
-                else 0
-            )
-            bucket_size = (usage_end - usage_start) if usage_end else None
-
-            lower_limit = 0
-            upper_limit = bucket_size
-            rate = Decimal(bucket.get("value"))
-
-            usage_applied = 0
-            if upper_limit is not None:
-                usage_applied = self._bucket_applied(balance, lower_limit, upper_limit)
-            else:
-                usage_applied = balance
-
-            charge += usage_applied * rate
-            balance -= usage_applied
+    def _tiered_rate_terms(self, usage_column, rates):
+        """Return the tiers that price a usage column.
 
-        return Decimal(charge)
+        Each bounded tier applies its rate to the usage above its lower limit,
+        up to its size. The final tier applies its rate to whatever remains.
 
-    def _calculate_charge(self, rates, usage):
-        """Calculate charge based on rate and usage."""
-        charge_dictionary = {}
-        for key, value in usage.items():
-            if not value:
-                value = Decimal(0.0)
-            charge_value = self._calculate_variable_charge(value, rates)
-            charge_dictionary[key] = {"usage": value, "charge": charge_value}
-        return charge_dictionary
+        Args:
+            usage_column (str) The daily summary column holding the usage
+            rates (dict) The cost model rate containing tiered_rates
 
-    @staticmethod
-    def _aggregate_charges(usage_charge, request_charge):
-        """Combine the usage and request charges."""
-        if usage_charge.keys() != request_charge.keys():
-            raise OCPReportChargeUpdaterError("Usage and request charge mismatched.")
-
-        charge_dictionary = {}
-        for key, value in usage_charge.items():
-            usage_charge_value = value.get("charge")
-            request_charge_value = request_charge[key].get("charge")
-            charge_dictionary[key] = {
-                "usage_charge": usage_charge_value,
-                "request_charge": request_charge_value,
-                "charge": usage_charge_value + request_charge_value,
-            }
-        return charge_dictionary
+        Returns
+            (dict) The usage column, bounded tiers and remainder tier
 
-    @staticmethod
-    def _charge_dictionary_to_csv(charge_dictionary):
-        """Write charge dictionary to a csv file_obj."""
-        dictionary_data = []
-        for key, value in charge_dictionary.items():
-            line_item = (key, value.get("charge"))
-            dictionary_data.append(line_item)
-
-        file_obj = io.StringIO()
-        writer = csv.writer(file_obj, delimiter="\t", quoting=csv.QUOTE_NONE, quotechar="")
-        writer.writerows(dictionary_data)
-        file_obj.seek(0)
-
-        return file_obj
-
-    def _write_to_temp_table(self, report_accessor, charge_data):
-        """Create temporary table to store charge."""
-        columns = [{"lineid": "bigint"}, {"charge": "numeric(24,6)"}]
-        temp_table = report_accessor.create_new_temp_table("charge", columns)
-        csv_file = self._charge_dictionary_to_csv(charge_data)
-        report_accessor.bulk_insert_rows(csv_file, temp_table, ["lineid", "charge"])
-        return temp_table
+        """
+        tiers = []
+        remainder = None
+        lower = Decimal(0)
+        if rates:
+            for bucket in self._normalize_tier(rates.get("tiered_rates", [])):
+                usage = bucket.get("usage", {})
+                usage_start = Decimal(usage.get("usage_start")) if usage.get("usage_start") else Decimal(0)
+                rate = Decimal(bucket.get("value"))
+                if not usage.get("usage_end"):
+                    # Nothing is left for tiers after an unbounded one
+                    remainder = {"rate": rate, "lower": lower}
+                    break
+                size = Decimal(usage.get("usage_end")) - usage_start
+                tiers.append({"rate": rate, "lower": lower, "size": size})
+                lower += size
+        return {"usage": usage_column, "tiers": tiers, "remainder": remainder}
 
     def _update_markup_cost(self, start_date, end_date):
         """Populate markup costs for OpenShift.
@@ -217,7 +152,6 @@ class OCPReportChargeUpdater(OCPCloudUpdaterBase):
             accessor.populate_markup_cost(infra_markup_value, ocp_markup_value, cluster_id)
         LOG.info("Finished updating markup.")
 
-    # pylint: disable=too-many-locals
     def _update_pod_charge(self, start_date, end_date):
         """Calculate and store total POD charges."""
         try:
@@ -227,41 +161,29 @@ class OCPReportChargeUpdater(OCPCloudUpdaterBase):
                 mem_usage_rates = cost_model_accessor.get_memory_gb_usage_per_hour_rates()
                 mem_request_rates = cost_model_accessor.get_memory_gb_request_per_hour_rates()
 
-            with OCPReportDBAccessor(self._schema, self._column_map) as report_accessor:
-                try:
-                    cpu_usage = report_accessor.get_pod_usage_cpu_core_hours(start_date, end_date, self._cluster_id)
-                    cpu_usage_charge = self._calculate_charge(cpu_usage_rates, cpu_usage)
-                    cpu_request = report_accessor.get_pod_request_cpu_core_hours(
-                        start_date, end_date, self._cluster_id
-                    )
-                    cpu_request_charge = self._calculate_charge(cpu_request_rates, cpu_request)
-
-                    total_cpu_charge = self._aggregate_charges(cpu_usage_charge, cpu_request_charge)
-                except OCPReportChargeUpdaterError as error:
-                    total_cpu_charge = {}
-                    LOG.error("Unable to calculate cpu charge. Error: %s", str(error))
-
-                cpu_temp_table = self._write_to_temp_table(report_accessor, total_cpu_charge)
-
-                try:
-                    mem_usage = report_accessor.get_pod_usage_memory_gigabyte_hours(
-                        start_date, end_date, self._cluster_id
-                    )
-                    mem_usage_charge = self._calculate_charge(mem_usage_rates, mem_usage)
-
-                    mem_request = report_accessor.get_pod_request_memory_gigabyte_hours(
-                        start_date, end_date, self._cluster_id
-                    )
-                    mem_request_charge = self._calculate_charge(mem_request_rates, mem_request)
-
-                    total_memory_charge = self._aggregate_charges(mem_usage_charge, mem_request_charge)
-                except OCPReportChargeUpdaterError as error:
-                    total_memory_charge = {}
-                    LOG.error("Unable to calculate memory charge. Error: %s", str(error))
-
-                mem_temp_table = self._write_to_temp_table(report_accessor, total_memory_charge)
-
-                report_accessor.populate_pod_charge(cpu_temp_table, mem_temp_table)
+            charges = []
+            try:
+                cpu_terms = [
+                    self._tiered_rate_terms("pod_usage_cpu_core_hours", cpu_usage_rates),
+                    self._tiered_rate_terms("pod_request_cpu_core_hours", cpu_request_rates),
+                ]
+                charges.append({"column": "pod_charge_cpu_core_hours", "terms": cpu_terms})
+            except OCPReportChargeUpdaterError as error:
+                LOG.error("Unable to calculate cpu charge. Error: %s", str(error))
+
+            try:
+                mem_terms = [
+                    self._tiered_rate_terms("pod_usage_memory_gigabyte_hours", mem_usage_rates),
+                    self._tiered_rate_terms("pod_request_memory_gigabyte_hours", mem_request_rates),
+                ]
+                charges.append({"column": "pod_charge_memory_gigabyte_hours", "terms": mem_terms})
+            except OCPReportChargeUpdaterError as error:
+                LOG.error("Unable to calculate memory charge. Error: %s", str(error))
+
+            # The cpu and memory charges are only stored together
+            if len(charges) == 2:
+                with OCPReportDBAccessor(self._schema, self._column_map) as report_accessor:
+                    report_accessor.populate_tiered_charges(charges, "Pod", start_date, end_date, self._cluster_id)
         except OCPReportChargeUpdaterError as error:
             LOG.error("Unable to calculate charge. Error: %s", str(error))
 
@@ -272,19 +194,13 @@ class OCPReportChargeUpdater(OCPCloudUpdaterBase):
                 storage_usage_rates = cost_model_accessor.get_storage_gb_usage_per_month_rates()
                 storage_request_rates = cost_model_accessor.get_storage_gb_request_per_month_rates()
 
+            storage_terms = [
+                self._tiered_rate_terms("persistentvolumeclaim_usage_gigabyte_months", storage_usage_rates),
+                self._tiered_rate_terms("volume_request_storage_gigabyte_months", storage_request_rates),
+            ]
+            charges = [{"column": "persistentvolumeclaim_charge_gb_month", "terms": storage_terms}]
             with OCPReportDBAccessor(self._schema, self._column_map) as report_accessor:
-                storage_usage = report_accessor.get_persistentvolumeclaim_usage_gigabyte_months(
-                    start_date, end_date, self._cluster_id
-                )
-                storage_usage_charge = self._calculate_charge(storage_usage_rates, storage_usage)
-
-                storage_request = report_accessor.get_volume_request_storage_gigabyte_months(
-                    start_date, end_date, self._cluster_id
-                )
-                storage_request_charge = self._calculate_charge(storage_request_rates, storage_request)
-                total_storage_charge = self._aggregate_charges(storage_usage_charge, storage_request_charge)
-                temp_table = self._write_to_temp_table(report_accessor, total_storage_charge)
-                report_accessor.populate_storage_charge(temp_table)
+                report_accessor.populate_tiered_charges(charges, "Storage", start_date, end_date, self._cluster_id)
 
         except OCPReportChargeUpdaterError as error:
             LOG.error("Unable to calculate storage usage charge. Error: %s", str(error))
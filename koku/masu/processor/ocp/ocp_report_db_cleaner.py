@@ -19,6 +19,7 @@ import logging
 
 from tenant_schemas.utils import schema_context
 
+from masu.database import OCP_REPORT_TABLE_MAP
 from masu.database.ocp_report_db_accessor import OCPReportDBAccessor
 from masu.database.reporting_common_db_accessor import ReportingCommonDBAccessor
 
@@ -67,6 +68,14 @@ class OCPReportDBCleaner:
             removed_items = []
 
             if expired_date is not None:
+                # Whole months of line items are dropped with their partitions,
+                # leaving only rows in the legacy partition to delete below.
+                for table in (
+                    OCP_REPORT_TABLE_MAP["line_item_daily"],
+                    OCP_REPORT_TABLE_MAP["storage_line_item_daily"],
+                ):
+                    dropped = accessor.drop_expired_partitions(table, expired_date, simulate=simulate)
+                    LOG.info("Expired partitions of %s to drop: %s", table, dropped)
                 usage_period_objs = accessor.get_usage_period_before_date(expired_date)
             else:
                 usage_period_objs = accessor.get_usage_period_query_by_provider(provider_uuid)
@@ -23,6 +23,7 @@ import json
 import logging
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from os import path
 from os import remove
 
@@ -32,6 +33,9 @@ from masu.config import Config
 from masu.database.ocp_report_db_accessor import OCPReportDBAccessor
 from masu.database.reporting_common_db_accessor import ReportingCommonDBAccessor
 from masu.processor.report_processor_base import ReportProcessorBase
+from masu.util.copy_stream import copy_lines_from_rows
+from masu.util.copy_stream import CopyStream
+from masu.util.dimension_cache import DimensionCache
 from reporting.provider.ocp.models import OCPStorageLineItem
 from reporting.provider.ocp.models import OCPUsageLineItem
 from reporting.provider.ocp.models import OCPUsageReport
@@ -39,6 +43,8 @@ from reporting.provider.ocp.models import OCPUsageReportPeriod
 
 LOG = logging.getLogger(__name__)
 
+LABEL_CACHE_SIZE = 4096
+
 
 class OCPReportProcessorError(Exception):
     """OCPReportProcessor Error."""
@@ -63,13 +69,18 @@ class ProcessedOCPReport:
         self.report_periods = {}
         self.reports = {}
         self.line_items = []
-        self.line_item_keys = {}
+        # Conflict keys of the current batch. Each batch is merged with an
+        # upsert on these keys, which resolves a key repeated from an earlier
+        # batch but fails on one repeated within the batch, so only the batch
+        # is indexed rather than every key of the file.
+        self.line_item_keys = set()
 
     def remove_processed_rows(self):
         """Clear a batch of rows from their containers."""
         self.report_periods = {}
         self.reports = {}
         self.line_items = []
+        self.line_item_keys = set()
 
 
 class OCPReportProcessor:
@@ -179,10 +190,18 @@ class OCPReportProcessorBase(ReportProcessorBase):
             self.column_map = report_common_db.column_map
 
         with OCPReportDBAccessor(self._schema, self.column_map) as report_db:
-            self.existing_report_periods_map = report_db.get_report_periods()
-            self.existing_report_map = report_db.get_reports()
+            self.report_schema = report_db.report_schema
+
+        # Reports are loaded per report period as the file reaches it, rather
+        # than every report interval ever ingested into the schema.
+        self.existing_report_periods_map = DimensionCache()
+        self.existing_report_map = DimensionCache(
+            get_scope=lambda key: key[0] if isinstance(key, tuple) else None, load_scope=self._get_period_reports
+        )
 
         self.line_item_columns = None
+        self._line_item_converters = None
+        self._line_item_key_indexes = None
 
     def _create_report(self, row, report_period_id, report_db_accessor):
         """Create a report object.
@@ -196,16 +215,15 @@ class OCPReportProcessorBase(ReportProcessorBase):
 
         """
         table_name = OCPUsageReport
-        start = datetime.strptime(row.get("interval_start"), Config.OCP_DATETIME_STR_FORMAT)
-        end = datetime.strptime(row.get("interval_end"), Config.OCP_DATETIME_STR_FORMAT)
-
-        key = (report_period_id, start)
+        key = (report_period_id, row.get("interval_start"))
         if key in self.processed_report.reports:
             return self.processed_report.reports[key]
 
         if key in self.existing_report_map:
             return self.existing_report_map[key]
 
+        start = datetime.strptime(row.get("interval_start"), Config.OCP_DATETIME_STR_FORMAT)
+        end = datetime.strptime(row.get("interval_end"), Config.OCP_DATETIME_STR_FORMAT)
         data = {"report_period_id": report_period_id, "interval_start": start, "interval_end": end}
         report_id = report_db_accessor.insert_on_conflict_do_nothing(
             table_name, data, conflict_columns=["report_period_id", "interval_start"]
@@ -262,20 +280,90 @@ class OCPReportProcessorBase(ReportProcessorBase):
             (dict): The JSON dictionary made from the label string
 
         """
-        labels = label_string.split("|") if label_string else []
-        label_dict = {}
-
-        for label in labels:
-            try:
-                key, value = label.split(":")
-                key = key.replace("label_", "")
-                label_dict[key] = value
-            except ValueError as err:
-                LOG.warning(err)
-                LOG.warning("%s could not be properly split", label)
+        return _labels_to_json(label_string or "")
+
+    def _set_line_item_layout(self, report_columns):
+        """Compute the line item column order and value converters for a report.
+
+        Args:
+            report_columns (iterable): The column names of the report file
+
+        Returns:
+            (None)
+
+        """
+        table_name = self.table_name._meta.db_table
+        column_map = self.column_map[table_name]
+        column_types = self.report_schema.column_types[table_name]
+
+        converters = []
+        db_columns = []
+        for report_column in report_columns:
+            db_column = column_map.get(report_column)
+            if db_column is None or db_column in self.label_columns:
                 continue
+            if column_types.get(db_column) == "BigIntegerField":
+                converters.append((report_column, self._convert_int))
+            else:
+                converters.append((report_column, _clean_value))
+            db_columns.append(db_column)
+
+        self.line_item_columns = db_columns + ["report_period_id", "report_id"] + self.label_columns
+        self._line_item_converters = converters
+        self._line_item_key_indexes = [
+            self.line_item_columns.index(column) if column in self.line_item_columns else None
+            for column in self.line_item_conflict_columns
+        ]
+
+    def _convert_int(self, value):
+        """Convert a report value for an integer column, as clean_data does."""
+        value = _clean_value(value)
+        if value is None:
+            return None
+        try:
+            return int(value)
+        except ValueError as err:
+            LOG.warning(err)
+            return None
 
-        return json.dumps(label_dict)
+    def _create_usage_report_line_item(self, row, report_period_id, report_id, report_db_accessor):
+        """Create a line item row ready to be written with COPY.
+
+        Args:
+            row (dict): A dictionary representation of a CSV file row
+            report_period_id (str): A report period object id
+            report_id (str): A report object id
+
+        Returns:
+            (None)
+
+        """
+        if self.line_item_columns is None:
+            self._set_line_item_layout(row.keys())
+
+        line_item = [convert(row.get(report_column)) for report_column, convert in self._line_item_converters]
+        line_item.append(report_period_id)
+        line_item.append(report_id)
+        for label_column in self.label_columns:
+            line_item.append(self._process_pod_labels(row.get(label_column)))
+
+        # Deduplicate potential repeated rows in data
+        key = tuple(line_item[index] if index is not None else None for index in self._line_item_key_indexes)
+        if key in self.processed_report.line_item_keys:
+            return
+
+        self.processed_report.line_items.append(tuple(line_item))
+        self.processed_report.line_item_keys.add(key)
+
+    def _save_to_db(self, temp_table, report_db_accessor):
+        """Stream the current batch of line items into the temp table."""
+        stream = CopyStream(copy_lines_from_rows(self.processed_report.line_items))
+        report_db_accessor.bulk_insert_rows(stream, temp_table, tuple(self.line_item_columns))
+
+    def _get_period_reports(self, report_period_id):
+        """Return the map of the existing reports of a report period."""
+        with OCPReportDBAccessor(self._schema, self.column_map) as report_db:
+            return report_db.get_reports(report_period_id=report_period_id)
 
     def _update_mappings(self):
         """Update cache of database objects for reference."""
@@ -370,44 +458,16 @@ class OCPCpuMemReportProcessor(OCPReportProcessorBase):
         )
         LOG.info(stmt)
 
-    def _create_usage_report_line_item(self, row, report_period_id, report_id, report_db_accessor):
-        """Create a cost entry line item object.
-
-        Args:
-            row (dict): A dictionary representation of a CSV file row
-            report_period_id (str): A report period object id
-            report_id (str): A report object id
-
-        Returns:
-            (None)
-
-        """
-        data = self._get_data_for_table(row, self.table_name._meta.db_table)
-        pod_label_str = ""
-        if "pod_labels" in data:
-            pod_label_str = data.pop("pod_labels")
-
-        data = report_db_accessor.clean_data(data, self.table_name._meta.db_table)
-
-        data["report_period_id"] = report_period_id
-        data["report_id"] = report_id
-        data["pod_labels"] = self._process_pod_labels(pod_label_str)
-        # Deduplicate potential repeated rows in data
-        key = tuple(data.get(column) for column in self.line_item_conflict_columns)
-        if key in self.processed_report.line_item_keys:
-            return
-
-        self.processed_report.line_items.append(data)
-        self.processed_report.line_item_keys[key] = True
-
-        if self.line_item_columns is None:
-            self.line_item_columns = list(data.keys())
-
     @property
     def line_item_conflict_columns(self):
         """Create a property to check conflict on line items."""
         return ["report_id", "namespace", "pod", "node"]
 
+    @property
+    def label_columns(self):
+        """Return the label columns parsed into JSON."""
+        return ["pod_labels"]
+
 
 class OCPStorageProcessor(OCPReportProcessorBase):
     """OCP Usage Report processor."""
@@ -434,47 +494,42 @@ class OCPStorageProcessor(OCPReportProcessorBase):
         )
         LOG.info(stmt)
 
-    def _create_usage_report_line_item(self, row, report_period_id, report_id, report_db_accessor):
-        """Create a cost entry line item object.
-
-        Args:
-            row (dict): A dictionary representation of a CSV file row
-            report_period_id (str): A report period object id
-            report_id (str): A report object id
-
-        Returns:
-            (None)
-
-        """
-        data = self._get_data_for_table(row, self.table_name._meta.db_table)
-
-        persistentvolume_labels_str = ""
-        if "persistentvolume_labels" in data:
-            persistentvolume_labels_str = data.pop("persistentvolume_labels")
-
-        persistentvolumeclaim_labels_str = ""
-        if "persistentvolumeclaim_labels" in data:
-            persistentvolumeclaim_labels_str = data.pop("persistentvolumeclaim_labels")
+    @property
+    def line_item_conflict_columns(self):
+        """Create a property to check conflict on line items."""
+        return ["report_id", "namespace", "persistentvolumeclaim"]
 
-        data = report_db_accessor.clean_data(data, self.table_name._meta.db_table)
+    @property
+    def label_columns(self):
+        """Return the label columns parsed into JSON."""
+        return ["persistentvolume_labels", "persistentvolumeclaim_labels"]
 
-        data["report_period_id"] = report_period_id
-        data["report_id"] = report_id
-        data["persistentvolume_labels"] = self._process_pod_labels(persistentvolume_labels_str)
-        data["persistentvolumeclaim_labels"] = self._process_pod_labels(persistentvolumeclaim_labels_str)
 
-        # Deduplicate potential repeated rows in data
-        key = tuple(data.get(column) for column in self.line_item_conflict_columns)
-        if key in self.processed_report.line_item_keys:
-            return
+def _clean_value(value):
+    """Return None for empty report values."""
+    if value is None or value == "":
+        return None
+    return value
 
-        self.processed_report.line_items.append(data)
-        self.processed_report.line_item_keys[key] = True
 
-        if self.line_item_columns is None:
-            self.line_item_columns = list(data.keys())
+@lru_cache(maxsize=LABEL_CACHE_SIZE)
+def _labels_to_json(label_string):
+    """Convert a report label string to a JSON dictionary string.
 
-    @property
-    def line_item_conflict_columns(self):
-        """Create a property to check conflict on line items."""
-        return ["report_id", "namespace", "persistentvolumeclaim"]
+    The same label string repeats for every interval a pod or volume is
+    reported, so conversions are cached.
+    """
+    labels = label_string.split("|") if label_string else []
+    label_dict = {}
+
+    for label in labels:
+        try:
+            key, value = label.split(":")
+            key = key.replace("label_", "")
+            label_dict[key] = value
+        except ValueError as err:
+            LOG.warning(err)
+            LOG.warning("%s could not be properly split", label)
+            continue
+
+    return json.dumps(label_dict)
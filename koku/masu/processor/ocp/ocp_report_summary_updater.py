@@ -104,9 +104,13 @@ class OCPReportSummaryUpdater:
                 )
                 accessor.populate_line_item_daily_summary_table(start, end, self._cluster_id)
                 accessor.populate_storage_line_item_daily_summary_table(start, end, self._cluster_id)
-            accessor.populate_pod_label_summary_table()
-            accessor.populate_volume_claim_label_summary_table()
-            accessor.populate_volume_label_summary_table()
+            # Without report periods there are no labels to summarize, and an
+            # empty list would rebuild the label summaries of the whole schema.
+            report_period_ids = self._get_report_period_ids(accessor, start_date, end_date)
+            if report_period_ids:
+                accessor.populate_pod_label_summary_table(report_period_ids)
+                accessor.populate_volume_claim_label_summary_table(report_period_ids)
+                accessor.populate_volume_label_summary_table(report_period_ids)
 
             for period in report_periods:
                 if period.summary_data_creation_datetime is None:
@@ -116,6 +120,13 @@ class OCPReportSummaryUpdater:
 
         return start_date, end_date
 
+    def _get_report_period_ids(self, accessor, start_date, end_date):
+        """Return the ids of this provider's report periods overlapping the dates."""
+        report_periods = accessor.get_usage_period_query_by_provider(self._provider.uuid)
+        with schema_context(self._schema):
+            report_periods = report_periods.filter(report_period_start__lte=end_date, report_period_end__gt=start_date)
+            return [str(period.id) for period in report_periods]
+
     def _get_sql_inputs(self, start_date, end_date):
         """Get the required inputs for running summary SQL."""
         # Default to this month's bill
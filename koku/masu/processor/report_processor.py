@@ -18,6 +18,8 @@
 import logging
 
 from api.models import Provider
+from masu.config import Config
+from masu.processor.aws.aws_columnar_report_processor import AWSColumnarReportProcessor
 from masu.processor.aws.aws_report_processor import AWSReportProcessor
 from masu.processor.azure.azure_report_processor import AzureReportProcessor
 from masu.processor.gcp.gcp_report_processor import GCPReportProcessor
@@ -36,10 +38,13 @@ class ReportProcessorError(Exception):
 class ReportProcessor:
     """Interface for masu to use to processor CUR."""
 
-    def __init__(self, schema_name, report_path, compression, provider, provider_uuid, manifest_id):
+    def __init__(
+        self, schema_name, report_path, compression, provider, provider_uuid, manifest_id, report_stream=None
+    ):
         """Set the processor based on the data provider."""
         self.schema_name = schema_name
         self.report_path = report_path
+        self.report_stream = report_stream
         self.compression = compression
         self.provider_type = provider
         self.provider_uuid = provider_uuid
@@ -66,12 +71,14 @@ class ReportProcessor:
 
         """
         if self.provider_type in (Provider.PROVIDER_AWS, Provider.PROVIDER_AWS_LOCAL):
-            return AWSReportProcessor(
+            processor_class = AWSColumnarReportProcessor if Config.AWS_COLUMNAR_PROCESSING else AWSReportProcessor
+            return processor_class(
                 schema_name=self.schema_name,
                 report_path=self.report_path,
                 compression=self.compression,
                 provider_uuid=self.provider_uuid,
                 manifest_id=self.manifest_id,
+                report_stream=self.report_stream,
             )
 
         if self.provider_type in (Provider.PROVIDER_AZURE, Provider.PROVIDER_AZURE_LOCAL):
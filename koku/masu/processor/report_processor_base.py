@@ -15,10 +15,15 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 """Report Processor base class."""
+import codecs
 import csv
 import gzip
 import io
 import logging
+import resource
+import time
+from contextlib import closing
+from contextlib import contextmanager
 
 import ciso8601
 from dateutil.relativedelta import relativedelta
@@ -42,7 +47,9 @@ class ReportProcessorBase:
     Base object class for downloading cost reports from a cloud provider.
     """
 
-    def __init__(self, schema_name, report_path, compression, provider_uuid, manifest_id, processed_report):
+    def __init__(
+        self, schema_name, report_path, compression, provider_uuid, manifest_id, processed_report, report_stream=None
+    ):
         """Initialize the report processor base class.
 
         Args:
@@ -50,6 +57,8 @@ class ReportProcessorBase:
             report_path (str): Where the report file lives in the file system
             compression (CONST): How the report file is compressed.
                 Accepted values: UNCOMPRESSED, GZIP_COMPRESSED
+            report_stream (Callable): Opens a binary stream of the report
+                content, read instead of the file at report_path
 
         """
         if compression.upper() not in ALLOWED_COMPRESSIONS:
@@ -58,6 +67,7 @@ class ReportProcessorBase:
 
         self._schema = schema_name
         self._report_path = report_path
+        self._report_stream = report_stream
         self._compression = compression.upper()
         self._provider_uuid = provider_uuid
         self._manifest_id = manifest_id
@@ -73,6 +83,28 @@ class ReportProcessorBase:
             data_cutoff_date = today.replace(day=1)
         return data_cutoff_date
 
+    def _log_processing_stats(self, row_count, start_time):
+        """Log throughput and peak memory for a processed report file.
+
+        Args:
+            row_count (int): The number of line items written
+            start_time (float): The time.monotonic() value when processing began
+
+        """
+        elapsed = time.monotonic() - start_time
+        rows_per_second = row_count / elapsed if elapsed else float(row_count)
+        # ru_maxrss is reported in kilobytes on Linux
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        stmt = (
+            f"Processing stats for file: {self._report_path}\n"
+            f" schema_name: {self._schema}\n"
+            f" rows: {row_count}\n"
+            f" seconds: {elapsed:.2f}\n"
+            f" rows/sec: {rows_per_second:.0f}\n"
+            f" peak RSS (KiB): {peak_rss}"
+        )
+        LOG.info(stmt)
+
     def _get_data_for_table(self, row, table_name):
         """Extract the data from a row for a specific table.
 
@@ -104,6 +136,30 @@ class ReportProcessorBase:
             return gzip.open, "rt"
         return open, "r"  # assume uncompressed by default
 
+    @contextmanager
+    def _open_report(self):
+        """Open the report for reading as text.
+
+        A streamed report is decompressed as it is read from the object
+        store, so it is never written to the local file system.
+
+        Yields:
+            (file): The report text stream
+
+        """
+        if self._report_stream is None:
+            opener, mode = self._get_file_opener(self._compression)
+            with opener(self._report_path, mode) as report_file:
+                yield report_file
+            return
+
+        with closing(self._report_stream()) as raw:
+            if self._compression == GZIP_COMPRESSED:
+                with io.TextIOWrapper(gzip.GzipFile(fileobj=raw, mode="rb"), encoding="utf-8") as report_file:
+                    yield report_file
+            else:
+                yield codecs.getreader("utf-8")(raw)
+
     def _write_processed_rows_to_csv(self):
         """Output CSV content to file stream object."""
         values = [tuple(item.values()) for item in self.processed_report.line_items]
@@ -22,30 +22,135 @@ import datetime
 import os
 
 from celery import chain
+from celery import group
 from celery.utils.log import get_task_logger
 from dateutil import parser
+from dateutil.relativedelta import relativedelta
 from django.db import connection
 from tenant_schemas.utils import schema_context
 
 import masu.prometheus_stats as worker_stats
 from api.provider.models import Provider
+from koku.cache import invalidate_report_cache
+from koku.cache import invalidate_tag_key_cache
 from koku.celery import app
+from masu.config import Config
+from masu.database.aws_report_db_accessor import AWSReportDBAccessor
+from masu.database.report_db_accessor_base import ReportDBAccessorBase
 from masu.database.report_manifest_db_accessor import ReportManifestDBAccessor
 from masu.database.report_stats_db_accessor import ReportStatsDBAccessor
+from masu.database.reporting_common_db_accessor import ReportingCommonDBAccessor
+from masu.external import POLL_INGEST
 from masu.external.accounts_accessor import AccountsAccessor
 from masu.external.accounts_accessor import AccountsAccessorError
 from masu.external.date_accessor import DateAccessor
+from masu.processor._tasks.download import _download_report_file
+from masu.processor._tasks.download import _get_report_context
 from masu.processor._tasks.download import _get_report_files
 from masu.processor._tasks.process import _process_report_file
 from masu.processor._tasks.remove_expired import _remove_expired_data
 from masu.processor.report_charge_updater import ReportChargeUpdater
 from masu.processor.report_processor import ReportProcessorError
 from masu.processor.report_summary_updater import ReportSummaryUpdater
-from reporting.models import AWS_MATERIALIZED_VIEWS
+from masu.util.common import ingest_method_for_provider
 
 LOG = get_task_logger(__name__)
 
 
+def _should_skip_report_file(file_name, manifest_id):
+    """Determine whether a report file is already processed or being processed.
+
+    Args:
+        file_name   (String): The base name of the local report file
+        manifest_id (Integer): The manifest the file belongs to
+
+    Returns:
+        (Boolean): True if processing should be skipped
+
+    """
+    with ReportStatsDBAccessor(file_name, manifest_id) as stats:
+        started_date = stats.get_last_started_datetime()
+        completed_date = stats.get_last_completed_datetime()
+
+    # Skip processing if already in progress.
+    if started_date and not completed_date:
+        expired_start_date = started_date + datetime.timedelta(hours=2)
+        if DateAccessor().today_with_timezone("UTC") < expired_start_date:
+            LOG.info("Skipping processing task for %s since it was started at: %s.", file_name, str(started_date))
+            return True
+
+    # Skip processing if complete.
+    if started_date and completed_date:
+        LOG.info(
+            "Skipping processing task for %s. Started on: %s and completed on: %s.",
+            file_name,
+            str(started_date),
+            str(completed_date),
+        )
+        return True
+
+    return False
+
+
+def _manifest_files_processed(manifest_id):
+    """Determine whether every file of a manifest has been processed.
+
+    Args:
+        manifest_id (Integer): The manifest id
+
+    Returns:
+        (Boolean): True if the processed file count reached the total
+
+    """
+    with ReportManifestDBAccessor() as manifest_accessor:
+        manifest = manifest_accessor.get_manifest_by_id(manifest_id)
+        if not manifest:
+            return False
+        return manifest.num_processed_files >= manifest.num_total_files
+
+
+def _report_meta(schema_name, provider_type, provider_uuid, manifest_id):
+    """Return the description of a report to summarize."""
+    return {
+        "schema_name": schema_name,
+        "provider_type": provider_type,
+        "provider_uuid": provider_uuid,
+        "manifest_id": manifest_id,
+    }
+
+
+def _process_report(customer_name, schema_name, provider_type, provider_uuid, report_dict):
+    """Process a downloaded report file unless it should be skipped.
+
+    Returns:
+        (dict, Boolean): The report to summarize, or None if skipped, and
+            whether this file completed its manifest
+
+    """
+    manifest_id = report_dict.get("manifest_id")
+    file_name = os.path.basename(report_dict.get("file"))
+    if _should_skip_report_file(file_name, manifest_id):
+        return None, False
+
+    stmt = (
+        f"Processing starting:\n"
+        f" schema_name: {customer_name}\n"
+        f" provider: {provider_type}\n"
+        f" provider_uuid: {provider_uuid}\n"
+        f' file: {report_dict.get("file")}'
+    )
+    LOG.info(stmt)
+    worker_stats.PROCESS_REPORT_ATTEMPTS_COUNTER.labels(provider_type=provider_type).inc()
+    try:
+        manifest_complete = _process_report_file(schema_name, provider_type, provider_uuid, report_dict)
+    except ReportProcessorError as processing_error:
+        worker_stats.PROCESS_REPORT_ERROR_COUNTER.labels(provider_type=provider_type).inc()
+        LOG.error(str(processing_error))
+        raise processing_error
+
+    return _report_meta(schema_name, provider_type, provider_uuid, manifest_id), manifest_complete
+
+
 # pylint: disable=too-many-locals
 @app.task(name="masu.processor.tasks.get_report_files", queue_name="download", bind=True)
 def get_report_files(
@@ -58,6 +163,12 @@ def get_report_files(
     Once we know a realistic processing time for the largest CUR file in production
     this value can be adjusted or made configurable.
 
+    When PARALLEL_REPORT_PROCESSING is enabled for a polled provider, only the
+    first file of the manifest is processed here and the remaining files are
+    fanned out to get_report_file subtasks. The subtask that processes the
+    last file of the manifest schedules summarization, so an empty list is
+    returned in that case.
+
     Args:
         customer_name     (String): Name of the customer owning the cost usage report.
         authentication    (String): Credential needed to access cost usage report
@@ -67,76 +178,180 @@ def get_report_files(
         schema_name       (String): Name of the DB schema
 
     Returns:
-        None
+        ([{}]) Reports to summarize
 
     """
     worker_stats.GET_REPORT_ATTEMPTS_COUNTER.labels(provider_type=provider_type).inc()
     month = parser.parse(report_month)
+    if Config.PARALLEL_REPORT_PROCESSING and ingest_method_for_provider(provider_type) == POLL_INGEST:
+        return _fan_out_report_files(
+            self, customer_name, authentication, billing_source, provider_type, schema_name, provider_uuid, month
+        )
+
     reports = _get_report_files(
         self, customer_name, authentication, billing_source, provider_type, provider_uuid, month
     )
 
-    try:
+    stmt = (
+        f"Reports to be processed:\n"
+        f" schema_name: {customer_name}\n"
+        f" provider: {provider_type}\n"
+        f" provider_uuid: {provider_uuid}\n"
+    )
+    for report in reports:
+        stmt += " file: " + str(report["file"]) + "\n"
+    LOG.info(stmt[:-1])
+    reports_to_summarize = []
+    for report_dict in reports:
+        report_meta, _ = _process_report(customer_name, schema_name, provider_type, provider_uuid, report_dict)
+        if report_meta is None:
+            continue
+        known_manifest_ids = [report.get("manifest_id") for report in reports_to_summarize]
+        if report_meta.get("manifest_id") not in known_manifest_ids:
+            reports_to_summarize.append(report_meta)
+
+    return reports_to_summarize
+
+
+def _fan_out_report_files(
+    task, customer_name, authentication, billing_source, provider_type, schema_name, provider_uuid, month
+):
+    """Process the first file of a manifest and dispatch the rest as subtasks.
+
+    The first file is processed inline because processing the first file of a
+    manifest clears stale line items for the bill; the remaining files only
+    append and are safe to process concurrently.
+
+    Returns:
+        ([{}]) Reports to summarize, empty when summarization is left to a subtask
+
+    """
+    report_context = _get_report_context(
+        task, customer_name, authentication, billing_source, provider_type, provider_uuid, month
+    )
+    files = report_context.get("files", [])
+    if not files:
+        return []
+
+    first_file, *remaining_files = files
+    report_dict = _download_report_file(
+        task,
+        customer_name,
+        authentication,
+        billing_source,
+        provider_type,
+        provider_uuid,
+        month,
+        report_context,
+        first_file,
+    )
+    report_meta, manifest_complete = _process_report(
+        customer_name, schema_name, provider_type, provider_uuid, report_dict
+    )
+    if report_meta is None:
+        # A skipped file is not counted again, so the manifest may already be complete.
+        report_meta = _report_meta(schema_name, provider_type, provider_uuid, report_context.get("manifest_id"))
+        manifest_complete = _manifest_files_processed(report_context.get("manifest_id"))
+    elif not remaining_files:
+        manifest_complete = True
+
+    if remaining_files:
         stmt = (
-            f"Reports to be processed:\n"
+            f"Dispatching report files for parallel processing:\n"
             f" schema_name: {customer_name}\n"
             f" provider: {provider_type}\n"
             f" provider_uuid: {provider_uuid}\n"
+            f" manifest_id: {report_context.get('manifest_id')}\n"
+            f" files: {len(remaining_files)}"
         )
-        for report in reports:
-            stmt += " file: " + str(report["file"]) + "\n"
-        LOG.info(stmt[:-1])
-        reports_to_summarize = []
-        for report_dict in reports:
-            manifest_id = report_dict.get("manifest_id")
-            file_name = os.path.basename(report_dict.get("file"))
-            with ReportStatsDBAccessor(file_name, manifest_id) as stats:
-                started_date = stats.get_last_started_datetime()
-                completed_date = stats.get_last_completed_datetime()
-
-            # Skip processing if already in progress.
-            if started_date and not completed_date:
-                expired_start_date = started_date + datetime.timedelta(hours=2)
-                if DateAccessor().today_with_timezone("UTC") < expired_start_date:
-                    LOG.info(
-                        "Skipping processing task for %s since it was started at: %s.", file_name, str(started_date)
-                    )
-                    continue
-
-            # Skip processing if complete.
-            if started_date and completed_date:
-                LOG.info(
-                    "Skipping processing task for %s. Started on: %s and completed on: %s.",
-                    file_name,
-                    str(started_date),
-                    str(completed_date),
-                )
-                continue
-
-            stmt = (
-                f"Processing starting:\n"
-                f" schema_name: {customer_name}\n"
-                f" provider: {provider_type}\n"
-                f" provider_uuid: {provider_uuid}\n"
-                f' file: {report_dict.get("file")}'
+        LOG.info(stmt)
+        group(
+            get_report_file.s(
+                customer_name,
+                authentication,
+                billing_source,
+                provider_type,
+                schema_name,
+                provider_uuid,
+                month.isoformat(),
+                report_context,
+                report,
             )
-            LOG.info(stmt)
-            worker_stats.PROCESS_REPORT_ATTEMPTS_COUNTER.labels(provider_type=provider_type).inc()
-            _process_report_file(schema_name, provider_type, provider_uuid, report_dict)
-            report_meta = {}
-            known_manifest_ids = [report.get("manifest_id") for report in reports_to_summarize]
-            if report_dict.get("manifest_id") not in known_manifest_ids:
-                report_meta["schema_name"] = schema_name
-                report_meta["provider_type"] = provider_type
-                report_meta["provider_uuid"] = provider_uuid
-                report_meta["manifest_id"] = report_dict.get("manifest_id")
-                reports_to_summarize.append(report_meta)
-    except ReportProcessorError as processing_error:
-        worker_stats.PROCESS_REPORT_ERROR_COUNTER.labels(provider_type=provider_type).inc()
-        LOG.error(str(processing_error))
-        raise processing_error
+            for report in remaining_files
+        ).apply_async()
 
-    return reports_to_summarize
+    if manifest_complete:
+        return [report_meta]
+    return []
+
+
+@app.task(name="masu.processor.tasks.get_report_file", queue_name="process", bind=True)
+def get_report_file(
+    self,
+    customer_name,
+    authentication,
+    billing_source,
+    provider_type,
+    schema_name,
+    provider_uuid,
+    report_month,
+    report_context,
+    report,
+):
+    """
+    Task to download and process a single file of a manifest.
+
+    Progress is recorded per file in ReportStatsDBAccessor and the manifest's
+    processed file count is incremented atomically, so whichever subtask
+    processes the last file schedules summarization for the manifest. A
+    skipped file schedules it if the manifest is already complete, and a
+    failed file schedules it for the files that were processed, since the
+    count will then never reach the total.
+
+    Args:
+        customer_name     (String): Name of the customer owning the cost usage report.
+        authentication    (String): Credential needed to access cost usage report
+                                    in the backend provider.
+        billing_source    (String): Location of the cost usage report in the backend provider.
+        provider_type     (String): Koku defined provider type string.  Example: Amazon = 'AWS'
+        schema_name       (String): Name of the DB schema
+        provider_uuid     (String): Provider uuid.
+        report_month      (String): Month for report to download.
+        report_context    (Dict): The manifest context from the parent task.
+        report            (String): The report file to download and process.
+
+    Returns:
+        None
+
+    """
+    month = parser.parse(report_month)
+    manifest_id = report_context.get("manifest_id")
+    report_meta = _report_meta(schema_name, provider_type, provider_uuid, manifest_id)
+    try:
+        report_dict = _download_report_file(
+            self,
+            customer_name,
+            authentication,
+            billing_source,
+            provider_type,
+            provider_uuid,
+            month,
+            report_context,
+            report,
+        )
+        processed_meta, manifest_complete = _process_report(
+            customer_name, schema_name, provider_type, provider_uuid, report_dict
+        )
+    except Exception:
+        LOG.info("Processing %s failed for manifest %s, queuing summarization.", report, manifest_id)
+        summarize_reports.delay([report_meta])
+        raise
+
+    if processed_meta is None:
+        manifest_complete = _manifest_files_processed(manifest_id)
+    if manifest_complete:
+        LOG.info("All files processed for manifest %s, queuing summarization.", manifest_id)
+        summarize_reports.delay([report_meta])
 
 
 @app.task(name="masu.processor.tasks.remove_expired_data", queue_name="remove_expired")
@@ -162,6 +377,9 @@ def remove_expired_data(schema_name, provider, simulate, provider_uuid=None):
     )
     LOG.info(stmt)
     _remove_expired_data(schema_name, provider, simulate, provider_uuid)
+    if not simulate:
+        invalidate_report_cache(schema_name)
+        invalidate_tag_key_cache(schema_name)
 
 
 @app.task(name="masu.processor.tasks.summarize_reports", queue_name="process")
@@ -229,13 +447,14 @@ def update_summary_tables(schema_name, provider, provider_uuid, start_date, end_
     if updater.manifest_is_ready():
         start_date, end_date = updater.update_daily_tables(start_date, end_date)
         updater.update_summary_tables(start_date, end_date)
+        invalidate_tag_key_cache(schema_name)
     if provider_uuid:
         chain(
             update_charge_info.s(schema_name, provider_uuid, start_date, end_date),
-            refresh_materialized_views.si(schema_name, provider, manifest_id),
+            refresh_materialized_views.si(schema_name, provider, manifest_id, start_date, end_date),
         ).apply_async()
     else:
-        refresh_materialized_views.delay(schema_name, provider, manifest_id)
+        refresh_materialized_views.delay(schema_name, provider, manifest_id, start_date, end_date)
 
 
 @app.task(name="masu.processor.tasks.update_all_summary_tables", queue_name="reporting")
@@ -293,20 +512,24 @@ def update_charge_info(schema_name, provider_uuid, start_date=None, end_date=Non
 
     updater = ReportChargeUpdater(schema_name, provider_uuid)
     updater.update_charge_info(start_date, end_date)
+    invalidate_report_cache(schema_name)
 
 
 @app.task(name="masu.processor.tasks.refresh_materialized_views", queue_name="reporting")
-def refresh_materialized_views(schema_name, provider_type, manifest_id=None):
-    """Refresh the database's materialized views for reporting."""
-    materialized_views = ()
+def refresh_materialized_views(schema_name, provider_type, manifest_id=None, start_date=None, end_date=None):
+    """Update the database's UI summary tables for reporting.
+
+    The AWS UI summaries are regular tables maintained incrementally for
+    the summarized date range. Without a range the whole window of this
+    month and last month is rebuilt.
+    """
     if provider_type in (Provider.PROVIDER_AWS, Provider.PROVIDER_AWS_LOCAL):
-        materialized_views = AWS_MATERIALIZED_VIEWS
-    with schema_context(schema_name):
-        for view in materialized_views:
-            table_name = view._meta.db_table
-            with connection.cursor() as cursor:
-                cursor.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {table_name}")
-                LOG.info(f"Refreshed {table_name}.")
+        with ReportingCommonDBAccessor() as reporting_common:
+            column_map = reporting_common.column_map
+        with AWSReportDBAccessor(schema_name, column_map) as accessor:
+            accessor.populate_ui_summary_tables(start_date, end_date)
+
+    invalidate_report_cache(schema_name)
 
     if manifest_id:
         # Processing for this monifest should be complete after this step
@@ -336,3 +559,21 @@ def vacuum_schema(schema_name):
                 cursor.execute(sql)
                 LOG.info(sql)
                 LOG.info(cursor.statusmessage)
+
+
+@app.task(name="masu.processor.tasks.create_partitions", queue_name="reporting")
+def create_partitions(schema_name, months_ahead=1):
+    """Create the monthly partitions of the line item tables ahead of the data.
+
+    Args:
+        schema_name (str): The tenant schema
+        months_ahead (int): How many months after the current one to create
+
+    """
+    start_date = DateAccessor().today_with_timezone("UTC")
+    end_date = start_date + relativedelta(months=months_ahead)
+    with ReportingCommonDBAccessor() as reporting_common:
+        column_map = reporting_common.column_map
+
+    with ReportDBAccessorBase(schema_name, column_map) as accessor:
+        accessor.create_all_month_partitions(start_date, end_date)
@@ -0,0 +1,112 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test the ingestion benchmark harness."""
+import csv
+import io
+import shutil
+import tempfile
+import time
+
+from masu.benchmark.generators import GENERATORS
+from masu.benchmark.generators import ReportShape
+from masu.benchmark.harness import CountingReader
+from masu.benchmark.harness import instrument
+from masu.benchmark.harness import PHASE_CLEAN
+from masu.benchmark.harness import PHASE_DIMENSION
+from masu.benchmark.harness import PhaseTimer
+from masu.benchmark.harness import run_benchmark
+from masu.processor.aws.aws_columnar_report_processor import AWSColumnarReportProcessor
+from masu.processor.ocp.ocp_report_processor import OCPReportProcessor
+from masu.processor.ocp.ocp_report_processor import OCPReportTypes
+from masu.test import MasuTestCase
+
+
+class BenchmarkHarnessTest(MasuTestCase):
+    """Test Cases for the ingestion benchmark harness."""
+
+    def setUp(self):
+        """Set up a scratch directory."""
+        super().setUp()
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the scratch directory."""
+        super().tearDown()
+        shutil.rmtree(self.temp_dir)
+
+    def test_phase_timer_exclusive(self):
+        """Test that nested phase time is not counted in the enclosing phase."""
+        timer = PhaseTimer()
+        with timer.phase("outer"):
+            with timer.phase("inner"):
+                time.sleep(0.02)
+        self.assertLess(timer.seconds["outer"], timer.seconds["inner"])
+        self.assertEqual(timer.calls, {"outer": 1, "inner": 1})
+
+    def test_instrument_restores_methods(self):
+        """Test that instrumented methods are timed and then restored."""
+        original = AWSColumnarReportProcessor.__dict__["_resolve_dimension"]
+        timer = PhaseTimer()
+        methods = [(AWSColumnarReportProcessor, "_resolve_dimension", PHASE_DIMENSION)]
+        with instrument(timer, methods):
+            self.assertIsInstance(AWSColumnarReportProcessor.__dict__["_resolve_dimension"], staticmethod)
+        self.assertIs(AWSColumnarReportProcessor.__dict__["_resolve_dimension"], original)
+
+    def test_counting_reader(self):
+        """Test that the lines read through the reader are counted."""
+        for data in ["a\tb\nc\td\n", "a\tb\nc\td"]:
+            with self.subTest(data=data):
+                reader = CountingReader(io.StringIO(data))
+                self.assertEqual(reader.readline(), "a\tb\n")
+                while reader.read(3):
+                    pass
+                self.assertEqual(reader.lines, 2)
+
+    def test_generators_are_reproducible(self):
+        """Test that a shape always generates the same report."""
+        shape = ReportShape(rows=20, tag_keys=3, skus=4, resources=5)
+        for kind, generator in GENERATORS.items():
+            with self.subTest(kind=kind):
+                first = list(generator(shape).rows())
+                second = list(generator(shape).rows())
+                self.assertEqual(len(first), 20)
+                self.assertEqual(first, second)
+                self.assertEqual(len(first[0]), len(generator(shape).columns))
+
+    def test_ocp_reports_are_detected(self):
+        """Test that the generated OCP reports have the operator headers."""
+        shape = ReportShape(rows=5)
+        expected = {"OCP-cpu-mem": OCPReportTypes.CPU_MEM_USAGE, "OCP-storage": OCPReportTypes.STORAGE}
+        for kind, report_type in expected.items():
+            report_path = GENERATORS[kind](shape).write(self.temp_dir)
+            with open(report_path) as report_file:
+                self.assertEqual(next(csv.reader(report_file)), GENERATORS[kind].columns)
+            processor = OCPReportProcessor.__new__(OCPReportProcessor)
+            self.assertEqual(processor._detect_report_type(report_path), report_type)
+
+    def test_run_benchmark(self):
+        """Test that a benchmark run reports throughput and phases."""
+        shape = ReportShape(rows=100, resources=10)
+        result = run_benchmark("OCP-cpu-mem", shape, self.schema, self.ocp_provider_uuid)
+
+        self.assertEqual(result.rows, 100)
+        self.assertGreater(result.rows_per_second, 0)
+        self.assertGreater(result.queries, 0)
+        self.assertIn(PHASE_CLEAN, result.phases)
+        self.assertIn(PHASE_DIMENSION, result.phases)
+        self.assertEqual(result.calls[PHASE_CLEAN], 100)
+        self.assertIn("rows/sec", str(result))
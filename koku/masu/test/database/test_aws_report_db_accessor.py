@@ -35,6 +35,8 @@ from masu.database import OCP_REPORT_TABLE_MAP
 from masu.database.aws_report_db_accessor import AWSReportDBAccessor
 from masu.database.ocp_report_db_accessor import OCPReportDBAccessor
 from masu.database.provider_db_accessor import ProviderDBAccessor
+from masu.database.report_db_accessor_base import FOREIGN_KEYS_SQL
+from masu.database.report_db_accessor_base import get_report_schema
 from masu.database.report_db_accessor_base import ReportSchema
 from masu.database.report_manifest_db_accessor import ReportManifestDBAccessor
 from masu.database.reporting_common_db_accessor import ReportingCommonDBAccessor
@@ -44,6 +46,7 @@ from masu.test.database.helpers import map_django_field_type_to_python_type
 from masu.test.database.helpers import ReportObjectCreator
 from reporting.provider.aws.models import AWSCostEntryProduct
 from reporting.provider.aws.models import AWSCostEntryReservation
+from reporting.provider.aws.models import AWSCostSummary
 
 
 class ReportSchemaTest(MasuTestCase):
@@ -309,6 +312,43 @@ class AWSReportDBAccessorTest(MasuTestCase):
                 previous_count = count
                 previous_row_id = row_id
 
+    def test_bulk_insert_on_conflict_do_nothing(self):
+        """Test that a bulk INSERT returns ids for new and existing rows."""
+        table_name = AWS_CUR_TABLE_MAP["product"]
+        table = AWSCostEntryProduct
+        key_columns = ["sku", "product_name", "region"]
+        with schema_context(self.schema):
+            existing = self.creator.create_columns_for_table(table_name)
+            existing_id = self.accessor.insert_on_conflict_do_nothing(table, dict(existing), key_columns)
+            new_rows = [self.creator.create_columns_for_table(table_name) for _ in range(2)]
+            query = self.accessor._get_db_obj_query(table_name)
+            initial_count = query.count()
+
+            row_ids = self.accessor.bulk_insert_on_conflict_do_nothing(table, [existing] + new_rows, key_columns)
+
+            self.assertEqual(query.count(), initial_count + 2)
+            self.assertEqual(row_ids[0], existing_id)
+            for row, row_id in zip(new_rows, row_ids[1:]):
+                self.assertEqual(query.get(id=row_id).sku, row["sku"])
+
+    def test_bulk_insert_on_conflict_do_nothing_null_key(self):
+        """Test that a row with a NULL key column is only inserted once."""
+        table_name = AWS_CUR_TABLE_MAP["product"]
+        table = AWSCostEntryProduct
+        key_columns = ["sku", "product_name", "region"]
+        with schema_context(self.schema):
+            row = self.creator.create_columns_for_table(table_name)
+            row["region"] = ""
+            query = self.accessor._get_db_obj_query(table_name)
+            initial_count = query.count()
+
+            first_ids = self.accessor.bulk_insert_on_conflict_do_nothing(table, [dict(row)], key_columns)
+            second_ids = self.accessor.bulk_insert_on_conflict_do_nothing(table, [dict(row)], key_columns)
+
+            self.assertEqual(query.count(), initial_count + 1)
+            self.assertEqual(second_ids, first_ids)
+            self.assertIsNone(query.get(id=first_ids[0]).region)
+
     def test_insert_on_conflict_do_update_with_conflict(self):
         """Test that an INSERT succeeds ignoring the conflicting row."""
         table_name = AWS_CUR_TABLE_MAP["reservation"]
@@ -398,21 +438,30 @@ class AWSReportDBAccessorTest(MasuTestCase):
             type = map_django_field_type_to_python_type(column_type)
             self.assertIsInstance(value, type)
 
-    def test_convert_value_decimal_invalid_operation(self):
-        """Test that an InvalidOperation is raised and None is returned."""
-        dec = Decimal("123342348239472398472309847230984723098427309")
+    def test_get_report_schema_cached(self):
+        """Test that accessors with the same column map share one report schema."""
+        with AWSReportDBAccessor(self.schema, ReportingCommonDBAccessor().column_map) as accessor:
+            self.assertIs(accessor.report_schema, self.accessor.report_schema)
+        self.assertIs(get_report_schema(self.column_map), self.accessor.report_schema)
 
-        result = self.accessor._convert_value(dec, Decimal)
-        self.assertIsNone(result)
-
-        result = self.accessor._convert_value("", Decimal)
-        self.assertIsNone(result)
+    def test_clean_data_converters(self):
+        """Test that integer columns are converted and empty values are nulled."""
+        table_name = AWS_CUR_TABLE_MAP["line_item"]
+        converters = self.accessor.report_schema.converters[table_name]
+        integer_columns = [
+            column
+            for column, column_type in self.accessor.report_schema.column_types[table_name].items()
+            if column_type == "BigIntegerField"
+        ]
+        self.assertEqual(set(converters), set(integer_columns))
 
-    def test_convert_value_value_error(self):
-        """Test that a value error results in a None value."""
-        value = "Not a Number"
-        result = self.accessor._convert_value(value, float)
-        self.assertIsNone(result)
+        data = {"usage_type": "", "line_item_type": "Usage"}
+        data.update({column: "10" for column in integer_columns})
+        cleaned = self.accessor.clean_data(data, table_name)
+        self.assertIsNone(cleaned["usage_type"])
+        self.assertEqual(cleaned["line_item_type"], "Usage")
+        for column in integer_columns:
+            self.assertEqual(cleaned[column], 10)
 
     def test_get_cost_entry_bills(self):
         """Test that bills are returned in a dict."""
@@ -922,6 +971,56 @@ class AWSReportDBAccessorTest(MasuTestCase):
 
             self.assertEqual(sorted(tag_keys), sorted(expected_tag_keys))
 
+    def test_populate_awstags_summary_table_for_bills(self):
+        """Test that only the given bills are summarized."""
+        bill_ids = []
+        ce_table_name = AWS_CUR_TABLE_MAP["cost_entry"]
+        tags_summary_name = AWS_CUR_TABLE_MAP["tags_summary"]
+
+        ce_table = getattr(self.accessor.report_schema, ce_table_name)
+
+        today = DateAccessor().today_with_timezone("UTC")
+        last_month = today - relativedelta.relativedelta(months=1)
+        with schema_context(self.schema):
+            for cost_entry_date in (today, last_month):
+                bill = self.creator.create_cost_entry_bill(
+                    provider_uuid=self.aws_provider.uuid, bill_date=cost_entry_date
+                )
+                bill_ids.append(str(bill.id))
+                cost_entry = self.creator.create_cost_entry(bill, cost_entry_date)
+                product = self.creator.create_cost_entry_product("Compute Instance")
+                pricing = self.creator.create_cost_entry_pricing()
+                reservation = self.creator.create_cost_entry_reservation()
+                self.creator.create_cost_entry_line_item(bill, cost_entry, product, pricing, reservation)
+
+        with schema_context(self.schema):
+            ce_entry = ce_table.objects.all().aggregate(Min("interval_start"), Max("interval_start"))
+            start_date = ce_entry["interval_start__min"]
+            end_date = ce_entry["interval_start__max"]
+
+        self.accessor.populate_line_item_daily_table(start_date, end_date, bill_ids)
+        self.accessor.populate_tags_summary_table(bill_ids[:1])
+
+        query = self.accessor._get_db_obj_query(tags_summary_name)
+        with schema_context(self.schema):
+            summarized_bills = {str(tag.cost_entry_bill_id) for tag in query.all()}
+            self.assertEqual(summarized_bills, {bill_ids[0]})
+
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    """SELECT DISTINCT key, value
+                        FROM reporting_awscostentrylineitem_daily,
+                            jsonb_each_text(tags) labels
+                        WHERE cost_entry_bill_id = %s""",
+                    [bill_ids[0]],
+                )
+                expected_values = {}
+                for key, value in cursor.fetchall():
+                    expected_values.setdefault(key, []).append(value)
+
+            for tag in query.all():
+                self.assertEqual(tag.values, sorted(expected_values[tag.key]))
+
     def test_populate_ocp_on_aws_cost_daily_summary(self):
         """Test that the OCP on AWS cost summary table is populated."""
         summary_table_name = AWS_CUR_TABLE_MAP["ocp_on_aws_daily_summary"]
@@ -1010,6 +1109,38 @@ class AWSReportDBAccessorTest(MasuTestCase):
             self.assertEquals(len(bills), 1)
             self.assertEquals(bills[0].id, bill2.id)
 
+    def test_populate_ui_summary_tables(self):
+        """Test that the UI summary tables are replaced for a date range."""
+        summary_table_name = AWS_CUR_TABLE_MAP["line_item_daily_summary"]
+        entry_datetime = DateAccessor().today_with_timezone("UTC").replace(hour=0, minute=0, second=0, microsecond=0)
+
+        bill = self.creator.create_cost_entry_bill(provider_uuid=self.aws_provider.uuid, bill_date=entry_datetime)
+        for _ in range(5):
+            cost_entry = self.creator.create_cost_entry(bill, entry_datetime=entry_datetime)
+            product = self.creator.create_cost_entry_product()
+            pricing = self.creator.create_cost_entry_pricing()
+            reservation = self.creator.create_cost_entry_reservation()
+            self.creator.create_cost_entry_line_item(bill, cost_entry, product, pricing, reservation)
+
+        start_date = end_date = entry_datetime.date()
+        self.accessor.populate_line_item_daily_table(start_date, end_date, [str(bill.id)])
+        self.accessor.populate_line_item_daily_summary_table(start_date, end_date, [str(bill.id)])
+        with schema_context(self.schema):
+            expected = (
+                self.accessor._get_db_obj_query(summary_table_name)
+                .filter(usage_start__date=start_date)
+                .aggregate(Sum("unblended_cost"))["unblended_cost__sum"]
+            )
+
+        # Running twice must replace the range rather than append to it
+        self.accessor.populate_ui_summary_tables(start_date, end_date)
+        self.accessor.populate_ui_summary_tables(start_date, end_date)
+
+        with schema_context(self.schema):
+            summaries = AWSCostSummary.objects.filter(usage_start__date=start_date)
+            self.assertEqual(summaries.count(), 1)
+            self.assertAlmostEqual(summaries.get().unblended_cost, expected, places=6)
+
     def test_mark_bill_as_finalized(self):
         """Test that test_mark_bill_as_finalized sets finalized_datetime field."""
         bill = self.creator.create_cost_entry_bill(provider_uuid=self.aws_provider.uuid)
@@ -1098,3 +1229,40 @@ class AWSReportDBAccessorTest(MasuTestCase):
 
         for k, v in found_values.items():
             self.assertAlmostEqual(v, possible_values[k], 6)
+
+    def test_month_partitions(self):
+        """Test that monthly partitions are created after the newest and expired ones are dropped."""
+        table = AWS_CUR_TABLE_MAP["line_item_daily"]
+        partitions = self.accessor.get_partitions(table)
+        self.assertEqual(partitions[0][0], f"{table}_legacy")
+        first_month = partitions[-1][1]
+        second_month = first_month + relativedelta.relativedelta(months=1)
+        expected = [f"{table}_{first_month:%Y_%m}", f"{table}_{second_month:%Y_%m}"]
+
+        try:
+            created = self.accessor.create_month_partitions(table, first_month, second_month)
+            self.assertEqual(created, expected)
+            self.assertEqual(self.accessor.create_month_partitions(table, first_month, second_month), [])
+            with schema_context(self.schema):
+                with connection.cursor() as cursor:
+                    cursor.execute(FOREIGN_KEYS_SQL, [self.schema, f"{table}_legacy"])
+                    legacy_keys = {definition for _, definition in cursor.fetchall()}
+                    cursor.execute(FOREIGN_KEYS_SQL, [self.schema, expected[1]])
+                    partition_keys = {definition for _, definition in cursor.fetchall()}
+            self.assertTrue(legacy_keys)
+            self.assertEqual(partition_keys, legacy_keys)
+            self.assertEqual(
+                [name for name, _ in self.accessor.get_partitions(table)], [name for name, _ in partitions] + expected
+            )
+
+            expired = self.accessor.drop_expired_partitions(table, second_month, simulate=True)
+            self.assertEqual(expired, [name for name, _ in partitions] + expected[:1])
+            expired = self.accessor.drop_expired_partitions(
+                table, second_month + relativedelta.relativedelta(months=1), simulate=True
+            )
+            self.assertNotIn(expected[1], expired)
+        finally:
+            with schema_context(self.schema):
+                with connection.cursor() as cursor:
+                    for partition in expected:
+                        cursor.execute(f"DROP TABLE IF EXISTS {partition}")
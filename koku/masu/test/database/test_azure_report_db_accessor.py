@@ -186,6 +186,38 @@ class AzureReportDBAccessorTest(MasuTestCase):
             self.assertEquals(len(bills), 1)
             self.assertEquals(bills[0].id, bill2.id)
 
+    def test_populate_tags_summary_table_for_bills(self):
+        """Test that only the given bills are summarized and their vanished keys removed."""
+        tags_summary_name = AZURE_REPORT_TABLE_MAP["tags_summary"]
+        today = DateAccessor().today_with_timezone("UTC")
+        bills = []
+        for bill_date in (today, today - relativedelta(months=1)):
+            bill = self.creator.create_azure_cost_entry_bill(
+                provider_uuid=self.azure_provider_uuid, bill_date=bill_date
+            )
+            product = self.creator.create_azure_cost_entry_product(provider_uuid=self.azure_provider_uuid)
+            meter = self.creator.create_azure_meter(provider_uuid=self.azure_provider_uuid)
+            self.creator.create_azure_cost_entry_line_item(bill, product, meter)
+            bills.append(bill)
+
+        query = self.accessor._get_db_obj_query(tags_summary_name)
+        with schema_context(self.schema):
+            for bill in bills:
+                query.model.objects.create(key="vanished", values=["value"], cost_entry_bill=bill)
+
+        self.accessor.populate_tags_summary_table([str(bills[0].id)])
+
+        line_items = self.accessor._get_db_obj_query(AZURE_REPORT_TABLE_MAP["line_item"])
+        with schema_context(self.schema):
+            expected_values = {}
+            for line_item in line_items.filter(cost_entry_bill=bills[0]):
+                for key, value in (line_item.tags or {}).items():
+                    expected_values.setdefault(key, set()).add(value)
+
+            summarized = {tag.key: tag.values for tag in query.filter(cost_entry_bill=bills[0])}
+            self.assertEqual(summarized, {key: sorted(values) for key, values in expected_values.items()})
+            self.assertEqual([tag.key for tag in query.filter(cost_entry_bill=bills[1])], ["vanished"])
+
     def test_populate_line_item_daily_summary_table(self):
         """Test that the daily summary table is populated."""
         summary_table_name = AZURE_REPORT_TABLE_MAP["line_item_daily_summary"]
@@ -416,6 +416,45 @@ class OCPReportDBAccessorTest(MasuTestCase):
 
             self.assertEqual(sorted(tag_keys), sorted(expected_tag_keys))
 
+    def test_populate_pod_label_summary_table_for_report_periods(self):
+        """Test that only the given report periods are summarized and their vanished keys removed."""
+        agg_table_name = OCP_REPORT_TABLE_MAP["pod_label_summary"]
+        today = DateAccessor().today_with_timezone("UTC")
+        last_month = today - relativedelta.relativedelta(months=1)
+        periods = []
+        for start_date in (today, last_month):
+            period = self.creator.create_ocp_report_period(
+                self.ocp_provider_uuid, period_date=start_date, cluster_id=self.cluster_id
+            )
+            report = self.creator.create_ocp_report(period, start_date)
+            self.creator.create_ocp_usage_line_item(period, report)
+            periods.append(period)
+
+        query = self.accessor._get_db_obj_query(agg_table_name)
+        with schema_context(self.schema):
+            for period in periods:
+                query.model.objects.create(key="vanished", values=["value"], report_period=period)
+
+        self.accessor.populate_line_item_daily_table(last_month, today, self.cluster_id)
+        self.accessor.populate_pod_label_summary_table([str(periods[0].id)])
+
+        with schema_context(self.schema):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    """SELECT DISTINCT key, value
+                        FROM reporting_ocpusagelineitem_daily,
+                            jsonb_each_text(pod_labels) labels
+                        WHERE report_period_id = %s""",
+                    [periods[0].id],
+                )
+                expected_values = {}
+                for key, value in cursor.fetchall():
+                    expected_values.setdefault(key, []).append(value)
+
+            summarized = {tag.key: tag.values for tag in query.filter(report_period=periods[0])}
+            self.assertEqual(summarized, {key: sorted(values) for key, values in expected_values.items()})
+            self.assertEqual([tag.key for tag in query.filter(report_period=periods[1])], ["vanished"])
+
     def test_populate_volume_claim_label_summary_table(self):
         """Test that the volume claim summary table is populated."""
         report_table_name = OCP_REPORT_TABLE_MAP["report"]
@@ -564,132 +603,6 @@ class OCPReportDBAccessorTest(MasuTestCase):
         with schema_context(self.schema):
             self.assertEqual(usage_report_query.count(), 0)
 
-    def test_get_pod_cpu_core_hours(self):
-        """Test that gets pod cpu usage/request."""
-        start_date, end_date = self._populate_pod_summary()
-        table_name = OCP_REPORT_TABLE_MAP["line_item_daily_summary"]
-
-        # Verify that the line items for the test cluster_id are returned
-        cluster_id = self.accessor._get_db_obj_query(table_name).first().cluster_id
-        reports = self.accessor._get_db_obj_query(table_name).filter(cluster_id=cluster_id)
-
-        expected_usage_reports = {entry.id: entry.pod_usage_cpu_core_hours for entry in reports}
-        expected_request_reports = {entry.id: entry.pod_usage_cpu_core_hours for entry in reports}
-        cpu_usage_query = self.accessor.get_pod_usage_cpu_core_hours(start_date, end_date, cluster_id)
-        cpu_request_query = self.accessor.get_pod_request_cpu_core_hours(start_date, end_date, cluster_id)
-
-        self.assertEqual(len(cpu_usage_query.keys()), len(expected_usage_reports.keys()))
-        self.assertEqual(len(cpu_request_query.keys()), len(expected_request_reports.keys()))
-
-        # Verify that no line items are returned for an incorrect cluster_id
-        wrong_cluster_id = cluster_id + "bad"
-        cpu_usage_query = self.accessor.get_pod_usage_cpu_core_hours(start_date, end_date, wrong_cluster_id)
-        self.assertEqual(len(cpu_usage_query.keys()), 0)
-        cpu_request_query = self.accessor.get_pod_request_cpu_core_hours(start_date, end_date, wrong_cluster_id)
-        self.assertEqual(len(cpu_request_query.keys()), 0)
-
-    def test_get_pod_cpu_core_hours_no_cluster_id(self):
-        """Test that gets pod cpu usage/request without cluster id."""
-        start_date, end_date = self._populate_pod_summary()
-        table_name = OCP_REPORT_TABLE_MAP["line_item_daily_summary"]
-        # Verify that the line items for the test cluster_id are returned
-        reports = self.accessor._get_db_obj_query(table_name).filter(data_source="Pod").all()
-
-        expected_usage_reports = {entry.id: entry.pod_usage_cpu_core_hours for entry in reports}
-        expected_request_reports = {entry.id: entry.pod_usage_cpu_core_hours for entry in reports}
-        cpu_usage_query = self.accessor.get_pod_usage_cpu_core_hours(start_date, end_date)
-        cpu_request_query = self.accessor.get_pod_request_cpu_core_hours(start_date, end_date)
-
-        self.assertEqual(len(cpu_usage_query.keys()), len(expected_usage_reports.keys()))
-        self.assertEqual(len(cpu_request_query.keys()), len(expected_request_reports.keys()))
-
-    def test_get_pod_memory_gigabyte_hours(self):
-        """Test that gets pod memory usage/request."""
-        start_date, end_date = self._populate_pod_summary()
-        table_name = OCP_REPORT_TABLE_MAP["line_item_daily_summary"]
-
-        # Verify that the line items for the test cluster_id are returned
-        cluster_id = self.accessor._get_db_obj_query(table_name).first().cluster_id
-        reports = self.accessor._get_db_obj_query(table_name).filter(cluster_id=cluster_id)
-
-        expected_usage_reports = {entry.id: entry.pod_usage_memory_gigabyte_hours for entry in reports}
-        expected_request_reports = {entry.id: entry.pod_request_memory_gigabyte_hours for entry in reports}
-        mem_usage_query = self.accessor.get_pod_usage_memory_gigabyte_hours(start_date, end_date, cluster_id)
-        mem_request_query = self.accessor.get_pod_request_memory_gigabyte_hours(start_date, end_date, cluster_id)
-
-        self.assertEqual(len(mem_usage_query.keys()), len(expected_usage_reports.keys()))
-        self.assertEqual(len(mem_request_query.keys()), len(expected_request_reports.keys()))
-
-        # Verify that no line items are returned for an incorrect cluster_id
-        wrong_cluster_id = cluster_id + "bad"
-        mem_usage_query = self.accessor.get_pod_usage_cpu_core_hours(start_date, end_date, wrong_cluster_id)
-        self.assertEqual(len(mem_usage_query.keys()), 0)
-        mem_request_query = self.accessor.get_pod_usage_cpu_core_hours(start_date, end_date, wrong_cluster_id)
-        self.assertEqual(len(mem_request_query.keys()), 0)
-
-    def test_get_pod_memory_gigabyte_hours_no_cluster_id(self):
-        """Test that gets pod memory usage/request without cluster id."""
-        start_date, end_date = self._populate_pod_summary()
-        table_name = OCP_REPORT_TABLE_MAP["line_item_daily_summary"]
-
-        # Verify that the line items for the test cluster_id are returned
-        reports = self.accessor._get_db_obj_query(table_name).filter(data_source="Pod").all()
-
-        expected_usage_reports = {entry.id: entry.pod_usage_memory_gigabyte_hours for entry in reports}
-        expected_request_reports = {entry.id: entry.pod_request_memory_gigabyte_hours for entry in reports}
-        mem_usage_query = self.accessor.get_pod_usage_memory_gigabyte_hours(start_date, end_date)
-        mem_request_query = self.accessor.get_pod_request_memory_gigabyte_hours(start_date, end_date)
-
-        self.assertEqual(len(mem_usage_query.keys()), len(expected_usage_reports.keys()))
-        self.assertEqual(len(mem_request_query.keys()), len(expected_request_reports.keys()))
-
-    def test_get_volume_gigabyte_months(self):
-        """Test that gets pod volume usage/request."""
-        start_date, end_date = self._populate_pod_summary()
-        table_name = OCP_REPORT_TABLE_MAP["line_item_daily_summary"]
-
-        # Verify that the line items for the test cluster_id are returned
-        reports = self.accessor._get_db_obj_query(table_name).filter(cluster_id=self.cluster_id, data_source="Storage")
-
-        expected_usage_reports = {entry.id: entry.persistentvolumeclaim_usage_gigabyte_months for entry in reports}
-        expected_request_reports = {entry.id: entry.volume_request_storage_gigabyte_months for entry in reports}
-        vol_usage_query = self.accessor.get_persistentvolumeclaim_usage_gigabyte_months(
-            start_date, end_date, self.cluster_id
-        )
-        vol_request_query = self.accessor.get_volume_request_storage_gigabyte_months(
-            start_date, end_date, self.cluster_id
-        )
-
-        self.assertEqual(len(vol_usage_query.keys()), len(expected_usage_reports.keys()))
-        self.assertEqual(len(vol_request_query.keys()), len(expected_request_reports.keys()))
-
-        # Verify that no line items are returned for an incorrect cluster_id
-        wrong_cluster_id = self.cluster_id + "bad"
-        vol_usage_query = self.accessor.get_persistentvolumeclaim_usage_gigabyte_months(
-            start_date, end_date, wrong_cluster_id
-        )
-        self.assertEqual(len(vol_usage_query.keys()), 0)
-        vol_request_query = self.accessor.get_volume_request_storage_gigabyte_months(
-            start_date, end_date, wrong_cluster_id
-        )
-        self.assertEqual(len(vol_request_query.keys()), 0)
-
-    def test_get_volume_gigabyte_months_no_cluster_id(self):
-        """Test that gets pod volume usage/request without cluster id."""
-        start_date, end_date = self._populate_pod_summary()
-        table_name = OCP_REPORT_TABLE_MAP["line_item_daily_summary"]
-
-        # Verify that the line items for the test cluster_id are returned
-        reports = self.accessor._get_db_obj_query(table_name).filter(data_source="Storage").all()
-
-        expected_usage_reports = {entry.id: entry.persistentvolumeclaim_usage_gigabyte_months for entry in reports}
-        expected_request_reports = {entry.id: entry.volume_request_storage_gigabyte_months for entry in reports}
-        vol_usage_query = self.accessor.get_persistentvolumeclaim_usage_gigabyte_months(start_date, end_date)
-        vol_request_query = self.accessor.get_volume_request_storage_gigabyte_months(start_date, end_date)
-
-        self.assertEqual(len(vol_usage_query.keys()), len(expected_usage_reports.keys()))
-        self.assertEqual(len(vol_request_query.keys()), len(expected_request_reports.keys()))
-
     def test_get_daily_usage_query_for_clusterid(self):
         """Test that daily usage getter is correct."""
         self._populate_pod_summary()
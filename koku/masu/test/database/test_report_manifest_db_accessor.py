@@ -78,6 +78,16 @@ class ReportManifestDBAccessorTest(IamTestCase):
         self.assertIsNotNone(manifest)
         self.assertEqual(added_manifest, manifest)
 
+    def test_increment_num_processed_files(self):
+        """Test that the processed file count is incremented in the database."""
+        with schema_context(self.schema):
+            manifest = self.manifest_accessor.add(**self.manifest_dict)
+            stale_manifest = self.manifest_accessor.get_manifest_by_id(manifest.id)
+
+            self.assertEqual(self.manifest_accessor.increment_num_processed_files(manifest), 1)
+            self.assertEqual(self.manifest_accessor.increment_num_processed_files(stale_manifest), 2)
+            self.assertEqual(self.manifest_accessor.get_manifest_by_id(manifest.id).num_processed_files, 2)
+
     def test_mark_manifest_as_updated(self):
         """Test that the manifest is marked updated."""
         with schema_context(self.schema):
@@ -17,6 +17,7 @@
 """Test the ReportingCommonDBAccessor utility object."""
 import copy
 from unittest.mock import Mock
+from unittest.mock import patch
 
 from masu.database import AWS_CUR_TABLE_MAP
 from masu.database.reporting_common_db_accessor import ReportingCommonDBAccessor
@@ -53,6 +54,18 @@ class ReportingCommonDBAccessorTest(MasuTestCase):
         for table in tables:
             self.assertIn(table, keys)
 
+    def test_generate_column_map_cached(self):
+        """Assert the column map is read from the database once and copied for each accessor."""
+        ReportingCommonDBAccessor.clear_column_map_cache()
+        expected = ReportingCommonDBAccessor().column_map
+        with patch("masu.database.reporting_common_db_accessor.ReportColumnMap.objects") as mock_objects:
+            column_map = ReportingCommonDBAccessor().column_map
+            mock_objects.all.assert_not_called()
+        self.assertEqual(column_map, expected)
+
+        column_map[AWS_CUR_TABLE_MAP["bill"]]["test"] = "test"
+        self.assertNotIn("test", ReportingCommonDBAccessor().column_map[AWS_CUR_TABLE_MAP["bill"]])
+
     def test_add(self):
         """Test the add() function."""
         with ReportingCommonDBAccessor() as accessor:
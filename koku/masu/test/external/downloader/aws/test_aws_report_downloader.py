@@ -140,11 +140,39 @@ class FakeSessionDownloadError:
         if "cur" in service:
             return Mock(**{"describe_report_definitions.return_value": fake_report})
         elif "s3" in service:
-            return Mock(**{"get_object.side_effect": mock_kwargs_error})
+            return Mock(**{"head_object.side_effect": mock_kwargs_error, "get_object.side_effect": mock_kwargs_error})
         else:
             return Mock()
 
 
+class FakeS3Client:
+    """In-memory S3 stand-in that serves objects by byte range."""
+
+    def __init__(self, objects):
+        """Initialize the client with a dict of key to bytes."""
+        self.objects = objects
+        self.ranges = []
+
+    def _etag(self, key):
+        return f'"{hash(self.objects[key])}"'
+
+    def head_object(self, Bucket, Key):
+        """Return the object metadata."""
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {"ETag": self._etag(Key), "ContentLength": len(self.objects[Key])}
+
+    def get_object(self, Bucket, Key, Range=None, IfMatch=None):
+        """Return the object, or an inclusive byte range of it."""
+        if IfMatch and IfMatch != self._etag(Key):
+            raise ClientError({"Error": {"Code": "PreconditionFailed"}}, "GetObject")
+        if Range is None:
+            return {"Body": io.BytesIO(self.objects[Key])}
+        start, end = (int(value) for value in Range.replace("bytes=", "").split("-"))
+        self.ranges.append((start, end))
+        return {"Body": io.BytesIO(self.objects[Key][start : end + 1])}  # noqa: E203
+
+
 class AWSReportDownloaderTest(MasuTestCase):
     """Test Cases for the AWS S3 functions."""
 
@@ -287,7 +315,7 @@ class AWSReportDownloaderTest(MasuTestCase):
     def test_check_size_success(self, fake_session, fake_shutil):
         """Test _check_size is successful."""
         fake_client = Mock()
-        fake_client.get_object.return_value = {"ContentLength": 123456, "Body": Mock()}
+        fake_client.head_object.return_value = {"ContentLength": 123456}
         fake_shutil.disk_usage.return_value = (10, 10, 4096 * 1024 * 1024)
 
         auth_credential = fake_arn(service="iam", generate_account_id=True)
@@ -305,7 +333,7 @@ class AWSReportDownloaderTest(MasuTestCase):
     def test_check_size_fail_nospace(self, fake_session, fake_shutil):
         """Test _check_size fails if there is no more space."""
         fake_client = Mock()
-        fake_client.get_object.return_value = {"ContentLength": 123456, "Body": Mock()}
+        fake_client.head_object.return_value = {"ContentLength": 123456}
         fake_shutil.disk_usage.return_value = (10, 10, 10)
 
         auth_credential = fake_arn(service="iam", generate_account_id=True)
@@ -322,7 +350,7 @@ class AWSReportDownloaderTest(MasuTestCase):
     def test_check_size_fail_nosize(self, fake_session):
         """Test _check_size fails if there report has no size."""
         fake_client = Mock()
-        fake_client.get_object.return_value = {}
+        fake_client.head_object.return_value = {}
 
         auth_credential = fake_arn(service="iam", generate_account_id=True)
         downloader = AWSReportDownloader(
@@ -339,7 +367,8 @@ class AWSReportDownloaderTest(MasuTestCase):
     def test_check_size_inflate_success(self, fake_session, fake_shutil):
         """Test _check_size inflation succeeds."""
         fake_client = Mock()
-        fake_client.get_object.return_value = {"ContentLength": 123456, "Body": io.BytesIO(b"\xd2\x02\x96I")}
+        fake_client.head_object.return_value = {"ContentLength": 123456}
+        fake_client.get_object.return_value = {"Body": io.BytesIO(b"\xd2\x02\x96I")}
         fake_shutil.disk_usage.return_value = (10, 10, 4096 * 1024 * 1024)
 
         auth_credential = fake_arn(service="iam", generate_account_id=True)
@@ -357,7 +386,8 @@ class AWSReportDownloaderTest(MasuTestCase):
     def test_check_size_inflate_fail(self, fake_session, fake_shutil):
         """Test _check_size fails when inflation fails."""
         fake_client = Mock()
-        fake_client.get_object.return_value = {"ContentLength": 123456, "Body": io.BytesIO(b"\xd2\x02\x96I")}
+        fake_client.head_object.return_value = {"ContentLength": 123456}
+        fake_client.get_object.return_value = {"Body": io.BytesIO(b"\xd2\x02\x96I")}
         fake_shutil.disk_usage.return_value = (10, 10, 1234567)
 
         auth_credential = fake_arn(service="iam", generate_account_id=True)
@@ -375,7 +405,8 @@ class AWSReportDownloaderTest(MasuTestCase):
     def test_download_file_check_size_fail(self, fake_session, fake_shutil):
         """Test _check_size fails when key is fake."""
         fake_client = Mock()
-        fake_client.get_object.return_value = {"ContentLength": 123456, "Body": io.BytesIO(b"\xd2\x02\x96I")}
+        fake_client.head_object.return_value = {"ContentLength": 123456}
+        fake_client.get_object.return_value = {"Body": io.BytesIO(b"\xd2\x02\x96I")}
         fake_shutil.disk_usage.return_value = (10, 10, 1234567)
 
         auth_credential = fake_arn(service="iam", generate_account_id=True)
@@ -393,7 +424,7 @@ class AWSReportDownloaderTest(MasuTestCase):
         """Test _check_size fails when there is a downloader error."""
         fake_response = {"Error": {"Code": self.fake.word()}}
         fake_client = Mock()
-        fake_client.get_object.side_effect = ClientError(fake_response, "masu-test")
+        fake_client.head_object.side_effect = ClientError(fake_response, "masu-test")
 
         auth_credential = fake_arn(service="iam", generate_account_id=True)
         downloader = AWSReportDownloader(
@@ -409,7 +440,7 @@ class AWSReportDownloaderTest(MasuTestCase):
         """Test that downloading a nonexistent file fails with AWSReportDownloaderNoFileError."""
         fake_response = {"Error": {"Code": "NoSuchKey"}}
         fake_client = Mock()
-        fake_client.get_object.side_effect = ClientError(fake_response, "masu-test")
+        fake_client.head_object.side_effect = ClientError(fake_response, "masu-test")
 
         auth_credential = fake_arn(service="iam", generate_account_id=True)
         downloader = AWSReportDownloader(
@@ -420,6 +451,83 @@ class AWSReportDownloaderTest(MasuTestCase):
         with self.assertRaises(AWSReportDownloaderNoFileError):
             downloader.download_file(self.fake.file_path())
 
+    @patch("masu.util.aws.common.get_assume_role_session", return_value=FakeSession)
+    def test_download_file_head_not_found(self, fake_session):
+        """Test that a 404 from head_object raises AWSReportDownloaderNoFileError."""
+        downloader = AWSReportDownloader(
+            self.mock_task, self.fake_customer_name, self.auth_credential, self.fake_bucket_name
+        )
+        downloader.s3_client = FakeS3Client({})
+
+        with self.assertRaises(AWSReportDownloaderNoFileError):
+            downloader.download_file(self.fake.file_path())
+
+    @patch("masu.external.downloader.transfer.Config.REPORT_DOWNLOAD_CHUNK_SIZE", 10)
+    @patch("masu.util.aws.common.get_assume_role_session", return_value=FakeSession)
+    def test_download_file_in_ranges(self, fake_session):
+        """Test that a file is downloaded in ranges and not again while its ETag is unchanged."""
+        key = "prefix/report/20200101-20200201/report-1.csv"
+        content = b"a,b,c\n" * 7
+        s3_client = FakeS3Client({key: content})
+        downloader = AWSReportDownloader(
+            self.mock_task, self.fake_customer_name, self.auth_credential, self.fake_bucket_name
+        )
+        downloader.s3_client = s3_client
+
+        full_file_path, etag = downloader.download_file(key)
+        with open(full_file_path, "rb") as local_file:
+            self.assertEqual(local_file.read(), content)
+        self.assertEqual(s3_client.ranges, [(0, 9), (10, 19), (20, 29), (30, 39), (40, 41)])
+
+        s3_client.ranges = []
+        self.assertEqual(downloader.download_file(key, stored_etag=etag), (full_file_path, etag))
+        self.assertEqual(s3_client.ranges, [])
+
+    @patch("masu.external.downloader.transfer.Config.REPORT_DOWNLOAD_CHUNK_SIZE", 10)
+    @patch("masu.util.aws.common.get_assume_role_session", return_value=FakeSession)
+    def test_download_file_resumes(self, fake_session):
+        """Test that an interrupted download continues from its partial file."""
+        key = "prefix/report/20200101-20200201/report-1.csv"
+        content = b"a,b,c\n" * 7
+        s3_client = FakeS3Client({key: content})
+        downloader = AWSReportDownloader(
+            self.mock_task, self.fake_customer_name, self.auth_credential, self.fake_bucket_name
+        )
+        downloader.s3_client = s3_client
+
+        first_range = s3_client.get_object(Bucket=BUCKET, Key=key, Range="bytes=0-9")
+        interrupted = ClientError({"Error": {"Code": "InternalError"}}, "GetObject")
+        with patch.object(s3_client, "get_object", side_effect=[first_range, interrupted]):
+            with self.assertRaises(AWSReportDownloaderError):
+                downloader.download_file(key)
+
+        s3_client.ranges = []
+        full_file_path, _ = downloader.download_file(key)
+        with open(full_file_path, "rb") as local_file:
+            self.assertEqual(local_file.read(), content)
+        self.assertEqual(s3_client.ranges[0], (10, 19))
+
+    @patch("masu.util.aws.common.get_assume_role_session", return_value=FakeSession)
+    def test_stream_file(self, fake_session):
+        """Test that a streamed file is read from S3 and not written locally."""
+        key = "prefix/report/20200101-20200201/report-1.csv"
+        content = b"a,b,c\n" * 7
+        s3_client = FakeS3Client({key: content})
+        downloader = AWSReportDownloader(
+            self.mock_task, self.fake_customer_name, self.auth_credential, self.fake_bucket_name
+        )
+        downloader.s3_client = s3_client
+
+        full_file_path, etag, open_stream = downloader.stream_file(key)
+        self.assertEqual(etag, s3_client.head_object(BUCKET, key)["ETag"])
+        self.assertEqual(full_file_path, downloader._get_local_file_path(key))
+        self.assertEqual(open_stream().read(), content)
+        self.assertFalse(os.path.exists(full_file_path))
+
+        s3_client.objects[key] = b"changed"
+        with self.assertRaises(AWSReportDownloaderError):
+            open_stream()
+
     @patch(
         "masu.external.downloader.aws.aws_report_downloader.AWSReportDownloader.check_if_manifest_should_be_downloaded"
     )
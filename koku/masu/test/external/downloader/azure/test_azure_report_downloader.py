@@ -28,6 +28,7 @@ from masu.external.downloader.azure.azure_report_downloader import AzureReportDo
 from masu.external.downloader.azure.azure_report_downloader import AzureReportDownloaderError
 from masu.external.downloader.azure.azure_service import AzureCostReportNotFound
 from masu.external.downloader.report_downloader_base import ReportDownloaderBase
+from masu.external.downloader.transfer import TransferError
 from masu.test import MasuTestCase
 from masu.util import common as utils
 
@@ -48,6 +49,7 @@ class MockAzureService:
         self.export_uuid = "9c308505-61d3-487c-a1bb-017956c9170a"
         self.export_file = f"{self.export_name}_{self.export_uuid}.csv"
         self.export_etag = "absdfwef"
+        self.export_content = b"csvcontents"
         self.export_key = f"{self.report_path}/{self.export_file}"
         self.bad_test_date = datetime(2019, 7, 15)
         self.bad_month_range = utils.month_date_range(self.bad_test_date)
@@ -80,6 +82,7 @@ class MockAzureService:
 
         class ExportProperties:
             etag = self.export_etag
+            content_length = len(self.export_content)
 
         class Export:
             name = self.export_file
@@ -92,6 +95,10 @@ class MockAzureService:
             raise AzureCostReportNotFound(message)
         return mock_export
 
+    def get_cost_export_range(self, blob_name, container_name, start, end):
+        """Get a range of an export."""
+        return self.export_content[start : end + 1]  # noqa: E203
+
     def download_cost_export(self, key, container_name, destination=None):
         """Get exports."""
         file_path = destination
@@ -197,6 +204,8 @@ class AzureReportDownloaderTest(MasuTestCase):
         full_file_path, etag = self.downloader.download_file(self.mock_data.export_key)
         self.assertEqual(full_file_path, expected_full_path)
         self.assertEqual(etag, self.mock_data.export_etag)
+        with open(full_file_path, "rb") as export_file:
+            self.assertEqual(export_file.read(), self.mock_data.export_content)
 
     def test_download_missing_file(self):
         """Test that Azure report is not downloaded for incorrect key."""
@@ -205,6 +214,17 @@ class AzureReportDownloaderTest(MasuTestCase):
         with self.assertRaises(AzureReportDownloaderError):
             self.downloader.download_file(key)
 
+    @patch(
+        "masu.external.downloader.azure.azure_report_downloader.download_ranges",
+        side_effect=TransferError("Downloaded 0 bytes, expected 100"),
+    )
+    def test_download_file_transfer_error(self, mock_download_ranges):
+        """Test that a failed ranged transfer is raised as an Azure downloader error."""
+        with patch("masu.external.downloader.azure.azure_report_downloader.os.path.isfile", return_value=False):
+            with self.assertRaises(AzureReportDownloaderError):
+                self.downloader.download_file(self.mock_data.export_key)
+        mock_download_ranges.assert_called()
+
     @patch("masu.external.downloader.azure.azure_report_downloader.AzureReportDownloader")
     def test_download_file_matching_etag(self, mock_download_cost_method):
         """Test that Azure report report is not downloaded with matching etag."""
@@ -16,6 +16,7 @@
 #
 """Test the AzureService object."""
 from datetime import datetime
+from unittest.mock import Mock
 from unittest.mock import patch
 
 from dateutil.relativedelta import relativedelta
@@ -125,6 +126,10 @@ class MockBlobService:
         """Get the blob path."""
         return "/to/my/export"
 
+    def get_blob_to_bytes(self, container_name, export_name, start_range=None, end_range=None):
+        """Get a range of the blob content."""
+        return Mock(content=b"csvcontents"[start_range : end_range + 1])  # noqa: E203
+
 
 class MockStorageAccount:
     """Mock an azure storage account."""
@@ -400,6 +405,11 @@ class AzureServiceTest(MasuTestCase):
         exports = client.describe_cost_management_exports()
         self.assertEquals(exports, [])
 
+    def test_get_cost_export_range(self):
+        """Test that a byte range of a cost export is returned."""
+        key = "{}_{}_day_{}".format(self.container_name, "blob", self.current_date_time.day)
+        self.assertEqual(self.client.get_cost_export_range(key, self.container_name, 3, 6), b"cont")
+
     def test_download_cost_export(self):
         """Test that cost management exports are downloaded."""
         key = "{}_{}_day_{}".format(self.container_name, "blob", self.current_date_time.day)
@@ -1,6 +1,7 @@
 """Test the GCPReportDownloader class."""
 import shutil
 from datetime import datetime
+from unittest.mock import ANY
 from unittest.mock import Mock
 from unittest.mock import patch
 from uuid import uuid4
@@ -13,6 +14,7 @@ from masu.external.downloader.gcp.gcp_report_downloader import DATA_DIR
 from masu.external.downloader.gcp.gcp_report_downloader import GCPReportDownloader
 from masu.external.downloader.gcp.gcp_report_downloader import GCPReportDownloaderError
 from masu.external.downloader.gcp.gcp_report_downloader import GCPReportDownloaderNoFileError
+from masu.external.downloader.transfer import TransferError
 from masu.test import MasuTestCase
 
 FAKE = Faker()
@@ -306,8 +308,9 @@ class GCPReportDownloaderTest(MasuTestCase):
             mock_bucket_info.get_blob.return_value = None
             downloader.download_file(key)
 
+    @patch("masu.external.downloader.gcp.gcp_report_downloader.download_ranges")
     @patch("masu.external.downloader.gcp.gcp_report_downloader.os.makedirs")
-    def test_download_file_without_etag(self, mock_makedirs):
+    def test_download_file_without_etag(self, mock_makedirs, mock_download_ranges):
         """Assert download_file downloads and returns local path with GCP's etag."""
         key = FAKE.file_path()
         expected_etag = FAKE.slug()
@@ -321,12 +324,13 @@ class GCPReportDownloaderTest(MasuTestCase):
             mock_get_local_path.return_value = expected_full_local_path
             results = downloader.download_file(key)
             mock_bucket_info.get_blob.assert_called_with(key)
-        mock_blob.download_to_filename.assert_called_with(expected_full_local_path)
+        mock_download_ranges.assert_called_with(ANY, mock_blob.size, expected_full_local_path, version=expected_etag)
         mock_makedirs.assert_called()
         self.assertEqual(results, (expected_full_local_path, expected_etag))
 
+    @patch("masu.external.downloader.gcp.gcp_report_downloader.download_ranges")
     @patch("masu.external.downloader.gcp.gcp_report_downloader.os.makedirs")
-    def test_download_file_with_mismatched_etag(self, mock_makedirs):
+    def test_download_file_with_mismatched_etag(self, mock_makedirs, mock_download_ranges):
         """
         Assert download_file downloads and returns local path with GCP's etag.
 
@@ -349,10 +353,52 @@ class GCPReportDownloaderTest(MasuTestCase):
             mock_get_local_path.return_value = expected_full_local_path
             results = downloader.download_file(key, stored_etag)
             mock_bucket_info.get_blob.assert_called_with(key)
-        mock_blob.download_to_filename.assert_called_with(expected_full_local_path)
+        mock_download_ranges.assert_called_with(ANY, mock_blob.size, expected_full_local_path, version=expected_etag)
         mock_makedirs.assert_called()
         self.assertEqual(results, (expected_full_local_path, expected_etag))
 
+    @patch("masu.external.downloader.gcp.gcp_report_downloader.download_ranges")
+    @patch("masu.external.downloader.gcp.gcp_report_downloader.os.path.isfile", return_value=True)
+    @patch("masu.external.downloader.gcp.gcp_report_downloader.os.makedirs")
+    def test_download_file_with_matching_etag(self, mock_makedirs, mock_isfile, mock_download_ranges):
+        """Assert download_file skips downloading a local blob whose etag is unchanged."""
+        key = FAKE.file_path()
+        etag = FAKE.slug()
+        mock_blob = MockBlob(etag=etag)
+        expected_full_local_path = FAKE.file_path()
+        downloader = self.create_gcp_downloader_with_mock_gcp_storage()
+        with patch.object(downloader, "_bucket_info") as mock_bucket_info, patch.object(
+            downloader, "_get_local_file_path"
+        ) as mock_get_local_path:
+            mock_bucket_info.get_blob.return_value = mock_blob
+            mock_get_local_path.return_value = expected_full_local_path
+            results = downloader.download_file(key, etag)
+        mock_download_ranges.assert_not_called()
+        self.assertEqual(results, (expected_full_local_path, etag))
+
+    @patch(
+        "masu.external.downloader.gcp.gcp_report_downloader.download_ranges",
+        side_effect=TransferError("Downloaded 0 bytes, expected 100"),
+    )
+    @patch("masu.external.downloader.gcp.gcp_report_downloader.os.makedirs")
+    def test_download_file_transfer_error(self, mock_makedirs, mock_download_ranges):
+        """Assert download_file raises GCPReportDownloaderError when the ranged transfer fails."""
+        key = FAKE.file_path()
+        downloader = self.create_gcp_downloader_with_mock_gcp_storage()
+        with patch.object(downloader, "_bucket_info") as mock_bucket_info, patch.object(
+            downloader, "_get_local_file_path", return_value=FAKE.file_path()
+        ):
+            mock_bucket_info.get_blob.return_value = MockBlob(etag=FAKE.slug())
+            with self.assertRaises(GCPReportDownloaderError):
+                downloader.download_file(key)
+        mock_download_ranges.assert_called()
+
+    def test_download_blob_range(self):
+        """Assert a blob range is requested with inclusive bounds."""
+        mock_blob = MockBlob()
+        GCPReportDownloader._download_blob_range(mock_blob, 0, 9)
+        mock_blob.download_as_string.assert_called_with(start=0, end=9)
+
     def test_get_local_directory_path(self):
         """Assert expected local directory path construction."""
         customer_name = "Bilbo/Baggins"
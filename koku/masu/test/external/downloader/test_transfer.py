@@ -0,0 +1,165 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test the report downloader transfer helpers."""
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from masu.external.downloader.transfer import download_ranges
+from masu.external.downloader.transfer import map_concurrently
+from masu.external.downloader.transfer import partial_file_path
+from masu.external.downloader.transfer import remove_stale_partial_files
+from masu.external.downloader.transfer import TransferError
+from masu.test import MasuTestCase
+
+
+class RangeServer:
+    """Serve byte ranges of some content, optionally failing after a number of requests."""
+
+    def __init__(self, content, fail_after=None):
+        """Initialize the server."""
+        self.content = content
+        self.fail_after = fail_after
+        self.ranges = []
+
+    def __call__(self, start, end):
+        """Return the inclusive range of the content."""
+        if self.fail_after is not None and len(self.ranges) >= self.fail_after:
+            raise ConnectionError("Connection reset")
+        self.ranges.append((start, end))
+        return self.content[start : end + 1]  # noqa: E203
+
+
+class TransferTest(MasuTestCase):
+    """Test Cases for the transfer helpers."""
+
+    def setUp(self):
+        """Set up a download directory."""
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.destination = os.path.join(self.directory, "report.csv")
+        self.content = b"0123456789" * 5 + b"abc"
+
+    def tearDown(self):
+        """Remove the download directory."""
+        super().tearDown()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def read_destination(self):
+        """Return the downloaded content."""
+        with open(self.destination, "rb") as downloaded:
+            return downloaded.read()
+
+    def test_partial_file_path(self):
+        """Test that partial files are named for the object version."""
+        self.assertEqual(partial_file_path(self.destination), f"{self.destination}.part")
+        first = partial_file_path(self.destination, '"etag-1"')
+        second = partial_file_path(self.destination, '"etag-2"')
+        self.assertNotEqual(first, second)
+        self.assertTrue(first.startswith(self.destination))
+
+    def test_download_ranges(self):
+        """Test that content is downloaded in chunk sized ranges."""
+        server = RangeServer(self.content)
+        download_ranges(server, len(self.content), self.destination, version="v1", chunk_size=20)
+
+        self.assertEqual(self.read_destination(), self.content)
+        self.assertEqual(server.ranges, [(0, 19), (20, 39), (40, 52)])
+        self.assertFalse(os.path.exists(partial_file_path(self.destination, "v1")))
+
+    def test_download_ranges_resumes(self):
+        """Test that an interrupted download continues from the partial file."""
+        with self.assertRaises(ConnectionError):
+            download_ranges(
+                RangeServer(self.content, fail_after=2), len(self.content), self.destination, "v1", chunk_size=10
+            )
+        self.assertFalse(os.path.exists(self.destination))
+        self.assertEqual(os.path.getsize(partial_file_path(self.destination, "v1")), 20)
+
+        server = RangeServer(self.content)
+        download_ranges(server, len(self.content), self.destination, version="v1", chunk_size=10)
+
+        self.assertEqual(self.read_destination(), self.content)
+        self.assertEqual(server.ranges[0], (20, 29))
+
+    def test_download_ranges_new_version_starts_over(self):
+        """Test that a partial file of another object version is not resumed."""
+        with self.assertRaises(ConnectionError):
+            download_ranges(
+                RangeServer(self.content, fail_after=2), len(self.content), self.destination, "v1", chunk_size=10
+            )
+
+        server = RangeServer(self.content)
+        download_ranges(server, len(self.content), self.destination, version="v2", chunk_size=10)
+
+        self.assertEqual(self.read_destination(), self.content)
+        self.assertEqual(server.ranges[0], (0, 9))
+        self.assertFalse(os.path.exists(partial_file_path(self.destination, "v1")))
+
+    def test_remove_stale_partial_files(self):
+        """Test that only the partial files of other versions of the destination are removed."""
+        current = partial_file_path(self.destination, "v2")
+        stale = [partial_file_path(self.destination), partial_file_path(self.destination, "v1")]
+        unrelated = os.path.join(self.directory, "report.csv.gz.part")
+        for path in stale + [current, unrelated]:
+            with open(path, "wb") as partial_file:
+                partial_file.write(b"0")
+
+        self.assertEqual(sorted(remove_stale_partial_files(self.destination, current)), sorted(stale))
+        self.assertTrue(os.path.exists(current))
+        self.assertTrue(os.path.exists(unrelated))
+
+    def test_download_ranges_empty_response(self):
+        """Test that an empty range response raises TransferError."""
+        with self.assertRaises(TransferError):
+            download_ranges(lambda start, end: b"", 10, self.destination, chunk_size=5)
+
+    def test_map_concurrently(self):
+        """Test that results keep the order of the items when run on several threads."""
+        threads = set()
+
+        def work(item):
+            threads.add(threading.get_ident())
+            time.sleep(0.01 * (5 - item))
+            return item * 2
+
+        self.assertEqual(map_concurrently(work, range(5), max_workers=3), [0, 2, 4, 6, 8])
+        self.assertGreater(len(threads), 1)
+
+    def test_map_concurrently_serial(self):
+        """Test that a single worker runs the items on the calling thread."""
+        threads = set()
+
+        def work(item):
+            threads.add(threading.get_ident())
+            return item
+
+        self.assertEqual(map_concurrently(work, [1, 2, 3], max_workers=1), [1, 2, 3])
+        self.assertEqual(threads, {threading.get_ident()})
+
+    def test_map_concurrently_raises(self):
+        """Test that an exception raised by any call is re-raised."""
+
+        def work(item):
+            if item == 2:
+                raise TransferError("failed")
+            return item
+
+        with self.assertRaises(TransferError):
+            map_concurrently(work, [1, 2, 3], max_workers=2)
@@ -0,0 +1,176 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test the AWSColumnarReportProcessor."""
+import copy
+import shutil
+import tempfile
+
+import pandas
+from tenant_schemas.utils import schema_context
+
+from masu.database import AWS_CUR_TABLE_MAP
+from masu.database.aws_report_db_accessor import AWSReportDBAccessor
+from masu.database.reporting_common_db_accessor import ReportingCommonDBAccessor
+from masu.external import GZIP_COMPRESSED
+from masu.external import UNCOMPRESSED
+from masu.processor.aws.aws_columnar_report_processor import AWSColumnarReportProcessor
+from masu.processor.aws.aws_report_processor import AWSReportProcessor
+from masu.test import MasuTestCase
+
+
+class AWSColumnarReportProcessorTest(MasuTestCase):
+    """Test Cases for the AWSColumnarReportProcessor object."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the test class with required objects."""
+        super().setUpClass()
+        cls.test_report_test_path = "./koku/masu/test/data/test_cur.csv"
+        cls.test_report_gzip_test_path = "./koku/masu/test/data/test_cur.csv.gz"
+
+        with ReportingCommonDBAccessor() as report_common_db:
+            cls.column_map = report_common_db.column_map
+
+        _report_tables = copy.deepcopy(AWS_CUR_TABLE_MAP)
+        _report_tables.pop("line_item_daily", None)
+        _report_tables.pop("line_item_daily_summary", None)
+        _report_tables.pop("tags_summary", None)
+        _report_tables.pop("ocp_on_aws_daily_summary", None)
+        _report_tables.pop("ocp_on_aws_project_daily_summary", None)
+        cls.report_tables = list(_report_tables.values())
+
+    def setUp(self):
+        """Set up shared variables."""
+        super().setUp()
+        self.temp_dir = tempfile.mkdtemp()
+        self.test_report = f"{self.temp_dir}/test_cur.csv"
+        self.test_report_gzip = f"{self.temp_dir}/test_cur.csv.gz"
+        shutil.copy2(self.test_report_test_path, self.test_report)
+        shutil.copy2(self.test_report_gzip_test_path, self.test_report_gzip)
+
+        self.accessor = AWSReportDBAccessor(self.schema, self.column_map)
+        self.report_schema = self.accessor.report_schema
+
+        self.processor = AWSColumnarReportProcessor(
+            schema_name=self.schema,
+            report_path=self.test_report,
+            compression=UNCOMPRESSED,
+            provider_uuid=self.aws_provider_uuid,
+        )
+
+    def tearDown(self):
+        """Return the database to a pre-test state."""
+        super().tearDown()
+        shutil.rmtree(self.temp_dir)
+
+    def _get_table_counts(self):
+        """Return the row count of each report table."""
+        counts = {}
+        for table_name in self.report_tables:
+            table = getattr(self.report_schema, table_name)
+            with schema_context(self.schema):
+                counts[table_name] = table.objects.count()
+        return counts
+
+    def test_process_matches_row_processor(self):
+        """Test that the columnar engine writes the same rows as the row engine."""
+        line_item_table = getattr(self.report_schema, AWS_CUR_TABLE_MAP["line_item"])
+
+        AWSReportProcessor(
+            schema_name=self.schema,
+            report_path=self.test_report,
+            compression=UNCOMPRESSED,
+            provider_uuid=self.aws_provider_uuid,
+        ).process()
+        with schema_context(self.schema):
+            row_engine_items = list(
+                line_item_table.objects.order_by("id").values("usage_start", "unblended_cost", "tags", "cost_entry_id")
+            )
+            line_item_table.objects.all().delete()
+        expected_counts = self._get_table_counts()
+
+        shutil.copy2(self.test_report_test_path, self.test_report)
+        self.processor.process()
+
+        with schema_context(self.schema):
+            columnar_items = list(
+                line_item_table.objects.order_by("id").values("usage_start", "unblended_cost", "tags", "cost_entry_id")
+            )
+        self.assertEqual(columnar_items, row_engine_items)
+        for table_name, count in self._get_table_counts().items():
+            if table_name == AWS_CUR_TABLE_MAP["line_item"]:
+                self.assertEqual(count, len(row_engine_items))
+            else:
+                self.assertEqual(count, expected_counts[table_name])
+
+    def test_process_gzip(self):
+        """Test the processing of a gzip compressed file."""
+        counts = self._get_table_counts()
+        processor = AWSColumnarReportProcessor(
+            schema_name=self.schema,
+            report_path=self.test_report_gzip,
+            compression=GZIP_COMPRESSED,
+            provider_uuid=self.aws_provider_uuid,
+        )
+        processor.process()
+
+        new_counts = self._get_table_counts()
+        self.assertGreater(new_counts[AWS_CUR_TABLE_MAP["line_item"]], counts[AWS_CUR_TABLE_MAP["line_item"]])
+        self.assertGreater(new_counts[AWS_CUR_TABLE_MAP["bill"]], counts[AWS_CUR_TABLE_MAP["bill"]])
+
+    def test_resolve_dimension(self):
+        """Test that the create function is called once per distinct key."""
+        chunk = pandas.DataFrame({"key": ["a", "b", "a", "c", "b"], "other": ["1", "2", "3", "4", "5"]})
+        calls = []
+
+        def create_func(row):
+            calls.append(row["key"])
+            return len(calls)
+
+        ids = self.processor._resolve_dimension(chunk, ["key"], create_func)
+        self.assertEqual(calls, ["a", "b", "c"])
+        self.assertEqual(list(ids), [1, 2, 1, 3, 2])
+
+    def test_resolve_dimension_missing_columns(self):
+        """Test that a chunk without key columns resolves to a single id."""
+        chunk = pandas.DataFrame({"other": ["1", "2"]})
+        ids = self.processor._resolve_dimension(chunk, ["key"], lambda row: 7)
+        self.assertEqual(list(ids), [7, 7])
+
+    def test_process_tag_columns(self):
+        """Test that tag columns are extracted to JSON per row."""
+        chunk = pandas.DataFrame(
+            {"resourceTags/user:environment": ["prod", ""], "resourceTags/user:app": ["", "web"], "other": ["", ""]}
+        )
+        tags = self.processor._process_tag_columns(chunk)
+        self.assertEqual(list(tags), ['{"environment": "prod"}', '{"app": "web"}'])
+
+    def test_coerce_columns(self):
+        """Test that invalid values are nulled per column type."""
+        table_name = AWS_CUR_TABLE_MAP["line_item"]
+        frame = pandas.DataFrame(
+            {
+                "unblended_cost": ["1.5", "bad", ""],
+                "usage_start": ["2018-06-01T00:00:00Z", "nope", "2018-06-01T01:00:00Z"],
+                "product_code": ["AmazonEC2", "", "AmazonS3"],
+            }
+        )
+        frame = self.processor._coerce_columns(frame, table_name)
+        self.assertEqual(frame["unblended_cost"].notna().tolist(), [True, False, False])
+        self.assertEqual(frame["usage_start"].notna().tolist(), [True, False, True])
+        self.assertEqual(frame["product_code"].notna().tolist(), [True, False, True])
+        self.assertEqual(frame["unblended_cost"].iloc[0], "1.5")
@@ -16,8 +16,10 @@
 #
 """Test the AWSReportDBCleaner utility object."""
 import datetime
+from unittest.mock import patch
 
 from dateutil import relativedelta
+from django.db import transaction
 from tenant_schemas.utils import schema_context
 
 from masu.database import AWS_CUR_TABLE_MAP
@@ -63,6 +65,27 @@ class AWSReportDBCleanerTest(MasuTestCase):
         """Test initializer."""
         self.assertIsNotNone(self.report_schema)
 
+    def test_purge_expired_report_data_drops_partitions(self):
+        """Test that partitions holding only expired line items are dropped, including the legacy one."""
+        tables = [AWS_CUR_TABLE_MAP["line_item"], AWS_CUR_TABLE_MAP["line_item_daily"]]
+        cleaner = AWSReportDBCleaner(self.schema)
+        # DDL is transactional, so rolling back restores the dropped partitions for the other tests.
+        with transaction.atomic():
+            partitions = {table: [name for name, _ in self.accessor.get_partitions(table)] for table in tables}
+            newest_end = max(self.accessor.get_partitions(table)[-1][1] for table in tables)
+            expired_date = newest_end + relativedelta.relativedelta(months=1)
+            for table in tables:
+                self.accessor.create_month_partitions(table, newest_end, expired_date)
+
+            cleaner.purge_expired_report_data(expired_date)
+
+            for table in tables:
+                self.assertEqual(partitions[table][0], f"{table}_legacy")
+                self.assertEqual(
+                    [name for name, _ in self.accessor.get_partitions(table)], [f"{table}_{expired_date:%Y_%m}"]
+                )
+            transaction.set_rollback(True)
+
     def test_purge_expired_report_data_on_date(self):
         """Test to remove report data on a provided date."""
         bill_table_name = AWS_CUR_TABLE_MAP["bill"]
@@ -201,6 +224,16 @@ class AWSReportDBCleanerTest(MasuTestCase):
             self.assertIsNone(self.accessor._get_db_obj_query(line_item_table_name).first())
             self.assertIsNone(self.accessor._get_db_obj_query(cost_entry_table_name).first())
 
+    @patch("masu.processor.aws.aws_report_db_cleaner.AWSReportDBAccessor.populate_ui_summary_tables")
+    def test_purge_expired_report_data_for_provider_rebuilds_ui_summary(self, mock_populate):
+        """Test that removing a provider rebuilds the UI summary window."""
+        cleaner = AWSReportDBCleaner(self.schema)
+        cleaner.purge_expired_report_data(provider_uuid=self.aws_provider_uuid, simulate=True)
+        mock_populate.assert_not_called()
+
+        cleaner.purge_expired_report_data(provider_uuid=self.aws_provider_uuid)
+        mock_populate.assert_called_once_with()
+
     def test_purge_expired_report_data_no_args(self):
         """Test that the provider_uuid deletes all data for the provider."""
         cleaner = AWSReportDBCleaner(self.schema)
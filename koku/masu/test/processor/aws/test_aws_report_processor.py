@@ -19,6 +19,7 @@ import copy
 import csv
 import datetime
 import gzip
+import io
 import json
 import logging
 import os
@@ -241,6 +242,30 @@ class AWSReportProcessorTest(MasuTestCase):
             else:
                 self.assertTrue(count > counts[table_name])
 
+    def test_process_gzip_stream(self):
+        """Test the processing of a gzip compressed report streamed from the object store."""
+        with open(self.test_report_gzip, "rb") as report_file:
+            content = report_file.read()
+        local_path = os.path.join(tempfile.mkdtemp(), "streamed.csv.gz")
+        processor = AWSReportProcessor(
+            schema_name=self.schema,
+            report_path=local_path,
+            compression=GZIP_COMPRESSED,
+            provider_uuid=self.aws_provider_uuid,
+            report_stream=lambda: io.BytesIO(content),
+        )
+        report_schema = self.accessor.report_schema
+        table = getattr(report_schema, AWS_CUR_TABLE_MAP["line_item"])
+        with schema_context(self.schema):
+            count = table.objects.count()
+
+        self.assertFalse(processor._check_for_finalized_bill())
+        self.assertFalse(processor.process())
+
+        with schema_context(self.schema):
+            self.assertGreater(table.objects.count(), count)
+        self.assertFalse(os.path.exists(local_path))
+
     def test_process_duplicates(self):
         """Test that row duplicates are not inserted into the DB."""
         counts = {}
@@ -645,6 +670,25 @@ class AWSReportProcessorTest(MasuTestCase):
         cost_entry_id = self.processor._create_cost_entry(self.row, bill_id, self.accessor)
         self.assertEqual(cost_entry_id, expected_id)
 
+    def test_existing_cost_entries_loaded_per_bill(self):
+        """Test that a new processor loads the cost entries of a bill on its first miss."""
+        bill_id = self.processor._create_cost_entry_bill(self.row, self.accessor)
+        cost_entry_id = self.processor._create_cost_entry(self.row, bill_id, self.accessor)
+
+        processor = AWSReportProcessor(
+            schema_name=self.schema,
+            report_path=self.test_report,
+            compression=UNCOMPRESSED,
+            provider_uuid=self.aws_provider_uuid,
+        )
+        self.assertEqual(len(processor.existing_cost_entry_map), 0)
+
+        start, _ = processor._get_cost_entry_time_interval(self.row.get("identity/TimeInterval"))
+        with patch.object(AWSReportDBAccessor, "insert_on_conflict_do_nothing") as mock_insert:
+            self.assertEqual(processor._create_cost_entry(self.row, bill_id, self.accessor), cost_entry_id)
+            mock_insert.assert_not_called()
+        self.assertIn((bill_id, start), processor.existing_cost_entry_map)
+
     def test_create_cost_entry_line_item(self):
         """Test that line item data is returned properly."""
         bill_id = self.processor._create_cost_entry_bill(self.row, self.accessor)
@@ -671,6 +715,23 @@ class AWSReportProcessorTest(MasuTestCase):
 
         self.assertIsNotNone(self.processor.line_item_columns)
 
+    def test_create_dimensions(self):
+        """Test that dimensions are created in bulk and found in memory."""
+        with patch.object(
+            AWSReportDBAccessor, "insert_on_conflict_do_nothing", wraps=self.accessor.insert_on_conflict_do_nothing
+        ) as mock_insert:
+            self.processor._create_dimensions([self.row], self.accessor)
+            bill_id = self.processor._create_cost_entry_bill(self.row, self.accessor)
+            cost_entry_id = self.processor._create_cost_entry(self.row, bill_id, self.accessor)
+            product_id = self.processor._create_cost_entry_product(self.row, self.accessor)
+            mock_insert.assert_not_called()
+
+        with schema_context(self.schema):
+            product = self.accessor._get_db_obj_query(AWS_CUR_TABLE_MAP["product"]).get(id=product_id)
+            cost_entry = self.accessor._get_db_obj_query(AWS_CUR_TABLE_MAP["cost_entry"]).get(id=cost_entry_id)
+        self.assertEqual(product.sku, self.row.get("product/sku"))
+        self.assertEqual(cost_entry.bill_id, bill_id)
+
     def test_create_cost_entry_product(self):
         """Test that a cost entry product id is returned."""
         table_name = AWS_CUR_TABLE_MAP["product"]
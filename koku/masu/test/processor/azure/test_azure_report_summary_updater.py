@@ -156,3 +156,16 @@ class AzureReportSummaryUpdaterTest(MasuTestCase):
             bill = accessor.get_cost_entry_bills_by_date(bill_date)[0]
             self.assertIsNotNone(bill.summary_data_creation_datetime)
             self.assertIsNotNone(bill.summary_data_updated_datetime)
+
+    @patch("masu.processor.azure.azure_report_summary_updater.AzureReportDBAccessor.populate_tags_summary_table")
+    @patch(
+        "masu.processor.azure.azure_report_summary_updater.AzureReportDBAccessor.populate_line_item_daily_summary_table"
+    )
+    @patch("masu.processor.azure.azure_report_summary_updater.get_bills_from_provider", return_value=[])
+    def test_update_summary_tables_no_bills(self, mock_bills, mock_summary, mock_tags):
+        """Test that tag summaries are skipped rather than rebuilt for the schema without bills."""
+        start_date = self.date_accessor.today_with_timezone("UTC").strftime("%Y-%m-%d")
+
+        self.updater.update_summary_tables(start_date, start_date)
+        mock_summary.assert_called()
+        mock_tags.assert_not_called()
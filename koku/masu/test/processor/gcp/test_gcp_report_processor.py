@@ -5,7 +5,7 @@ import tempfile
 import uuid
 from datetime import datetime
 
-import numpy as np
+import pandas
 import pytz
 from dateutil import parser
 from faker import Faker
@@ -192,29 +192,24 @@ class GCPReportProcessorTest(MasuTestCase):
             self.assertEquals(num_projects, len(GCPProject.objects.all()))
             self.assertEquals(num_bills, len(GCPCostEntryBill.objects.all()))
 
-    def test_consolidate_line_items(self):
-        """Test that logic for consolidating lines work."""
-        line1 = {
-            "int": fake.pyint(),
-            "float": fake.pyfloat(),
-            "date": datetime.now(),
-            "npint": np.int64(fake.pyint()),
-            "cost_entry_bill_id": fake.pyint(),
-            "project_id": fake.pyint(),
-        }
-        line2 = {
-            "int": fake.pyint(),
-            "float": fake.pyfloat(),
-            "date": datetime.now(),
-            "npint": np.int64(fake.pyint()),
-            "cost_entry_bill_id": fake.pyint(),
-            "project_id": fake.pyint(),
-        }
-        consolidated_line = self.processor._consolidate_line_items(line1, line2)
-
-        self.assertEquals(consolidated_line["int"], line1["int"] + line2["int"])
-        self.assertEquals(consolidated_line["float"], line1["float"] + line2["float"])
-        self.assertEquals(consolidated_line["npint"], line1["npint"] + line2["npint"])
-        self.assertEquals(consolidated_line["date"], line1["date"])
-        self.assertEquals(consolidated_line["cost_entry_bill_id"], line1["cost_entry_bill_id"])
-        self.assertEquals(consolidated_line["project_id"], line1["project_id"])
+    def test_create_line_item_frame(self):
+        """Test that duplicate line items in a chunk are consolidated into one."""
+        chunk = pandas.read_csv(self.test_report, dtype=str, keep_default_na=False)
+        expected_count = len(chunk.drop_duplicates(subset=["Project ID", "Start Time", "Line Item"]))
+        duplicate = chunk.iloc[[0]].copy()
+        duplicate["Cost"] = "1.5"
+        duplicate["Description"] = "Duplicate"
+        chunk = pandas.concat([chunk, duplicate], ignore_index=True)
+
+        line_items = self.processor._create_line_item_frame(chunk, self.accessor)
+
+        key_columns = self.processor.line_item_conflict_columns
+        self.assertFalse(line_items.duplicated(subset=key_columns).any())
+        self.assertEqual(len(line_items), expected_count)
+        first = line_items.iloc[0]
+        self.assertEqual(first["line_item_type"], chunk["Line Item"].iloc[0])
+        self.assertEqual(first["consumption"], str(int(chunk["Measurement1 Total Consumption"].iloc[0]) * 2))
+        self.assertAlmostEqual(first["cost"], float(chunk["Cost"].iloc[0]) + 1.5)
+        self.assertEqual(first["description"], chunk["Description"].iloc[0])
+        self.assertIsNotNone(first["cost_entry_bill_id"])
+        self.assertIsNotNone(first["project_id"])
@@ -155,147 +155,75 @@ class OCPReportChargeUpdaterTest(MasuTestCase):
             self.updater._normalize_tier(rate_json)
             self.assertIn("Missing final tier", error)
 
-    def test_bucket_applied(self):
-        """Test the tier helper function."""
-        lower_limit = 0
-        upper_limit = 10
-        test_matrix = [
-            {"usage": -10, "expected_usage_applied": 0},
-            {"usage": 5, "expected_usage_applied": 5},
-            {"usage": 10, "expected_usage_applied": 10},
-            {"usage": 15, "expected_usage_applied": 10},
-        ]
-
-        for test in test_matrix:
-            usage_applied = self.updater._bucket_applied(test.get("usage"), lower_limit, upper_limit)
-            self.assertEqual(usage_applied, test.get("expected_usage_applied"))
-
-    def test_aggregate_charges(self):
-        """Test the helper function to aggregate usage and request charges."""
-        usage_charge = {
-            3: {"usage": Decimal("0.000249"), "charge": Decimal("0.049800")},
-            4: {"usage": Decimal("0.05"), "charge": Decimal("0.10")},
-        }
-        request_charge = {
-            3: {"usage": Decimal("0.000173"), "charge": Decimal("0.043250")},
-            4: {"usage": Decimal("0.06"), "charge": Decimal("0.20")},
-        }
-
-        total_charge = self.updater._aggregate_charges(usage_charge, request_charge)
-        for key, charge in total_charge.items():
-            usage_charge_value = usage_charge.get(key).get("charge")
-            request_charge_value = request_charge.get(key).get("charge")
-            total_charge = usage_charge_value + request_charge_value
-
-            self.assertEqual(charge.get("usage_charge"), usage_charge_value)
-            self.assertEqual(charge.get("request_charge"), request_charge_value)
-            self.assertEqual(charge.get("charge"), total_charge)
-
-    def test_aggregate_charges_extra_usage(self):
-        """Test the helper function to aggregate usage and request charges where usage_charge is larger."""
-        usage_charge = {
-            3: {"usage": Decimal("0.000249"), "charge": Decimal("0.049800")},
-            4: {"usage": Decimal("0.05"), "charge": Decimal("0.10")},
-        }
-        request_charge = {3: {"usage": Decimal("0.000173"), "charge": Decimal("0.043250")}}
-
-        with self.assertRaises(OCPReportChargeUpdaterError):
-            self.updater._aggregate_charges(usage_charge, request_charge)
-
-    def test_aggregate_charges_extra_request(self):
-        """Test the helper function to aggregate usage and request charges where request_charge is larger."""
-        usage_charge = {3: {"usage": Decimal("0.000249"), "charge": Decimal("0.049800")}}
-        request_charge = {
-            3: {"usage": Decimal("0.000173"), "charge": Decimal("0.043250")},
-            4: {"usage": Decimal("0.06"), "charge": Decimal("0.20")},
-        }
-
-        with self.assertRaises(OCPReportChargeUpdaterError):
-            self.updater._aggregate_charges(usage_charge, request_charge)
-
-    def test_aggregate_charges_mismatched_keys(self):
-        """Test the helper function to aggregate usage and request charges where dictionaries have different keys."""
-        usage_charge = {
-            3: {"usage": Decimal("0.000249"), "charge": Decimal("0.049800")},
-            4: {"usage": Decimal("0.05"), "charge": Decimal("0.10")},
-        }
-        request_charge = {
-            3: {"usage": Decimal("0.000173"), "charge": Decimal("0.043250")},
-            5: {"usage": Decimal("0.06"), "charge": Decimal("0.20")},
-        }
-
-        with self.assertRaises(OCPReportChargeUpdaterError):
-            self.updater._aggregate_charges(usage_charge, request_charge)
-
-    def test_calculate_variable_charge(self):
-        """Test the helper function to calculate charge."""
+    def test_tiered_rate_terms(self):
+        """Test that tiered rates are converted to cumulative tier limits."""
         rate_json = {
             "tiered_rates": [
-                {"usage": {"usage_start": None, "usage_end": "10"}, "value": "0.10", "unit": "USD"},
-                {"usage": {"usage_start": "10", "usage_end": "20"}, "value": "0.20", "unit": "USD"},
                 {"usage": {"usage_start": "20", "usage_end": "30"}, "value": "0.30", "unit": "USD"},
+                {"usage": {"usage_start": None, "usage_end": "10"}, "value": "0.10", "unit": "USD"},
                 {"usage": {"usage_start": "30", "usage_end": None}, "value": "0.40", "unit": "USD"},
+                {"usage": {"usage_start": "10", "usage_end": "20"}, "value": "0.20", "unit": "USD"},
             ]
         }
-        usage_dictionary = {1: Decimal(5), 2: Decimal(15), 3: Decimal(25), 4: Decimal(50), 5: Decimal(0)}
-
-        expected_results = {
-            1: Decimal(0.5),  # usage: 5,  charge: 0.5 = 5 * 0.1
-            2: Decimal(2.0),  # usage: 15, charge: 2.0 = (10 * 0.1) + (5 * 0.2)
-            3: Decimal(4.5),  # usage: 25, charge: 4.5 = (10 * 0.1) + (10 * 0.2) + (5 * 0.3)
-            4: Decimal(14.0),  # usage: 50, charge: 14.0 = (10 * 0.1) + (10 * 0.2) + (10 * 0.3) + (20 * 0.4)
-            5: Decimal(0.0),
-        }  # usage: 0, charge: 0
-
-        for key, usage in usage_dictionary.items():
-            tier_charge = self.updater._calculate_variable_charge(usage, rate_json)
-            self.assertEqual(tier_charge, expected_results.get(key))
-
-    def test_calculate_variable_charge_floating_ends(self):
-        """Test the helper function to calculate charge with floating endpoints."""
-        rate_json = {
-            "tiered_rates": [
-                {"usage": {"usage_start": None, "usage_end": "10.3"}, "value": "0.10", "unit": "USD"},
-                {"usage": {"usage_start": "10.3", "usage_end": "19.8"}, "value": "0.20", "unit": "USD"},
-                {"usage": {"usage_start": "19.8", "usage_end": "22.6"}, "value": "0.30", "unit": "USD"},
-                {"usage": {"usage_start": "22.6", "usage_end": None}, "value": "0.40", "unit": "USD"},
-            ]
-        }
+        expected_tiers = [
+            {"rate": Decimal("0.10"), "lower": Decimal(0), "size": Decimal(10)},
+            {"rate": Decimal("0.20"), "lower": Decimal(10), "size": Decimal(10)},
+            {"rate": Decimal("0.30"), "lower": Decimal(20), "size": Decimal(10)},
+        ]
+
+        terms = self.updater._tiered_rate_terms("pod_usage_cpu_core_hours", rate_json)
+        self.assertEqual(terms.get("usage"), "pod_usage_cpu_core_hours")
+        self.assertEqual(terms.get("tiers"), expected_tiers)
+        self.assertEqual(terms.get("remainder"), {"rate": Decimal("0.40"), "lower": Decimal(30)})
 
-        usage_dictionary = {1: Decimal(5), 2: Decimal(15), 3: Decimal(25), 4: Decimal(50), 5: Decimal(0)}
+    def test_tiered_rate_terms_single_rate(self):
+        """Test that a rate without tiers applies to all usage once."""
+        rate_json = {"tiered_rates": [{"value": "100", "unit": "USD"}]}
 
-        expected_results = {
-            1: Decimal("0.5"),  # usage: 5,  charge: 0.5 = 5 * 0.1
-            2: Decimal("1.97"),  # usage: 15, charge: 1.97 = (10.3 * 0.1) + (4.7 * 0.2)
-            3: Decimal("4.730"),  # usage: 25, charge: 4.730 = (10.3 * 0.1) + (9.5 * 0.2) + (2.8 * 0.3) + (2.4 * 0.4)
-            4: Decimal("14.730"),  # usage: 50, charge: 14.73 = (10.3 * 0.1) + (9.5 * 0.2) + (2.8 * 0.3) + (27.4 * 0.4)
-            5: Decimal("0.0"),
-        }  # usage: 0, charge: 0
+        terms = self.updater._tiered_rate_terms("pod_usage_cpu_core_hours", rate_json)
+        self.assertEqual(terms.get("tiers"), [])
+        self.assertEqual(terms.get("remainder"), {"rate": Decimal("100"), "lower": Decimal(0)})
 
-        for key, usage in usage_dictionary.items():
-            tier_charge = self.updater._calculate_variable_charge(usage, rate_json)
-            self.assertEqual(tier_charge, expected_results.get(key))
+    def test_tiered_rate_terms_no_rates(self):
+        """Test that no rates produce no charge terms."""
+        terms = self.updater._tiered_rate_terms("pod_usage_cpu_core_hours", None)
+        self.assertEqual(terms.get("tiers"), [])
+        self.assertIsNone(terms.get("remainder"))
 
-    def test_calculate_variable_charge_ends_missing(self):
-        """Test the helper function to calculate charge when end limits are missing."""
+    def test_tiered_rate_terms_bad_tiers(self):
+        """Test that invalid tiers raise an error."""
         rate_json = {
             "tiered_rates": [
-                {"usage": {"usage_end": "10"}, "value": "0.10", "unit": "USD"},
                 {"usage": {"usage_start": "10", "usage_end": "20"}, "value": "0.20", "unit": "USD"},
-                {"usage": {"usage_start": "20", "usage_end": "30"}, "value": "0.30", "unit": "USD"},
-                {"usage": {"usage_start": "30"}, "value": "0.40", "unit": "USD"},
+                {"usage": {"usage_start": "20", "usage_end": None}, "value": "0.30", "unit": "USD"},
             ]
         }
-        usage_dictionary = {1: Decimal(5), 2: Decimal(15), 3: Decimal(25), 4: Decimal(50), 5: Decimal(0)}
-
-        expected_results = {1: Decimal(0.5), 2: Decimal(2.0), 3: Decimal(4.5), 4: Decimal(14.0), 5: Decimal(0.0)}
+        with self.assertRaises(OCPReportChargeUpdaterError):
+            self.updater._tiered_rate_terms("pod_usage_cpu_core_hours", rate_json)
 
-        for key, usage in usage_dictionary.items():
-            tier_charge = self.updater._calculate_variable_charge(usage, rate_json)
-            self.assertEqual(tier_charge, expected_results.get(key))
+    def _assert_tiered_charges(self, rate_json, expected_results):
+        """Price usage values on a summary row and compare the charges."""
+        usage_period = self.accessor.get_current_usage_period()
+        start_date = usage_period.report_period_start.date() + relativedelta(days=-1)
+        end_date = usage_period.report_period_end.date() + relativedelta(days=+1)
+        self.accessor.populate_line_item_daily_table(start_date, end_date, self.cluster_id)
+        self.accessor.populate_line_item_daily_summary_table(start_date, end_date, self.cluster_id)
 
-    def test_calculate_charge(self):
-        """Test the helper function to calculate charge."""
+        terms = [
+            self.updater._tiered_rate_terms("pod_usage_cpu_core_hours", rate_json),
+            self.updater._tiered_rate_terms("pod_request_cpu_core_hours", None),
+        ]
+        charges = [{"column": "pod_charge_cpu_core_hours", "terms": terms}]
+        with schema_context(self.schema):
+            item = OCPUsageLineItemDailySummary.objects.filter(data_source="Pod", cluster_id=self.cluster_id).first()
+            for usage, expected_charge in expected_results:
+                OCPUsageLineItemDailySummary.objects.filter(id=item.id).update(pod_usage_cpu_core_hours=usage)
+                self.accessor.populate_tiered_charges(charges, "Pod", None, None, self.cluster_id)
+                item.refresh_from_db()
+                self.assertEqual(item.pod_charge_cpu_core_hours, expected_charge)
+
+    def test_populate_tiered_charges(self):
+        """Test that tiered rates are applied in the database."""
         rate_json = {
             "tiered_rates": [
                 {"usage": {"usage_start": None, "usage_end": "10"}, "value": "0.10", "unit": "USD"},
@@ -304,20 +232,34 @@ class OCPReportChargeUpdaterTest(MasuTestCase):
                 {"usage": {"usage_start": "30", "usage_end": None}, "value": "0.40", "unit": "USD"},
             ]
         }
-        usage_dictionary = {1: Decimal(5), 2: Decimal(15), 3: Decimal(25)}
+        expected_results = [
+            (Decimal(5), Decimal("0.5")),  # charge: 0.5 = 5 * 0.1
+            (Decimal(15), Decimal("2.0")),  # charge: 2.0 = (10 * 0.1) + (5 * 0.2)
+            (Decimal(25), Decimal("4.5")),  # charge: 4.5 = (10 * 0.1) + (10 * 0.2) + (5 * 0.3)
+            (Decimal(50), Decimal("14.0")),  # charge: 14.0 = (10 * 0.1) + (10 * 0.2) + (10 * 0.3) + (20 * 0.4)
+            (Decimal(0), Decimal("0.0")),
+            (None, Decimal("0.0")),
+        ]
+        self._assert_tiered_charges(rate_json, expected_results)
 
-        expected_results = {
-            1: {"expected_charge": Decimal(0.5)},
-            2: {"expected_charge": Decimal(2.0)},
-            3: {"expected_charge": Decimal(4.5)},
+    def test_populate_tiered_charges_floating_ends(self):
+        """Test that tiered rates with floating endpoints are applied in the database."""
+        rate_json = {
+            "tiered_rates": [
+                {"usage": {"usage_end": "10.3"}, "value": "0.10", "unit": "USD"},
+                {"usage": {"usage_start": "10.3", "usage_end": "19.8"}, "value": "0.20", "unit": "USD"},
+                {"usage": {"usage_start": "19.8", "usage_end": "22.6"}, "value": "0.30", "unit": "USD"},
+                {"usage": {"usage_start": "22.6"}, "value": "0.40", "unit": "USD"},
+            ]
         }
-
-        charge_dictionary = self.updater._calculate_charge(rate_json, usage_dictionary)
-        for key, entry in expected_results.items():
-            usage = charge_dictionary[key].get("usage")
-            calculated_charge = charge_dictionary[key].get("charge")
-            self.assertEqual(usage, usage_dictionary[key])
-            self.assertEqual(round(float(calculated_charge), 1), entry.get("expected_charge"))
+        expected_results = [
+            (Decimal(5), Decimal("0.5")),  # charge: 0.5 = 5 * 0.1
+            (Decimal(15), Decimal("1.97")),  # charge: 1.97 = (10.3 * 0.1) + (4.7 * 0.2)
+            (Decimal(25), Decimal("4.730")),  # charge: (10.3 * 0.1) + (9.5 * 0.2) + (2.8 * 0.3) + (2.4 * 0.4)
+            (Decimal(50), Decimal("14.730")),  # charge: (10.3 * 0.1) + (9.5 * 0.2) + (2.8 * 0.3) + (27.4 * 0.4)
+            (Decimal(0), Decimal("0.0")),
+        ]
+        self._assert_tiered_charges(rate_json, expected_results)
 
     @patch("masu.database.cost_model_db_accessor.CostModelDBAccessor._make_rate_by_metric_map")
     @patch("masu.database.cost_model_db_accessor.CostModelDBAccessor.get_markup")
@@ -18,6 +18,7 @@
 import datetime
 
 from dateutil import relativedelta
+from django.db import transaction
 from tenant_schemas.utils import schema_context
 
 from masu.database import OCP_REPORT_TABLE_MAP
@@ -55,6 +56,27 @@ class OCPReportDBCleanerTest(MasuTestCase):
         """Test initializer."""
         self.assertIsNotNone(self.report_schema)
 
+    def test_purge_expired_report_data_drops_partitions(self):
+        """Test that partitions holding only expired line items are dropped, including the legacy one."""
+        tables = [OCP_REPORT_TABLE_MAP["line_item_daily"], OCP_REPORT_TABLE_MAP["storage_line_item_daily"]]
+        cleaner = OCPReportDBCleaner("acct10001")
+        # DDL is transactional, so rolling back restores the dropped partitions for the other tests.
+        with transaction.atomic():
+            partitions = {table: [name for name, _ in self.accessor.get_partitions(table)] for table in tables}
+            newest_end = max(self.accessor.get_partitions(table)[-1][1] for table in tables)
+            expired_date = newest_end + relativedelta.relativedelta(months=1)
+            for table in tables:
+                self.accessor.create_month_partitions(table, newest_end, expired_date)
+
+            cleaner.purge_expired_report_data(expired_date)
+
+            for table in tables:
+                self.assertEqual(partitions[table][0], f"{table}_legacy")
+                self.assertEqual(
+                    [name for name, _ in self.accessor.get_partitions(table)], [f"{table}_{expired_date:%Y_%m}"]
+                )
+            transaction.set_rollback(True)
+
     def test_purge_expired_report_data_on_date(self):
         """Test to remove report data on a provided date."""
         report_period_table_name = OCP_REPORT_TABLE_MAP["report_period"]
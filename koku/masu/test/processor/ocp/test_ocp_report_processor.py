@@ -24,6 +24,7 @@ import shutil
 import tempfile
 from unittest.mock import patch
 
+from django.db import connection
 from tenant_schemas.utils import schema_context
 
 from masu.config import Config
@@ -63,6 +64,7 @@ class ProcessedOCPReportTest(MasuTestCase):
         self.assertEqual(self.report.report_periods, {})
         self.assertEqual(self.report.line_items, [])
         self.assertEqual(self.report.reports, {})
+        self.assertEqual(self.report.line_item_keys, set())
 
 
 class OCPReportProcessorTest(MasuTestCase):
@@ -337,29 +339,55 @@ class OCPReportProcessorTest(MasuTestCase):
             for key in test_entry:
                 self.assertIn(key, ce_map)
 
-    def test_write_processed_rows_to_csv(self):
-        """Test that the CSV bulk upload file contains proper data."""
+    def test_save_to_db(self):
+        """Test that the batch of line items is copied into the temp table."""
         cluster_id = "12345"
-        report_period_id = self.ocp_processor._processor._create_report_period(self.row, cluster_id, self.accessor)
-        report_id = self.ocp_processor._processor._create_report(self.row, report_period_id, self.accessor)
-        self.ocp_processor._processor._create_usage_report_line_item(
-            self.row, report_period_id, report_id, self.accessor
-        )
+        processor = self.ocp_processor._processor
+        report_period_id = processor._create_report_period(self.row, cluster_id, self.accessor)
+        report_id = processor._create_report(self.row, report_period_id, self.accessor)
+        processor._create_usage_report_line_item(self.row, report_period_id, report_id, self.accessor)
 
-        file_obj = self.ocp_processor._processor._write_processed_rows_to_csv()
-        line_item_data = self.ocp_processor._processor.processed_report.line_items.pop()
-        # Convert data to CSV format
-        expected_values = [str(value) if value else None for value in line_item_data.values()]
+        table_name = processor.table_name._meta.db_table
+        temp_table = self.accessor.create_temp_table(table_name, drop_column="id")
+        processor._save_to_db(temp_table, self.accessor)
 
-        reader = csv.reader(file_obj, delimiter="\t")
-        new_row = next(reader)
+        with schema_context(self.schema):
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT report_id, pod_labels FROM {temp_table}")
+                rows = cursor.fetchall()
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0][0], report_id)
+        self.assertEqual(rows[0][1], json.loads(processor._process_pod_labels(self.row.get("pod_labels"))))
 
-        actual = {}
-        for i, key in enumerate(line_item_data.keys()):
-            actual[key] = new_row[i] if new_row[i] else None
+    def test_create_usage_report_line_item_duplicate(self):
+        """Test that rows repeating a conflict key are only added once."""
+        cluster_id = "12345"
+        processor = self.ocp_processor._processor
+        report_period_id = processor._create_report_period(self.row, cluster_id, self.accessor)
+        report_id = processor._create_report(self.row, report_period_id, self.accessor)
+
+        processor._create_usage_report_line_item(self.row, report_period_id, report_id, self.accessor)
+        processor._create_usage_report_line_item(self.row, report_period_id, report_id, self.accessor)
+        self.assertEqual(len(processor.processed_report.line_items), 1)
+
+        row = copy.deepcopy(self.row)
+        row["pod"] = "another-pod"
+        processor._create_usage_report_line_item(row, report_period_id, report_id, self.accessor)
+        self.assertEqual(len(processor.processed_report.line_items), 2)
+
+    def test_create_usage_report_line_item_duplicate_next_batch(self):
+        """Test that a key repeated after its batch was saved is left to the merge upsert."""
+        cluster_id = "12345"
+        processor = self.ocp_processor._processor
+        report_period_id = processor._create_report_period(self.row, cluster_id, self.accessor)
+        report_id = processor._create_report(self.row, report_period_id, self.accessor)
 
-        self.assertEqual(actual.keys(), line_item_data.keys())
-        self.assertEqual(list(actual.values()), expected_values)
+        processor._create_usage_report_line_item(self.row, report_period_id, report_id, self.accessor)
+        processor.processed_report.remove_processed_rows()
+        processor._create_usage_report_line_item(self.row, report_period_id, report_id, self.accessor)
+        self.assertEqual(len(processor.processed_report.line_items), 1)
+        self.assertEqual(len(processor.processed_report.line_item_keys), 1)
 
     def test_create_report_period(self):
         """Test that a report period id is returned."""
@@ -403,7 +431,8 @@ class OCPReportProcessorTest(MasuTestCase):
 
         line_item = None
         if self.ocp_processor._processor.processed_report.line_items:
-            line_item = self.ocp_processor._processor.processed_report.line_items[-1]
+            line_items = self.ocp_processor._processor.processed_report.line_items
+            line_item = dict(zip(self.ocp_processor._processor.line_item_columns, line_items[-1]))
 
         self.assertIsNotNone(line_item)
         self.assertEqual(line_item.get("report_period_id"), report_period_id)
@@ -430,7 +459,8 @@ class OCPReportProcessorTest(MasuTestCase):
 
         line_item = None
         if storage_processor._processor.processed_report.line_items:
-            line_item = storage_processor._processor.processed_report.line_items[-1]
+            line_items = storage_processor._processor.processed_report.line_items
+            line_item = dict(zip(storage_processor._processor.line_item_columns, line_items[-1]))
 
         self.assertIsNotNone(line_item)
         self.assertEqual(line_item.get("report_period_id"), report_period_id)
@@ -459,7 +489,8 @@ class OCPReportProcessorTest(MasuTestCase):
 
         line_item = None
         if storage_processor._processor.processed_report.line_items:
-            line_item = storage_processor._processor.processed_report.line_items[-1]
+            line_items = storage_processor._processor.processed_report.line_items
+            line_item = dict(zip(storage_processor._processor.line_item_columns, line_items[-1]))
 
         self.assertIsNotNone(line_item)
         self.assertEqual(line_item.get("report_period_id"), report_period_id)
@@ -481,7 +512,8 @@ class OCPReportProcessorTest(MasuTestCase):
 
         line_item = None
         if self.ocp_processor._processor.processed_report.line_items:
-            line_item = self.ocp_processor._processor.processed_report.line_items[-1]
+            line_items = self.ocp_processor._processor.processed_report.line_items
+            line_item = dict(zip(self.ocp_processor._processor.line_item_columns, line_items[-1]))
 
         self.assertIsNotNone(line_item)
         self.assertEqual(line_item.get("report_period_id"), report_period_id)
@@ -371,3 +371,19 @@ class OCPReportSummaryUpdaterTest(MasuTestCase):
         self.updater.update_summary_tables(start_date_str, end_date_str)
         mock_sum.assert_called()
         mock_storage_summary.assert_called()
+
+    @patch("masu.processor.ocp.ocp_report_summary_updater.OCPReportDBAccessor.populate_pod_label_summary_table")
+    @patch("masu.processor.ocp.ocp_report_summary_updater.OCPReportSummaryUpdater._get_report_period_ids")
+    @patch(
+        "masu.processor.ocp.ocp_report_summary_updater."
+        "OCPReportDBAccessor.populate_storage_line_item_daily_summary_table"
+    )
+    @patch("masu.processor.ocp.ocp_report_summary_updater.OCPReportDBAccessor.populate_line_item_daily_summary_table")
+    def test_update_summary_tables_no_label_periods(self, mock_sum, mock_storage_summary, mock_ids, mock_labels):
+        """Test that label summaries are skipped rather than rebuilt for the schema without report periods."""
+        mock_ids.return_value = []
+        start_date = self.date_accessor.today_with_timezone("UTC").strftime("%Y-%m-%d")
+
+        self.updater.update_summary_tables(start_date, start_date)
+        mock_sum.assert_called()
+        mock_labels.assert_not_called()
@@ -19,6 +19,7 @@ from unittest.mock import patch
 
 from api.models import Provider
 from masu.exceptions import MasuProcessingError
+from masu.processor.aws.aws_columnar_report_processor import AWSColumnarReportProcessor
 from masu.processor.report_processor import ReportProcessor
 from masu.processor.report_processor import ReportProcessorError
 from masu.test import MasuTestCase
@@ -39,6 +40,19 @@ class ReportProcessorTest(MasuTestCase):
         )
         self.assertIsNotNone(processor._processor)
 
+    @patch("masu.processor.report_processor.Config.AWS_COLUMNAR_PROCESSING", True)
+    def test_initializer_aws_columnar(self):
+        """Test to initializer for AWS with the columnar engine enabled."""
+        processor = ReportProcessor(
+            schema_name=self.schema,
+            report_path="/my/report/file",
+            compression="GZIP",
+            provider=Provider.PROVIDER_AWS,
+            provider_uuid=self.aws_provider_uuid,
+            manifest_id=None,
+        )
+        self.assertIsInstance(processor._processor, AWSColumnarReportProcessor)
+
     def test_initializer_aws_local(self):
         """Test to initializer for AWS-local."""
         processor = ReportProcessor(
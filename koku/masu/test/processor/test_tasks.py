@@ -50,6 +50,7 @@ from masu.processor._tasks.download import _get_report_files
 from masu.processor._tasks.process import _process_report_file
 from masu.processor.expired_data_remover import ExpiredDataRemover
 from masu.processor.report_processor import ReportProcessorError
+from masu.processor.tasks import get_report_file
 from masu.processor.tasks import get_report_files
 from masu.processor.tasks import refresh_materialized_views
 from masu.processor.tasks import remove_expired_data
@@ -61,7 +62,7 @@ from masu.processor.tasks import vacuum_schema
 from masu.test import MasuTestCase
 from masu.test.database.helpers import ReportObjectCreator
 from masu.test.external.downloader.aws import fake_arn
-from reporting.models import AWS_MATERIALIZED_VIEWS
+from reporting.models import AWS_UI_SUMMARY_TABLES
 
 
 class FakeDownloader(Mock):
@@ -551,6 +552,93 @@ class TestProcessorTasks(MasuTestCase):
         reports = get_report_files(**self.fake_get_report_args)
         self.assertIsNotNone(reports)
 
+    @patch("masu.processor.tasks.Config.PARALLEL_REPORT_PROCESSING", True)
+    @patch("masu.processor.tasks.group")
+    @patch("masu.processor.tasks._process_report", return_value=({"manifest_id": 1}, False))
+    @patch("masu.processor.tasks._download_report_file")
+    @patch("masu.processor.tasks._get_report_context")
+    def test_get_report_files_parallel(self, mock_context, mock_download, mock_process, mock_group):
+        """Test that the files after the first are dispatched as subtasks."""
+        mock_context.return_value = {"manifest_id": 1, "files": ["file1", "file2", "file3"]}
+        mock_download.return_value = {"file": "file1", "manifest_id": 1}
+
+        reports = get_report_files(**self.fake_get_report_args)
+
+        self.assertEqual(reports, [])
+        self.assertEqual(mock_download.call_count, 1)
+        mock_process.assert_called_once()
+        dispatched = list(mock_group.call_args[0][0])
+        self.assertEqual([signature.args[-1] for signature in dispatched], ["file2", "file3"])
+        mock_group.return_value.apply_async.assert_called_once()
+
+    @patch("masu.processor.tasks.Config.PARALLEL_REPORT_PROCESSING", True)
+    @patch("masu.processor.tasks.group")
+    @patch("masu.processor.tasks._process_report", return_value=({"manifest_id": 1}, True))
+    @patch("masu.processor.tasks._download_report_file")
+    @patch("masu.processor.tasks._get_report_context")
+    def test_get_report_files_parallel_single_file(self, mock_context, mock_download, mock_process, mock_group):
+        """Test that a single file manifest is processed inline and summarized."""
+        mock_context.return_value = {"manifest_id": 1, "files": ["file1"]}
+
+        reports = get_report_files(**self.fake_get_report_args)
+
+        self.assertEqual(reports, [{"manifest_id": 1}])
+        mock_group.assert_not_called()
+
+    @patch("masu.processor.tasks.summarize_reports")
+    @patch("masu.processor.tasks._process_report")
+    @patch("masu.processor.tasks._download_report_file")
+    def test_get_report_file_summarizes_completed_manifest(self, mock_download, mock_process, mock_summarize):
+        """Test that only the subtask completing the manifest queues summarization."""
+        args = dict(self.fake_get_report_args)
+        args["report_context"] = {"manifest_id": 1, "files": ["file1", "file2"]}
+        args["report"] = "file2"
+
+        mock_process.return_value = ({"manifest_id": 1}, False)
+        get_report_file(**args)
+        mock_summarize.delay.assert_not_called()
+
+        mock_process.return_value = ({"manifest_id": 1}, True)
+        get_report_file(**args)
+        mock_summarize.delay.assert_called_once()
+        self.assertEqual(mock_summarize.delay.call_args[0][0][0]["manifest_id"], 1)
+
+    @patch("masu.processor.tasks.summarize_reports")
+    @patch("masu.processor.tasks.ReportManifestDBAccessor")
+    @patch("masu.processor.tasks._process_report", return_value=(None, False))
+    @patch("masu.processor.tasks._download_report_file")
+    def test_get_report_file_skipped_summarizes_completed_manifest(
+        self, mock_download, mock_process, mock_manifest_accessor, mock_summarize
+    ):
+        """Test that a skipped file queues summarization when the manifest is already complete."""
+        args = dict(self.fake_get_report_args)
+        args["report_context"] = {"manifest_id": 1, "files": ["file1", "file2"]}
+        args["report"] = "file2"
+        manifest = mock_manifest_accessor.return_value.__enter__.return_value.get_manifest_by_id.return_value
+
+        manifest.num_processed_files, manifest.num_total_files = 1, 2
+        get_report_file(**args)
+        mock_summarize.delay.assert_not_called()
+
+        manifest.num_processed_files = 2
+        get_report_file(**args)
+        mock_summarize.delay.assert_called_once()
+        self.assertEqual(mock_summarize.delay.call_args[0][0][0]["manifest_id"], 1)
+
+    @patch("masu.processor.tasks.summarize_reports")
+    @patch("masu.processor.tasks._process_report", side_effect=ReportProcessorError("Mocked Error!"))
+    @patch("masu.processor.tasks._download_report_file")
+    def test_get_report_file_failed_summarizes_manifest(self, mock_download, mock_process, mock_summarize):
+        """Test that a failed file queues summarization of the files that were processed."""
+        args = dict(self.fake_get_report_args)
+        args["report_context"] = {"manifest_id": 1, "files": ["file1", "file2"]}
+        args["report"] = "file2"
+
+        with self.assertRaises(ReportProcessorError):
+            get_report_file(**args)
+        mock_summarize.delay.assert_called_once()
+        self.assertEqual(mock_summarize.delay.call_args[0][0][0]["manifest_id"], 1)
+
 
 class TestRemoveExpiredDataTasks(MasuTestCase):
     """Test cases for Processor Celery tasks."""
@@ -842,7 +930,7 @@ class TestUpdateSummaryTablesTask(MasuTestCase):
 
         refresh_materialized_views(self.schema, Provider.PROVIDER_AWS, manifest_id=manifest.id)
 
-        views_to_check = [view for view in AWS_MATERIALIZED_VIEWS if "Cost" in view._meta.db_table]
+        views_to_check = [view for view in AWS_UI_SUMMARY_TABLES if "Cost" in view._meta.db_table]
 
         with schema_context(self.schema):
             for view in views_to_check:
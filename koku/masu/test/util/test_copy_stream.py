@@ -0,0 +1,67 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test the COPY stream utilities."""
+from unittest import TestCase
+
+import pandas
+
+from masu.util.copy_stream import copy_lines_from_frame
+from masu.util.copy_stream import copy_lines_from_rows
+from masu.util.copy_stream import CopyStream
+from masu.util.copy_stream import escape_copy_value
+
+
+class CopyStreamTest(TestCase):
+    """Test Cases for the COPY stream utilities."""
+
+    def test_escape_copy_value(self):
+        """Test that special characters and nulls are escaped."""
+        self.assertEqual(escape_copy_value(None), "")
+        self.assertEqual(escape_copy_value(12), "12")
+        self.assertEqual(escape_copy_value("a\tb\nc\\d"), "a\\tb\\nc\\\\d")
+
+    def test_copy_lines_from_frame(self):
+        """Test that a DataFrame is serialized one line per row."""
+        frame = pandas.DataFrame({"name": ["one", "tw\to", None], "value": ["1", "2", "3"]})
+        lines = list(copy_lines_from_frame(frame))
+        self.assertEqual(lines, ["one\t1\n", "tw\\to\t2\n", "\t3\n"])
+
+    def test_copy_lines_from_rows(self):
+        """Test that tuples are serialized one line per row."""
+        lines = list(copy_lines_from_rows([(1, "a"), (None, "b")]))
+        self.assertEqual(lines, ["1\ta\n", "\tb\n"])
+
+    def test_read_sized(self):
+        """Test that sized reads return the stream in order."""
+        stream = CopyStream(["abc\n", "def\n", "ghi\n"])
+        self.assertEqual(stream.read(5), "abc\nd")
+        self.assertEqual(stream.read(100), "ef\nghi\n")
+        self.assertEqual(stream.read(100), "")
+        self.assertEqual(stream.row_count, 3)
+
+    def test_read_all(self):
+        """Test that an unsized read drains the stream."""
+        stream = CopyStream(["abc\n", "def\n"])
+        self.assertEqual(stream.read(), "abc\ndef\n")
+        self.assertEqual(stream.read(), "")
+
+    def test_readline(self):
+        """Test that lines are returned one at a time."""
+        stream = CopyStream(["abc\n", "def\n"])
+        self.assertEqual(stream.readline(), "abc\n")
+        self.assertEqual(stream.readline(), "def\n")
+        self.assertEqual(stream.readline(), "")
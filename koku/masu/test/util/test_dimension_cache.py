@@ -0,0 +1,66 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test the DimensionCache."""
+from unittest import TestCase
+
+from masu.util.dimension_cache import DimensionCache
+
+
+class DimensionCacheTest(TestCase):
+    """Test Cases for the DimensionCache."""
+
+    def setUp(self):
+        """Set up a cache of keys scoped by their first item."""
+        super().setUp()
+        self.loaded = []
+
+        def load_scope(scope):
+            self.loaded.append(scope)
+            return {(scope, "a"): 1, (scope, "b"): 2}
+
+        self.cache = DimensionCache(max_size=3, get_scope=lambda key: key[0], load_scope=load_scope)
+
+    def test_scope_loaded_once_on_miss(self):
+        """Test that the scope of a missed key is loaded once."""
+        self.assertIn(("bill", "a"), self.cache)
+        self.assertEqual(self.cache[("bill", "b")], 2)
+        self.assertNotIn(("bill", "c"), self.cache)
+        self.assertEqual(self.loaded, ["bill"])
+
+    def test_missing_key_raises(self):
+        """Test that a key missing from its scope raises a KeyError."""
+        with self.assertRaises(KeyError):
+            self.cache[("bill", "c")]
+
+    def test_least_recently_used_evicted(self):
+        """Test that keys beyond the maximum size are evicted least recently used first."""
+        self.assertIn(("bill", "a"), self.cache)
+        self.cache[("other", "a")] = 10
+        self.assertIn(("bill", "b"), self.cache)
+        self.cache[("other", "b")] = 11
+
+        self.assertEqual(list(self.cache), [("other", "a"), ("bill", "b"), ("other", "b")])
+        # The scope of an evicted key is not loaded again
+        self.assertNotIn(("bill", "a"), self.cache)
+        self.assertEqual(self.loaded, ["bill"])
+
+    def test_no_scope(self):
+        """Test that a cache without a scope loader only holds what is added."""
+        cache = DimensionCache(max_size=2)
+        cache.update({"a": 1, "b": 2, "c": 3})
+        self.assertNotIn("a", cache)
+        self.assertEqual(list(cache.values()), [2, 3])
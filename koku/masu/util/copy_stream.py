@@ -0,0 +1,146 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Utilities for streaming rows into Postgres COPY."""
+COPY_NULL = ""
+COPY_SEPARATOR = "\t"
+
+# Characters that have a special meaning in the COPY text format
+COPY_ESCAPES = (("\\", "\\\\"), ("\t", "\\t"), ("\n", "\\n"), ("\r", "\\r"))
+
+
+def escape_copy_value(value):
+    """Return a value formatted for the COPY text format.
+
+    Args:
+        value (var): The value to format
+
+    Returns:
+        (str): The escaped value, or the null marker for None
+
+    """
+    if value is None:
+        return COPY_NULL
+    value = str(value)
+    for char, escaped in COPY_ESCAPES:
+        if char in value:
+            value = value.replace(char, escaped)
+    return value
+
+
+def escape_copy_series(series):
+    """Return a pandas Series formatted for the COPY text format.
+
+    Args:
+        series (pandas.Series): The column to format
+
+    Returns:
+        (pandas.Series): A string column with nulls as the null marker
+
+    """
+    series = series.where(series.notna(), COPY_NULL).astype(str)
+    for char, escaped in COPY_ESCAPES:
+        series = series.str.replace(char, escaped, regex=False)
+    return series
+
+
+def copy_lines_from_frame(frame):
+    """Yield COPY text lines for each row of a pandas DataFrame.
+
+    Args:
+        frame (pandas.DataFrame): The rows to serialize
+
+    Returns:
+        (generator): One tab separated, newline terminated line per row
+
+    """
+    escaped = frame.apply(escape_copy_series)
+    for row in escaped.itertuples(index=False, name=None):
+        yield COPY_SEPARATOR.join(row) + "\n"
+
+
+def copy_lines_from_rows(rows):
+    """Yield COPY text lines for each tuple of values.
+
+    Args:
+        rows (iterable): Tuples of raw values in column order
+
+    Returns:
+        (generator): One tab separated, newline terminated line per row
+
+    """
+    for row in rows:
+        yield COPY_SEPARATOR.join(escape_copy_value(value) for value in row) + "\n"
+
+
+class CopyStream:
+    """A read-only file-like object over an iterator of COPY lines.
+
+    psycopg2's ``copy_from`` only ever calls ``read``/``readline`` on the
+    file object, so lines are produced on demand and never held in memory
+    as a whole.
+    """
+
+    def __init__(self, lines):
+        """Initialize the stream.
+
+        Args:
+            lines (iterable): COPY formatted, newline terminated strings
+
+        """
+        self._lines = iter(lines)
+        self._buffer = ""
+        self.row_count = 0
+
+    def _next_line(self):
+        """Return the next line, or an empty string when exhausted."""
+        try:
+            line = next(self._lines)
+        except StopIteration:
+            return ""
+        self.row_count += 1
+        return line
+
+    def read(self, size=-1):
+        """Read up to size characters from the stream."""
+        if size is None or size < 0:
+            parts = [self._buffer]
+            line = self._next_line()
+            while line:
+                parts.append(line)
+                line = self._next_line()
+            self._buffer = ""
+            return "".join(parts)
+
+        parts = [self._buffer]
+        length = len(self._buffer)
+        while length < size:
+            line = self._next_line()
+            if not line:
+                break
+            parts.append(line)
+            length += len(line)
+        data = "".join(parts)
+        self._buffer = data[size:]
+        return data[:size]
+
+    def readline(self, size=-1):
+        """Read a single line from the stream."""
+        if self._buffer:
+            line, sep, rest = self._buffer.partition("\n")
+            self._buffer = rest
+            return line + sep
+        return self._next_line()
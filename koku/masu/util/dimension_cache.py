@@ -0,0 +1,79 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""A bounded cache of report dimension ids."""
+from collections import OrderedDict
+
+from masu.config import Config
+
+
+class DimensionCache(OrderedDict):
+    """A map of dimension keys to database ids, evicted least recently used first.
+
+    A processor only needs the dimensions of the bills or report periods in
+    the file it processes. When given, ``get_scope`` returns the scope, such
+    as the bill id, of a key and ``load_scope`` returns the known keys and ids
+    of a scope. A scope is loaded the first time one of its keys is missed.
+    Keys that are evicted or were never loaded are resolved by the processor
+    with an insert-or-select.
+    """
+
+    def __init__(self, max_size=None, get_scope=None, load_scope=None):
+        """Initialize the cache.
+
+        Args:
+            max_size (int): The most keys held, defaults to REPORT_DIMENSION_CACHE_SIZE
+            get_scope (function): Returns the scope of a key, or None
+            load_scope (function): Returns a dict of the keys and ids of a scope
+
+        """
+        super().__init__()
+        self._max_size = max_size or Config.REPORT_DIMENSION_CACHE_SIZE
+        self._get_scope = get_scope
+        self._load_scope = load_scope
+        self._loaded_scopes = set()
+
+    def _load(self, key):
+        """Load the scope of a missed key, once."""
+        if self._load_scope is None:
+            return
+        scope = self._get_scope(key)
+        if scope is None or scope in self._loaded_scopes:
+            return
+        self._loaded_scopes.add(scope)
+        self.update(self._load_scope(scope))
+
+    def __contains__(self, key):
+        """Return whether the key is known, loading its scope on a miss."""
+        if not super().__contains__(key):
+            self._load(key)
+            if not super().__contains__(key):
+                return False
+        self.move_to_end(key)
+        return True
+
+    def __getitem__(self, key):
+        """Return the id of a key, loading its scope on a miss."""
+        if key not in self:
+            raise KeyError(key)
+        return super().__getitem__(key)
+
+    def __setitem__(self, key, value):
+        """Add a key, evicting the least recently used keys beyond the maximum size."""
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self._max_size:
+            self.popitem(last=False)
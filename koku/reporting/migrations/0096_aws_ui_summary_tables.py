@@ -0,0 +1,85 @@
+from django.db import migrations
+
+# (table, unique index, unique index columns)
+AWS_UI_SUMMARY_TABLES = (
+    ("reporting_aws_compute_summary", "aws_compute_summary", "usage_start, instance_type"),
+    (
+        "reporting_aws_compute_summary_by_account",
+        "aws_compute_summary_account",
+        "usage_start, usage_account_id, account_alias_id, instance_type",
+    ),
+    (
+        "reporting_aws_compute_summary_by_region",
+        "aws_compute_summary_region",
+        "usage_start, region, availability_zone, instance_type",
+    ),
+    (
+        "reporting_aws_compute_summary_by_service",
+        "aws_compute_summary_service",
+        "usage_start, product_code, product_family, instance_type",
+    ),
+    ("reporting_aws_cost_summary", "aws_cost_summary", "usage_start"),
+    (
+        "reporting_aws_cost_summary_by_account",
+        "aws_cost_summary_account",
+        "usage_start, usage_account_id, account_alias_id",
+    ),
+    ("reporting_aws_cost_summary_by_region", "aws_cost_summary_region", "usage_start, region, availability_zone"),
+    ("reporting_aws_cost_summary_by_service", "aws_cost_summary_service", "usage_start, product_code, product_family"),
+    ("reporting_aws_database_summary", "aws_database_summary", "usage_start, product_code"),
+    ("reporting_aws_network_summary", "aws_network_summary", "usage_start, product_code"),
+    ("reporting_aws_storage_summary", "aws_storage_summary", "usage_start, product_family"),
+    (
+        "reporting_aws_storage_summary_by_account",
+        "aws_storage_summary_account",
+        "usage_start, usage_account_id, account_alias_id, product_family",
+    ),
+    (
+        "reporting_aws_storage_summary_by_region",
+        "aws_storage_summary_region",
+        "usage_start, region, availability_zone, product_family",
+    ),
+    (
+        "reporting_aws_storage_summary_by_service",
+        "aws_storage_summary_service",
+        "usage_start, product_code, product_family",
+    ),
+)
+
+CONVERT_VIEW_SQL = """
+    DROP INDEX IF EXISTS {index};
+
+    ALTER MATERIALIZED VIEW {table} RENAME TO {table}_mv;
+
+    CREATE TABLE {table} AS SELECT * FROM {table}_mv;
+
+    DROP MATERIALIZED VIEW {table}_mv;
+
+    CREATE SEQUENCE {table}_id_seq OWNED BY {table}.id;
+
+    SELECT setval('{table}_id_seq', coalesce(max(id), 0) + 1, false) FROM {table};
+
+    ALTER TABLE {table}
+        ALTER COLUMN id SET DEFAULT nextval('{table}_id_seq'),
+        ALTER COLUMN id SET NOT NULL,
+        ADD PRIMARY KEY (id);
+
+    CREATE UNIQUE INDEX {index}
+    ON {table} ({columns})
+    ;
+"""
+
+
+class Migration(migrations.Migration):
+    """Replace the AWS UI materialized views with incrementally maintained tables."""
+
+    dependencies = [("reporting", "0095_auto_20200212_1606")]
+
+    operations = [
+        migrations.RunSQL(
+            "".join(
+                CONVERT_VIEW_SQL.format(table=table, index=index, columns=columns)
+                for table, index, columns in AWS_UI_SUMMARY_TABLES
+            )
+        )
+    ]
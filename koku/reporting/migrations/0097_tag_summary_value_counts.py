@@ -0,0 +1,36 @@
+# Generated by Django 2.2.10 on 2020-02-20 14:12
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("reporting", "0096_aws_ui_summary_tables")]
+
+    operations = [
+        migrations.AddField(
+            model_name="awstagssummary",
+            name="value_counts",
+            field=django.contrib.postgres.fields.jsonb.JSONField(default=dict),
+        ),
+        migrations.AddField(
+            model_name="azuretagssummary",
+            name="value_counts",
+            field=django.contrib.postgres.fields.jsonb.JSONField(default=dict),
+        ),
+        migrations.AddField(
+            model_name="ocpstoragevolumeclaimlabelsummary",
+            name="value_counts",
+            field=django.contrib.postgres.fields.jsonb.JSONField(default=dict),
+        ),
+        migrations.AddField(
+            model_name="ocpstoragevolumelabelsummary",
+            name="value_counts",
+            field=django.contrib.postgres.fields.jsonb.JSONField(default=dict),
+        ),
+        migrations.AddField(
+            model_name="ocpusagepodlabelsummary",
+            name="value_counts",
+            field=django.contrib.postgres.fields.jsonb.JSONField(default=dict),
+        ),
+    ]
@@ -0,0 +1,60 @@
+from django.db import migrations
+
+# Tables partitioned by month and the column they are partitioned on. This
+# mirrors masu.database.PARTITIONED_TABLES at the time of the migration.
+# Besides the daily tables, the raw AWS line item table is partitioned: it is
+# the largest table and is loaded with plain COPY, so it does not need the
+# ON CONFLICT merges that keep the other raw line item tables unpartitioned.
+PARTITIONED_TABLES = {
+    "reporting_awscostentrylineitem": "usage_start",
+    "reporting_awscostentrylineitem_daily": "usage_start",
+    "reporting_azurecostentrylineitem_daily": "usage_date_time",
+    "reporting_ocpusagelineitem_daily": "usage_start",
+    "reporting_ocpstoragelineitem_daily": "usage_start",
+}
+
+# The existing table becomes the first partition of a new partitioned table
+# with the same columns, so its rows are not copied. It holds every row
+# before the month following both its newest row and the migration, and
+# masu creates the monthly partitions after it. Foreign keys stay on the
+# partitions rather than the parent; LIKE does not copy them, so masu copies
+# them onto every new partition. Declarative partitioning needs PostgreSQL 10.
+PARTITION_TABLE_SQL = """
+DO $$
+DECLARE
+    boundary timestamptz;
+    id_sequence text;
+BEGIN
+    IF current_setting('server_version_num')::integer < 100000 THEN
+        RAISE EXCEPTION 'Partitioning {table} requires PostgreSQL 10 or later.';
+    END IF;
+
+    IF EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = '{table}'::regclass) THEN
+        RETURN;
+    END IF;
+
+    SELECT date_trunc('month', greatest(max({column}), now()) AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+            + interval '1 month'
+        INTO boundary
+        FROM {table};
+    id_sequence := pg_get_serial_sequence('{table}', 'id');
+
+    ALTER TABLE {table} RENAME TO {table}_legacy;
+    CREATE TABLE {table} (LIKE {table}_legacy INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+        PARTITION BY RANGE ({column});
+    EXECUTE format('ALTER SEQUENCE %s OWNED BY {table}.id', id_sequence);
+    EXECUTE format(
+        'ALTER TABLE {table} ATTACH PARTITION {table}_legacy FOR VALUES FROM (MINVALUE) TO (%L)', boundary
+    );
+END $$;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("reporting", "0097_tag_summary_value_counts")]
+
+    operations = [
+        migrations.RunSQL(sql=PARTITION_TABLE_SQL.format(table=table, column=column))
+        for table, column in PARTITIONED_TABLES.items()
+    ]
@@ -0,0 +1,15 @@
+# Generated by Django 2.2.10 on 2020-02-24 15:02
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("reporting", "0098_partition_line_item_tables")]
+
+    operations = [
+        migrations.RemoveField(model_name="awstagssummary", name="value_counts"),
+        migrations.RemoveField(model_name="azuretagssummary", name="value_counts"),
+        migrations.RemoveField(model_name="ocpstoragevolumeclaimlabelsummary", name="value_counts"),
+        migrations.RemoveField(model_name="ocpstoragevolumelabelsummary", name="value_counts"),
+        migrations.RemoveField(model_name="ocpusagepodlabelsummary", name="value_counts"),
+    ]
@@ -63,7 +63,7 @@ from reporting.provider.ocp_aws.models import OCPAWSCostLineItemDailySummary
 from reporting.provider.ocp_aws.models import OCPAWSCostLineItemProjectDailySummary
 
 
-AWS_MATERIALIZED_VIEWS = (
+AWS_UI_SUMMARY_TABLES = (
     AWSComputeSummary,
     AWSComputeSummaryByAccount,
     AWSComputeSummaryByRegion,
@@ -283,9 +283,9 @@ class AWSTagsSummary(models.Model):
     cost_entry_bill = models.ForeignKey("AWSCostEntryBill", on_delete=models.CASCADE)
 
 
-# Materialized Views for UI Reporting
+# Summary tables for UI Reporting, maintained by AWSReportDBAccessor.populate_ui_summary_tables
 class AWSCostSummary(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of total cost.
 
@@ -311,7 +311,7 @@ class AWSCostSummary(models.Model):
 
 
 class AWSCostSummaryByService(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of total cost by service.
 
@@ -341,7 +341,7 @@ class AWSCostSummaryByService(models.Model):
 
 
 class AWSCostSummaryByAccount(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of total cost by account.
 
@@ -371,7 +371,7 @@ class AWSCostSummaryByAccount(models.Model):
 
 
 class AWSCostSummaryByRegion(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of total cost by region.
 
@@ -401,7 +401,7 @@ class AWSCostSummaryByRegion(models.Model):
 
 
 class AWSComputeSummary(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of compute usage.
 
@@ -437,7 +437,7 @@ class AWSComputeSummary(models.Model):
 
 
 class AWSComputeSummaryByService(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of compute usage by service and instance type.
 
@@ -477,7 +477,7 @@ class AWSComputeSummaryByService(models.Model):
 
 
 class AWSComputeSummaryByAccount(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of total cost by service and instance type.
 
@@ -517,7 +517,7 @@ class AWSComputeSummaryByAccount(models.Model):
 
 
 class AWSComputeSummaryByRegion(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of total cost by service and instance type.
 
@@ -557,7 +557,7 @@ class AWSComputeSummaryByRegion(models.Model):
 
 
 class AWSStorageSummary(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of storage usage.
 
@@ -589,7 +589,7 @@ class AWSStorageSummary(models.Model):
 
 
 class AWSStorageSummaryByService(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of storage usage by service.
 
@@ -623,7 +623,7 @@ class AWSStorageSummaryByService(models.Model):
 
 
 class AWSStorageSummaryByAccount(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of storage by account.
 
@@ -659,7 +659,7 @@ class AWSStorageSummaryByAccount(models.Model):
 
 
 class AWSStorageSummaryByRegion(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of total cost by service and instance type.
 
@@ -695,7 +695,7 @@ class AWSStorageSummaryByRegion(models.Model):
 
 
 class AWSNetworkSummary(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of network usage.
 
@@ -727,7 +727,7 @@ class AWSNetworkSummary(models.Model):
 
 
 class AWSDatabaseSummary(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of database usage.
 